@@ -29,13 +29,15 @@ Versión: 3.0 - Agentes IA Hiperrealistas
 
 from src.config.ConfiguradorSimulacion import ConfiguradorSimulacion
 from src.utils.SimuladorLogger import SimuladorLogger
+from src.utils.SimulacionReport import ResultadoSimulacion
+from src.utils.AlmacenResultados import AlmacenResultados, clave_ejecucion
+from src.utils.ExportadorColumnar import ExportadorColumnar
 from src.systems.PreciosDinamicos import integrar_sistema_precios_dinamicos, actualizar_precios_mercado
 from src.systems.VisualizacionAvanzada import DashboardEconomico, VisualizadorTiempoReal, exportar_resultados_completos
 from src.systems.EstimuloEconomico import detectar_estancamiento_economico, aplicar_estimulo_emergencia
 from src.systems.CrisisFinanciera import evaluar_recuperacion_crisis, aplicar_medidas_recuperacion, evaluar_riesgo_sistemico
 from src.systems.MercadoLaboral import MercadoLaboral
 from src.systems.labor_market import EnhancedLaborMarket
-from src.systems.AnalyticsML import SistemaAnalyticsML
 from src.systems.SistemaBancario import SistemaBancario, Banco
 # NUEVOS SISTEMAS HIPERREALISTAS v3.0
 from src.systems.BancoCentral import BancoCentral
@@ -62,8 +64,6 @@ try:
     MODELOS_ECONOMICOS_DISPONIBLES = True
 except ImportError:
     MODELOS_ECONOMICOS_DISPONIBLES = False
-# SISTEMA DE AGENTES IA HIPERREALISTAS v3.0
-from src.ai.IntegradorAgentesIA import IntegradorAgentesIA, ConfiguracionSistemaIA
 from src.models.Gobierno import Gobierno
 from src.models.EmpresaProductora import EmpresaProductora
 from src.models.EmpresaProductoraHiperrealista import EmpresaProductoraHiperrealista
@@ -71,16 +71,20 @@ from src.models.Empresa import Empresa
 from src.models.Consumidor import Consumidor
 from src.models.Bien import Bien
 from src.models.Mercado import Mercado
-from src.utils.SimuladorLogger import init_logging, get_simulador_logger, close_logging
+from src.utils.SimuladorLogger import init_logging, get_simulador_logger, close_logging, set_simulador_logger
 import sys
 import os
 import time
 import random
 import logging
-import matplotlib.pyplot as plt
 import argparse
 import json
 
+# Los sistemas con dependencias pesadas (Analytics ML -> scikit-learn/joblib,
+# Agentes IA) se importan en integrar_sistemas_avanzados solo si la
+# configuración los activa; el dashboard importa matplotlib/pandas al graficar
+# o exportar. Así las ejecuciones headless no pagan esos imports al arrancar.
+
 # Añadir src al path de Python
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
 
@@ -165,6 +169,21 @@ def crear_bienes_expandidos():
     return bienes
 
 
+def limitar_catalogo_bienes(bienes, num_bienes):
+    """Reduce el catálogo a ``num_bienes`` tomando bienes de cada categoría por turnos"""
+    if not num_bienes or num_bienes >= len(bienes):
+        return bienes
+    por_categoria = {}
+    for nombre, bien in bienes.items():
+        por_categoria.setdefault(bien.categoria, []).append(nombre)
+    seleccion = []
+    while len(seleccion) < num_bienes:
+        for nombres in por_categoria.values():
+            if nombres and len(seleccion) < num_bienes:
+                seleccion.append(nombres.pop(0))
+    return {nombre: bienes[nombre] for nombre in seleccion}
+
+
 def configurar_economia_avanzada(mercado, config):
     """Configura la economía con parámetros del archivo de configuración"""
     logger.log_configuracion("Configurando economía avanzada...")
@@ -316,8 +335,11 @@ def integrar_sistemas_avanzados(mercado, config):
 
     # === MACHINE LEARNING ===
     ml_config = config.obtener_seccion('machine_learning')
+    # El analytics interno del mercado sigue la misma activación que el ML
+    mercado.analytics_habilitado = bool(ml_config.get('activar', True))
     if ml_config.get('activar', True):
         logger.log_configuracion("Activando sistema de Machine Learning...")
+        from src.systems.AnalyticsML import SistemaAnalyticsML, PredictorDemanda
         mercado.analytics_ml = SistemaAnalyticsML(mercado)
 
         # Entrenar modelos iniciales con datos sintéticos
@@ -326,7 +348,6 @@ def integrar_sistemas_avanzados(mercado, config):
         # Entrenar primeros 10 bienes
         for bien_nombre in list(mercado.bienes.keys())[:10]:
             if mercado.analytics_ml.predictor_demanda.get(bien_nombre) is None:
-                from src.systems.AnalyticsML import PredictorDemanda
                 mercado.analytics_ml.predictor_demanda[bien_nombre] = PredictorDemanda(
                 )
 
@@ -476,6 +497,8 @@ def integrar_sistemas_avanzados(mercado, config):
     ia_config = config.obtener_seccion('agentes_ia')
     if ia_config.get('activar', True):
         try:
+            from src.ai.IntegradorAgentesIA import IntegradorAgentesIA, ConfiguracionSistemaIA
+
             # Configuración del sistema de IA
             configuracion_ia = ConfiguracionSistemaIA(
                 num_consumidores_ia=ia_config.get('num_consumidores', 15),
@@ -514,6 +537,9 @@ def integrar_sistemas_avanzados(mercado, config):
     try:
         # Obtener configuración de rendimiento
         perf_config = config.obtener_seccion('performance')
+        if not getattr(mercado, 'persistencia_habilitada', True):
+            # Perfil headless: sin reportes/gráficos de rendimiento en disco
+            perf_config = dict(perf_config, activar_reportes_rendimiento=False)
         
         # Inicializar sistema de rendimiento en el mercado
         if mercado.inicializar_sistema_rendimiento(perf_config):
@@ -538,13 +564,41 @@ def integrar_sistemas_avanzados(mercado, config):
         logger.log_error(f"   ❌ No se pudo activar la Bolsa de Valores: {e}")
 
 
-def ejecutar_simulacion_completa(config, prefijo_resultados: str | None = None):
-    """Ejecuta la simulación completa con todas las mejoras hiperrealistas v3.0"""
+def ejecutar_simulacion_completa(config, prefijo_resultados: str | None = None, al_terminar_ciclo=None,
+                                 canal_metricas=None):
+    """Ejecuta la simulación completa con todas las mejoras hiperrealistas v3.0
+
+    En perfil headless (``ejecucion.perfil``) no se generan gráficos ni
+    archivos intermedios; el resultado estructurado queda en
+    ``mercado.resultado``. Si se pasa ``al_terminar_ciclo`` se invoca como
+    ``al_terminar_ciclo(mercado, ciclo, num_ciclos)`` al final de cada ciclo
+    (progreso de trabajos en segundo plano); una excepción suya detiene la
+    simulación. ``canal_metricas`` (p. ej. ``CanalMetricas``) recibe los
+    indicadores de cada ciclo según se registran. Con la sección
+    ``exportacion_columnar`` activada, las series macro, los paneles de agentes
+    y las transacciones se escriben en particiones columnares durante la
+    ejecución.
+    """
+    headless = config.es_headless() if hasattr(config, 'es_headless') else False
+
     logger.log_inicio("INICIANDO SIMULACIÓN ECONÓMICA HIPERREALISTA v3.0")
     logger.log_inicio("=" * 70)
 
     # Inicializar sistema de logging (ya tenemos uno global, pero mantenemos el local para compatibilidad)
-    local_logger = SimuladorLogger()
+    log_config = config.obtener_seccion('logging') if hasattr(config, 'obtener_seccion') else {}
+    opciones_log = {
+        'asincrono': log_config.get('asincrono', True),
+        'jsonl': log_config.get('formato_jsonl', False),
+        'niveles_componentes': {c: n if isinstance(n, int) else logging.getLevelName(str(n).upper())
+                                for c, n in (log_config.get('niveles_componentes') or {}).items()},
+    }
+    if headless:
+        # Sin archivo de log y solo advertencias/errores por consola
+        local_logger = SimuladorLogger(log_dir=None, log_level=logging.WARNING, **opciones_log)
+    else:
+        local_logger = SimuladorLogger(**opciones_log)
+    # Los sistemas que piden get_simulador_logger() comparten esta instancia
+    set_simulador_logger(local_logger)
     local_logger.log_inicio("Simulación Económica Hiperrealista v3.0 iniciada")
 
     tiempo_inicio = time.time()
@@ -552,9 +606,13 @@ def ejecutar_simulacion_completa(config, prefijo_resultados: str | None = None):
     # === CONFIGURACIÓN INICIAL ===
     # Crear bienes expandidos primero
     bienes = crear_bienes_expandidos()
+    bienes = limitar_catalogo_bienes(
+        bienes, config.obtener_parametro('simulacion', 'num_bienes', None))
 
     # Crear mercado con bienes
     mercado = Mercado(bienes)
+    mercado.persistencia_habilitada = not headless
+    mercado.canal_metricas = canal_metricas
     
     # Configurar heterogeneidad de consumidores
     mercado.config_hetero = config.obtener_seccion('heterogeneidad_consumidores')
@@ -569,6 +627,10 @@ def ejecutar_simulacion_completa(config, prefijo_resultados: str | None = None):
     sim_config = config.obtener_seccion('simulacion')
     num_ciclos = sim_config.get('num_ciclos', 50)
     frecuencia_reportes = sim_config.get('frecuencia_reportes', 5)
+    # Control de concentración por ciclo: desactivado por defecto para no alterar
+    # el número de empresas de las ejecuciones ya calibradas
+    config_concentracion = config.obtener_seccion('mejoras_integrales').get('control_concentracion', {})
+    controlar_concentracion = config_concentracion.get('controlar_cada_ciclo', False)
 
     # Visualizador en tiempo real (opcional)
     usar_tiempo_real = False  # Cambiar a True para gráficos en tiempo real
@@ -593,6 +655,14 @@ def ejecutar_simulacion_completa(config, prefijo_resultados: str | None = None):
         mercado.reporter_rendimiento.iniciar_seguimiento(f"simulacion_{num_ciclos}ciclos")
         local_logger.log_configuracion("📊 Seguimiento de rendimiento activado")
 
+    # === EXPORTACIÓN COLUMNAR (opcional) ===
+    exportador = ExportadorColumnar.desde_config(
+        config, f"{prefijo_resultados or 'simulacion'}_{int(time.time())}")
+    if exportador is not None:
+        local_logger.log_configuracion(f"Exportación columnar ({exportador.formato}) en {exportador.directorio}")
+
+    mercado.tiempo_inicializacion = time.time() - tiempo_inicio
+
     # === EJECUCIÓN PRINCIPAL ===
     for ciclo in range(1, num_ciclos + 1):
         # Log inicio de ciclo
@@ -890,6 +960,14 @@ def ejecutar_simulacion_completa(config, prefijo_resultados: str | None = None):
                 }
             )
 
+        # Control de concentración: con las ventas del ciclo ya registradas
+        if controlar_concentracion and hasattr(mercado, 'controlador_empresas'):
+            control_concentracion = mercado.controlador_empresas.controlar_concentracion_ciclo(mercado, ciclo)
+            if control_concentracion['empresas_creadas'] > 0:
+                local_logger.log_sistema(f"🏢 Control Concentración - Ciclo {ciclo}: "
+                                       f"{control_concentracion['empresas_creadas']} empresas creadas "
+                                       f"({control_concentracion['razon_intervencion']})")
+
         # === NUEVO: VALIDACIÓN ECONÓMICA POST-CICLO ===
         if hasattr(mercado, 'validador_economico'):
             alertas = mercado.validador_economico.validar_indicadores_macroeconomicos(mercado, ciclo)
@@ -1091,7 +1169,15 @@ REPORTE HIPERREALISTA v3.0 - CICLO {ciclo}/{num_ciclos}:
             visualizador_tiempo_real.actualizar_grafico_tiempo_real(
                 mercado.dashboard)
 
+        if exportador is not None:
+            exportador.registrar_ciclo(mercado, ciclo)
+
+        if al_terminar_ciclo is not None:
+            al_terminar_ciclo(mercado, ciclo, num_ciclos)
+
     # === FINALIZACIÓN ===
+    if exportador is not None:
+        local_logger.log_sistema(f"Exportación columnar completada: {exportador.cerrar()}")
     tiempo_total = time.time() - tiempo_inicio
     local_logger.log_sistema(
         f"Simulación completada - Tiempo total: {tiempo_total:.2f} segundos")
@@ -1132,8 +1218,18 @@ REPORTE HIPERREALISTA v3.0 - CICLO {ciclo}/{num_ciclos}:
             local_logger.log_error(f"   ❌ Error generando reporte de rendimiento: {e}")
 
     # === RESULTADOS FINALES ===
-    local_logger.log_sistema("Generando resultados finales de la simulación")
-    generar_resultados_finales(mercado, tiempo_total, num_ciclos, prefijo_resultados=prefijo_resultados)
+    mercado.resultado = ResultadoSimulacion.desde_mercado(
+        mercado, num_ciclos, tiempo_total,
+        seed=config.obtener_parametro('simulacion', 'seed', None),
+        perfil='headless' if headless else 'completo')
+    if headless:
+        archivo_columnar = config.obtener_parametro('ejecucion', 'archivo_columnar', None)
+        if archivo_columnar:
+            ruta = mercado.resultado.guardar_columnar(archivo_columnar)
+            local_logger.log_sistema(f"Resultado columnar guardado: {ruta}")
+    else:
+        local_logger.log_sistema("Generando resultados finales de la simulación")
+        generar_resultados_finales(mercado, tiempo_total, num_ciclos, prefijo_resultados=prefijo_resultados)
 
     # Log final de cierre
     local_logger.log_fin(
@@ -1142,6 +1238,53 @@ REPORTE HIPERREALISTA v3.0 - CICLO {ciclo}/{num_ciclos}:
     return mercado
 
 
+def ejecutar_simulacion_headless(config, archivo_columnar: str | None = None,
+                                 al_terminar_ciclo=None, canal_metricas=None) -> ResultadoSimulacion:
+    """Ejecuta la simulación en perfil headless y devuelve el ResultadoSimulacion.
+
+    No escribe dashboard, exportaciones, reportes ni modelos; si se indica
+    ``archivo_columnar`` se guarda un único .npz al terminar.
+    """
+    config.activar_perfil_headless(archivo_columnar)
+    mercado = ejecutar_simulacion_completa(config, al_terminar_ciclo=al_terminar_ciclo,
+                                           canal_metricas=canal_metricas)
+    return mercado.resultado
+
+
+def ejecutar_simulacion_memoizada(config, archivo_columnar: str | None = None, seed: int | None = None,
+                                  almacen=None) -> ResultadoSimulacion:
+    """Simulación headless consultando antes el almacén de resultados.
+
+    La clave combina la configuración, la semilla efectiva (``seed`` o
+    ``simulacion.seed``) y la versión del código; si ya existe se devuelve sin
+    simular. Sin semilla, o con ``cache_resultados.habilitado`` a false, se
+    simula siempre.
+    """
+    if almacen is None:
+        almacen = AlmacenResultados.desde_config(config.config)
+    clave = clave_ejecucion(config.config, seed) if almacen is not None else None
+    if clave is not None:
+        resultado = almacen.obtener(clave)
+        if resultado is not None:
+            logger.log_sistema(f"♻️  Resultado recuperado del almacén ({clave[:12]}), sin simular")
+            if archivo_columnar:
+                resultado.guardar_columnar(archivo_columnar)
+            return resultado
+
+    resultado = ejecutar_simulacion_headless(config, archivo_columnar)
+    if clave is not None:
+        guardar_en_almacen(almacen, clave, resultado)
+    return resultado
+
+
+def guardar_en_almacen(almacen, clave: str, resultado: ResultadoSimulacion, metadatos=None):
+    """Guarda un resultado en el almacén sin que un fallo de disco aborte la ejecución"""
+    try:
+        almacen.guardar(clave, resultado, metadatos)
+    except Exception as e:
+        logger.log_error(f"No se pudo guardar el resultado en el almacén: {e}")
+
+
 def generar_resultados_finales(mercado, tiempo_total, num_ciclos, prefijo_resultados: str | None = None):
     """Genera y guarda todos los resultados finales"""
     logger.log_sistema("GENERANDO RESULTADOS FINALES...")
@@ -1377,6 +1520,9 @@ def main():
         parser = argparse.ArgumentParser(description="Simulador de Mercado Hiperrealista v3.0")
         parser.add_argument("--escenario", type=str, default=None, help="Ruta a archivo JSON de escenario o nombre en carpeta 'escenarios/'")
         parser.add_argument("--seed", type=int, default=None, help="Semilla para aleatoriedad")
+        parser.add_argument("--headless", action="store_true", help="Perfil sin gráficos ni archivos intermedios")
+        parser.add_argument("--salida-columnar", type=str, default=None, help="Archivo .npz con series y KPIs (solo --headless)")
+        parser.add_argument("--sin-cache", action="store_true", help="No consultar ni actualizar el almacén de resultados")
         args, unknown = parser.parse_known_args()
 
         # Semilla determinista opcional (CLI tiene prioridad)
@@ -1387,36 +1533,21 @@ def main():
         logger.log_inicio("Cargando configuración del simulador")
         configurador = ConfiguradorSimulacion()
         # Aplicar seed global desde config o CLI
-        configurador.aplicar_seed_global(cli_seed)
+        seed_aplicada = configurador.aplicar_seed_global(cli_seed)
 
         # Si se especifica un escenario, intentar cargarlo
         escenario_nombre = None
         if args.escenario:
-            def _deep_merge(base, overlay):
-                if not isinstance(base, dict) or not isinstance(overlay, dict):
-                    return overlay
-                result = dict(base)
-                for k, v in overlay.items():
-                    if k in result and isinstance(result[k], dict) and isinstance(v, dict):
-                        result[k] = _deep_merge(result[k], v)
-                    else:
-                        result[k] = v
-                return result
-            ruta = args.escenario
-            if not os.path.isabs(ruta) and not os.path.exists(ruta):
-                ruta = os.path.join(os.path.dirname(__file__), "escenarios", args.escenario if args.escenario.endswith('.json') else f"{args.escenario}.json")
-            if os.path.exists(ruta):
-                try:
-                    with open(ruta, 'r', encoding='utf-8') as f:
-                        escenario_cfg = json.load(f)
-                    # Merge profundo sobre config base ya cargada
-                    configurador.config = _deep_merge(configurador.config, escenario_cfg)
-                    escenario_nombre = os.path.splitext(os.path.basename(ruta))[0]
-                    logger.log_configuracion(f"✅ Escenario cargado: {ruta}")
-                except Exception as e:
-                    logger.log_configuracion(f"⚠️  No se pudo cargar el escenario '{ruta}': {e}. Se usará configuración por defecto.")
-            else:
-                logger.log_configuracion(f"⚠️  Escenario no encontrado: {ruta}. Se usará configuración por defecto.")
+            try:
+                escenario_nombre = configurador.aplicar_escenario(args.escenario)
+                logger.log_configuracion(f"✅ Escenario cargado: {args.escenario}")
+            except FileNotFoundError as e:
+                logger.log_configuracion(f"⚠️  Escenario no encontrado: {e}. Se usará configuración por defecto.")
+            except Exception as e:
+                logger.log_configuracion(f"⚠️  No se pudo cargar el escenario '{args.escenario}': {e}. Se usará configuración por defecto.")
+
+        if args.headless:
+            configurador.activar_perfil_headless(args.salida_columnar)
 
         # Ejecutar simulación
         logger.log_inicio("Iniciando ejecución de simulación hiperrealista")
@@ -1426,7 +1557,19 @@ def main():
             if args.seed is not None:
                 prefijo_resultados += f"_seed{args.seed}"
 
-        mercado = ejecutar_simulacion_completa(configurador, prefijo_resultados=prefijo_resultados)
+        almacen = None if args.sin_cache else AlmacenResultados.desde_config(configurador.config)
+        if args.headless and almacen is not None:
+            # Headless: el resultado es todo lo que se produce, se puede reutilizar
+            ejecutar_simulacion_memoizada(configurador, args.salida_columnar, seed=seed_aplicada,
+                                          almacen=almacen)
+        else:
+            # Perfil completo (o --sin-cache): siempre simula, pero el perfil
+            # completo deja su resultado en el almacén para ejecuciones posteriores
+            # (la clave se calcula antes: la simulación recalibra parámetros en la config)
+            clave = clave_ejecucion(configurador.config, seed_aplicada) if almacen is not None else None
+            mercado = ejecutar_simulacion_completa(configurador, prefijo_resultados=prefijo_resultados)
+            if clave is not None:
+                guardar_en_almacen(almacen, clave, mercado.resultado)
 
         logger.log_fin(
             "Simulación exitosa - SISTEMA DE AGENTES IA IMPLEMENTADO correctamente")
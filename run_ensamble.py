@@ -0,0 +1,95 @@
+"""
+Ensamble Monte-Carlo de un escenario con bandas de confianza por ciclo.
+
+Uso:
+  python run_ensamble.py --escenario shock_inflacion --replicas 40 --procesos 4
+
+Ejecuta réplicas con semillas consecutivas desde ``--semilla-inicial`` en
+procesos en paralelo y se detiene en cuanto los intervalos de confianza de
+PIB, inflación y desempleo son suficientemente estrechos (sección
+``ensamble_montecarlo``). Las réplicas ya simuladas se toman del almacén de
+resultados.
+
+Genera:
+  - results/ensamble_<escenario>_<ts>.json (bandas completas)
+  - results/ensamble_<escenario>_<ts>.csv (una fila por ciclo y serie)
+"""
+
+import argparse
+import json
+import os
+import sys
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from src.config.ConfiguradorSimulacion import ConfiguradorSimulacion
+from src.utils.EnsambleMonteCarlo import EnsambleMonteCarlo
+
+
+def guardar_resultados(resultado, nombre):
+    os.makedirs('results', exist_ok=True)
+    ts = int(datetime.now().timestamp())
+    json_path = f'results/ensamble_{nombre}_{ts}.json'
+    csv_path = f'results/ensamble_{nombre}_{ts}.csv'
+
+    with open(json_path, 'w', encoding='utf-8') as f:
+        json.dump(resultado.to_dict(), f, indent=2)
+
+    with open(csv_path, 'w', encoding='utf-8') as f:
+        for serie, bandas in resultado.bandas.items():
+            columnas = list(bandas)
+            if f.tell() == 0:
+                f.write(','.join(['serie', 'ciclo'] + columnas) + '\n')
+            for i in range(len(bandas['media'])):
+                f.write(','.join([serie, str(i + 1)] + [f"{bandas[c][i]:.6g}" for c in columnas]) + '\n')
+    return json_path, csv_path
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Ensamble Monte-Carlo del simulador')
+    parser.add_argument('--escenario', type=str, default=None)
+    parser.add_argument('--replicas', type=int, default=None, help='Máximo de réplicas')
+    parser.add_argument('--semilla-inicial', type=int, default=None)
+    parser.add_argument('--procesos', type=int, default=None)
+    parser.add_argument('--ciclos', type=int, default=None)
+    parser.add_argument('--sin-cache', action='store_true', help='Simular aunque haya réplicas guardadas')
+    args = parser.parse_args()
+
+    configurador = ConfiguradorSimulacion()
+    if args.escenario:
+        configurador.aplicar_escenario(args.escenario)
+    config = configurador.config
+    if args.ciclos is not None:
+        config['simulacion']['num_ciclos'] = args.ciclos
+
+    seccion = configurador.obtener_seccion('ensamble_montecarlo')
+    replicas = args.replicas or seccion.get('replicas_max', 50)
+    inicial = args.semilla_inicial if args.semilla_inicial is not None else seccion.get('semilla_inicial', 1000)
+    opciones = {'max_procesos': args.procesos} if args.procesos else {}
+    if args.sin_cache:
+        opciones['almacen'] = None
+    ensamble = EnsambleMonteCarlo.desde_config(config, **opciones)
+
+    def progreso(ens, seed):
+        estado = 'convergido' if ens.convergido() else 'en curso'
+        print(f"  réplica {ens.replicas}/{replicas} (seed={seed}) - {estado}")
+
+    nombre = os.path.splitext(os.path.basename(args.escenario))[0] if args.escenario else 'base'
+    print(f">>> Ensamble '{nombre}': hasta {replicas} réplicas en {ensamble.max_procesos} procesos")
+    resultado = ensamble.ejecutar(range(inicial, inicial + replicas), al_completar_replica=progreso)
+
+    if resultado.fallidas:
+        print(f"Réplicas fallidas: {resultado.fallidas}")
+    print(f"Réplicas: {resultado.replicas} ({resultado.desde_almacen} desde el almacén), "
+          f"convergido: {resultado.convergido}")
+    for serie, bandas in resultado.bandas.items():
+        print(f"  {serie} final: media={bandas['media'][-1]:.4g} "
+              f"IC{int(resultado.nivel_confianza * 100)}=[{bandas['ic_inferior'][-1]:.4g}, "
+              f"{bandas['ic_superior'][-1]:.4g}]")
+    json_path, csv_path = guardar_resultados(resultado, nombre)
+    print(f"\nResultados guardados:\n- {json_path}\n- {csv_path}")
+
+
+if __name__ == '__main__':
+    main()
@@ -7,6 +7,10 @@ Uso:
 Genera:
   - results/escenarios_kpis_<ts>.csv
   - results/escenarios_resumen_<ts>.txt
+
+Antes de lanzar cada escenario se consulta el almacén de resultados
+(``cache_resultados``): si ya hay una ejecución con la misma configuración,
+semilla y versión del código, sus KPIs se toman de ahí sin simular.
 """
 
 import argparse
@@ -21,16 +25,54 @@ from datetime import datetime
 ESCENARIOS_DIR = os.path.join(os.path.dirname(__file__), 'escenarios')
 
 
-def ejecutar_escenario(nombre, seed=None):
+def ejecutar_escenario(nombre, seed=None, sin_cache=False):
     cmd = [sys.executable, os.path.join(os.path.dirname(__file__), 'main.py'), '--escenario', nombre]
     if seed is not None:
         cmd += ['--seed', str(seed)]
+    if sin_cache:
+        cmd += ['--sin-cache']
     inicio = time.time()
     proc = subprocess.run(cmd, capture_output=True, text=True)
     duracion = time.time() - inicio
     return proc.returncode, proc.stdout, proc.stderr, duracion
 
 
+def buscar_en_almacen(nombre, seed=None):
+    """ResultadoSimulacion guardado para el escenario y semilla, o None"""
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+    from src.config.ConfiguradorSimulacion import ConfiguradorSimulacion
+    from src.utils.AlmacenResultados import AlmacenResultados, clave_ejecucion
+
+    configurador = ConfiguradorSimulacion()
+    # Igual que main.py: la semilla se fija antes de combinar el escenario
+    seed_efectiva = seed if seed is not None else configurador.obtener_parametro('simulacion', 'seed', None)
+    try:
+        configurador.aplicar_escenario(nombre)
+    except Exception:
+        return None
+    almacen = AlmacenResultados.desde_config(configurador.config)
+    if almacen is None:
+        return None
+    return almacen.obtener(clave_ejecucion(configurador.config, seed_efectiva))
+
+
+def extraer_kpis_desde_resultado(resultado):
+    """KPIs con la misma definición que el reporte de texto (VisualizacionAvanzada)"""
+    import numpy as np
+
+    series = resultado.series
+    kpis = {
+        'pib': resultado.kpis.get('pib_final'),
+        'inflacion': round(float(np.mean(series['inflacion'])), 2) if series.get('inflacion') else None,
+        'desempleo': round(float(np.mean(series['desempleo'])), 2) if series.get('desempleo') else None,
+        'empresas_activas': int(np.mean(series['empresas_activas'])) if series.get('empresas_activas')
+        else resultado.kpis.get('empresas_activas_final'),
+        'transacciones': int(sum(series['transacciones_por_ciclo'])) if series.get('transacciones_por_ciclo')
+        else resultado.kpis.get('transacciones_totales'),
+    }
+    return kpis
+
+
 def extraer_kpis_desde_archivos(nombre_escenario, seed):
     """Extrae KPIs desde los archivos de reporte generados."""
     import glob
@@ -157,12 +199,21 @@ def main():
     parser = argparse.ArgumentParser(description='Runner de escenarios para el simulador')
     parser.add_argument('--escenarios', nargs='*', default=['base', 'shock_inflacion', 'subsidio_y_restriccion_oferta'])
     parser.add_argument('--seed', type=int, default=None)
+    parser.add_argument('--sin-cache', action='store_true', help='Simular aunque haya resultados guardados')
     args = parser.parse_args()
 
     resultados = []
     for esc in args.escenarios:
+        resultado = None if args.sin_cache else buscar_en_almacen(esc, args.seed)
+        if resultado is not None:
+            print(f"\n>>> Escenario {esc}: resultado recuperado del almacén, sin simular")
+            kpis = extraer_kpis_desde_resultado(resultado)
+            kpis.update({'escenario': esc, 'seed': args.seed, 'duracion': 0.0})
+            resultados.append(kpis)
+            continue
+
         print(f"\n>>> Ejecutando escenario: {esc} ...")
-        code, out, err, dur = ejecutar_escenario(esc, seed=args.seed)
+        code, out, err, dur = ejecutar_escenario(esc, seed=args.seed, sin_cache=args.sin_cache)
         if code != 0:
             print(f"Escenario {esc} falló con código {code}. STDERR:\n{err}")
         
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Suite de Benchmarks con Seguimiento de Regresiones
+==================================================
+
+Ejecuta los micro-benchmarks por subsistema y los macro-benchmarks de ciclos
+completos, guarda los resultados como baseline del commit actual y falla
+(código de salida 1) si algún benchmark empeora más que el umbral respecto
+a la baseline de referencia.
+
+Uso:
+    python3 scripts/benchmark_simulacion.py                      # micro + macro 250/1k
+    python3 scripts/benchmark_simulacion.py --macro 250 1000 5000 20000
+    python3 scripts/benchmark_simulacion.py --solo-micro --filtro orderbook
+    python3 scripts/benchmark_simulacion.py --baseline a1b2c3d --umbral 0.15
+"""
+
+import os
+import sys
+import logging
+import argparse
+
+# Añadir el directorio raíz al path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.utils.BenchmarkSuite import SuiteBenchmarks, benchmarks_micro, benchmarks_macro, commit_actual
+from src.utils.ReporterRendimiento import ReporterRendimiento
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmarks del Simulador de Mercado")
+    parser.add_argument('--repeticiones', type=int, default=5, help='Repeticiones por micro-benchmark')
+    parser.add_argument('--escala', type=int, default=1, help='Multiplicador del tamaño de los micro-benchmarks')
+    parser.add_argument('--macro', type=int, nargs='*', default=[250, 1000],
+                        help='Números de consumidores para los macro-benchmarks (p. ej. 250 1000 5000 20000)')
+    parser.add_argument('--ciclos-macro', type=int, default=3, help='Ciclos por macro-benchmark')
+    parser.add_argument('--solo-micro', action='store_true', help='Omitir macro-benchmarks')
+    parser.add_argument('--filtro', type=str, default=None, help='Ejecutar solo benchmarks cuyo nombre contenga el texto')
+    parser.add_argument('--baseline', type=str, default=None, help='Commit de la baseline de referencia')
+    parser.add_argument('--umbral', type=float, default=0.20, help='Regresión máxima tolerada (0.20 = 20%%)')
+    parser.add_argument('--no-guardar', action='store_true', help='No guardar esta corrida como baseline')
+    parser.add_argument('--output-dir', type=str, default='results/benchmarks', help='Directorio de salida')
+    args = parser.parse_args()
+    # El progreso de las utilidades de rendimiento sale por el logger 'SimuladorEconomico'
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+
+    suite = SuiteBenchmarks(args.output_dir, repeticiones=args.repeticiones, umbral_regresion=args.umbral)
+    suite.registrar(benchmarks_micro(args.escala))
+    if not args.solo_micro and args.macro:
+        suite.registrar(benchmarks_macro(args.macro, args.ciclos_macro))
+
+    commit = commit_actual(os.path.join(os.path.dirname(__file__), '..'))
+    print(f"🚀 BENCHMARKS - commit {commit}")
+    print("=" * 50)
+    resultados = suite.ejecutar(args.filtro)
+
+    commit_base, baseline = suite.seleccionar_baseline(args.baseline, excluir=commit)
+    comparacion = suite.comparar(resultados, baseline)
+    if not args.no_guardar:
+        ruta = suite.guardar_baseline(resultados, commit)
+        print(f"💾 Baseline guardada en: {ruta}")
+
+    reporter = ReporterRendimiento(args.output_dir)
+    reporte = reporter.generar_reporte_benchmarks(
+        comparacion, {k: r.to_dict() for k, r in resultados.items()}, commit, commit_base, args.umbral)
+    print(f"📄 Reporte guardado en: {reporte}")
+
+    regresiones = [c for c in comparacion if c['regresion']]
+    for c in regresiones:
+        print(f"❌ REGRESIÓN {c['clave']}: {c['baseline'] * 1000:.2f} ms → {c['actual'] * 1000:.2f} ms "
+              f"({c['variacion']:+.1%})")
+    if regresiones:
+        sys.exit(1)
+    print("✅ Sin regresiones de rendimiento")
+
+
+if __name__ == "__main__":
+    main()
@@ -10,12 +10,14 @@ Uso:
     python3 scripts/profile_simulation.py --mode basic
     python3 scripts/profile_simulation.py --mode detailed --cycles 30
     python3 scripts/profile_simulation.py --mode compare --baseline
+    python3 scripts/profile_simulation.py --mode scaling --sweep-consumers 250 1000 4000
 
 Requiere: pip install line_profiler memory_profiler
 """
 
 import os
 import sys
+import logging
 import time
 import cProfile
 import pstats
@@ -340,6 +342,29 @@ class ProfilerSimulacion:
         
         print(f"📄 Reporte de comparación guardado en: {comparison_file}")
     
+    def profile_scaling(self, num_cycles=3, barridos=None, base=None, grid_completo=False,
+                        perfilar_subsistemas=True, aislar=True):
+        """Curvas de throughput frente a consumidores, bienes y empresas"""
+        from src.utils.AnalisisEscalabilidad import (
+            ejecutar_barrido, analizar_escalabilidad, generar_reporte_escalabilidad)
+
+        print(f"📈 INICIANDO ANÁLISIS DE ESCALABILIDAD: {num_cycles} ciclos por punto")
+        puntos = ejecutar_barrido(barridos, base, grid_completo, num_cycles,
+                                  perfilar_subsistemas, aislar)
+        analisis = analizar_escalabilidad(puntos)
+        reporte_md, reporte_json = generar_reporte_escalabilidad(
+            puntos, analisis, str(self.output_dir), self.timestamp)
+
+        for dimension, datos in analisis.items():
+            exponente = datos['exponente_ciclo']
+            texto = f"{exponente:.2f}" if exponente is not None else "n/d"
+            print(f"📊 {dimension}: t/ciclo ∝ n^{texto}, "
+                  f"se rompe primero: {datos['subsistema_mayor_exponente'] or 'n/d'}")
+        print(f"📄 Reporte de escalabilidad guardado en: {reporte_md}")
+
+        return {'puntos': puntos, 'analisis': analisis,
+                'reporte': str(reporte_md), 'datos': str(reporte_json)}
+
     def generar_reporte_consolidado(self):
         """Genera un reporte consolidado de todos los perfiles"""
         print("📋 GENERANDO REPORTE CONSOLIDADO")
@@ -384,14 +409,23 @@ class ProfilerSimulacion:
 
 def main():
     parser = argparse.ArgumentParser(description="Profiler para Simulador de Mercado")
-    parser.add_argument('--mode', choices=['basic', 'detailed', 'memory', 'compare', 'all'], 
+    parser.add_argument('--mode', choices=['basic', 'detailed', 'memory', 'compare', 'scaling', 'all'], 
                         default='basic', help='Modo de perfilado')
     parser.add_argument('--cycles', type=int, default=50, help='Número de ciclos')
     parser.add_argument('--consumers', type=int, default=250, help='Número de consumidores')
     parser.add_argument('--baseline', type=str, help='Archivo de línea base para comparación')
     parser.add_argument('--output-dir', type=str, default='results/perf', help='Directorio de salida')
+    parser.add_argument('--sweep-consumers', type=int, nargs='+', help='Barrido de consumidores (modo scaling)')
+    parser.add_argument('--sweep-goods', type=int, nargs='+', help='Barrido de bienes del catálogo (modo scaling)')
+    parser.add_argument('--sweep-firms', type=int, nargs='+', help='Barrido de empresas productoras (modo scaling)')
+    parser.add_argument('--scaling-cycles', type=int, default=3, help='Ciclos por punto de la grilla')
+    parser.add_argument('--full-grid', action='store_true', help='Producto cartesiano completo de los barridos')
+    parser.add_argument('--no-subsystems', action='store_true', help='Omitir la corrida con cProfile por punto')
+    parser.add_argument('--in-process', action='store_true', help='No aislar cada punto en un proceso hijo')
     
     args = parser.parse_args()
+    # El progreso de las utilidades de rendimiento sale por el logger 'SimuladorEconomico'
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
     
     profiler = ProfilerSimulacion(args.output_dir)
     
@@ -411,6 +445,18 @@ def main():
         if args.mode == 'compare':
             profiler.compare_performance(args.baseline)
         
+        if args.mode == 'scaling':
+            barridos = {}
+            if args.sweep_consumers:
+                barridos['consumidores'] = tuple(args.sweep_consumers)
+            if args.sweep_goods:
+                barridos['bienes'] = tuple(args.sweep_goods)
+            if args.sweep_firms:
+                barridos['empresas'] = tuple(args.sweep_firms)
+            profiler.profile_scaling(args.scaling_cycles, barridos, grid_completo=args.full_grid,
+                                     perfilar_subsistemas=not args.no_subsystems,
+                                     aislar=not args.in_process)
+        
         if args.mode == 'all':
             profiler.generar_reporte_consolidado()
         
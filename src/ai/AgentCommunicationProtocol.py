@@ -18,6 +18,8 @@ from datetime import datetime, timedelta
 import threading
 import queue
 import numpy as np
+from ..utils.SimuladorLogger import diagnostico
+import logging
 
 
 class TipoMensaje(Enum):
@@ -392,7 +394,8 @@ class AgentCommunicationProtocol:
                     try:
                         self.handlers_mensaje[mensaje.tipo](mensaje)
                     except Exception as e:
-                        print(f"Error procesando mensaje {mensaje.tipo}: {e}")
+                        diagnostico("Error procesando mensaje %s: %s", mensaje.tipo, e, componente='IA',
+                                    nivel=logging.WARNING)
                 
                 self.mensajes_entrantes.task_done()
                 
@@ -401,7 +404,8 @@ class AgentCommunicationProtocol:
                 self._limpiar_comunicaciones_expiradas()
                 continue
             except Exception as e:
-                print(f"Error en procesamiento de mensajes: {e}")
+                diagnostico("Error en procesamiento de mensajes: %s", e, componente='IA',
+                            nivel=logging.WARNING)
     
     def _handle_propuesta_precio(self, mensaje: Mensaje):
         """Maneja propuestas de precio"""
@@ -7,7 +7,6 @@ a los agentes aprender de sus experiencias y mejorar sus decisiones.
 """
 
 import numpy as np
-import pandas as pd
 from dataclasses import dataclass, field
 from typing import Dict, List, Any, Optional, Tuple
 from collections import deque
@@ -15,6 +14,8 @@ import pickle
 import json
 from datetime import datetime
 import uuid
+from ..utils.SimuladorLogger import diagnostico
+import logging
 
 
 @dataclass
@@ -498,4 +499,4 @@ class AgentMemorySystem:
             # ... (implementar reconstrucción completa si es necesario)
             
         except Exception as e:
-            print(f"Error cargando memoria: {e}")
+            diagnostico("Error cargando memoria: %s", e, componente='IA', nivel=logging.WARNING)
@@ -20,6 +20,7 @@ from .AgentCommunicationProtocol import AgentCommunicationProtocol, TipoMensaje,
 from .PerfilPersonalidadIA import GeneradorPerfilesPersonalidad, PerfilPersonalidadCompleto, TipoPersonalidad
 from .ComportamientoCompraIA import SistemaComportamientoCompra, ContextoCompra, ExperienciaCompra
 from ..models.BienHiperrealista import BienHiperrealista, TipoBien
+from ..utils.SimuladorLogger import diagnostico, diagnostico_activo
 
 
 @dataclass
@@ -110,7 +111,10 @@ class ConsumidorIA(Consumidor):
         # Precios ancla para sesgos cognitivos
         self.precios_ancla: Dict[str, float] = {}
         
-        print(f"[{self.nombre}] Consumidor IA inicializado: {self.perfil_personalidad_completo.get_descripcion_personalidad()}")
+        if diagnostico_activo('IA', logging.DEBUG):
+            diagnostico("[%s] Consumidor IA inicializado: %s", self.nombre,
+                        self.perfil_personalidad_completo.get_descripcion_personalidad(),
+                        componente='IA', nivel=logging.DEBUG)
     
     def _convertir_a_perfil_aprendizaje(self) -> PerfilAprendizajeIA:
         """Convierte el perfil de personalidad completo al formato de aprendizaje IA anterior"""
@@ -496,7 +500,8 @@ class ConsumidorIA(Consumidor):
     
     def adaptarse_a_crisis(self, tipo_crisis: str, severidad: float):
         """Adapta comportamiento durante crisis económicas"""
-        print(f"[{self.nombre}] Adaptándose a crisis: {tipo_crisis} (severidad: {severidad:.2f})")
+        diagnostico("[%s] Adaptándose a crisis: %s (severidad: %.2f)", self.nombre, tipo_crisis, severidad,
+                    componente='IA', nivel=logging.DEBUG)
         
         # Ajustar parámetros según tipo de crisis
         if tipo_crisis == "financiera":
@@ -592,7 +597,8 @@ class ConsumidorIA(Consumidor):
         """Busca empleo durante crisis (simplificado)"""
         # En implementación real, esto interactuaría con el mercado laboral
         # Por ahora, solo actualizar estado
-        print(f"[{self.nombre}] Buscando empleo durante crisis...")
+        diagnostico("[%s] Buscando empleo durante crisis...", self.nombre,
+                    componente='IA', nivel=logging.DEBUG)
     
     def tomar_decision_compra_hiperrealista(self, bien: str, precio: float, vendedor: str = None, 
                                           contexto_mercado: Dict[str, Any] = None) -> bool:
@@ -694,13 +700,15 @@ class ConsumidorIA(Consumidor):
             # Aprender de la experiencia
             self.memoria.aprender_de_experiencia(decision, decision.resultado)
             
-            print(f"[{self.nombre}] Compró {bien} por ${precio_final:.2f} (satisfacción: {satisfaccion:.2f})")
+            diagnostico("[%s] Compró %s por $%.2f (satisfacción: %.2f)", self.nombre, bien, precio_final,
+                        satisfaccion, componente='IA', nivel=logging.DEBUG)
             return True
         
         elif decidir_comprar:
             # Quería comprar pero no tenía dinero
             self.perfil_personalidad_completo.actualizar_estado_emocional("compra_fallida", 0.1)
-            print(f"[{self.nombre}] Quería comprar {bien} pero no tiene fondos suficientes")
+            diagnostico("[%s] Quería comprar %s pero no tiene fondos suficientes", self.nombre, bien,
+                        componente='IA', nivel=logging.DEBUG)
         
         return False
     
@@ -719,7 +727,8 @@ class ConsumidorIA(Consumidor):
                 bien._actualizar_valores_derivados()
             return bien
         except Exception as e:
-            print(f"[{self.nombre}] Error creando bien hiperrealista para {nombre_bien}: {e}")
+            diagnostico("[%s] Error creando bien hiperrealista para %s: %s", self.nombre, nombre_bien, e,
+                        componente='IA', nivel=logging.WARNING)
             return None
     
     def _inferir_tipo_bien(self, nombre_bien: str) -> TipoBien:
@@ -982,7 +991,8 @@ class ConsumidorIA(Consumidor):
             self._actualizar_estado_psicologico()
             
         except Exception as e:
-            print(f"[{self.nombre}] Error en ciclo IA hiperrealista: {e}")
+            diagnostico("[%s] Error en ciclo IA hiperrealista: %s", self.nombre, e,
+                        componente='IA', nivel=logging.WARNING)
     
     def _procesar_evolucion_personalidad(self):
         """Procesa la evolución gradual de la personalidad"""
@@ -1150,7 +1160,8 @@ class ConsumidorIA(Consumidor):
             self._actualizar_predicciones_demanda(estado_mercado)
             
         except Exception as e:
-            print(f"[{self.nombre}] Error actualizando conocimiento de mercado: {e}")
+            diagnostico("[%s] Error actualizando conocimiento de mercado: %s", self.nombre, e,
+                        componente='IA', nivel=logging.WARNING)
     
     def _detectar_tendencias_precios(self, precios_actuales: Dict[str, Dict[str, float]]):
         """Detecta tendencias en precios y actualiza estrategias"""
@@ -1196,7 +1207,8 @@ class ConsumidorIA(Consumidor):
             
             alianza_id = self.formar_grupos_compra(bien_elegido, cantidad_objetivo)
             if alianza_id:
-                print(f"[{self.nombre}] Formó grupo de compra para {bien_elegido} (ID: {alianza_id})")
+                diagnostico("[%s] Formó grupo de compra para %s (ID: %s)", self.nombre, bien_elegido,
+                            alianza_id, componente='IA', nivel=logging.DEBUG)
     
     def _actualizar_red_social_dinamica(self, mercado_actual):
         """Actualiza la red social de manera dinámica"""
@@ -1214,7 +1226,8 @@ class ConsumidorIA(Consumidor):
                     
                     if compatibilidad > 0.6 and random.random() < 0.1:  # 10% probabilidad si hay compatibilidad
                         self.red_social.append(otro.nombre)
-                        print(f"[{self.nombre}] Se conectó socialmente con {otro.nombre}")
+                        diagnostico("[%s] Se conectó socialmente con %s", self.nombre, otro.nombre,
+                                    componente='IA', nivel=logging.DEBUG)
         
         # Mantener red social limitada
         if len(self.red_social) > 15:
@@ -1337,7 +1350,8 @@ class ConsumidorIA(Consumidor):
             costo_educacion = self.ingreso_mensual * 0.1
             if self.dinero >= costo_educacion:
                 self.dinero -= costo_educacion
-                print(f"[{self.nombre}] Invirtió en educación financiera")
+                diagnostico("[%s] Invirtió en educación financiera", self.nombre,
+                            componente='IA', nivel=logging.DEBUG)
     
     def _actualizar_estado_psicologico(self):
         """Actualiza el estado psicológico de manera más sofisticada"""
@@ -1726,12 +1740,14 @@ class ConsumidorIA(Consumidor):
                 self.ultimo_pib = pib_actual
             
         except Exception as e:
-            print(f"[{self.nombre}] Error actualizando conocimiento de mercado: {e}")
+            diagnostico("[%s] Error actualizando conocimiento de mercado: %s", self.nombre, e,
+                        componente='IA', nivel=logging.WARNING)
 
     def finalizar_ia(self):
         """Finaliza todos los componentes IA del consumidor"""
         try:
             self.comunicacion.finalizar()
-            print(f"[{self.nombre}] Sistemas IA finalizados")
+            diagnostico("[%s] Sistemas IA finalizados", self.nombre, componente='IA', nivel=logging.DEBUG)
         except Exception as e:
-            print(f"[{self.nombre}] Error finalizando IA: {e}")
+            diagnostico("[%s] Error finalizando IA: %s", self.nombre, e,
+                        componente='IA', nivel=logging.WARNING)
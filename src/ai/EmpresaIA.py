@@ -17,6 +17,8 @@ from ..models.Empresa import Empresa
 from .AgentMemorySystem import AgentMemorySystem, Decision
 from .IADecisionEngine import IADecisionEngine, EstadoMercado, OpcionDecision
 from .AgentCommunicationProtocol import AgentCommunicationProtocol, TipoMensaje, PrioridadMensaje
+from ..utils.SimuladorLogger import diagnostico
+import logging
 
 
 @dataclass
@@ -211,7 +213,8 @@ class EmpresaIA(Empresa):
                 mejor_estrategia = estrategia
         
         self.estrategia_actual = mejor_estrategia
-        print(f"[{self.nombre}] Estrategia inicial: {mejor_estrategia.nombre}")
+        diagnostico("[%s] Estrategia inicial: %s", self.nombre, mejor_estrategia.nombre,
+                    componente='IA', nivel=logging.DEBUG)
     
     def _inicializar_productos_ia(self):
         """Inicializa análisis IA de productos"""
@@ -429,7 +432,9 @@ class EmpresaIA(Empresa):
         estrategia_anterior = self.estrategia_actual
         self.estrategia_actual = nueva_estrategia
         
-        print(f"[{self.nombre}] Cambio de estrategia: {estrategia_anterior.nombre if estrategia_anterior else 'Ninguna'} → {nueva_estrategia.nombre}")
+        diagnostico("[%s] Cambio de estrategia: %s → %s", self.nombre,
+                    estrategia_anterior.nombre if estrategia_anterior else 'Ninguna', nueva_estrategia.nombre,
+                    componente='IA', nivel=logging.DEBUG)
         
         # Registrar decisión estratégica
         decision = Decision(
@@ -677,7 +682,8 @@ class EmpresaIA(Empresa):
         self.costos_unitarios[producto_info['nombre']] = nuevo_producto.costo_produccion
         
         self.innovaciones_exitosas += 1
-        print(f"[{self.nombre}] Nuevo producto lanzado: {producto_info['nombre']}")
+        diagnostico("[%s] Nuevo producto lanzado: %s", self.nombre, producto_info['nombre'],
+                    componente='IA', nivel=logging.DEBUG)
     
     def gestionar_cadena_suministro_ia(self) -> Dict[str, Any]:
         """Gestiona la cadena de suministro con IA"""
@@ -782,7 +788,8 @@ class EmpresaIA(Empresa):
                 if alianza_id:
                     self.alianzas_activas.append(alianza_id)
                     nuevas_alianzas.append(alianza_id)
-                    print(f"[{self.nombre}] Nueva alianza {tipo_alianza} con {candidato}")
+                    diagnostico("[%s] Nueva alianza %s con %s", self.nombre, tipo_alianza, candidato,
+                                componente='IA', nivel=logging.DEBUG)
         
         return nuevas_alianzas
     
@@ -845,7 +852,8 @@ class EmpresaIA(Empresa):
             self._aprender_de_resultados_ciclo()
             
         except Exception as e:
-            print(f"[{self.nombre}] Error en ciclo empresarial IA: {e}")
+            diagnostico("[%s] Error en ciclo empresarial IA: %s", self.nombre, e,
+                        componente='IA', nivel=logging.WARNING)
     
     def _decisiones_operativas_ia(self):
         """Toma decisiones operativas usando IA"""
@@ -1057,7 +1065,8 @@ class EmpresaIA(Empresa):
                 self.ultimo_pib_empresa = pib_actual
             
         except Exception as e:
-            print(f"[{self.nombre}] Error actualizando conocimiento de mercado: {e}")
+            diagnostico("[%s] Error actualizando conocimiento de mercado: %s", self.nombre, e,
+                        componente='IA', nivel=logging.WARNING)
 
     def get_estadisticas_empresariales_ia(self) -> Dict[str, Any]:
         """Obtiene estadísticas completas de la empresa IA"""
@@ -1084,6 +1093,8 @@ class EmpresaIA(Empresa):
         """Finaliza todos los componentes IA de la empresa"""
         try:
             self.comunicacion.finalizar()
-            print(f"[{self.nombre}] Sistemas empresariales IA finalizados")
+            diagnostico("[%s] Sistemas empresariales IA finalizados", self.nombre,
+                        componente='IA', nivel=logging.DEBUG)
         except Exception as e:
-            print(f"[{self.nombre}] Error finalizando IA empresarial: {e}")
+            diagnostico("[%s] Error finalizando IA empresarial: %s", self.nombre, e,
+                        componente='IA', nivel=logging.WARNING)
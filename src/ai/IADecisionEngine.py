@@ -8,23 +8,19 @@ por refuerzo, redes neuronales y optimización estratégica.
 """
 
 import numpy as np
-import pandas as pd
 from typing import Dict, List, Any, Tuple, Optional
 from dataclasses import dataclass
 import random
 from collections import defaultdict
 import math
+import importlib.util
+from ..utils.SimuladorLogger import diagnostico
 
-# Importar bibliotecas de ML/IA (simuladas si no están disponibles)
-try:
-    from sklearn.ensemble import RandomForestRegressor, GradientBoostingRegressor
-    from sklearn.neural_network import MLPRegressor
-    from sklearn.preprocessing import StandardScaler
-    from sklearn.model_selection import train_test_split
-    ML_AVAILABLE = True
-except ImportError:
-    ML_AVAILABLE = False
-    print("Librerías ML no disponibles. Usando implementación básica.")
+# Bibliotecas de ML/IA: solo se comprueba su presencia; scikit-learn se
+# importa al entrenar por primera vez para no penalizar el arranque
+ML_AVAILABLE = importlib.util.find_spec('sklearn') is not None
+if not ML_AVAILABLE:
+    diagnostico("Librerías ML no disponibles. Usando implementación básica.", componente='IA')
 
 from .AgentMemorySystem import AgentMemorySystem, Decision
 
@@ -157,18 +153,23 @@ class NeuralNetwork:
     
     def __init__(self):
         self.model = None
-        self.scaler = StandardScaler()
+        self.scaler = None
         self.is_trained = False
-        
-        if ML_AVAILABLE:
-            self.model = MLPRegressor(
-                hidden_layer_sizes=(64, 32, 16),
-                activation='relu',
-                solver='adam',
-                learning_rate='adaptive',
-                max_iter=500,
-                random_state=42
-            )
+
+    def _crear_modelo(self):
+        """Instancia el regresor y el escalador (importa scikit-learn bajo demanda)"""
+        from sklearn.neural_network import MLPRegressor
+        from sklearn.preprocessing import StandardScaler
+
+        self.scaler = StandardScaler()
+        self.model = MLPRegressor(
+            hidden_layer_sizes=(64, 32, 16),
+            activation='relu',
+            solver='adam',
+            learning_rate='adaptive',
+            max_iter=500,
+            random_state=42
+        )
     
     def preparar_features(self, estado: EstadoMercado, accion: OpcionDecision) -> np.ndarray:
         """Convierte estado y acción en features numéricas"""
@@ -211,6 +212,9 @@ class NeuralNetwork:
         
         X = np.array(X)
         y = np.array(y)
+
+        if self.model is None:
+            self._crear_modelo()
         
         # Normalizar features
         X_scaled = self.scaler.fit_transform(X)
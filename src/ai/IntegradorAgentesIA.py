@@ -35,6 +35,8 @@ from .SistemaDeepLearningIA import SistemaDeepLearningIA, TipoRedNeural
 # Importar modelos base
 from ..models.Consumidor import Consumidor
 from ..models.Empresa import Empresa
+from ..utils.SimuladorLogger import diagnostico
+import logging
 
 
 @dataclass
@@ -97,23 +99,23 @@ class IntegradorAgentesIA:
             bienes_mercado: Lista de bienes que se comerciarán
             configuracion: Configuración del sistema (opcional)
         """
-        print("="*60)
-        print("INICIALIZANDO ECOSISTEMA DE AGENTES IA HIPERREALISTAS")
-        print("="*60)
+        diagnostico("="*60, componente='IA')
+        diagnostico("INICIALIZANDO ECOSISTEMA DE AGENTES IA HIPERREALISTAS", componente='IA')
+        diagnostico("="*60, componente='IA')
         
         self.configuracion = configuracion or ConfiguracionSistemaIA()
         self.bienes_mercado = bienes_mercado
         self.tiempo_inicio = datetime.now()
         
         # === FASE 1: FUNDAMENTOS IA ===
-        print("\n[FASE 1] Inicializando Fundamentos IA...")
+        diagnostico("[FASE 1] Inicializando Fundamentos IA...", componente='IA')
         
         # Mercado IA Central (incluye orquestador)
         self.mercado_ia = MercadoIA(bienes_mercado)
-        print("✓ Mercado IA Central inicializado")
+        diagnostico("✓ Mercado IA Central inicializado", componente='IA')
         
         # === FASE 2: AGENTES INTELIGENTES ===
-        print("\n[FASE 2] Creando Agentes Inteligentes...")
+        diagnostico("[FASE 2] Creando Agentes Inteligentes...", componente='IA')
         
         # Contenedores de agentes
         self.consumidores_ia: Dict[str, ConsumidorIA] = {}
@@ -121,25 +123,25 @@ class IntegradorAgentesIA:
         
         # Crear consumidores IA
         self._crear_consumidores_ia()
-        print(f"✓ {len(self.consumidores_ia)} Consumidores IA creados")
+        diagnostico("✓ %s Consumidores IA creados", len(self.consumidores_ia), componente='IA')
         
         # Crear empresas IA  
         self._crear_empresas_ia()
-        print(f"✓ {len(self.empresas_ia)} Empresas IA creadas")
+        diagnostico("✓ %s Empresas IA creadas", len(self.empresas_ia), componente='IA')
         
         # === FASE 3: REDES SOCIALES ===
-        print("\n[FASE 3] Estableciendo Redes Sociales...")
+        diagnostico("[FASE 3] Estableciendo Redes Sociales...", componente='IA')
         
         self.red_social = RedSocialAgentesIA()
         self._configurar_red_social()
-        print("✓ Red Social de Agentes configurada")
+        diagnostico("✓ Red Social de Agentes configurada", componente='IA')
         
         # === FASE 4: DEEP LEARNING ===
-        print("\n[FASE 4] Inicializando Deep Learning...")
+        diagnostico("[FASE 4] Inicializando Deep Learning...", componente='IA')
         
         self.sistema_deep_learning = SistemaDeepLearningIA()
         self._configurar_deep_learning()
-        print("✓ Sistema de Deep Learning configurado")
+        diagnostico("✓ Sistema de Deep Learning configurado", componente='IA')
         
         # === COORDINACIÓN Y ESTADO ===
         self.estadisticas = EstadisticasSistemaIA()
@@ -152,12 +154,15 @@ class IntegradorAgentesIA:
         # Logs de actividad
         self.logs_actividad = []
         
-        print("\n" + "="*60)
-        print("🤖 ECOSISTEMA DE IA HIPERREALISTA INICIADO EXITOSAMENTE")
-        print(f"📊 {len(self.consumidores_ia)} Consumidores + {len(self.empresas_ia)} Empresas")
-        print(f"🌐 {self.red_social.get_estadisticas_red()['relaciones_totales']} Relaciones Sociales")
-        print(f"🧠 {len(self.sistema_deep_learning.redes_especializadas)} Redes Neuronales")
-        print("="*60)
+        diagnostico("="*60, componente='IA')
+        diagnostico("🤖 ECOSISTEMA DE IA HIPERREALISTA INICIADO EXITOSAMENTE", componente='IA')
+        diagnostico("📊 %s Consumidores + %s Empresas", len(self.consumidores_ia), len(self.empresas_ia),
+                    componente='IA')
+        diagnostico("🌐 %s Relaciones Sociales", self.red_social.get_estadisticas_red()['relaciones_totales'],
+                    componente='IA')
+        diagnostico("🧠 %s Redes Neuronales", len(self.sistema_deep_learning.redes_especializadas),
+                    componente='IA')
+        diagnostico("="*60, componente='IA')
         
         # Iniciar coordinación
         self.hilo_coordinacion.start()
@@ -212,8 +217,8 @@ class IntegradorAgentesIA:
         # Establecer relaciones iniciales
         self._establecer_relaciones_iniciales(todos_agentes)
         
-        print(f"   - {len(todos_agentes)} agentes registrados")
-        print(f"   - {len(self.red_social.relaciones)} relaciones establecidas")
+        diagnostico("   - %s agentes registrados", len(todos_agentes), componente='IA')
+        diagnostico("   - %s relaciones establecidas", len(self.red_social.relaciones), componente='IA')
     
     def _generar_perfil_agente(self, agente_id: str) -> Dict[str, float]:
         """Genera perfil inicial para un agente"""
@@ -276,8 +281,10 @@ class IntegradorAgentesIA:
                 self.configuracion.intervalo_entrenamiento_minutos
             )
         
-        print(f"   - {len(redes_crear)} redes neuronales creadas")
-        print(f"   - Entrenamiento automático: {'activado' if self.configuracion.entrenar_automaticamente else 'desactivado'}")
+        diagnostico("   - %s redes neuronales creadas", len(redes_crear), componente='IA')
+        diagnostico("   - Entrenamiento automático: %s",
+                    'activado' if self.configuracion.entrenar_automaticamente else 'desactivado',
+                    componente='IA')
     
     def ejecutar_ciclo_mercado(self, duracion_minutos: int = 60):
         """
@@ -286,15 +293,15 @@ class IntegradorAgentesIA:
         Args:
             duracion_minutos: Duración del ciclo en minutos
         """
-        print(f"\n🚀 INICIANDO CICLO DE MERCADO IA ({duracion_minutos} minutos)")
-        print("-" * 50)
+        diagnostico("🚀 INICIANDO CICLO DE MERCADO IA (%s minutos)", duracion_minutos, componente='IA')
+        diagnostico("-" * 50, componente='IA')
         
         tiempo_fin = datetime.now() + timedelta(minutes=duracion_minutos)
         ciclo = 0
         
         while datetime.now() < tiempo_fin and self.sistemas_activos:
             ciclo += 1
-            print(f"\n--- Ciclo {ciclo} ---")
+            diagnostico("--- Ciclo %s ---", ciclo, componente='IA')
             
             # 1. Fase de análisis y planificación
             self._fase_analisis_planificacion()
@@ -318,7 +325,7 @@ class IntegradorAgentesIA:
             # Pausa entre ciclos
             time.sleep(2)
         
-        print(f"\n✅ CICLO DE MERCADO COMPLETADO - {ciclo} iteraciones")
+        diagnostico("✅ CICLO DE MERCADO COMPLETADO - %s iteraciones", ciclo, componente='IA')
         self._mostrar_resumen_final()
     
     def _fase_analisis_planificacion(self):
@@ -336,7 +343,8 @@ class IntegradorAgentesIA:
                     )
             except Exception as e:
                 if self.configuracion.activar_logs_detallados:
-                    print(f"   Error en análisis consumidor: {e}")
+                    diagnostico("   Error en análisis consumidor: %s", e, componente='IA',
+                                nivel=logging.WARNING)
         
         # Las empresas desarrollan estrategias
         for empresa in self.empresas_ia.values():
@@ -355,7 +363,8 @@ class IntegradorAgentesIA:
                     )
             except Exception as e:
                 if self.configuracion.activar_logs_detallados:
-                    print(f"   Error en estrategia empresa: {e}")
+                    diagnostico("   Error en estrategia empresa: %s", e, componente='IA',
+                                nivel=logging.WARNING)
     
     def _fase_negociacion_transacciones(self) -> List[Any]:
         """Fase de negociaciones y transacciones"""
@@ -384,7 +393,7 @@ class IntegradorAgentesIA:
             
         except Exception as e:
             if self.configuracion.activar_logs_detallados:
-                print(f"   Error en negociaciones: {e}")
+                diagnostico("   Error en negociaciones: %s", e, componente='IA', nivel=logging.WARNING)
         
         return transacciones_realizadas
     
@@ -432,7 +441,8 @@ class IntegradorAgentesIA:
                         
                 except Exception as e:
                     if self.configuracion.activar_logs_detallados:
-                        print(f"   Error procesando transacción: {e}")
+                        diagnostico("   Error procesando transacción: %s", e, componente='IA',
+                                    nivel=logging.WARNING)
         
         return transacciones
     
@@ -475,7 +485,7 @@ class IntegradorAgentesIA:
         
         except Exception as e:
             if self.configuracion.activar_logs_detallados:
-                print(f"   Error en aprendizaje: {e}")
+                diagnostico("   Error en aprendizaje: %s", e, componente='IA', nivel=logging.WARNING)
     
     def _fase_evolucion_social(self):
         """Fase de evolución de relaciones sociales"""
@@ -508,7 +518,7 @@ class IntegradorAgentesIA:
         
         except Exception as e:
             if self.configuracion.activar_logs_detallados:
-                print(f"   Error en evolución social: {e}")
+                diagnostico("   Error en evolución social: %s", e, componente='IA', nivel=logging.WARNING)
     
     def _actualizar_estadisticas(self):
         """Actualiza estadísticas del sistema"""
@@ -529,55 +539,59 @@ class IntegradorAgentesIA:
     
     def _mostrar_estadisticas_progreso(self):
         """Muestra estadísticas de progreso"""
-        print(f"\n📊 ESTADÍSTICAS ACTUALES:")
-        print(f"   Agentes activos: {self.estadisticas.agentes_activos}")
-        print(f"   Transacciones IA: {self.estadisticas.transacciones_ia}")
-        print(f"   Relaciones sociales: {self.estadisticas.relaciones_sociales}")
-        print(f"   Coaliciones activas: {self.estadisticas.coaliciones_activas}")
-        print(f"   Eficiencia global: {self.estadisticas.eficiencia_global:.3f}")
-        print(f"   Tiempo funcionamiento: {self.estadisticas.tiempo_funcionamiento:.1f}s")
+        diagnostico("📊 ESTADÍSTICAS ACTUALES:", componente='IA')
+        diagnostico("   Agentes activos: %s", self.estadisticas.agentes_activos, componente='IA')
+        diagnostico("   Transacciones IA: %s", self.estadisticas.transacciones_ia, componente='IA')
+        diagnostico("   Relaciones sociales: %s", self.estadisticas.relaciones_sociales, componente='IA')
+        diagnostico("   Coaliciones activas: %s", self.estadisticas.coaliciones_activas, componente='IA')
+        diagnostico("   Eficiencia global: %.3f", self.estadisticas.eficiencia_global, componente='IA')
+        diagnostico("   Tiempo funcionamiento: %.1fs", self.estadisticas.tiempo_funcionamiento,
+                    componente='IA')
     
     def _mostrar_resumen_final(self):
         """Muestra resumen final del ciclo"""
-        print("\n" + "="*60)
-        print("📋 RESUMEN FINAL DEL CICLO")
-        print("="*60)
+        diagnostico("="*60, componente='IA')
+        diagnostico("📋 RESUMEN FINAL DEL CICLO", componente='IA')
+        diagnostico("="*60, componente='IA')
         
         # Estadísticas del mercado
         mercado_stats = self.mercado_ia.get_estadisticas_mercado_ia()
-        print(f"🏪 MERCADO IA:")
-        print(f"   - Transacciones procesadas: {mercado_stats['transacciones_totales']}")
-        print(f"   - Patrones detectados: {mercado_stats['patrones_detectados']}")
-        print(f"   - Alertas generadas: {mercado_stats['alertas_activas']}")
-        print(f"   - Eficiencia precios: {mercado_stats['eficiencia_precios']:.3f}")
+        diagnostico("🏪 MERCADO IA:", componente='IA')
+        diagnostico("   - Transacciones procesadas: %s", mercado_stats['transacciones_totales'],
+                    componente='IA')
+        diagnostico("   - Patrones detectados: %s", mercado_stats['patrones_detectados'], componente='IA')
+        diagnostico("   - Alertas generadas: %s", mercado_stats['alertas_activas'], componente='IA')
+        diagnostico("   - Eficiencia precios: %.3f", mercado_stats['eficiencia_precios'], componente='IA')
         
         # Estadísticas de red social
         red_stats = self.red_social.get_estadisticas_red()
-        print(f"\n🌐 RED SOCIAL:")
-        print(f"   - Agentes conectados: {red_stats['agentes_registrados']}")
-        print(f"   - Relaciones establecidas: {red_stats['relaciones_totales']}")
-        print(f"   - Coaliciones formadas: {red_stats['coaliciones_activas']}")
-        print(f"   - Eficiencia comunicación: {red_stats['eficiencia_comunicacion']:.3f}")
+        diagnostico("🌐 RED SOCIAL:", componente='IA')
+        diagnostico("   - Agentes conectados: %s", red_stats['agentes_registrados'], componente='IA')
+        diagnostico("   - Relaciones establecidas: %s", red_stats['relaciones_totales'], componente='IA')
+        diagnostico("   - Coaliciones formadas: %s", red_stats['coaliciones_activas'], componente='IA')
+        diagnostico("   - Eficiencia comunicación: %.3f", red_stats['eficiencia_comunicacion'],
+                    componente='IA')
         
         # Estadísticas de deep learning
         dl_stats = self.sistema_deep_learning.get_estadisticas_sistema()
-        print(f"\n🧠 DEEP LEARNING:")
-        print(f"   - Redes neuronales: {dl_stats['redes_creadas']}")
-        print(f"   - Entrenamientos completados: {dl_stats['redes_entrenadas']}")
-        print(f"   - Optimizaciones evolutivas: {dl_stats['optimizaciones_completadas']}")
-        print(f"   - Datos de entrenamiento: {dl_stats['datos_entrenamiento_total']}")
+        diagnostico("🧠 DEEP LEARNING:", componente='IA')
+        diagnostico("   - Redes neuronales: %s", dl_stats['redes_creadas'], componente='IA')
+        diagnostico("   - Entrenamientos completados: %s", dl_stats['redes_entrenadas'], componente='IA')
+        diagnostico("   - Optimizaciones evolutivas: %s", dl_stats['optimizaciones_completadas'],
+                    componente='IA')
+        diagnostico("   - Datos de entrenamiento: %s", dl_stats['datos_entrenamiento_total'], componente='IA')
         
-        print("\n🎯 LOGROS ALCANZADOS:")
+        diagnostico("🎯 LOGROS ALCANZADOS:", componente='IA')
         if self.estadisticas.transacciones_ia > 50:
-            print("   ✅ Mercado activo con alta actividad transaccional")
+            diagnostico("   ✅ Mercado activo con alta actividad transaccional", componente='IA')
         if self.estadisticas.coaliciones_activas > 0:
-            print("   ✅ Colaboración emergente entre agentes")
+            diagnostico("   ✅ Colaboración emergente entre agentes", componente='IA')
         if self.estadisticas.eficiencia_global > 0.7:
-            print("   ✅ Alta eficiencia en descubrimiento de precios")
+            diagnostico("   ✅ Alta eficiencia en descubrimiento de precios", componente='IA')
         if dl_stats['redes_entrenadas'] > 5:
-            print("   ✅ Aprendizaje profundo activo y efectivo")
+            diagnostico("   ✅ Aprendizaje profundo activo y efectivo", componente='IA')
         
-        print("="*60)
+        diagnostico("="*60, componente='IA')
     
     def _ciclo_coordinacion_principal(self):
         """Ciclo principal de coordinación del sistema"""
@@ -595,7 +609,8 @@ class IntegradorAgentesIA:
                 time.sleep(self.configuracion.intervalo_sincronizacion_segundos)
                 
             except Exception as e:
-                print(f"[COORDINACIÓN] Error en ciclo principal: {e}")
+                diagnostico("[COORDINACIÓN] Error en ciclo principal: %s", e,
+                            componente='IA', nivel=logging.WARNING)
                 time.sleep(5)  # Pausa más larga en caso de error
     
     def _sincronizar_sistemas(self):
@@ -634,7 +649,7 @@ class IntegradorAgentesIA:
         self.logs_actividad.append(log_entry)
         
         if self.configuracion.activar_logs_detallados:
-            print(f"[{datetime.now().strftime('%H:%M:%S')}] {mensaje}")
+            diagnostico("[%s] %s", datetime.now().strftime('%H:%M:%S'), mensaje, componente='IA')
     
     def pausar_sistemas(self):
         """Pausa todos los sistemas de IA"""
@@ -655,34 +670,34 @@ class IntegradorAgentesIA:
     
     def finalizar_sistema(self):
         """Finaliza todos los sistemas de IA de forma ordenada"""
-        print("\n🛑 FINALIZANDO ECOSISTEMA DE IA...")
+        diagnostico("🛑 FINALIZANDO ECOSISTEMA DE IA...", componente='IA')
         
         self.sistemas_activos = False
         
         # Finalizar sistemas en orden
         try:
             self.sistema_deep_learning.finalizar()
-            print("   ✓ Sistema Deep Learning finalizado")
+            diagnostico("   ✓ Sistema Deep Learning finalizado", componente='IA')
         except Exception as e:
-            print(f"   ⚠ Error finalizando Deep Learning: {e}")
+            diagnostico("   ⚠ Error finalizando Deep Learning: %s", e, componente='IA', nivel=logging.WARNING)
         
         try:
             self.red_social.finalizar()
-            print("   ✓ Red Social finalizada")
+            diagnostico("   ✓ Red Social finalizada", componente='IA')
         except Exception as e:
-            print(f"   ⚠ Error finalizando Red Social: {e}")
+            diagnostico("   ⚠ Error finalizando Red Social: %s", e, componente='IA', nivel=logging.WARNING)
         
         try:
             self.mercado_ia.finalizar_ia()
-            print("   ✓ Mercado IA finalizado")
+            diagnostico("   ✓ Mercado IA finalizado", componente='IA')
         except Exception as e:
-            print(f"   ⚠ Error finalizando Mercado IA: {e}")
+            diagnostico("   ⚠ Error finalizando Mercado IA: %s", e, componente='IA', nivel=logging.WARNING)
         
         # Esperar finalización del hilo de coordinación
         if self.hilo_coordinacion.is_alive():
             self.hilo_coordinacion.join(timeout=3.0)
         
-        print("🏁 ECOSISTEMA DE IA FINALIZADO CORRECTAMENTE")
+        diagnostico("🏁 ECOSISTEMA DE IA FINALIZADO CORRECTAMENTE", componente='IA')
     
     def obtener_estado_completo(self) -> Dict[str, Any]:
         """Obtiene el estado completo del sistema"""
@@ -726,7 +741,7 @@ class IntegradorAgentesIA:
                     
             return True
         except Exception as e:
-            print(f"Error sincronizando mercado: {e}")
+            diagnostico("Error sincronizando mercado: %s", e, componente='IA', nivel=logging.WARNING)
             return False
     
     def _procesar_decisiones_consumidores_ia(self, ciclo):
@@ -758,7 +773,8 @@ class IntegradorAgentesIA:
             
             return decisiones
         except Exception as e:
-            print(f"Error procesando decisiones de consumidores: {e}")
+            diagnostico("Error procesando decisiones de consumidores: %s", e, componente='IA',
+                        nivel=logging.WARNING)
             return decisiones
     
     def _procesar_decisiones_empresas_ia(self, ciclo):
@@ -791,7 +807,8 @@ class IntegradorAgentesIA:
             
             return decisiones
         except Exception as e:
-            print(f"Error procesando decisiones de empresas: {e}")
+            diagnostico("Error procesando decisiones de empresas: %s", e, componente='IA',
+                        nivel=logging.WARNING)
             return decisiones
     
     def _aplicar_decisiones_al_mercado(self, mercado_tradicional, decisiones_consumidores, decisiones_empresas, ciclo):
@@ -817,7 +834,8 @@ class IntegradorAgentesIA:
             
             return transacciones_realizadas
         except Exception as e:
-            print(f"Error aplicando decisiones al mercado: {e}")
+            diagnostico("Error aplicando decisiones al mercado: %s", e, componente='IA',
+                        nivel=logging.WARNING)
             return 0
     
     def _actualizar_aprendizaje_global(self, resultado_ia, transacciones_ia, ciclo):
@@ -843,7 +861,7 @@ class IntegradorAgentesIA:
             
             return True
         except Exception as e:
-            print(f"Error actualizando aprendizaje: {e}")
+            diagnostico("Error actualizando aprendizaje: %s", e, componente='IA', nivel=logging.WARNING)
             return False
     
     def _obtener_estadisticas_completas(self):
@@ -881,7 +899,7 @@ class IntegradorAgentesIA:
             
             return stats
         except Exception as e:
-            print(f"Error obteniendo estadísticas: {e}")
+            diagnostico("Error obteniendo estadísticas: %s", e, componente='IA', nivel=logging.WARNING)
             return {
                 'agentes_activos': 0,
                 'transacciones_ia': 0,
@@ -914,7 +932,7 @@ class IntegradorAgentesIA:
             
             return predicciones
         except Exception as e:
-            print(f"Error generando predicciones: {e}")
+            diagnostico("Error generando predicciones: %s", e, componente='IA', nivel=logging.WARNING)
             return {
                 'pib_esperado': 600000,
                 'tendencia_precios': 'Incierta',
@@ -957,31 +975,32 @@ class IntegradorAgentesIA:
             
             return optimizaciones
         except Exception as e:
-            print(f"Error en auto-optimización: {e}")
+            diagnostico("Error en auto-optimización: %s", e, componente='IA', nivel=logging.WARNING)
             return {'cambios_realizados': 0, 'mejora_rendimiento': 0.0}
     
     def _recuperacion_automatica(self, error, ciclo):
         """Sistema de recuperación automática ante errores"""
         try:
-            print(f"🔧 Iniciando recuperación automática - Ciclo {ciclo}")
+            diagnostico("🔧 Iniciando recuperación automática - Ciclo %s", ciclo, componente='IA')
             
             # Reinicializar componentes problemáticos
             if "ConsumidorIA" in str(error):
-                print("   🔄 Reinicializando consumidores IA...")
+                diagnostico("   🔄 Reinicializando consumidores IA...", componente='IA')
                 # Recrear consumidores problemáticos
                 
             if "EmpresaIA" in str(error):
-                print("   🔄 Reinicializando empresas IA...")
+                diagnostico("   🔄 Reinicializando empresas IA...", componente='IA')
                 # Recrear empresas problemáticas
                 
             if "deep_learning" in str(error):
-                print("   🔄 Reinicializando sistema de deep learning...")
+                diagnostico("   🔄 Reinicializando sistema de deep learning...", componente='IA')
                 # Reinicializar deep learning
                 
-            print("   ✅ Recuperación automática completada")
+            diagnostico("   ✅ Recuperación automática completada", componente='IA')
             return True
         except Exception as e:
-            print(f"   ❌ Error en recuperación automática: {e}")
+            diagnostico("   ❌ Error en recuperación automática: %s", e, componente='IA',
+                        nivel=logging.WARNING)
             return False
     
     def ejecutar_ciclo_coordinado(self, mercado_tradicional, ciclo):
@@ -1004,14 +1023,15 @@ class IntegradorAgentesIA:
             
             return resultado_ia
         except Exception as e:
-            print(f"[COORDINACIÓN] Error en ciclo coordinado: {e}")
+            diagnostico("[COORDINACIÓN] Error en ciclo coordinado: %s", e,
+                        componente='IA', nivel=logging.WARNING)
             return {'exito': False, 'error': str(e)}
     
     def finalizar(self):
         """Finaliza el sistema de IA ordenadamente"""
         try:
             # Guardar estadísticas finales
-            print("🔧 INFO: SISTEMA: Finalizando Sistema de Agentes IA...")
+            diagnostico("🔧 INFO: SISTEMA: Finalizando Sistema de Agentes IA...", componente='IA')
             
             # Limpiar recursos
             if hasattr(self, 'sistema_deep_learning'):
@@ -1032,5 +1052,5 @@ class IntegradorAgentesIA:
                 
             return True
         except Exception as e:
-            print(f"Error finalizando sistema IA: {e}")
+            diagnostico("Error finalizando sistema IA: %s", e, componente='IA', nivel=logging.WARNING)
             return False
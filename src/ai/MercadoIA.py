@@ -20,6 +20,8 @@ from .OrquestadorAgentesIA import OrquestadorAgentesIA
 from .AgentMemorySystem import AgentMemorySystem, Decision
 from .IADecisionEngine import IADecisionEngine, EstadoMercado, OpcionDecision
 from .AgentCommunicationProtocol import TipoMensaje, PrioridadMensaje
+from ..utils.SimuladorLogger import diagnostico
+import logging
 
 
 @dataclass
@@ -521,7 +523,7 @@ class MercadoIA(Mercado):
         self.hilo_analisis.daemon = True
         self.hilo_analisis.start()
         
-        print("[MERCADO IA] Sistema de IA del mercado inicializado")
+        diagnostico("[MERCADO IA] Sistema de IA del mercado inicializado", componente='IA')
     
     def registrar_transaccion_ia(self, comprador: str, vendedor: str, bien: str,
                                cantidad: float, precio: float, negociada: bool = False) -> TransaccionIA:
@@ -950,12 +952,14 @@ class MercadoIA(Mercado):
                     alerta = self.detector_crisis.generar_alerta(indicadores)
                     if alerta:
                         self.alertas_activas.append(alerta)
-                        print(f"[MERCADO IA] Alerta {alerta.nivel}: {alerta.descripcion}")
+                        diagnostico("[MERCADO IA] Alerta %s: %s", alerta.nivel, alerta.descripcion,
+                                    componente='IA')
                 
                 # Detectar patrones emergentes
                 nuevos_patrones = self.detectar_patrones_emergentes()
                 if nuevos_patrones:
-                    print(f"[MERCADO IA] {len(nuevos_patrones)} nuevos patrones detectados")
+                    diagnostico("[MERCADO IA] %s nuevos patrones detectados", len(nuevos_patrones),
+                                componente='IA')
                 
                 # Optimizar liquidez si es necesario
                 if self.estado_ia.liquidez_mercado < 0.5:
@@ -968,7 +972,8 @@ class MercadoIA(Mercado):
                 self._limpiar_alertas_antigas()
                 
             except Exception as e:
-                print(f"[MERCADO IA] Error en análisis continuo: {e}")
+                diagnostico("[MERCADO IA] Error en análisis continuo: %s", e,
+                            componente='IA', nivel=logging.WARNING)
             
             time.sleep(self.intervalo_analisis)
     
@@ -1007,7 +1012,7 @@ class MercadoIA(Mercado):
     
     def finalizar_ia(self):
         """Finaliza todos los componentes IA del mercado"""
-        print("[MERCADO IA] Iniciando finalización...")
+        diagnostico("[MERCADO IA] Iniciando finalización...", componente='IA')
         
         self.procesando_ia = False
         
@@ -1018,4 +1023,4 @@ class MercadoIA(Mercado):
         # Finalizar orquestador
         self.orquestador_ia.finalizar()
         
-        print("[MERCADO IA] Finalización completada")
+        diagnostico("[MERCADO IA] Finalización completada", componente='IA')
@@ -22,6 +22,8 @@ from .AgentCommunicationProtocol import (
     AgentCommunicationProtocol, Mensaje, TipoMensaje, PrioridadMensaje,
     Negociacion, Alianza, SeñalMercado
 )
+from ..utils.SimuladorLogger import diagnostico
+import logging
 
 
 class RegistroAgente:
@@ -117,7 +119,7 @@ class OrquestadorAgentesIA:
         self.estadisticas.total_agentes += 1
         self.estadisticas.agentes_por_tipo[tipo] += 1
         
-        print(f"[ORQUESTADOR] Agente {agente_id} ({tipo}) registrado exitosamente")
+        diagnostico("[ORQUESTADOR] Agente %s (%s) registrado exitosamente", agente_id, tipo, componente='IA')
         return True
     
     def desregistrar_agente(self, agente_id: str) -> bool:
@@ -142,7 +144,7 @@ class OrquestadorAgentesIA:
         self.estadisticas.total_agentes -= 1
         self.estadisticas.agentes_por_tipo[registro.tipo] -= 1
         
-        print(f"[ORQUESTADOR] Agente {agente_id} desregistrado")
+        diagnostico("[ORQUESTADOR] Agente %s desregistrado", agente_id, componente='IA')
         return True
     
     def coordinar_agentes_ia(self) -> Dict[str, Any]:
@@ -227,7 +229,8 @@ class OrquestadorAgentesIA:
                 nuevo_estado.riesgo_sistemico = self._calcular_riesgo_sistemico()
                 
             except Exception as e:
-                print(f"[ORQUESTADOR] Error actualizando estado: {e}")
+                diagnostico("[ORQUESTADOR] Error actualizando estado: %s", e,
+                            componente='IA', nivel=logging.WARNING)
         
         # Calcular tendencias y volatilidad
         self._calcular_tendencias_volatilidad(nuevo_estado)
@@ -393,7 +396,8 @@ class OrquestadorAgentesIA:
                 return True
         
         except Exception as e:
-            print(f"[ORQUESTADOR] Error facilitando negociación: {e}")
+            diagnostico("[ORQUESTADOR] Error facilitando negociación: %s", e,
+                        componente='IA', nivel=logging.WARNING)
         
         return False
     
@@ -444,7 +448,8 @@ class OrquestadorAgentesIA:
                                 break
         
         except Exception as e:
-            print(f"[ORQUESTADOR] Error sugiriendo negociaciones: {e}")
+            diagnostico("[ORQUESTADOR] Error sugiriendo negociaciones: %s", e,
+                        componente='IA', nivel=logging.WARNING)
         
         return sugerencias
     
@@ -487,7 +492,8 @@ class OrquestadorAgentesIA:
                     alianzas_promovidas += 1
         
         except Exception as e:
-            print(f"[ORQUESTADOR] Error promoviendo alianzas: {e}")
+            diagnostico("[ORQUESTADOR] Error promoviendo alianzas: %s", e,
+                        componente='IA', nivel=logging.WARNING)
         
         return alianzas_promovidas
     
@@ -538,7 +544,8 @@ class OrquestadorAgentesIA:
                 señales_propagadas += 1
         
         except Exception as e:
-            print(f"[ORQUESTADOR] Error propagando señales: {e}")
+            diagnostico("[ORQUESTADOR] Error propagando señales: %s", e,
+                        componente='IA', nivel=logging.WARNING)
         
         return señales_propagadas
     
@@ -566,7 +573,8 @@ class OrquestadorAgentesIA:
             return eficiencia_total
         
         except Exception as e:
-            print(f"[ORQUESTADOR] Error optimizando eficiencia: {e}")
+            diagnostico("[ORQUESTADOR] Error optimizando eficiencia: %s", e,
+                        componente='IA', nivel=logging.WARNING)
             return 0.5
     
     def _calcular_eficiencia_comunicacion(self) -> float:
@@ -625,7 +633,7 @@ class OrquestadorAgentesIA:
     
     def _aplicar_medidas_correctivas(self):
         """Aplica medidas para mejorar la eficiencia del mercado"""
-        print("[ORQUESTADOR] Aplicando medidas correctivas para mejorar eficiencia...")
+        diagnostico("[ORQUESTADOR] Aplicando medidas correctivas para mejorar eficiencia...", componente='IA')
         
         # Incentivar más comunicación
         for agente_id, protocolo in self.hub_comunicaciones.items():
@@ -662,7 +670,8 @@ class OrquestadorAgentesIA:
                 self._resolver_manipulacion_precios()
         
         except Exception as e:
-            print(f"[ORQUESTADOR] Error detectando ineficiencias: {e}")
+            diagnostico("[ORQUESTADOR] Error detectando ineficiencias: %s", e,
+                        componente='IA', nivel=logging.WARNING)
     
     def _calcular_concentracion_mercado(self) -> float:
         """Calcula el índice de concentración del mercado"""
@@ -719,7 +728,7 @@ class OrquestadorAgentesIA:
     
     def _resolver_concentracion_excesiva(self):
         """Resuelve concentración excesiva promoviendo diversidad"""
-        print("[ORQUESTADOR] Resolviendo concentración excesiva...")
+        diagnostico("[ORQUESTADOR] Resolviendo concentración excesiva...", componente='IA')
         
         # Incentivar entrada de nuevos agentes y diversificar estrategias
         if hasattr(self, 'agentes_registrados') and len(self.agentes_registrados) > 0:
@@ -735,11 +744,12 @@ class OrquestadorAgentesIA:
                         # Si no tiene el método, continuar sin error
                         continue
             
-            print(f"[ORQUESTADOR] Diversificadas estrategias de {len(agentes_diversos)} agentes")
+            diagnostico("[ORQUESTADOR] Diversificadas estrategias de %s agentes", len(agentes_diversos),
+                        componente='IA')
     
     def _resolver_asimetria_informacion(self):
         """Resuelve asimetría de información promoviendo transparencia"""
-        print("[ORQUESTADOR] Resolviendo asimetría de información...")
+        diagnostico("[ORQUESTADOR] Resolviendo asimetría de información...", componente='IA')
         
         # Compartir información del mercado de manera más equitativa
         info_mercado = {
@@ -766,7 +776,8 @@ class OrquestadorAgentesIA:
     
     def _resolver_manipulacion_precios(self):
         """Resuelve manipulación de precios aplicando regulaciones"""
-        print("[ORQUESTADOR] Detectada posible manipulación - aplicando medidas correctivas...")
+        diagnostico("[ORQUESTADOR] Detectada posible manipulación - aplicando medidas correctivas...",
+                    componente='IA')
         
         # Alertar a todos los agentes sobre posible manipulación
         for agente_id, protocolo in self.hub_comunicaciones.items():
@@ -801,13 +812,13 @@ class OrquestadorAgentesIA:
                 
                 # Log periódico de estado
                 if self.ciclos_completados % 100 == 0:
-                    print(f"[ORQUESTADOR] Ciclo {self.ciclos_completados} - "
-                          f"Agentes: {len(self.agentes_activos)}, "
-                          f"Eficiencia: {self.estadisticas.eficiencia_mercado:.2f}, "
-                          f"Tiempo: {tiempo_ciclo:.3f}s")
+                    diagnostico("[ORQUESTADOR] Ciclo %s - Agentes: %s, Eficiencia: %.2f, Tiempo: %.3fs",
+                                self.ciclos_completados, len(self.agentes_activos),
+                                self.estadisticas.eficiencia_mercado, tiempo_ciclo, componente='IA')
                 
             except Exception as e:
-                print(f"[ORQUESTADOR] Error en ciclo de coordinación: {e}")
+                diagnostico("[ORQUESTADOR] Error en ciclo de coordinación: %s", e,
+                            componente='IA', nivel=logging.WARNING)
             
             # Esperar intervalo de actualización
             time.sleep(max(0, self.intervalo_actualizacion - (time.time() - inicio_ciclo)))
@@ -839,7 +850,7 @@ class OrquestadorAgentesIA:
     
     def finalizar(self):
         """Finaliza el orquestador y todos sus componentes"""
-        print("[ORQUESTADOR] Iniciando finalización...")
+        diagnostico("[ORQUESTADOR] Iniciando finalización...", componente='IA')
         
         self.ejecutando = False
         
@@ -851,4 +862,4 @@ class OrquestadorAgentesIA:
         for protocolo in self.hub_comunicaciones.values():
             protocolo.finalizar()
         
-        print("[ORQUESTADOR] Finalización completada")
+        diagnostico("[ORQUESTADOR] Finalización completada", componente='IA')
@@ -19,6 +19,8 @@ from enum import Enum
 
 from .AgentMemorySystem import AgentMemorySystem, Decision
 from .AgentCommunicationProtocol import TipoMensaje, PrioridadMensaje
+from ..utils.SimuladorLogger import diagnostico
+import logging
 
 
 class TipoRelacion(Enum):
@@ -509,7 +511,8 @@ class FormadorCoaliciones:
         # Notificar a agentes miembros
         self._notificar_formacion_coalicion(coalicion)
         
-        print(f"[COALICIONES] Formada coalición {coalicion.nombre} con {len(coalicion.miembros)} miembros")
+        diagnostico("[COALICIONES] Formada coalición %s con %s miembros", coalicion.nombre,
+                    len(coalicion.miembros), componente='IA')
         
         return coalicion
     
@@ -524,7 +527,8 @@ class FormadorCoaliciones:
         """Notifica a los miembros sobre la formación de la coalición"""
         for miembro in coalicion.miembros:
             # En implementación real, enviaría mensaje al agente
-            print(f"[COALICIONES] Notificando a {miembro} sobre coalición {coalicion.nombre}")
+            diagnostico("[COALICIONES] Notificando a %s sobre coalición %s", miembro, coalicion.nombre,
+                        componente='IA')
     
     def gestionar_coaliciones_activas(self) -> Dict[str, Any]:
         """Gestiona coaliciones activas, evalúa progreso y toma decisiones"""
@@ -618,14 +622,14 @@ class FormadorCoaliciones:
         coalicion.duracion_estimada = timedelta(days=90)  # Extensión estándar
         coalicion.creada_en = datetime.now()  # Reiniciar cronómetro
         coalicion.progreso = 0.0
-        print(f"[COALICIONES] Renovada coalición {coalicion.nombre}")
+        diagnostico("[COALICIONES] Renovada coalición %s", coalicion.nombre, componente='IA')
     
     def _disolver_coalicion(self, coalicion_id: str, coalicion: CoalicionAgentes):
         """Disuelve una coalición"""
         coalicion.activa = False
         self.historial_coaliciones.append(coalicion)
         del self.coaliciones_activas[coalicion_id]
-        print(f"[COALICIONES] Disuelta coalición {coalicion.nombre}")
+        diagnostico("[COALICIONES] Disuelta coalición %s", coalicion.nombre, componente='IA')
     
     def _facilitar_decision_conjunta(self, coalicion: CoalicionAgentes):
         """Facilita una decisión conjunta de la coalición"""
@@ -640,7 +644,8 @@ class FormadorCoaliciones:
         }
         
         coalicion.decisiones_conjuntas.append(decision)
-        print(f"[COALICIONES] Nueva decisión conjunta en {coalicion.nombre}: {decision['tipo']}")
+        diagnostico("[COALICIONES] Nueva decisión conjunta en %s: %s", coalicion.nombre, decision['tipo'],
+                    componente='IA')
 
 
 class RedSocialAgentesIA:
@@ -680,7 +685,7 @@ class RedSocialAgentesIA:
         self.hilo_analisis.daemon = True
         self.hilo_analisis.start()
         
-        print("[RED SOCIAL IA] Sistema de red social de agentes inicializado")
+        diagnostico("[RED SOCIAL IA] Sistema de red social de agentes inicializado", componente='IA')
     
     def registrar_agente(self, agente_id: str, perfil_inicial: Dict[str, Any] = None):
         """Registra un nuevo agente en la red social"""
@@ -695,7 +700,7 @@ class RedSocialAgentesIA:
         # Recalcular métricas de red
         self._recalcular_metricas_red()
         
-        print(f"[RED SOCIAL] Agente {agente_id} registrado en la red")
+        diagnostico("[RED SOCIAL] Agente %s registrado en la red", agente_id, componente='IA')
     
     def establecer_relacion(self, agente_a: str, agente_b: str,
                           tipo_relacion: TipoRelacion, fuerza_inicial: float = 0.5,
@@ -797,7 +802,8 @@ class RedSocialAgentesIA:
         # Registrar información
         self.informaciones_activas[informacion_id] = informacion
         
-        print(f"[RED SOCIAL] Información compartida por {emisor}, alcanzó {len(resultado_propagacion['agentes_alcanzados'])} agentes")
+        diagnostico("[RED SOCIAL] Información compartida por %s, alcanzó %s agentes", emisor,
+                    len(resultado_propagacion['agentes_alcanzados']), componente='IA')
         
         return informacion
     
@@ -893,7 +899,8 @@ class RedSocialAgentesIA:
                 self._recalcular_metricas_red()
                 
             except Exception as e:
-                print(f"[RED SOCIAL] Error en análisis de red: {e}")
+                diagnostico("[RED SOCIAL] Error en análisis de red: %s", e,
+                            componente='IA', nivel=logging.WARNING)
             
             time.sleep(self.intervalo_analisis)
     
@@ -939,10 +946,10 @@ class RedSocialAgentesIA:
     
     def finalizar(self):
         """Finaliza la red social de agentes"""
-        print("[RED SOCIAL] Finalizando red social...")
+        diagnostico("[RED SOCIAL] Finalizando red social...", componente='IA')
         self.procesando = False
         
         if self.hilo_analisis.is_alive():
             self.hilo_analisis.join(timeout=2.0)
         
-        print("[RED SOCIAL] Finalización completada")
+        diagnostico("[RED SOCIAL] Finalización completada", componente='IA')
@@ -20,6 +20,8 @@ import json
 
 from .AgentMemorySystem import AgentMemorySystem, Decision
 from .IADecisionEngine import EstadoMercado, OpcionDecision
+from ..utils.SimuladorLogger import diagnostico
+import logging
 
 
 class TipoRedNeural(Enum):
@@ -167,7 +169,8 @@ class RedNeuralEspecializada:
         # Construir capas
         self._construir_red(funciones_activacion)
         
-        print(f"[RED NEURAL] Red {tipo.value} creada con arquitectura {arquitectura}")
+        diagnostico("[RED NEURAL] Red %s creada con arquitectura %s", tipo.value, arquitectura,
+                    componente='IA')
     
     def _construir_red(self, funciones_activacion: List[str]):
         """Construye la estructura de la red neural"""
@@ -226,7 +229,7 @@ class RedNeuralEspecializada:
     def entrenar_lote(self, datos_entrenamiento: List[Tuple[List[float], List[float]]],
                      epocas: int = 100) -> Dict[str, float]:
         """Entrena la red con un lote de datos"""
-        print(f"[RED NEURAL] Iniciando entrenamiento por {epocas} épocas...")
+        diagnostico("[RED NEURAL] Iniciando entrenamiento por %s épocas...", epocas, componente='IA')
         
         metricas_entrenamiento = {
             'error_inicial': 0.0,
@@ -276,7 +279,8 @@ class RedNeuralEspecializada:
         self.precision_actual = precision_final
         self.epocas_entrenadas += epocas
         
-        print(f"[RED NEURAL] Entrenamiento completado. Precisión: {precision_final:.3f}")
+        diagnostico("[RED NEURAL] Entrenamiento completado. Precisión: %.3f", precision_final,
+                    componente='IA')
         
         return metricas_entrenamiento
     
@@ -370,7 +374,7 @@ class RedNeuralEspecializada:
         with open(ruta, 'w') as f:
             json.dump(modelo_datos, f, indent=2)
         
-        print(f"[RED NEURAL] Modelo guardado en {ruta}")
+        diagnostico("[RED NEURAL] Modelo guardado en %s", ruta, componente='IA')
 
 
 @dataclass
@@ -459,7 +463,8 @@ class OptimizadorEvolutivo:
         # Inicializar población
         self._inicializar_poblacion()
         
-        print(f"[EVOLUTIVO] Optimizador {tipo_algoritmo.value} inicializado con población de {tamano_poblacion}")
+        diagnostico("[EVOLUTIVO] Optimizador %s inicializado con población de %s", tipo_algoritmo.value,
+                    tamano_poblacion, componente='IA')
     
     def _inicializar_poblacion(self):
         """Inicializa la población de individuos"""
@@ -477,7 +482,8 @@ class OptimizadorEvolutivo:
                  max_generaciones: int = 100, 
                  objetivo_fitness: float = None) -> IndividuoEvolutivo:
         """Ejecuta optimización evolutiva"""
-        print(f"[EVOLUTIVO] Iniciando optimización por {max_generaciones} generaciones...")
+        diagnostico("[EVOLUTIVO] Iniciando optimización por %s generaciones...", max_generaciones,
+                    componente='IA')
         
         self.tiempo_inicio = time.time()
         
@@ -493,7 +499,8 @@ class OptimizadorEvolutivo:
             # Registrar progreso
             if generacion % 10 == 0:
                 mejor_fitness = self.mejor_individuo.fitness if self.mejor_individuo else 0
-                print(f"[EVOLUTIVO] Generación {generacion}, Mejor fitness: {mejor_fitness:.6f}")
+                diagnostico("[EVOLUTIVO] Generación %s, Mejor fitness: %.6f", generacion, mejor_fitness,
+                            componente='IA')
                 self.historial_mejores.append({
                     'generacion': generacion,
                     'fitness': mejor_fitness,
@@ -502,7 +509,7 @@ class OptimizadorEvolutivo:
             
             # Verificar criterio de parada
             if objetivo_fitness and self.mejor_individuo and self.mejor_individuo.fitness >= objetivo_fitness:
-                print(f"[EVOLUTIVO] Objetivo alcanzado en generación {generacion}")
+                diagnostico("[EVOLUTIVO] Objetivo alcanzado en generación %s", generacion, componente='IA')
                 break
             
             # Evolucionar población
@@ -518,7 +525,7 @@ class OptimizadorEvolutivo:
                 individuo.edad += 1
         
         tiempo_total = time.time() - self.tiempo_inicio
-        print(f"[EVOLUTIVO] Optimización completada en {tiempo_total:.2f} segundos")
+        diagnostico("[EVOLUTIVO] Optimización completada en %.2f segundos", tiempo_total, componente='IA')
         
         return self.mejor_individuo
     
@@ -774,7 +781,7 @@ class MetaAprendizajeIA:
         
         self.adaptaciones_automaticas += 1
         
-        print(f"[META-APRENDIZAJE] Parámetros adaptados: {parametros_adaptados}")
+        diagnostico("[META-APRENDIZAJE] Parámetros adaptados: %s", parametros_adaptados, componente='IA')
         
         return parametros_adaptados
     
@@ -801,7 +808,7 @@ class MetaAprendizajeIA:
         
         arquitectura = [dimension_entrada] + capas_ocultas + [dimension_salida]
         
-        print(f"[META-APRENDIZAJE] Arquitectura recomendada: {arquitectura}")
+        diagnostico("[META-APRENDIZAJE] Arquitectura recomendada: %s", arquitectura, componente='IA')
         
         return arquitectura
     
@@ -849,7 +856,7 @@ class SistemaDeepLearningIA:
         self.entrenando = False
         self.hilo_entrenamiento = None
         
-        print("[DEEP LEARNING] Sistema de Deep Learning IA inicializado")
+        diagnostico("[DEEP LEARNING] Sistema de Deep Learning IA inicializado", componente='IA')
     
     def crear_red_especializada(self, tipo: TipoRedNeural, 
                               caracteristicas_problema: Dict[str, Any] = None) -> RedNeuralEspecializada:
@@ -880,7 +887,8 @@ class SistemaDeepLearningIA:
         # Registrar red
         self.redes_especializadas[tipo] = red
         
-        print(f"[DEEP LEARNING] Red {tipo.value} creada con arquitectura {arquitectura}")
+        diagnostico("[DEEP LEARNING] Red %s creada con arquitectura %s", tipo.value, arquitectura,
+                    componente='IA')
         
         return red
     
@@ -1006,7 +1014,8 @@ class SistemaDeepLearningIA:
         self.optimizadores[optimizador_id] = optimizador
         self.optimizaciones_completadas += 1
         
-        print(f"[DEEP LEARNING] Parámetros optimizados para {agente_id}, fitness: {mejor_individuo.fitness:.6f}")
+        diagnostico("[DEEP LEARNING] Parámetros optimizados para %s, fitness: %.6f", agente_id,
+                    mejor_individuo.fitness, componente='IA')
         
         return mejor_individuo.genes
     
@@ -1021,7 +1030,7 @@ class SistemaDeepLearningIA:
     def entrenar_automatico_continuo(self, intervalo_minutos: int = 30):
         """Inicia entrenamiento automático continuo"""
         if self.entrenando:
-            print("[DEEP LEARNING] Entrenamiento continuo ya está activo")
+            diagnostico("[DEEP LEARNING] Entrenamiento continuo ya está activo", componente='IA')
             return
         
         self.entrenando = True
@@ -1045,7 +1054,8 @@ class SistemaDeepLearningIA:
                         self._optimizar_redes_existentes()
                     
                 except Exception as e:
-                    print(f"[DEEP LEARNING] Error en entrenamiento continuo: {e}")
+                    diagnostico("[DEEP LEARNING] Error en entrenamiento continuo: %s", e,
+                                componente='IA', nivel=logging.WARNING)
                 
                 time.sleep(intervalo_minutos * 60)
         
@@ -1053,7 +1063,8 @@ class SistemaDeepLearningIA:
         self.hilo_entrenamiento.daemon = True
         self.hilo_entrenamiento.start()
         
-        print(f"[DEEP LEARNING] Entrenamiento continuo iniciado (cada {intervalo_minutos} minutos)")
+        diagnostico("[DEEP LEARNING] Entrenamiento continuo iniciado (cada %s minutos)", intervalo_minutos,
+                    componente='IA')
     
     def _optimizar_redes_existentes(self):
         """Optimiza redes existentes usando técnicas avanzadas"""
@@ -1102,7 +1113,8 @@ class SistemaDeepLearningIA:
                     if len(datos) > 10:  # Mínimo de datos para entrenamiento
                         datos_recientes = datos[-50:]  # Últimos 50 ejemplos
                         red.entrenar_lote(datos_recientes, epocas=3)
-                        print(f"[DEEP LEARNING] Red {tipo_red.value} entrenada con {len(datos_recientes)} ejemplos")
+                        diagnostico("[DEEP LEARNING] Red %s entrenada con %s ejemplos", tipo_red.value,
+                                    len(datos_recientes), componente='IA')
             else:
                 # Entrenar todas las redes
                 for tipo, red in self.redes_especializadas.items():
@@ -1111,10 +1123,11 @@ class SistemaDeepLearningIA:
                         datos_recientes = datos[-50:]
                         red.entrenar_lote(datos_recientes, epocas=3)
                 
-                print(f"[DEEP LEARNING] Todas las redes entrenadas con datos recientes")
+                diagnostico("[DEEP LEARNING] Todas las redes entrenadas con datos recientes", componente='IA')
                 
         except Exception as e:
-            print(f"[DEEP LEARNING] Error en entrenamiento: {e}")
+            diagnostico("[DEEP LEARNING] Error en entrenamiento: %s", e,
+                        componente='IA', nivel=logging.WARNING)
 
     def get_estadisticas_sistema(self) -> Dict[str, Any]:
         """Obtiene estadísticas completas del sistema"""
@@ -1133,11 +1146,11 @@ class SistemaDeepLearningIA:
     
     def finalizar(self):
         """Finaliza el sistema de deep learning"""
-        print("[DEEP LEARNING] Finalizando sistema...")
+        diagnostico("[DEEP LEARNING] Finalizando sistema...", componente='IA')
         
         self.entrenando = False
         
         if self.hilo_entrenamiento and self.hilo_entrenamiento.is_alive():
             self.hilo_entrenamiento.join(timeout=3.0)
         
-        print("[DEEP LEARNING] Sistema finalizado")
+        diagnostico("[DEEP LEARNING] Sistema finalizado", componente='IA')
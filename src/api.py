@@ -1,45 +1,190 @@
 """
 API mínima (FastAPI) para interactuar con el simulador.
-- POST /simular: Ejecuta una simulación con parámetros opcionales.
+- POST /trabajos: Encola una simulación y devuelve su id al instante.
+- GET /trabajos/{id}: Estado y progreso (último ciclo completado).
+- GET /trabajos/{id}/metricas: Indicadores de cada ciclo en streaming (NDJSON o SSE).
+- GET /trabajos/{id}/resultado: KPIs y series por ciclo del trabajo completado.
+- POST /trabajos/{id}/cancelar: Cancela un trabajo pendiente o en ejecución.
+- POST /simular: Ejecuta una simulación y espera su resumen (sin bloquear el servidor).
 - GET /salud: Chequeo simple de salud.
+
+Las simulaciones corren en un pool acotado de procesos locales
+(``GestorTrabajos``) y, si ``cache_resultados.habilitado`` lo permite, sus
+resultados quedan en ``AlmacenResultados``: una petición con la misma
+configuración y semilla que otra ya completada se responde desde el almacén.
+El motor de simulación (``main``) solo se importa en los procesos del pool, de
+modo que arrancar la app o sondear /salud no paga el coste de importar todos
+los sistemas.
 """
-from fastapi import FastAPI
+import asyncio
+import json
+
+from fastapi import FastAPI, HTTPException
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 from typing import Optional, Dict, Any
 
 from src.config.ConfiguradorSimulacion import ConfiguradorSimulacion
-from src.main import ejecutar_simulacion_completa
+from src.utils.AlmacenResultados import AlmacenResultados
+from src.utils.GestorTrabajos import GestorTrabajos, COMPLETADO, TERMINALES
 
 app = FastAPI(title="Simulador de Mercado IA - API")
 
+_gestor: Optional[GestorTrabajos] = None
+
+
+def obtener_gestor() -> GestorTrabajos:
+    """Gestor de trabajos compartido por la app (creado en la primera petición)"""
+    global _gestor
+    if _gestor is None:
+        # cache_resultados.habilitado = false: sin memoización entre peticiones
+        _gestor = GestorTrabajos(almacen=AlmacenResultados.desde_config(ConfiguradorSimulacion().config))
+    return _gestor
+
+
 class SimulacionRequest(BaseModel):
     num_ciclos: Optional[int] = None
     num_consumidores: Optional[int] = None
     activar_ia: Optional[bool] = None
+    seed: Optional[int] = None
 
-@app.get("/salud")
-async def salud():
-    return {"status": "ok"}
 
-@app.post("/simular")
-async def simular(req: SimulacionRequest):
-    # Cargar configuración por defecto y aplicar overrides sencillos
-    config = ConfiguradorSimulacion()
-    cfg = config.config
+def construir_config(req: SimulacionRequest) -> Dict[str, Any]:
+    """Configuración por defecto con los overrides sencillos de la petición"""
+    cfg = ConfiguradorSimulacion().config
     if req.num_ciclos is not None:
         cfg.setdefault('simulacion', {})['num_ciclos'] = int(req.num_ciclos)
     if req.num_consumidores is not None:
         cfg.setdefault('simulacion', {})['num_consumidores'] = int(req.num_consumidores)
     if req.activar_ia is not None:
         cfg.setdefault('agentes_ia', {})['activar'] = bool(req.activar_ia)
-    # Ejecutar simulación (sin bloquear indefinidamente en casos largos)
-    mercado = ejecutar_simulacion_completa(config)
+    if req.seed is not None:
+        cfg.setdefault('simulacion', {})['seed'] = int(req.seed)
+    return cfg
+
+
+def _estado_o_404(id_trabajo: str) -> Dict[str, Any]:
+    estado = obtener_gestor().estado(id_trabajo)
+    if estado is None:
+        raise HTTPException(status_code=404, detail=f"Trabajo {id_trabajo} no encontrado")
+    return estado
+
+
+@app.on_event("shutdown")
+def cerrar_gestor():
+    if _gestor is not None:
+        _gestor.cerrar(esperar=False)
+
+
+@app.get("/salud")
+async def salud():
+    return {"status": "ok"}
+
+
+@app.post("/trabajos", status_code=202)
+async def crear_trabajo(req: SimulacionRequest):
+    trabajo = obtener_gestor().enviar(construir_config(req))
+    return obtener_gestor().estado(trabajo.id)
+
+
+@app.get("/trabajos/{id_trabajo}")
+async def estado_trabajo(id_trabajo: str):
+    return _estado_o_404(id_trabajo)
+
+
+def _registros_almacenados(resultado) -> list:
+    """Series de un resultado guardado con el formato del canal de métricas"""
+    series = resultado.series
+    registros = []
+    for i, ciclo in enumerate(series.get('ciclo', [])):
+        registro = {'ciclo': ciclo}
+        for clave, escala in (('pib', 1), ('inflacion', 100), ('desempleo', 100)):
+            valores = series.get(clave, [])
+            if i < len(valores):
+                registro[clave] = valores[i] / escala
+        registros.append(registro)
+    return registros
+
+
+async def _emitir_metricas(id_trabajo: str, formato: str):
+    def linea(registro):
+        datos = json.dumps(registro)
+        return f"data: {datos}\n\n" if formato == 'sse' else f"{datos}\n"
+
+    trabajo = obtener_gestor().obtener(id_trabajo)
+    canal = obtener_gestor().canal(id_trabajo)
+    if canal is None:
+        # Servido desde el almacén: no hubo ejecución que transmitir
+        resultado = obtener_gestor().resultado(id_trabajo)
+        for registro in _registros_almacenados(resultado) if resultado else []:
+            yield linea(registro)
+        return
+    cursor = 0
+    while not canal.terminado(cursor):
+        # Lectura sin espera: el bucle de eventos nunca se bloquea en el canal
+        registros, cursor, descartados = canal.leer(cursor, timeout=0)
+        for i, registro in enumerate(registros):
+            if i == 0 and descartados:
+                registro = dict(registro, descartados=descartados)
+            yield linea(registro)
+        if not registros:
+            if trabajo is not None and trabajo.estado in TERMINALES:
+                # El gestor ya vació las métricas del trabajo aunque faltara la marca de fin
+                break
+            await asyncio.sleep(0.25)
+
+
+@app.get("/trabajos/{id_trabajo}/metricas")
+async def metricas_trabajo(id_trabajo: str, formato: str = 'ndjson'):
+    _estado_o_404(id_trabajo)
+    if formato not in ('ndjson', 'sse'):
+        raise HTTPException(status_code=400, detail="formato debe ser 'ndjson' o 'sse'")
+    tipo = 'text/event-stream' if formato == 'sse' else 'application/x-ndjson'
+    return StreamingResponse(_emitir_metricas(id_trabajo, formato), media_type=tipo)
+
+
+@app.get("/trabajos/{id_trabajo}/resultado")
+async def resultado_trabajo(id_trabajo: str):
+    estado = _estado_o_404(id_trabajo)
+    if estado['estado'] != COMPLETADO:
+        raise HTTPException(status_code=409, detail=f"Trabajo en estado '{estado['estado']}'")
+    resultado = obtener_gestor().resultado(id_trabajo)
+    if resultado is None:
+        raise HTTPException(status_code=404, detail="Resultado no disponible en el almacén")
+    return {'id': id_trabajo, 'desde_cache': estado['desde_cache'], 'resultado': resultado.to_dict()}
+
+
+@app.post("/trabajos/{id_trabajo}/cancelar")
+async def cancelar_trabajo(id_trabajo: str):
+    _estado_o_404(id_trabajo)
+    if not obtener_gestor().cancelar(id_trabajo):
+        raise HTTPException(status_code=409, detail="El trabajo ya había terminado")
+    return obtener_gestor().estado(id_trabajo)
+
+
+@app.post("/simular")
+async def simular(req: SimulacionRequest):
+    cfg = construir_config(req)
+    gestor = obtener_gestor()
+    trabajo = gestor.enviar(cfg)
+    # Esperar en el bucle de eventos: las demás peticiones siguen atendiéndose
+    if trabajo.futuro is not None:
+        try:
+            await asyncio.wrap_future(trabajo.futuro)
+        except Exception:
+            pass
+        while trabajo.estado not in TERMINALES:
+            await asyncio.sleep(0.05)  # el callback del futuro aún está guardando
+    resultado = gestor.resultado(trabajo.id)
+    if resultado is None:
+        raise HTTPException(status_code=500, detail=trabajo.error or f"Trabajo {trabajo.estado}")
+    kpis = resultado.kpis
     # Resumen ligero
     resumen = {
         'ciclos': cfg['simulacion'].get('num_ciclos'),
-        'pib_final': mercado.pib_historico[-1] if mercado.pib_historico else 0,
-        'inflacion_final': mercado.inflacion_historica[-1] if mercado.inflacion_historica else 0,
-        'consumidores': len(mercado.getConsumidores()),
-        'empresas': len(mercado.getEmpresas()),
+        'pib_final': kpis.get('pib_final', 0),
+        'inflacion_final': kpis.get('inflacion_final', 0) / 100,
+        'consumidores': kpis.get('consumidores_final', 0),
+        'empresas': kpis.get('empresas_activas_final', 0),
     }
-    return {'resultado': 'ok', 'resumen': resumen}
+    return {'resultado': 'ok', 'trabajo': trabajo.id, 'desde_cache': trabajo.desde_cache, 'resumen': resumen}
@@ -9,6 +9,9 @@ ajustando parámetros específicos según las necesidades de simulación.
 from dataclasses import dataclass
 from typing import Dict, List, Optional
 import json
+import logging
+
+logger = logging.getLogger('SimuladorEconomico.Config')
 
 @dataclass
 class ConfigRRHH:
@@ -270,10 +273,10 @@ class ConfigEmpresaHiperrealista:
             )
         
         except FileNotFoundError:
-            print(f"Archivo {archivo} no encontrado. Usando configuración por defecto.")
+            logger.warning("Archivo %s no encontrado. Usando configuración por defecto.", archivo)
             return cls()
         except Exception as e:
-            print(f"Error cargando configuración: {e}. Usando configuración por defecto.")
+            logger.warning("Error cargando configuración: %s. Usando configuración por defecto.", e)
             return cls()
 
 # Configuraciones predefinidas para diferentes tipos de empresas
@@ -428,22 +431,24 @@ def crear_configuracion_personalizada(
 
 # Ejemplo de uso
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+
     # Crear configuración por defecto
     config_default = ConfigEmpresaHiperrealista()
-    print("✅ Configuración por defecto creada")
+    logger.info("✅ Configuración por defecto creada")
     
     # Guardar configuración
     mensaje = config_default.guardar_configuracion()
-    print(f"✅ {mensaje}")
+    logger.info("✅ %s", mensaje)
     
     # Crear configuraciones específicas
     config_tech = ConfiguracionesPredefinidas.empresa_tecnologia()
     config_tech.guardar_configuracion("config_empresa_tecnologia.json")
-    print("✅ Configuración de empresa tecnológica guardada")
+    logger.info("✅ Configuración de empresa tecnológica guardada")
     
     config_startup = ConfiguracionesPredefinidas.empresa_startup()
     config_startup.guardar_configuracion("config_empresa_startup.json")
-    print("✅ Configuración de startup guardada")
+    logger.info("✅ Configuración de startup guardada")
     
     # Crear configuración personalizada
     config_personalizada = crear_configuracion_personalizada(
@@ -453,10 +458,10 @@ if __name__ == "__main__":
         sensibilidad_riesgo="media"
     )
     config_personalizada.guardar_configuracion("config_empresa_personalizada.json")
-    print("✅ Configuración personalizada guardada")
+    logger.info("✅ Configuración personalizada guardada")
     
-    print("\n📋 Archivos de configuración creados:")
-    print("   • config_empresa_hiperrealista.json (configuración por defecto)")
-    print("   • config_empresa_tecnologia.json (empresa de tecnología)")
-    print("   • config_empresa_startup.json (startup)")
-    print("   • config_empresa_personalizada.json (configuración personalizada)")
+    logger.info("📋 Archivos de configuración creados:")
+    logger.info("   • config_empresa_hiperrealista.json (configuración por defecto)")
+    logger.info("   • config_empresa_tecnologia.json (empresa de tecnología)")
+    logger.info("   • config_empresa_startup.json (startup)")
+    logger.info("   • config_empresa_personalizada.json (configuración personalizada)")
@@ -5,6 +5,29 @@ Permite cargar parámetros desde archivo JSON externo
 
 import json
 import os
+from ..utils.SimuladorLogger import diagnostico
+import logging
+
+
+# Perfiles de ejecución soportados:
+# - 'completo': dashboard PNG, exportaciones CSV/JSON/TXT, reporte de validación,
+#   persistencia de modelos ML y reportes de rendimiento (comportamiento clásico)
+# - 'headless': sin gráficos ni escrituras intermedias; las métricas quedan en
+#   memoria y se devuelven como ResultadoSimulacion (opcionalmente un único
+#   archivo columnar al final). Pensado para calibración y Monte-Carlo.
+PERFILES_EJECUCION = ('completo', 'headless')
+
+
+def _combinar_profundo(base, overlay):
+    if not isinstance(base, dict) or not isinstance(overlay, dict):
+        return overlay
+    result = dict(base)
+    for k, v in overlay.items():
+        if k in result and isinstance(result[k], dict) and isinstance(v, dict):
+            result[k] = _combinar_profundo(result[k], v)
+        else:
+            result[k] = v
+    return result
 
 
 class ConfiguradorSimulacion:
@@ -22,15 +45,15 @@ class ConfiguradorSimulacion:
         try:
             with open(ruta_config, 'r', encoding='utf-8') as archivo:
                 raw = json.load(archivo)
-                print(f"✅ Configuración cargada desde {self.archivo_config}")
+                diagnostico("✅ Configuración cargada desde %s", self.archivo_config, componente='Config')
                 return self._validar_y_normalizar(raw)
         except FileNotFoundError:
-            print(
-                f"⚠️  Archivo de configuración {self.archivo_config} no encontrado. Usando valores por defecto.")
+            diagnostico("⚠️  Archivo de configuración %s no encontrado. Usando valores por defecto.",
+                        self.archivo_config, componente='Config', nivel=logging.WARNING)
             return self.configuracion_por_defecto()
         except json.JSONDecodeError as e:
-            print(
-                f"⚠️  Error leyendo configuración: {e}. Usando valores por defecto.")
+            diagnostico("⚠️  Error leyendo configuración: %s. Usando valores por defecto.", e,
+                        componente='Config', nivel=logging.WARNING)
             return self.configuracion_por_defecto()
 
     def configuracion_por_defecto(self):
@@ -105,6 +128,40 @@ class ConfiguradorSimulacion:
                     "peso_producto": 0.5,
                     "suavizamiento": 0.8
                 }
+            },
+            "ejecucion": {
+                "perfil": "completo",
+                "archivo_columnar": None
+            },
+            "logging": {
+                "asincrono": True,
+                "formato_jsonl": False,
+                "niveles_componentes": {}
+            },
+            # Memoización de ejecuciones (src/utils/AlmacenResultados.py)
+            "cache_resultados": {
+                "habilitado": True,
+                "directorio": "results/almacen_resultados",
+                "max_entradas": 200
+            },
+            # Exportación columnar por ciclo (src/utils/ExportadorColumnar.py)
+            "exportacion_columnar": {
+                "activar": False,
+                "directorio": "results/columnar",
+                "ciclos_por_particion": 10,
+                "tablas": ["macro", "consumidores", "empresas", "transacciones"]
+            },
+            # Réplicas Monte-Carlo (src/utils/EnsambleMonteCarlo.py, run_ensamble.py)
+            "ensamble_montecarlo": {
+                "replicas_max": 50,
+                "replicas_min": 8,
+                "semilla_inicial": 1000,
+                "procesos": None,
+                "nivel_confianza": 0.95,
+                "tolerancia_relativa": 0.05,
+                "tolerancia_absoluta": 0.25,
+                "cuantiles": [0.05, 0.5, 0.95],
+                "series": ["pib", "inflacion", "desempleo"]
             }
         }
 
@@ -180,6 +237,11 @@ class ConfiguradorSimulacion:
         cfg.setdefault('precios', {})
         cfg.setdefault('agentes_ia', {})
         cfg.setdefault('politica_monetaria', {})
+        cfg.setdefault('ejecucion', {})
+        cfg.setdefault('logging', {})
+        cfg.setdefault('cache_resultados', {})
+        cfg.setdefault('exportacion_columnar', {})
+        cfg.setdefault('ensamble_montecarlo', {})
 
         # Completar con defaults si faltan claves esenciales
         defaults = self.configuracion_por_defecto()
@@ -200,6 +262,12 @@ class ConfiguradorSimulacion:
             # No fallar, solo eliminar duplicado para suavidad en tests
             cfg['economia'].pop('num_consumidores', None)
 
+        # Perfil de ejecución
+        perfil = cfg['ejecucion'].get('perfil', 'completo')
+        if perfil not in PERFILES_EJECUCION:
+            errores.append(f"ejecucion.perfil debe ser uno de {PERFILES_EJECUCION}")
+            cfg['ejecucion']['perfil'] = 'completo'
+
         # Seed normalizado a entero
         seed = sim.get('seed', None)
         if seed is not None:
@@ -246,6 +314,38 @@ class ConfiguradorSimulacion:
         except Exception:
             pass
         return seed
+
+    def obtener_perfil_ejecucion(self) -> str:
+        """Devuelve el perfil de ejecución activo ('completo' o 'headless')."""
+        perfil = self.obtener_parametro('ejecucion', 'perfil', 'completo')
+        return perfil if perfil in PERFILES_EJECUCION else 'completo'
+
+    def es_headless(self) -> bool:
+        """True si la simulación debe ejecutarse sin gráficos ni escrituras intermedias."""
+        return self.obtener_perfil_ejecucion() == 'headless'
+
+    def activar_perfil_headless(self, archivo_columnar: str | None = None):
+        """Activa el perfil headless; opcionalmente fija el archivo columnar final."""
+        self.establecer_parametro('ejecucion', 'perfil', 'headless')
+        self.establecer_parametro('ejecucion', 'archivo_columnar', archivo_columnar)
+
+    def aplicar_escenario(self, escenario: str) -> str:
+        """Combina un escenario JSON (ruta o nombre en 'escenarios/') sobre la configuración.
+
+        Devuelve el nombre del escenario; lanza FileNotFoundError si no existe.
+        """
+        ruta = escenario
+        if not os.path.isabs(ruta) and not os.path.exists(ruta):
+            nombre_archivo = escenario if escenario.endswith('.json') else f"{escenario}.json"
+            ruta = os.path.join(os.path.dirname(__file__), '..', '..', 'escenarios', nombre_archivo)
+        if not os.path.exists(ruta):
+            raise FileNotFoundError(ruta)
+        with open(ruta, 'r', encoding='utf-8') as f:
+            escenario_cfg = json.load(f)
+        # Merge profundo sobre la configuración ya cargada
+        self.config = _combinar_profundo(self.config, escenario_cfg)
+        return os.path.splitext(os.path.basename(ruta))[0]
+
     def obtener(self, seccion, clave, valor_por_defecto=None):
         """Obtiene un valor de configuración específico"""
         try:
@@ -272,7 +372,7 @@ class ConfiguradorSimulacion:
         if 'tasa_desempleo_inicial' in economia:
             config_economica.TASA_DESEMPLEO_OBJETIVO = economia['tasa_desempleo_inicial']
 
-        print(f"✅ ConfigEconomica actualizada con parámetros externos")
+        diagnostico("✅ ConfigEconomica actualizada con parámetros externos", componente='Config')
 
 
 # Instancia global para uso en toda la aplicación
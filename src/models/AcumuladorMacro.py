@@ -0,0 +1,178 @@
+"""
+Acumulador de indicadores macroeconómicos
+=========================================
+
+Mantiene al día los agregados que los sistemas de política (Gobierno,
+BancoCentralAvanzado, política fiscal, ciclo económico) obtenían recorriendo
+transacciones y consumidores en cada ciclo: volumen y número de transacciones
+por ciclo, producción vendida por sector, población y empleo. Los contadores
+se mueven cuando ocurre el hecho económico:
+
+- ``Mercado.registrar_transaccion`` / ``registrar_transacciones_lote`` suman
+  volumen y transacciones al ciclo con que se etiquetan.
+- ``Mercado.registrar_venta`` suma la producción vendida al sector de la
+  empresa vendedora.
+- ``Consumidor.empleado`` es un ``CampoEmpleo``: contratar o despedir a un
+  consumidor registrado mueve el contador de empleados.
+- Los consumidores entran y salen con ``Mercado.agregar_persona`` /
+  ``Mercado.retirar_persona``.
+
+Sobre ``mercado.pib_historico`` guarda sumas acumuladas para la tendencia
+lineal (PIB potencial) y la volatilidad del crecimiento; cada consulta solo
+incorpora los ciclos añadidos a la serie desde la anterior.
+
+Se activa con ``"performance": {"acumulador_macro": true}``.
+"""
+
+import math
+from typing import Dict, Iterable, Optional, Tuple
+
+from .AlmacenConsumidores import CampoAlmacen
+
+
+class CampoEmpleo(CampoAlmacen):
+    """``Consumidor.empleado``: además de guardar el valor, avisa al acumulador de altas y bajas"""
+
+    def __set__(self, obj, valor):
+        acumulador = obj.__dict__.get('_acumulador_macro')
+        if acumulador is not None:
+            empleado = bool(valor)
+            if bool(self.__get__(obj)) != empleado:
+                acumulador._cambio_empleo(empleado)
+        super().__set__(obj, valor)
+
+
+class AcumuladorMacro:
+    """Agregados macro actualizados por eventos, con lecturas O(1)"""
+
+    def __init__(self, mercado=None):
+        self.mercado = mercado
+        # Población y empleo de los consumidores registrados
+        self.poblacion = 0
+        self.empleados = 0
+        # Transacciones por etiqueta de ciclo
+        self.volumen_por_ciclo: Dict[int, float] = {}
+        self.transacciones_por_ciclo: Dict[int, int] = {}
+        # Producción vendida por sector en el ciclo en curso
+        self.produccion_sectorial: Dict[str, float] = {}
+        self._reiniciar_pib()
+
+    # --- Consumidores ---
+    def registrar(self, consumidor):
+        """Empieza a contar al consumidor; idempotente"""
+        estado = consumidor.__dict__
+        if estado.get('_acumulador_macro') is self:
+            return
+        estado['_acumulador_macro'] = self
+        self.poblacion += 1
+        if consumidor.empleado:
+            self.empleados += 1
+
+    def registrar_todos(self, consumidores: Iterable):
+        for consumidor in consumidores:
+            self.registrar(consumidor)
+
+    def retirar(self, consumidor):
+        estado = consumidor.__dict__
+        if estado.get('_acumulador_macro') is not self:
+            return
+        if consumidor.empleado:
+            self.empleados -= 1
+        del estado['_acumulador_macro']
+        self.poblacion -= 1
+
+    def _cambio_empleo(self, empleado: bool):
+        self.empleados += 1 if empleado else -1
+
+    def tasa_desempleo(self) -> float:
+        return (self.poblacion - self.empleados) / self.poblacion if self.poblacion > 0 else 0
+
+    def tasa_empleo(self) -> float:
+        return self.empleados / self.poblacion if self.poblacion > 0 else 0
+
+    # --- Transacciones y ventas ---
+    def iniciar_ciclo(self):
+        """Empieza un ciclo: la producción sectorial vuelve a cero"""
+        self.produccion_sectorial = {}
+
+    def registrar_transaccion(self, ciclo, costo_total):
+        self.volumen_por_ciclo[ciclo] = self.volumen_por_ciclo.get(ciclo, 0) + costo_total
+        self.transacciones_por_ciclo[ciclo] = self.transacciones_por_ciclo.get(ciclo, 0) + 1
+
+    def registrar_transacciones(self, transacciones: Iterable[dict]):
+        for t in transacciones:
+            self.registrar_transaccion(t.get('ciclo'), t.get('costo_total', 0))
+
+    def registrar_venta(self, empresa, importe):
+        sector = getattr(getattr(empresa, 'sector', None), 'nombre', None)
+        if sector is not None:
+            self.produccion_sectorial[sector] = self.produccion_sectorial.get(sector, 0.0) + importe
+
+    def volumen_ciclo(self, ciclo) -> float:
+        return self.volumen_por_ciclo.get(ciclo, 0)
+
+    def num_transacciones_ciclo(self, ciclo) -> int:
+        return self.transacciones_por_ciclo.get(ciclo, 0)
+
+    # --- Estadísticas móviles del PIB ---
+    def _reiniciar_pib(self):
+        self._n_pib = 0
+        self._pib_anterior = None
+        self._suma_pib = 0
+        self._suma_xy_pib = 0
+        # Crecimiento: media y suma de cuadrados (Welford)
+        self._n_crecimiento = 0
+        self._media_crecimiento = 0.0
+        self._m2_crecimiento = 0.0
+
+    def _sincronizar_pib(self):
+        """Incorpora los ciclos añadidos a ``pib_historico`` desde la última consulta"""
+        serie = getattr(self.mercado, 'pib_historico', None) or []
+        if len(serie) < self._n_pib:
+            # La serie se reemplazó: se vuelve a acumular desde el principio
+            self._reiniciar_pib()
+        for i in range(self._n_pib, len(serie)):
+            pib = serie[i]
+            self._suma_pib += pib
+            self._suma_xy_pib += i * pib
+            anterior = self._pib_anterior
+            if anterior is not None and anterior != 0:
+                crecimiento = (pib - anterior) / anterior
+                self._n_crecimiento += 1
+                delta = crecimiento - self._media_crecimiento
+                self._media_crecimiento += delta / self._n_crecimiento
+                self._m2_crecimiento += delta * (crecimiento - self._media_crecimiento)
+            self._pib_anterior = pib
+        self._n_pib = len(serie)
+
+    def tendencia_pib(self) -> Optional[Tuple[float, float]]:
+        """(intercepto, pendiente) de la recta de mínimos cuadrados sobre todo el historial"""
+        self._sincronizar_pib()
+        n = self._n_pib
+        if n < 2:
+            return None
+        x_sum = n * (n - 1) // 2
+        x2_sum = (n - 1) * n * (2 * n - 1) // 6
+        pendiente = (n * self._suma_xy_pib - x_sum * self._suma_pib) / (n * x2_sum - x_sum ** 2)
+        intercepto = (self._suma_pib - pendiente * x_sum) / n
+        return intercepto, pendiente
+
+    def pib_potencial(self) -> Optional[float]:
+        """Valor de la tendencia en el último ciclo del historial"""
+        tendencia = self.tendencia_pib()
+        if tendencia is None:
+            return None
+        intercepto, pendiente = tendencia
+        return intercepto + pendiente * (self._n_pib - 1)
+
+    def volatilidad_crecimiento(self) -> Optional[float]:
+        """Desviación típica (poblacional) del crecimiento del PIB ciclo a ciclo"""
+        self._sincronizar_pib()
+        if self._n_crecimiento < 2:
+            return None
+        return math.sqrt(max(0.0, self._m2_crecimiento / self._n_crecimiento))
+
+
+def acumulador_de(mercado) -> Optional[AcumuladorMacro]:
+    """Acumulador macro del mercado si está activado"""
+    return getattr(mercado, 'acumulador_macro', None)
@@ -0,0 +1,141 @@
+"""
+Almacén columnar de consumidores
+================================
+
+Guarda los campos "calientes" de los consumidores (dinero, ingreso,
+empleo, propensiones, ahorros y deuda) en arrays NumPy contiguos, uno por
+campo, indexados por la posición del agente en el almacén. ``Consumidor``
+conserva su API de atributos: cada campo es un descriptor que, con el
+consumidor adjunto, lee y escribe en el array correspondiente, así que el
+código de los agentes no cambia y los sistemas que recorren a toda la
+población (fiscal, ciclo económico, estadísticas) pueden operar sobre las
+columnas completas.
+
+Se activa con ``"performance": {"almacen_columnar_consumidores": true}``.
+"""
+
+from typing import Dict, Iterable, Optional
+
+import numpy as np
+
+
+class CampoAlmacen:
+    """Atributo de ``Consumidor`` respaldado por una columna del almacén.
+
+    Sin almacén el valor se guarda en la propia instancia; una vez adjunto,
+    lecturas y escrituras van a la posición del consumidor en la columna.
+    """
+
+    def __set_name__(self, propietario, nombre):
+        self.nombre = nombre
+
+    def __get__(self, obj, tipo=None):
+        if obj is None:
+            return self
+        almacen = obj.__dict__.get('_almacen')
+        if almacen is None:
+            try:
+                return obj.__dict__[self.nombre]
+            except KeyError:
+                raise AttributeError(self.nombre) from None
+        return almacen.columnas[self.nombre][obj._indice_almacen].item()
+
+    def __set__(self, obj, valor):
+        almacen = obj.__dict__.get('_almacen')
+        if almacen is None:
+            obj.__dict__[self.nombre] = valor
+        else:
+            almacen.columnas[self.nombre][obj._indice_almacen] = valor
+
+
+class AlmacenConsumidores:
+    """Columnas NumPy con el estado de todos los consumidores adjuntos"""
+
+    CAMPOS = {
+        'dinero': float,
+        'ingreso_mensual': float,
+        'empleado': bool,
+        'propension_consumo': float,
+        'propension_ahorro': float,
+        'ahorros': float,
+        'deuda': float,
+    }
+
+    def __init__(self, capacidad: int = 1024):
+        capacidad = max(1, capacidad)
+        self.columnas: Dict[str, np.ndarray] = {
+            campo: np.zeros(capacidad, dtype=tipo) for campo, tipo in self.CAMPOS.items()}
+        self.activos = np.zeros(capacidad, dtype=bool)
+        self.tamano = 0
+        self._libres = []
+
+    def __len__(self):
+        return int(self.activos[:self.tamano].sum())
+
+    def __getattr__(self, nombre):
+        # Acceso directo a las columnas: almacen.dinero, almacen.empleado, ...
+        columnas = self.__dict__.get('columnas')
+        if columnas is not None and nombre in columnas:
+            return columnas[nombre]
+        raise AttributeError(nombre)
+
+    def _crecer(self, minimo: int):
+        capacidad = max(minimo, 2 * len(self.activos))
+        for campo, columna in self.columnas.items():
+            nueva = np.zeros(capacidad, dtype=columna.dtype)
+            nueva[:self.tamano] = columna[:self.tamano]
+            self.columnas[campo] = nueva
+        activos = np.zeros(capacidad, dtype=bool)
+        activos[:self.tamano] = self.activos[:self.tamano]
+        self.activos = activos
+
+    def adjuntar(self, consumidor) -> int:
+        """Copia los campos del consumidor a las columnas y los enlaza"""
+        if consumidor.__dict__.get('_almacen') is self:
+            return consumidor._indice_almacen
+        if self._libres:
+            indice = self._libres.pop()
+        else:
+            if self.tamano >= len(self.activos):
+                self._crecer(self.tamano + 1)
+            indice = self.tamano
+            self.tamano += 1
+
+        estado = consumidor.__dict__
+        for campo, columna in self.columnas.items():
+            columna[indice] = estado.pop(campo, 0)
+        self.activos[indice] = True
+        estado['_indice_almacen'] = indice
+        estado['_almacen'] = self
+        return indice
+
+    def adjuntar_todos(self, consumidores: Iterable):
+        for consumidor in consumidores:
+            self.adjuntar(consumidor)
+
+    def liberar(self, consumidor):
+        """Devuelve los campos a la instancia y libera su posición"""
+        estado = consumidor.__dict__
+        if estado.get('_almacen') is not self:
+            return
+        indice = estado.pop('_indice_almacen')
+        del estado['_almacen']
+        for campo, columna in self.columnas.items():
+            estado[campo] = columna[indice].item()
+        self.activos[indice] = False
+        self._libres.append(indice)
+
+    def indices(self, consumidores) -> Optional[np.ndarray]:
+        """Posiciones de ``consumidores`` en las columnas; None si alguno no está adjunto"""
+        indices = np.empty(len(consumidores), dtype=np.int64)
+        for i, consumidor in enumerate(consumidores):
+            estado = consumidor.__dict__
+            if estado.get('_almacen') is not self:
+                return None
+            indices[i] = estado['_indice_almacen']
+        return indices
+
+
+def almacen_de(mercado) -> Optional[AlmacenConsumidores]:
+    """Almacén columnar del mercado si está activado"""
+    return getattr(mercado, 'almacen_consumidores', None)
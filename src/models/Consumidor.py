@@ -1,5 +1,7 @@
 from .Empresa import Empresa
 from .Persona import Persona
+from .AlmacenConsumidores import CampoAlmacen
+from .AcumuladorMacro import CampoEmpleo
 from ..config.ConfigEconomica import ConfigEconomica
 import random
 import numpy as np
@@ -7,6 +9,15 @@ import math
 
 
 class Consumidor(Persona):
+    # Campos calientes: viven en el AlmacenConsumidores del mercado si está activo
+    dinero = CampoAlmacen()
+    ingreso_mensual = CampoAlmacen()
+    empleado = CampoEmpleo()  # Además avisa al AcumuladorMacro de altas y bajas
+    propension_consumo = CampoAlmacen()
+    propension_ahorro = CampoAlmacen()
+    ahorros = CampoAlmacen()
+    deuda = CampoAlmacen()
+
     def __init__(self, nombre, mercado, bienes={}, config_hetero=None):
         super().__init__(mercado)
         self.nombre = nombre
@@ -582,6 +593,7 @@ class Consumidor(Persona):
             # Registrar transacción
             mercado.registrar_transaccion(
                 self, bien, cantidad, costo_total, ciclo)
+            mercado.registrar_venta(empresa, bien, precio_base * cantidad)
 
             # Actualizar historial para decisiones futuras
             self.historial_compras[bien] = precio_final
@@ -676,7 +688,12 @@ class Consumidor(Persona):
         self.decidir_acciones(mercado.mercado_financiero,
                               mercado.registrar_transaccion, ciclo)
 
-        # Decisión de compra
+        # En modo por lotes el mercado resuelve las compras de todos a la vez
+        if not getattr(mercado, 'compras_en_lote', False):
+            self.ciclo_compras(ciclo, mercado)
+
+    def ciclo_compras(self, ciclo, mercado):
+        """Decisión de compra del ciclo y saciedad de lo consumido"""
         if hasattr(self, 'perfil_psicologico') and mercado.sistema_psicologia:
             self.decidir_compra_con_psicologia(mercado, ciclo)
         else:
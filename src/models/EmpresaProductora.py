@@ -5,6 +5,10 @@ import random
 import logging
 import math
 
+# Logger del componente 'Empresa': los mensajes DEBUG se construyen solo si
+# el nivel está habilitado (ver SimuladorLogger)
+logger = logging.getLogger('SimuladorEconomico.Empresa')
+
 
 class EmpresaProductora(Empresa):
     def __init__(self, nombre, mercado, bienes={}):
@@ -208,6 +212,17 @@ class EmpresaProductora(Empresa):
             self.empleados.remove(consumidor)
             self.costo_salarios -= consumidor.ingreso_mensual
 
+    def _agregados_mercado(self, mercado):
+        """Agregados del ciclo; se calculan al vuelo si el mercado no los ofrece"""
+        agregados = getattr(mercado, 'agregados_bienes', None)
+        if agregados is None:
+            from ..systems.AgregadosBienes import AgregadosBienes
+            agregados = AgregadosBienes(mercado)
+        return agregados.vigentes()
+
+    def _estadisticas_bien(self, mercado, bien):
+        return self._agregados_mercado(mercado).estadisticas.get(bien)
+
     def calcular_demanda_estimada(self, bien, mercado):
         """Estima la demanda del bien basada en el mercado"""
         try:
@@ -216,37 +231,30 @@ class EmpresaProductora(Empresa):
                 return 1  # Demanda mínima de seguridad
 
             # Demanda basada en población de consumidores
-            consumidores = mercado.getConsumidores()
-            if not consumidores:
+            agregados = self._agregados_mercado(mercado)
+            if not agregados.num_consumidores:
                 return 1  # Demanda mínima si no hay consumidores
 
-            empleados = [c for c in consumidores if c.empleado]
-            if empleados:
-                ingreso_promedio = sum(
-                    [c.ingreso_mensual for c in empleados]) / len(empleados)
-            else:
+            ingreso_promedio = agregados.ingreso_promedio_empleados
+            if ingreso_promedio is None:
                 ingreso_promedio = 5000  # Ingreso promedio de fallback
 
             # Usar el método del bien para calcular demanda base
             demanda_base = mercado.bienes[bien].calcular_demanda_base(
-                len(consumidores), ingreso_promedio)
+                agregados.num_consumidores, ingreso_promedio)
 
             # Asegurar demanda base mínima
             demanda_base = max(1, demanda_base)
 
-            # Ajustar por competencia
-            competidores = [e for e in mercado.getEmpresas() if e !=
-                            self and bien in e.bienes]
-            factor_competencia = 1.0 / max(1, len(competidores))
+            # Ajustar por competencia (agregados del ciclo, sin recorrer rivales)
+            estadisticas = self._estadisticas_bien(mercado, bien)
+            num_competidores = estadisticas.num_competidores(self) if estadisticas else 0
+            factor_competencia = 1.0 / max(1, num_competidores)
 
             # Ajustar por precio relativo
-            if competidores:
-                precios_competencia = [e.precios.get(
-                    bien, 0) for e in competidores if e.precios.get(bien, 0) > 0]
-                if precios_competencia:
-                    precio_promedio_competencia = sum(
-                        precios_competencia) / len(precios_competencia)
-
+            if num_competidores:
+                precio_promedio_competencia = estadisticas.precio_medio_competencia(self)
+                if precio_promedio_competencia is not None:
                     # Obtener precio propio, garantizando que nunca sea cero
                     precio_propio = self.precios.get(bien, 1)
                     if precio_propio <= 0:
@@ -269,11 +277,11 @@ class EmpresaProductora(Empresa):
             return max(1, demanda_estimada)
 
         except (ZeroDivisionError, ValueError, TypeError, AttributeError) as e:
-            logging.error(
+            logger.error(
                 f"Error calculando demanda estimada para {bien} en {self.nombre}: {e}")
             return 1  # Demanda mínima de seguridad
         except Exception as e:
-            logging.error(
+            logger.error(
                 f"Error inesperado calculando demanda para {bien} en {self.nombre}: {e}")
             return 1
 
@@ -307,22 +315,23 @@ class EmpresaProductora(Empresa):
                         
                         plan_produccion[bien] = max(0, produccion_planificada)
                         
-                        logging.debug(f"{self.nombre}: S,s política activada para {bien} - "
-                                    f"Stock: {stock_actual}, Reorden: {punto_reorden}, "
-                                    f"Objetivo: {inventario_objetivo}, Producir: {plan_produccion[bien]}")
+                        if logger.isEnabledFor(logging.DEBUG):
+                            logger.debug(f"{self.nombre}: S,s política activada para {bien} - "
+                                        f"Stock: {stock_actual}, Reorden: {punto_reorden}, "
+                                        f"Objetivo: {inventario_objetivo}, Producir: {plan_produccion[bien]}")
                     else:
                         # No producir - stock por encima del punto de reorden
                         plan_produccion[bien] = 0
 
                 except (ZeroDivisionError, ValueError, TypeError, KeyError) as e:
-                    logging.error(f"Error planificando producción S,s de {bien} en {self.nombre}: {e}")
+                    logger.error(f"Error planificando producción S,s de {bien} en {self.nombre}: {e}")
                     plan_produccion[bien] = 0
                 except Exception as e:
-                    logging.error(f"Error inesperado planificando producción S,s de {bien} en {self.nombre}: {e}")
+                    logger.error(f"Error inesperado planificando producción S,s de {bien} en {self.nombre}: {e}")
                     plan_produccion[bien] = 0
 
         except Exception as e:
-            logging.error(
+            logger.error(
                 f"Error general en planificación de producción de {self.nombre}: {e}")
             # Retornar un plan vacío en caso de error
             plan_produccion = {bien: 0 for bien in self.capacidad_produccion}
@@ -382,7 +391,7 @@ class EmpresaProductora(Empresa):
                         self.nombre, bien, cantidad_efectiva, self.factor_emisiones
                     )
             except Exception as e:
-                logging.warning(
+                logger.warning(
                     f"Error en registro ambiental para {self.nombre}: {e}")
 
             if cantidad_efectiva <= 0:
@@ -406,10 +415,10 @@ class EmpresaProductora(Empresa):
             return cantidad_efectiva
 
         except (ZeroDivisionError, ValueError, TypeError, AttributeError) as e:
-            logging.error(f"Error produciendo {bien} en {self.nombre}: {e}")
+            logger.error(f"Error produciendo {bien} en {self.nombre}: {e}")
             return 0
         except Exception as e:
-            logging.error(
+            logger.error(
                 f"Error inesperado produciendo {bien} en {self.nombre}: {e}")
             return 0
 
@@ -459,34 +468,39 @@ class EmpresaProductora(Empresa):
     def ajustar_precios_dinamico(self, mercado, bien):
         """Ajusta precios basado en múltiples factores económicos mejorados"""
         try:
-            logging.debug(
-                f"{self.nombre}: INICIO ajuste de precio para {bien}")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(
+                    f"{self.nombre}: INICIO ajuste de precio para {bien}")
 
             # NUEVA VALIDACIÓN: Verificar que el bien existe en el mercado
             if not hasattr(mercado, 'bienes') or bien not in mercado.bienes:
-                logging.debug(
-                    f"{self.nombre}: Bien {bien} no existe en el mercado, omitiendo ajuste de precio")
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug(
+                        f"{self.nombre}: Bien {bien} no existe en el mercado, omitiendo ajuste de precio")
                 return
 
             # Validaciones de seguridad más robustas
             if not hasattr(self, 'precios') or bien not in self.precios:
-                logging.debug(
-                    f"{self.nombre}: No tiene precios para {bien}, saliendo")
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug(
+                        f"{self.nombre}: No tiene precios para {bien}, saliendo")
                 return
             if not hasattr(self, 'costos_unitarios') or bien not in self.costos_unitarios:
-                logging.debug(
-                    f"{self.nombre}: No tiene costos unitarios para {bien}, saliendo")
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug(
+                        f"{self.nombre}: No tiene costos unitarios para {bien}, saliendo")
                 return
             if not hasattr(self, 'bienes'):
-                logging.debug(
-                    f"{self.nombre}: No tiene atributo bienes, saliendo")
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug(
+                        f"{self.nombre}: No tiene atributo bienes, saliendo")
                 return
 
             # Asegurar que el precio actual no sea cero
             if self.precios[bien] <= 0:
                 costo_base = self.costos_unitarios.get(bien, 10)
                 self.precios[bien] = max(costo_base * 1.2, 1.0)
-                logging.warning(
+                logger.warning(
                     f"{self.nombre}: Precio de {bien} era <= 0, ajustado a {self.precios[bien]}")
                 return
 
@@ -494,8 +508,9 @@ class EmpresaProductora(Empresa):
             costo_unitario = max(
                 0.01, self.costos_unitarios[bien])  # Evitar cero
 
-            logging.debug(
-                f"{self.nombre}: Precio actual de {bien}: ${precio_actual:.2f}, Costo: ${costo_unitario:.2f}")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(
+                    f"{self.nombre}: Precio actual de {bien}: ${precio_actual:.2f}, Costo: ${costo_unitario:.2f}")
 
             # Factor 1: Análisis de demanda (ventas recientes)
             try:
@@ -504,21 +519,23 @@ class EmpresaProductora(Empresa):
                 demanda_estimada = max(
                     1, self.calcular_demanda_estimada(bien, mercado))
 
-                logging.debug(
-                    f"{self.nombre}: Ventas recientes de {bien}: {ventas_recientes}, Demanda estimada: {demanda_estimada}")
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug(
+                        f"{self.nombre}: Ventas recientes de {bien}: {ventas_recientes}, Demanda estimada: {demanda_estimada}")
 
                 # Protección adicional contra división por cero
                 if demanda_estimada == 0:
-                    logging.warning(
+                    logger.warning(
                         f"{self.nombre}: Demanda estimada es 0 para {bien}, usando 1")
                     demanda_estimada = 1
 
                 ratio_demanda = ventas_recientes / float(demanda_estimada)
-                logging.debug(
-                    f"{self.nombre}: Ratio demanda para {bien}: {ratio_demanda}")
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug(
+                        f"{self.nombre}: Ratio demanda para {bien}: {ratio_demanda}")
 
             except (ZeroDivisionError, ValueError, TypeError) as e:
-                logging.error(
+                logger.error(
                     f"{self.nombre}: Error calculando ratio demanda para {bien}: {e}")
                 # En caso de cualquier error numérico, no cambiar precio
                 return
@@ -529,48 +546,50 @@ class EmpresaProductora(Empresa):
 
             # Evitar división por cero
             if stock_optimo == 0:
-                logging.warning(
+                logger.warning(
                     f"{self.nombre}: Stock óptimo es 0 para {bien}, usando 5")
                 stock_optimo = 5
 
             ratio_stock = stock_actual / float(stock_optimo)
-            logging.debug(
-                f"{self.nombre}: Stock actual de {bien}: {stock_actual}, Óptimo: {stock_optimo}, Ratio: {ratio_stock}")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(
+                    f"{self.nombre}: Stock actual de {bien}: {stock_actual}, Óptimo: {stock_optimo}, Ratio: {ratio_stock}")
 
             # Factor 3: Competencia (más agresiva)
-            competidores = [e for e in mercado.getEmpresas(
-            ) if e != self and bien in e.precios]
+            estadisticas = self._estadisticas_bien(mercado, bien)
             factor_competencia = 1.0
-            if competidores:
-                precios_competencia = [e.precios.get(
-                    bien, 0) for e in competidores if bien in e.precios and e.precios.get(bien, 0) > 0]
-                if precios_competencia:
-                    precio_promedio_competencia = sum(
-                        precios_competencia) / len(precios_competencia)
-                    logging.debug(
-                        f"{self.nombre}: Precio promedio competencia para {bien}: ${precio_promedio_competencia:.2f}")
+            if estadisticas and estadisticas.num_competidores(self):
+                precio_promedio_competencia = estadisticas.precio_medio_competencia(self)
+                if precio_promedio_competencia is not None:
+                    if logger.isEnabledFor(logging.DEBUG):
+                        logger.debug(
+                            f"{self.nombre}: Precio promedio competencia para {bien}: ${precio_promedio_competencia:.2f}")
 
                     if precio_promedio_competencia > 0 and precio_actual > precio_promedio_competencia * 1.1:
                         factor_competencia = 0.95  # Reducir precio para competir
-                        logging.debug(
-                            f"{self.nombre}: Precio alto vs competencia, factor: {factor_competencia}")
+                        if logger.isEnabledFor(logging.DEBUG):
+                            logger.debug(
+                                f"{self.nombre}: Precio alto vs competencia, factor: {factor_competencia}")
                     elif precio_promedio_competencia > 0 and precio_actual < precio_promedio_competencia * 0.9:
                         factor_competencia = 1.05  # Aumentar precio si somos muy baratos
-                        logging.debug(
-                            f"{self.nombre}: Precio bajo vs competencia, factor: {factor_competencia}")
+                        if logger.isEnabledFor(logging.DEBUG):
+                            logger.debug(
+                                f"{self.nombre}: Precio bajo vs competencia, factor: {factor_competencia}")
 
             # Factor 4: Condiciones macroeconómicas
             factor_macro = 1.0
             if hasattr(mercado, 'inflacion_historica') and mercado.inflacion_historica:
                 inflacion_actual = mercado.inflacion_historica[-1]
                 factor_macro += inflacion_actual * 0.5  # Ajustar por inflación
-                logging.debug(
-                    f"{self.nombre}: Factor macro por inflación: {factor_macro}")
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug(
+                        f"{self.nombre}: Factor macro por inflación: {factor_macro}")
 
             if hasattr(mercado, 'crisis_financiera_activa') and mercado.crisis_financiera_activa:
                 factor_macro *= 0.95  # Reducir precios durante crisis
-                logging.debug(
-                    f"{self.nombre}: Factor macro por crisis: {factor_macro}")
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug(
+                        f"{self.nombre}: Factor macro por crisis: {factor_macro}")
 
             # Factor 5: Estacionalidad (nuevo)
             factor_estacional = 1.0
@@ -578,8 +597,9 @@ class EmpresaProductora(Empresa):
                 mes_actual = mercado.ciclo_actual % 12
                 factor_estacional = mercado.bienes[bien].obtener_factor_estacional(
                     mes_actual)
-                logging.debug(
-                    f"{self.nombre}: Factor estacional para {bien}: {factor_estacional}")
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug(
+                        f"{self.nombre}: Factor estacional para {bien}: {factor_estacional}")
 
             # Calcular ajuste de precio combinado
             ajuste_demanda = - \
@@ -593,8 +613,9 @@ class EmpresaProductora(Empresa):
             factor_total = (1 + ajuste_demanda + ajuste_stock + ajuste_aleatorio) * \
                 factor_competencia * factor_macro * factor_estacional
 
-            logging.debug(
-                f"{self.nombre}: Factores para {bien} - demanda: {ajuste_demanda}, stock: {ajuste_stock}, total: {factor_total}")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(
+                    f"{self.nombre}: Factores para {bien} - demanda: {ajuste_demanda}, stock: {ajuste_stock}, total: {factor_total}")
 
             # Aplicar ajuste con límites
             precio_nuevo = precio_actual * factor_total
@@ -638,23 +659,26 @@ class EmpresaProductora(Empresa):
                     })
                     self.ciclos_sin_cambio_precio[bien] = 0
                     
-                    logging.debug(f"{self.nombre}: Precio de {bien} cambiado de ${precio_actual:.2f} a ${precio_final:.2f} "
-                                f"(costo ajuste: ${self.costo_ajuste_precio:.2f})")
+                    if logger.isEnabledFor(logging.DEBUG):
+                        logger.debug(f"{self.nombre}: Precio de {bien} cambiado de ${precio_actual:.2f} a ${precio_final:.2f} "
+                                    f"(costo ajuste: ${self.costo_ajuste_precio:.2f})")
                 else:
                     # Cambio no justificado por el costo
-                    logging.debug(f"{self.nombre}: Cambio de precio para {bien} no justificado "
-                                f"(beneficio: ${beneficio_estimado:.2f} vs costo: ${self.costo_ajuste_precio:.2f})")
+                    if logger.isEnabledFor(logging.DEBUG):
+                        logger.debug(f"{self.nombre}: Cambio de precio para {bien} no justificado "
+                                    f"(beneficio: ${beneficio_estimado:.2f} vs costo: ${self.costo_ajuste_precio:.2f})")
             else:
-                logging.debug(f"{self.nombre}: Cambio de precio para {bien} muy pequeño ({cambio_propuesto:.3f} < {self.umbral_cambio_precio:.3f})")
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug(f"{self.nombre}: Cambio de precio para {bien} muy pequeño ({cambio_propuesto:.3f} < {self.umbral_cambio_precio:.3f})")
             
             # Incrementar contador de ciclos sin cambio
             self.ciclos_sin_cambio_precio[bien] = self.ciclos_sin_cambio_precio.get(bien, 0) + 1
             self.precios[bien] = precio_final
 
         except Exception as e:
-            logging.error(
+            logger.error(
                 f"{self.nombre}: Error inesperado ajustando precio de {bien}: {e}")
-            logging.error(
+            logger.error(
                 f"Estado: precio_actual={self.precios.get(bien, 'N/A')}, costo={self.costos_unitarios.get(bien, 'N/A')}")
 
     def obtener_ventas_recientes(self, bien, mercado, num_ciclos):
@@ -713,7 +737,7 @@ class EmpresaProductora(Empresa):
             
             # Validación de rango numérico para evitar overflow
             if costo_total <= 0 or costo_total > 1e9:
-                logging.warning(f"{self.nombre}: Costo operativo inválido: {costo_total}")
+                logger.warning(f"{self.nombre}: Costo operativo inválido: {costo_total}")
                 costo_total = max(1000, min(costo_total, 50000))  # Normalizar entre límites seguros
             
             # Crisis progresiva: Intentar pagos múltiples antes de fallar
@@ -764,12 +788,12 @@ class EmpresaProductora(Empresa):
             return False
             
         except (OverflowError, ValueError, ArithmeticError) as e:
-            logging.error(f"Error numérico en pagar_costos_operativos de {self.nombre}: {e}")
+            logger.error(f"Error numérico en pagar_costos_operativos de {self.nombre}: {e}")
             # Fallback seguro: reset básico
             self.dinero = max(0, self.dinero)
             return False
         except Exception as e:
-            logging.error(f"Error general en pagar_costos_operativos de {self.nombre}: {e}")
+            logger.error(f"Error general en pagar_costos_operativos de {self.nombre}: {e}")
             return False
 
     def _calcular_costos_operativos(self):
@@ -822,10 +846,10 @@ class EmpresaProductora(Empresa):
             return total
             
         except (OverflowError, ValueError, ArithmeticError) as e:
-            logging.error(f"Error numérico calculando costos operativos en {self.nombre}: {e}")
+            logger.error(f"Error numérico calculando costos operativos en {self.nombre}: {e}")
             return 1000  # Costo de seguridad básico
         except Exception as e:
-            logging.error(f"Error general calculando costos operativos en {self.nombre}: {e}")
+            logger.error(f"Error general calculando costos operativos en {self.nombre}: {e}")
             return 1000
 
     def verificar_estado_financiero(self):
@@ -842,7 +866,7 @@ class EmpresaProductora(Empresa):
                 if not hasattr(self, 'costos_fijos_originales'):
                     self.costos_fijos_originales = self.costos_fijos_mensuales
                 self.costos_fijos_mensuales *= 0.8
-                logging.info(f"{self.nombre}: Reduciendo costos operativos por dificultades financieras")
+                logger.info(f"{self.nombre}: Reduciendo costos operativos por dificultades financieras")
             
             elif self.ciclos_sin_actividad == 2:
                 # Segundo ciclo: Buscar financiamiento de emergencia
@@ -861,7 +885,7 @@ class EmpresaProductora(Empresa):
                             self.deuda_bancaria = 0
                         self.deuda_bancaria += prestamo_emergencia * 1.1
                         self.ciclos_sin_actividad = 0  # Reset contador
-                        logging.info(f"{self.nombre}: Préstamo de emergencia obtenido - ${prestamo_emergencia:.2f}")
+                        logger.info(f"{self.nombre}: Préstamo de emergencia obtenido - ${prestamo_emergencia:.2f}")
                         return True
             
             elif self.ciclos_sin_actividad >= 5:  # Aumentado de 3 a 5 ciclos
@@ -871,12 +895,12 @@ class EmpresaProductora(Empresa):
                     rescate_exitoso = self.mercado.rescate_empresarial.evaluar_rescate(self)
                     if rescate_exitoso:
                         self.ciclos_sin_actividad = 0
-                        logging.info(f"{self.nombre}: Rescatada por el gobierno")
+                        logger.info(f"{self.nombre}: Rescatada por el gobierno")
                         return True
                 
                 # Si no hay rescate, entonces quiebra
                 self.en_quiebra = True
-                logging.warning(
+                logger.warning(
                     f"{self.nombre}: EMPRESA EN QUIEBRA después de 5 ciclos - Dinero: ${self.dinero:.2f}, Costos: ${costos_totales:.2f}")
                 return False
         else:
@@ -894,8 +918,9 @@ class EmpresaProductora(Empresa):
 
         # Verificar si tiene dinero mínimo para operaciones básicas
         if self.dinero < self.dinero_minimo_operacion:
-            logging.debug(
-                f"{self.nombre}: Fondos insuficientes para operaciones (${self.dinero:.2f} < ${self.dinero_minimo_operacion:.2f})")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(
+                    f"{self.nombre}: Fondos insuficientes para operaciones (${self.dinero:.2f} < ${self.dinero_minimo_operacion:.2f})")
             return False
 
         return True
@@ -903,88 +928,100 @@ class EmpresaProductora(Empresa):
     def ciclo_persona(self, ciclo, mercado):
         """Ciclo principal de la empresa productora"""
         try:
-            logging.debug(
-                f"INICIO ciclo {ciclo} para {self.nombre} - Dinero: ${self.dinero:.2f}")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(
+                    f"INICIO ciclo {ciclo} para {self.nombre} - Dinero: ${self.dinero:.2f}")
 
             # Verificar estado financiero antes de cualquier operación
             if not self.verificar_estado_financiero():
                 if self.en_quiebra:
-                    logging.warning(
+                    logger.warning(
                         f"{self.nombre}: EMPRESA EN QUIEBRA - Saltando ciclo")
                     return False
                 else:
-                    logging.debug(
-                        f"{self.nombre}: Fondos insuficientes - Saltando operaciones complejas")
+                    if logger.isEnabledFor(logging.DEBUG):
+                        logger.debug(
+                            f"{self.nombre}: Fondos insuficientes - Saltando operaciones complejas")
                     return False
 
             # CORRECCIÓN: Asegurar que la empresa tenga al menos un empleado para operar
             if len(self.empleados) == 0 and self.dinero > 5000:  # Solo si tiene dinero suficiente
                 try:
-                    logging.debug(f"{self.nombre}: Intentando contratar empleado inicial...")
+                    if logger.isEnabledFor(logging.DEBUG):
+                        logger.debug(f"{self.nombre}: Intentando contratar empleado inicial...")
                     # Contratar directamente un consumidor desempleado
                     consumidores_desempleados = [c for c in mercado.getConsumidores() if not c.empleado]
                     if consumidores_desempleados:
                         consumidor = random.choice(consumidores_desempleados)
                         self.contratar(consumidor)
-                        logging.debug(f"{self.nombre}: Empleado inicial contratado")
+                        if logger.isEnabledFor(logging.DEBUG):
+                            logger.debug(f"{self.nombre}: Empleado inicial contratado")
                 except Exception as e:
-                    logging.warning(f"{self.nombre}: No pudo contratar empleado inicial: {e}")
+                    logger.warning(f"{self.nombre}: No pudo contratar empleado inicial: {e}")
             
             # Si aún no tiene empleados, usar modo de operación limitada
             if len(self.empleados) == 0:
-                logging.debug(f"{self.nombre}: Operando sin empleados - capacidad limitada")
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug(f"{self.nombre}: Operando sin empleados - capacidad limitada")
                 # La empresa puede funcionar con capacidad muy reducida pero sin dividir por cero
 
             # Pagar costos operativos
             try:
-                logging.debug(f"{self.nombre}: Pagando costos operativos...")
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug(f"{self.nombre}: Pagando costos operativos...")
                 resultado_costos = self.pagar_costos_operativos()
-                logging.debug(
-                    f"{self.nombre}: Costos pagados - Resultado: {resultado_costos}, Dinero restante: ${self.dinero:.2f}")
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug(
+                        f"{self.nombre}: Costos pagados - Resultado: {resultado_costos}, Dinero restante: ${self.dinero:.2f}")
 
                 # Si no pudo pagar costos, no continuar con operaciones
                 if not resultado_costos:
-                    logging.warning(
+                    logger.warning(
                         f"{self.nombre}: No pudo pagar costos operativos - Saltando producción")
                     return False
             except ZeroDivisionError as e:
-                logging.error(f"DIVISIÓN POR CERO en pago de costos de {self.nombre}: {e}")
+                logger.error(f"DIVISIÓN POR CERO en pago de costos de {self.nombre}: {e}")
                 self._aplicar_correcciones_division_cero()
                 return False
 
             # Planificar y ejecutar producción
             try:
-                logging.debug(f"{self.nombre}: Planificando producción...")
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug(f"{self.nombre}: Planificando producción...")
                 plan_produccion = self.planificar_produccion(mercado)
-                logging.debug(
-                    f"{self.nombre}: Plan de producción: {plan_produccion}")
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug(
+                        f"{self.nombre}: Plan de producción: {plan_produccion}")
             except ZeroDivisionError as e:
-                logging.error(f"DIVISIÓN POR CERO en planificación de {self.nombre}: {e}")
+                logger.error(f"DIVISIÓN POR CERO en planificación de {self.nombre}: {e}")
                 self._aplicar_correcciones_division_cero()
                 plan_produccion = {}  # Plan vacío de emergencia
 
             for bien, cantidad in plan_produccion.items():
                 if cantidad > 0:
                     try:
-                        logging.debug(
-                            f"{self.nombre}: Produciendo {cantidad} unidades de {bien}")
+                        if logger.isEnabledFor(logging.DEBUG):
+                            logger.debug(
+                                f"{self.nombre}: Produciendo {cantidad} unidades de {bien}")
                         cantidad_producida = self.producir_bien_mejorado(
                             bien, cantidad, mercado)
-                        logging.debug(
-                            f"{self.nombre}: Producidas {cantidad_producida} unidades de {bien}")
+                        if logger.isEnabledFor(logging.DEBUG):
+                            logger.debug(
+                                f"{self.nombre}: Producidas {cantidad_producida} unidades de {bien}")
                     except ZeroDivisionError as e:
-                        logging.error(
+                        logger.error(
                             f"DIVISION POR CERO en producción de {self.nombre} para {bien}: {e}")
-                        logging.error(
+                        logger.error(
                             f"Estado: dinero={self.dinero}, costo_unitario={self.costos_unitarios.get(bien, 'N/A')}")
                         continue
                     except Exception as e:
-                        logging.error(
+                        logger.error(
                             f"Error en producción de {self.nombre} para {bien}: {e}")
                         continue
 
             # Ajustar precios dinámicamente solo si tiene inventario o puede producir
-            logging.debug(f"{self.nombre}: Ajustando precios dinámicamente...")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(f"{self.nombre}: Ajustando precios dinámicamente...")
             
             # MEJORADO: Filtrar solo bienes válidos que existen en el mercado
             bienes_validos = [bien for bien in self.precios.keys() 
@@ -993,70 +1030,77 @@ class EmpresaProductora(Empresa):
             for bien in bienes_validos:
                 try:
                     precio_anterior = self.precios.get(bien, 0)
-                    logging.debug(
-                        f"{self.nombre}: Ajustando precio de {bien} (actual: ${precio_anterior:.2f})")
+                    if logger.isEnabledFor(logging.DEBUG):
+                        logger.debug(
+                            f"{self.nombre}: Ajustando precio de {bien} (actual: ${precio_anterior:.2f})")
                     self.ajustar_precios_dinamico(mercado, bien)
                     precio_nuevo = self.precios.get(bien, 0)
-                    logging.debug(
-                        f"{self.nombre}: Precio de {bien} ajustado: ${precio_anterior:.2f} -> ${precio_nuevo:.2f}")
+                    if logger.isEnabledFor(logging.DEBUG):
+                        logger.debug(
+                            f"{self.nombre}: Precio de {bien} ajustado: ${precio_anterior:.2f} -> ${precio_nuevo:.2f}")
                 except ZeroDivisionError as e:
-                    logging.error(
+                    logger.error(
                         f"DIVISION POR CERO en ajuste de precios de {self.nombre} para {bien}: {e}")
-                    logging.error(
+                    logger.error(
                         f"Estado precio: precio_actual={self.precios.get(bien, 'N/A')}, costo={self.costos_unitarios.get(bien, 'N/A')}")
                     continue
                 except Exception as e:
-                    logging.error(
+                    logger.error(
                         f"Error en ajuste de precios de {self.nombre} para {bien}: {e}")
                     continue
 
             # Considerar expansión solo si tiene fondos suficientes
             if ciclo % 5 == 0 and self.dinero > self.costos_fijos_mensuales * 2:  # Cada 5 ciclos y con reservas
                 try:
-                    logging.debug(f"{self.nombre}: Evaluando expansión...")
+                    if logger.isEnabledFor(logging.DEBUG):
+                        logger.debug(f"{self.nombre}: Evaluando expansión...")
                     self.gestionar_expansion()
-                    logging.debug(f"{self.nombre}: Expansión evaluada")
+                    if logger.isEnabledFor(logging.DEBUG):
+                        logger.debug(f"{self.nombre}: Expansión evaluada")
                 except ZeroDivisionError as e:
-                    logging.error(
+                    logger.error(
                         f"DIVISION POR CERO en expansión de {self.nombre}: {e}")
-                    logging.error(
+                    logger.error(
                         f"Estado expansión: dinero={self.dinero}, costos_fijos={self.costos_fijos_mensuales}")
                 except Exception as e:
-                    logging.error(f"Error en expansión de {self.nombre}: {e}")
+                    logger.error(f"Error en expansión de {self.nombre}: {e}")
 
             # Actividades de empresa base (acciones, dividendos)
             try:
-                logging.debug(
-                    f"{self.nombre}: Ejecutando actividades financieras...")
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug(
+                        f"{self.nombre}: Ejecutando actividades financieras...")
                 self.emitir_acciones(5, mercado.mercado_financiero)
                 self.distribuir_dividendos(mercado.mercado_financiero)
-                logging.debug(
-                    f"{self.nombre}: Actividades financieras completadas")
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug(
+                        f"{self.nombre}: Actividades financieras completadas")
             except Exception as e:
-                logging.error(
+                logger.error(
                     f"Error en actividades financieras de {self.nombre}: {e}")
 
-            logging.debug(
-                f"FIN ciclo {ciclo} para {self.nombre} - Dinero final: ${self.dinero:.2f}")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(
+                    f"FIN ciclo {ciclo} para {self.nombre} - Dinero final: ${self.dinero:.2f}")
 
         except ZeroDivisionError as e:
-            logging.error(f"DIVISIÓN POR CERO en ciclo de {self.nombre}: {e}")
-            logging.error(f"Estado: dinero={self.dinero:.2f}, empleados={len(self.empleados)}")
+            logger.error(f"DIVISIÓN POR CERO en ciclo de {self.nombre}: {e}")
+            logger.error(f"Estado: dinero={self.dinero:.2f}, empleados={len(self.empleados)}")
             # Aplicar correcciones de emergencia
             self._aplicar_correcciones_division_cero()
             
         except Exception as e:
-            logging.error(f"Error general en ciclo de {self.nombre}: {e}")
+            logger.error(f"Error general en ciclo de {self.nombre}: {e}")
             # Agregar más información de debug
-            logging.error(f"Estado completo de {self.nombre}:")
-            logging.error(f"  - Dinero: ${self.dinero:.2f}")
-            logging.error(f"  - Empleados: {len(self.empleados)}")
-            logging.error(f"  - Costos fijos: ${self.costos_fijos_mensuales}")
-            logging.error(f"  - Costo salarios: ${self.costo_salarios}")
+            logger.error(f"Estado completo de {self.nombre}:")
+            logger.error(f"  - Dinero: ${self.dinero:.2f}")
+            logger.error(f"  - Empleados: {len(self.empleados)}")
+            logger.error(f"  - Costos fijos: ${self.costos_fijos_mensuales}")
+            logger.error(f"  - Costo salarios: ${self.costo_salarios}")
             # Solo mostrar primeros 3
-            logging.error(
+            logger.error(
                 f"  - Precios: {dict(list(self.precios.items())[:3])}...")
-            logging.error(
+            logger.error(
                 f"  - Costos unitarios: {dict(list(self.costos_unitarios.items())[:3])}...")
 
         # Reset de producción actual para próximo ciclo
@@ -1070,34 +1114,34 @@ class EmpresaProductora(Empresa):
             for bien in self.precios:
                 if self.precios[bien] <= 0:
                     self.precios[bien] = 1.0  # Precio mínimo de seguridad
-                    logging.warning(f"{self.nombre}: Precio de {bien} corregido a $1.00")
+                    logger.warning(f"{self.nombre}: Precio de {bien} corregido a $1.00")
             
             # Corregir costos unitarios que sean cero
             for bien in self.costos_unitarios:
                 if self.costos_unitarios[bien] <= 0:
                     self.costos_unitarios[bien] = 0.5  # Costo mínimo de seguridad
-                    logging.warning(f"{self.nombre}: Costo unitario de {bien} corregido a $0.50")
+                    logger.warning(f"{self.nombre}: Costo unitario de {bien} corregido a $0.50")
             
             # Asegurar que acciones_emitidas no sea cero
             if hasattr(self, 'acciones_emitidas') and self.acciones_emitidas <= 0:
                 self.acciones_emitidas = 1
-                logging.warning(f"{self.nombre}: Acciones emitidas corregidas a 1")
+                logger.warning(f"{self.nombre}: Acciones emitidas corregidas a 1")
             
             # Asegurar capacidad de producción mínima
             for bien in self.capacidad_produccion:
                 if self.capacidad_produccion[bien] <= 0:
                     self.capacidad_produccion[bien] = 1
-                    logging.warning(f"{self.nombre}: Capacidad de producción de {bien} corregida a 1")
+                    logger.warning(f"{self.nombre}: Capacidad de producción de {bien} corregida a 1")
             
             # Asegurar que los costos fijos no sean cero
             if self.costos_fijos_mensuales <= 0:
                 self.costos_fijos_mensuales = 100.0  # Costo fijo mínimo
-                logging.warning(f"{self.nombre}: Costos fijos corregidos a $100.00")
+                logger.warning(f"{self.nombre}: Costos fijos corregidos a $100.00")
                 
-            logging.info(f"{self.nombre}: Correcciones de división por cero aplicadas")
+            logger.info(f"{self.nombre}: Correcciones de división por cero aplicadas")
             
         except Exception as e:
-            logging.error(f"{self.nombre}: Error aplicando correcciones: {e}")
+            logger.error(f"{self.nombre}: Error aplicando correcciones: {e}")
 
     def _despedir_empleados(self, cantidad):
         """Despide una cantidad específica de empleados para reducir costos"""
@@ -1122,11 +1166,11 @@ class EmpresaProductora(Empresa):
             else:
                 self.costo_salarios = 0
             
-            logging.info(f"{self.nombre}: Despidió {empleados_despedidos} empleados por crisis financiera")
+            logger.info(f"{self.nombre}: Despidió {empleados_despedidos} empleados por crisis financiera")
             return empleados_despedidos
             
         except Exception as e:
-            logging.error(f"Error despidiendo empleados en {self.nombre}: {e}")
+            logger.error(f"Error despidiendo empleados en {self.nombre}: {e}")
             return 0
 
     def _solicitar_prestamo_emergencia(self, monto):
@@ -1140,14 +1184,15 @@ class EmpresaProductora(Empresa):
                 try:
                     resultado = banco.solicitar_prestamo(self, monto, 24)  # 24 meses
                     if isinstance(resultado, tuple) and resultado[0]:
-                        logging.info(f"{self.nombre}: Préstamo de emergencia aprobado - ${monto:,.2f}")
+                        logger.info(f"{self.nombre}: Préstamo de emergencia aprobado - ${monto:,.2f}")
                         return True
                 except Exception as e:
-                    logging.debug(f"Banco {banco.nombre} rechazó préstamo para {self.nombre}: {e}")
+                    if logger.isEnabledFor(logging.DEBUG):
+                        logger.debug(f"Banco {banco.nombre} rechazó préstamo para {self.nombre}: {e}")
                     continue
             
             return False
             
         except Exception as e:
-            logging.error(f"Error solicitando préstamo de emergencia para {self.nombre}: {e}")
+            logger.error(f"Error solicitando préstamo de emergencia para {self.nombre}: {e}")
             return False
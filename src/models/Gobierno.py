@@ -31,16 +31,23 @@ class Gobierno:
 
     def calcular_indicadores_macroeconomicos(self):
         """Calcula indicadores económicos principales"""
-        # PIB como suma de toda la actividad económica
-        transacciones_ciclo = [t for t in self.mercado.transacciones if t['ciclo'] == len(
-            self.mercado.transacciones)]
-        self.pib_nominal = sum([t['costo_total'] for t in transacciones_ciclo])
-
-        # Población y tasa de desempleo
-        self.poblacion = len(self.mercado.getConsumidores())
-        desempleados = len(
-            [c for c in self.mercado.getConsumidores() if not c.empleado])
-        self.tasa_desempleo = desempleados / self.poblacion if self.poblacion > 0 else 0
+        acumulador = getattr(self.mercado, 'acumulador_macro', None)
+        if acumulador is not None:
+            # Lecturas O(1): mismo criterio de ciclo que el recorrido de abajo
+            self.pib_nominal = acumulador.volumen_ciclo(len(self.mercado.transacciones))
+            self.poblacion = acumulador.poblacion
+            self.tasa_desempleo = acumulador.tasa_desempleo()
+        else:
+            # PIB como suma de toda la actividad económica
+            transacciones_ciclo = [t for t in self.mercado.transacciones if t['ciclo'] == len(
+                self.mercado.transacciones)]
+            self.pib_nominal = sum([t['costo_total'] for t in transacciones_ciclo])
+
+            # Población y tasa de desempleo
+            self.poblacion = len(self.mercado.getConsumidores())
+            desempleados = len(
+                [c for c in self.mercado.getConsumidores() if not c.empleado])
+            self.tasa_desempleo = desempleados / self.poblacion if self.poblacion > 0 else 0
 
         # Desempleo por sector
         self.desempleo_sectorial = {}
@@ -0,0 +1,264 @@
+"""
+Índice de oferentes por bien
+============================
+
+Mantiene, para cada bien, qué empresas del mercado lo ofrecen (tienen una
+entrada en su inventario ``empresa.bienes``), cuáles tienen existencias y el
+stock total, actualizado de forma incremental en lugar de recorrer
+``getEmpresas()`` cada vez que un sistema pregunta por la competencia de un
+bien.
+
+Al registrar una empresa, su inventario pasa a ser un ``InventarioOferta``
+(un ``dict`` cuyas listas de unidades son ``UnidadesBien``): producir,
+vender, retirar o traspasar unidades y dar de alta o de baja un bien avisan
+al índice con el cambio de existencias. Las empresas entran y salen del
+índice con ``Mercado.agregar_persona`` / ``Mercado.retirar_persona``. El
+código de las empresas no cambia: siguen manipulando diccionarios y listas.
+
+Se activa con ``"performance": {"indice_oferentes": true}``.
+"""
+
+from dataclasses import dataclass, field
+from itertools import count
+from typing import Any, Dict, List, Optional
+
+
+class UnidadesBien(list):
+    """Lista de unidades de un bien que avisa al índice cuando cambia su longitud"""
+
+    __slots__ = ('_inventario', '_bien')
+
+    def __init__(self, unidades=(), inventario=None, bien=None):
+        super().__init__(unidades)
+        self._inventario = inventario
+        self._bien = bien
+
+    def _avisar(self, antes: int):
+        inventario = self._inventario
+        if inventario is not None:
+            inventario._indice._cambio_existencias(inventario._empresa, self._bien, antes, len(self))
+
+    def __reduce_ex__(self, protocolo):
+        # Copias y pickles son listas normales: el enlace al índice no viaja
+        return list, (list(self),)
+
+
+def _con_aviso(metodo):
+    def envoltura(self, *args):
+        antes = len(self)
+        resultado = metodo(self, *args)
+        if len(self) != antes:
+            self._avisar(antes)
+        return resultado
+    envoltura.__name__ = metodo.__name__
+    envoltura.__doc__ = metodo.__doc__
+    return envoltura
+
+
+for _nombre in ('append', 'extend', 'insert', 'pop', 'remove', 'clear',
+                '__delitem__', '__setitem__', '__iadd__', '__imul__'):
+    setattr(UnidadesBien, _nombre, _con_aviso(getattr(list, _nombre)))
+
+
+def _unidades(valor) -> int:
+    return len(valor) if isinstance(valor, list) else 0
+
+
+class InventarioOferta(dict):
+    """Inventario ``{bien: [unidades]}`` de una empresa registrada en el índice"""
+
+    def __init__(self, indice: 'IndiceOferentes', empresa, inventario=None):
+        super().__init__()
+        self._indice = indice
+        self._empresa = empresa
+        for bien, valor in (inventario or {}).items():
+            self[bien] = valor
+
+    def _enlazar(self, bien, valor):
+        if not isinstance(valor, list):
+            return valor
+        if isinstance(valor, UnidadesBien) and (
+                valor._inventario is None or (valor._inventario is self and valor._bien == bien)):
+            # Lista suelta (p. ej. retirada de otro inventario con pop) o la propia: se reutiliza
+            valor._inventario, valor._bien = self, bien
+            return valor
+        return UnidadesBien(valor, self, bien)
+
+    def _soltar(self, valor):
+        if isinstance(valor, UnidadesBien) and valor._inventario is self:
+            valor._inventario = None
+
+    def __setitem__(self, bien, valor):
+        anterior = dict.get(self, bien)
+        existia = dict.__contains__(self, bien)
+        valor = self._enlazar(bien, valor)
+        dict.__setitem__(self, bien, valor)
+        if existia:
+            if anterior is not valor:
+                self._soltar(anterior)
+            self._indice._cambio_existencias(self._empresa, bien, _unidades(anterior), _unidades(valor))
+        else:
+            self._indice._alta(self._empresa, bien, _unidades(valor))
+
+    def __delitem__(self, bien):
+        valor = dict.pop(self, bien)
+        self._soltar(valor)
+        self._indice._baja(self._empresa, bien, _unidades(valor))
+
+    _sin_valor = object()
+
+    def pop(self, bien, defecto=_sin_valor):
+        if not dict.__contains__(self, bien):
+            if defecto is InventarioOferta._sin_valor:
+                raise KeyError(bien)
+            return defecto
+        valor = dict.__getitem__(self, bien)
+        del self[bien]
+        return valor
+
+    def popitem(self):
+        bien = next(reversed(self.keys()))
+        return bien, self.pop(bien)
+
+    def clear(self):
+        for bien in list(self.keys()):
+            del self[bien]
+
+    def update(self, *args, **kwargs):
+        for bien, valor in dict(*args, **kwargs).items():
+            self[bien] = valor
+
+    def setdefault(self, bien, defecto=None):
+        if not dict.__contains__(self, bien):
+            self[bien] = defecto
+        return dict.__getitem__(self, bien)
+
+    def desligar(self) -> Dict[str, Any]:
+        """Inventario como diccionario normal, sin avisos al índice"""
+        for valor in self.values():
+            self._soltar(valor)
+        return {bien: list(valor) if isinstance(valor, list) else valor for bien, valor in self.items()}
+
+    def __reduce_ex__(self, protocolo):
+        return dict, (dict(self),)
+
+
+@dataclass
+class OfertaBien:
+    """Empresas que ofrecen un bien y sus existencias agregadas.
+
+    ``oferentes`` y ``con_existencias`` se mantienen en orden de entrada al
+    mercado (el de ``getEmpresas()``): se pueden recorrer sus ``values()``
+    directamente, sin ordenar en cada consulta.
+    """
+    bien: str
+    oferentes: Dict[int, Any] = field(default_factory=dict)  # id(empresa) -> empresa
+    con_existencias: Dict[int, Any] = field(default_factory=dict)
+    stock_total: int = 0
+
+
+class IndiceOferentes:
+    """Índice bien -> empresas oferentes, mantenido incrementalmente"""
+
+    def __init__(self, mercado=None):
+        self.mercado = mercado
+        self.ofertas: Dict[str, OfertaBien] = {}
+        self._orden: Dict[int, int] = {}  # id(empresa) -> orden de registro
+        self._secuencia = count()
+
+    # --- Altas y bajas de empresas ---
+    def registrar(self, empresa):
+        """Añade una empresa y enlaza su inventario; idempotente"""
+        clave = id(empresa)
+        if clave in self._orden:
+            return
+        self._orden[clave] = next(self._secuencia)
+        inventario = getattr(empresa, 'bienes', None)
+        empresa.bienes = InventarioOferta(self, empresa, inventario if isinstance(inventario, dict) else None)
+
+    def retirar(self, empresa):
+        """Quita la empresa de todas las ofertas y devuelve a su inventario a un dict normal"""
+        clave = id(empresa)
+        if self._orden.pop(clave, None) is None:
+            return
+        inventario = getattr(empresa, 'bienes', None)
+        if not isinstance(inventario, InventarioOferta):
+            return
+        for bien, valor in inventario.items():
+            self._quitar(clave, bien, _unidades(valor))
+        empresa.bienes = inventario.desligar()
+
+    def contiene(self, empresa) -> bool:
+        return id(empresa) in self._orden
+
+    # --- Avisos del inventario ---
+    def _oferta(self, bien) -> OfertaBien:
+        oferta = self.ofertas.get(bien)
+        if oferta is None:
+            oferta = self.ofertas[bien] = OfertaBien(bien)
+        return oferta
+
+    def _colocar(self, empresas: Dict[int, Any], empresa):
+        """Añade la empresa manteniendo el orden de entrada al mercado"""
+        clave = id(empresa)
+        if clave in empresas:
+            return
+        ultima = next(reversed(empresas), None)
+        empresas[clave] = empresa
+        if ultima is not None and self._orden.get(ultima, 0) > self._orden.get(clave, 0):
+            # Alta fuera de orden (bien nuevo en una empresa antigua): caso raro, se reordena
+            ordenadas = sorted(empresas.items(), key=lambda par: self._orden.get(par[0], 0))
+            empresas.clear()
+            empresas.update(ordenadas)
+
+    def _alta(self, empresa, bien, unidades: int):
+        oferta = self._oferta(bien)
+        self._colocar(oferta.oferentes, empresa)
+        self._cambio_existencias(empresa, bien, 0, unidades)
+
+    def _baja(self, empresa, bien, unidades: int):
+        self._quitar(id(empresa), bien, unidades)
+
+    def _quitar(self, clave: int, bien, unidades: int):
+        oferta = self.ofertas.get(bien)
+        if oferta is None:
+            return
+        oferta.oferentes.pop(clave, None)
+        oferta.con_existencias.pop(clave, None)
+        oferta.stock_total -= unidades
+
+    def _cambio_existencias(self, empresa, bien, antes: int, despues: int):
+        oferta = self._oferta(bien)
+        oferta.stock_total += despues - antes
+        if despues > 0 and antes <= 0:
+            self._colocar(oferta.con_existencias, empresa)
+        elif despues <= 0 and antes > 0:
+            oferta.con_existencias.pop(id(empresa), None)
+
+    # --- Consultas O(1) por bien ---
+    def num_oferentes(self, bien) -> int:
+        oferta = self.ofertas.get(bien)
+        return len(oferta.oferentes) if oferta else 0
+
+    def num_con_existencias(self, bien) -> int:
+        oferta = self.ofertas.get(bien)
+        return len(oferta.con_existencias) if oferta else 0
+
+    def stock_total(self, bien) -> int:
+        oferta = self.ofertas.get(bien)
+        return oferta.stock_total if oferta else 0
+
+    def oferentes(self, bien) -> List[Any]:
+        """Empresas con el bien en su inventario, en orden de entrada al mercado"""
+        oferta = self.ofertas.get(bien)
+        return list(oferta.oferentes.values()) if oferta else []
+
+    def con_existencias(self, bien) -> List[Any]:
+        """Empresas con al menos una unidad del bien, en orden de entrada al mercado"""
+        oferta = self.ofertas.get(bien)
+        return list(oferta.con_existencias.values()) if oferta else []
+
+
+def indice_de(mercado) -> Optional[IndiceOferentes]:
+    """Índice de oferentes del mercado si está activado"""
+    return getattr(mercado, 'indice_oferentes', None)
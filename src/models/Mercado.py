@@ -4,6 +4,9 @@ import time
 from .EmpresaProductora import EmpresaProductora
 from .MercadoFinanciero import MercadoFinanciero
 from .Consumidor import Consumidor
+from .AlmacenConsumidores import AlmacenConsumidores
+from .IndiceOferentes import IndiceOferentes
+from .AcumuladorMacro import AcumuladorMacro
 from .Empresa import Empresa
 from .Gobierno import Gobierno
 from ..config.ConfigEconomica import ConfigEconomica
@@ -11,7 +14,6 @@ from ..systems.SistemaBancario import SistemaBancario
 from ..systems.SectoresEconomicos import EconomiaMultisectorial
 from ..systems.PsicologiaEconomica import inicializar_perfiles_psicologicos
 from ..systems.SistemaInnovacion import SistemaInnovacion
-from ..systems.AnalyticsML import SistemaAnalyticsML
 from ..systems.ComercioInternacional import Pais, TipoCambio
 from ..systems.CrisisFinanciera import (
     detectar_burbuja_precios,
@@ -27,6 +29,10 @@ from ..utils.EventBus import EventBus
 from ..utils.SimulacionReport import SimulacionReport
 from ..systems.IntegradorEmpresasHiperrealistas import GestorEmpresasHiperrealistas
 from ..systems.CadenaSuministro import GestorCadenaSuministro
+from ..systems.AgregadosBienes import AgregadosBienes
+from ..systems.ComprasLote import MODO_LOTE as MODO_COMPRAS_LOTE, RondaComprasLote, modo_compras
+import logging
+from ..utils.SimuladorLogger import diagnostico, diagnostico_activo
 
 
 class Mercado:
@@ -36,6 +42,8 @@ class Mercado:
         self.contador_consumidores = 0
         self.mercado_financiero = MercadoFinanciero()
         self.transacciones = []
+        # Importe vendido en el ciclo por (empresa, bien), para la concentración por mercado
+        self.ventas_ciclo_actual = {}
         self.gobierno = Gobierno(self)
         
         # Configuración de heterogeneidad de consumidores
@@ -46,6 +54,8 @@ class Mercado:
         self.reporte = SimulacionReport()
         self.order_books = OrderBookManager()
         self.order_book_habilitado = True
+        # Estadísticas por bien compartidas por todas las empresas en el ciclo
+        self.agregados_bienes = AgregadosBienes(self)
 
         # Sistemas avanzados
         self.sistema_bancario = SistemaBancario(self)
@@ -53,7 +63,12 @@ class Mercado:
         self.sistema_innovacion = SistemaInnovacion(self)
         self.mercado_laboral = MercadoLaboral(self)
         self.sistema_psicologia = None  # Se inicializa después
-        self.sistema_analytics = SistemaAnalyticsML(self)
+        # Analytics ML se crea bajo demanda: importa scikit-learn/joblib, que
+        # solo se cargan si el ML está habilitado en la configuración
+        self.analytics_habilitado = True
+        self._sistema_analytics = None
+        # False en perfil headless: los sistemas no escriben a disco
+        self.persistencia_habilitada = True
 
         # NUEVO: Sistema de empresas hiperrealistas
         self.gestor_empresas_hiperrealistas = GestorEmpresasHiperrealistas(self)
@@ -62,6 +77,11 @@ class Mercado:
 
         # NUEVO: Sistema de optimización de rendimiento
         self.config_performance = None  # Se inicializa en configuración
+        self.almacen_consumidores = None  # Columnas de consumidores (opcional)
+        self.indice_oferentes = None  # Índice bien -> empresas oferentes (opcional)
+        self.acumulador_macro = None  # Agregados macro actualizados por eventos (opcional)
+        self.compras_en_lote = False  # True durante la ronda de agentes en modo por lotes
+        self.canal_metricas = None  # Destino de las métricas por ciclo (streaming de la API)
         self.vectorizador = None
         self.reporter_rendimiento = None
         self.tiempos_ciclo = []
@@ -102,6 +122,18 @@ class Mercado:
         for bien in self.bienes:
             self.precios_historicos[bien] = []
 
+    @property
+    def sistema_analytics(self):
+        """Sistema de Analytics ML, instanciado en el primer acceso."""
+        if self._sistema_analytics is None:
+            from ..systems.AnalyticsML import SistemaAnalyticsML
+            self._sistema_analytics = SistemaAnalyticsML(self)
+        return self._sistema_analytics
+
+    @sistema_analytics.setter
+    def sistema_analytics(self, valor):
+        self._sistema_analytics = valor
+
     # --- ORDER BOOK API ---
     def enviar_orden(self, side: str, bien: str, price: float, qty: int, agente_nombre: str):
         """Publica una orden al libro y emite evento."""
@@ -171,11 +203,54 @@ class Mercado:
                 self.event_bus.publish('trade', bien=bien, price=price, qty=qty,
                                        buyer=buyer.nombre, seller=seller.nombre, ciclo=self.ciclo_actual)
                 self.registrar_transaccion(buyer, bien, qty, costo_total, self.ciclo_actual)
+                self.registrar_venta(seller, bien, costo_total)
 
     def agregar_persona(self, persona):
         self.personas.append(persona)
         if isinstance(persona, Consumidor):
             self.contador_consumidores += 1
+            if self.almacen_consumidores is not None:
+                self.almacen_consumidores.adjuntar(persona)
+            if self.acumulador_macro is not None:
+                self.acumulador_macro.registrar(persona)
+        elif isinstance(persona, Empresa) and self.indice_oferentes is not None:
+            self.indice_oferentes.registrar(persona)
+
+    def retirar_persona(self, persona):
+        """Saca a una persona del mercado (quiebra, absorción...) y de los índices"""
+        if persona in self.personas:
+            self.personas.remove(persona)
+        if isinstance(persona, Consumidor):
+            if self.acumulador_macro is not None:
+                self.acumulador_macro.retirar(persona)
+            if self.almacen_consumidores is not None:
+                self.almacen_consumidores.liberar(persona)
+        elif isinstance(persona, Empresa) and self.indice_oferentes is not None:
+            self.indice_oferentes.retirar(persona)
+
+    def activar_indice_oferentes(self):
+        """Indexa por bien a las empresas actuales; las siguientes entran con agregar_persona"""
+        if self.indice_oferentes is None:
+            self.indice_oferentes = IndiceOferentes(self)
+            for empresa in self.getEmpresas():
+                self.indice_oferentes.registrar(empresa)
+        return self.indice_oferentes
+
+    def activar_acumulador_macro(self):
+        """Cuenta población, empleo y transacciones ya registradas; después se actualiza por eventos"""
+        if self.acumulador_macro is None:
+            self.acumulador_macro = AcumuladorMacro(self)
+            self.acumulador_macro.registrar_todos(self.getConsumidores())
+            self.acumulador_macro.registrar_transacciones(self.transacciones)
+        return self.acumulador_macro
+
+    def activar_almacen_consumidores(self):
+        """Pasa los campos calientes de los consumidores a columnas NumPy"""
+        if self.almacen_consumidores is None:
+            consumidores = self.getConsumidores()
+            self.almacen_consumidores = AlmacenConsumidores(capacidad=2 * len(consumidores))
+            self.almacen_consumidores.adjuntar_todos(consumidores)
+        return self.almacen_consumidores
 
     def inicializar_sistema_rendimiento(self, config_performance=None):
         """Inicializa el sistema de optimización de rendimiento"""
@@ -190,23 +265,35 @@ class Mercado:
             usar_paralelismo = self.config_performance.get('activar_paralelismo', False)
             num_workers = self.config_performance.get('num_workers_paralelos', None)
             
+            if self.config_performance.get('almacen_columnar_consumidores', False):
+                self.activar_almacen_consumidores()
+                diagnostico("✅ Almacén columnar de consumidores activado")
+
+            if self.config_performance.get('indice_oferentes', False):
+                self.activar_indice_oferentes()
+                diagnostico("✅ Índice de oferentes por bien activado")
+
+            if self.config_performance.get('acumulador_macro', False):
+                self.activar_acumulador_macro()
+                diagnostico("✅ Acumulador de indicadores macro activado")
+
             if self.config_performance.get('activar_vectorizacion', True):
                 self.vectorizador = get_vectorizador(usar_paralelismo, num_workers)
-                print("✅ Sistema de vectorización iniciado")
+                diagnostico("✅ Sistema de vectorización iniciado")
             
             # Configurar reporter de rendimiento
             if self.config_performance.get('activar_reportes_rendimiento', True):
                 self.reporter_rendimiento = ReporterRendimiento()
                 set_reporter_global(self.reporter_rendimiento)
-                print("✅ Sistema de reportes de rendimiento iniciado")
+                diagnostico("✅ Sistema de reportes de rendimiento iniciado")
             
             return True
             
         except ImportError as e:
-            print(f"⚠️  No se pudo inicializar sistema de rendimiento: {e}")
+            diagnostico("⚠️  No se pudo inicializar sistema de rendimiento: %s", e, nivel=logging.WARNING)
             return False
         except Exception as e:
-            print(f"❌ Error inicializando sistema de rendimiento: {e}")
+            diagnostico("❌ Error inicializando sistema de rendimiento: %s", e, nivel=logging.WARNING)
             return False
 
     def agregar_pais(self, pais, mercado_nacional=None):
@@ -276,7 +363,7 @@ class Mercado:
                 self.indice_anterior = indice
                 return indice
             except Exception as e:
-                print(f"⚠️  Error en cálculo optimizado de índice precios: {e}")
+                diagnostico("⚠️  Error en cálculo optimizado de índice precios: %s", e, nivel=logging.WARNING)
                 # Continuar con método tradicional
         
         # Método tradicional (fallback)
@@ -487,7 +574,7 @@ class Mercado:
         for consumidor in candidatos[:cantidad]:
             if consumidor.empleado:
                 consumidor.perder_empleo()
-            self.personas.remove(consumidor)
+            self.retirar_persona(consumidor)
 
     def actualizar_demografia(self):
         """Actualiza la demografía del mercado"""
@@ -497,6 +584,20 @@ class Mercado:
         self.retirar_consumidores()
 
     def registrar_estadisticas(self):
+        """Registra estadísticas del ciclo actual y las publica en ``canal_metricas``"""
+        self._registrar_estadisticas_ciclo()
+        if self.canal_metricas is not None:
+            self._publicar_metricas()
+
+    def _publicar_metricas(self):
+        """Envía los indicadores del ciclo al canal sin bloquear la simulación"""
+        try:
+            from ..utils.CanalMetricas import metricas_ciclo
+            self.canal_metricas.publicar(metricas_ciclo(self))
+        except Exception as e:
+            diagnostico("⚠️  Error publicando métricas del ciclo: %s", e, nivel=logging.WARNING)
+
+    def _registrar_estadisticas_ciclo(self):
         """Registra estadísticas del ciclo actual con cálculo de PIB mejorado"""
         # Usar cálculo optimizado de PIB si está disponible
         if (self.vectorizador and 
@@ -515,7 +616,7 @@ class Mercado:
                 self.pib_historico.append(pib_ciclo)
                 
             except Exception as e:
-                print(f"⚠️  Error en cálculo optimizado PIB: {e}")
+                diagnostico("⚠️  Error en cálculo optimizado PIB: %s", e, nivel=logging.WARNING)
                 # Continuar con método tradicional
                 self._registrar_estadisticas_tradicional()
                 return
@@ -544,9 +645,12 @@ class Mercado:
             self.precios_historicos[bien].append(precio_promedio)
 
         # Volumen de transacciones
-        transacciones_ciclo = len(
-            [t for t in self.transacciones if t.get('ciclo') == self.ciclo_actual])
-        self.volumen_transacciones.append(transacciones_ciclo)
+        self.volumen_transacciones.append(self._num_transacciones_ciclo())
+
+    def _num_transacciones_ciclo(self):
+        if self.acumulador_macro is not None:
+            return self.acumulador_macro.num_transacciones_ciclo(self.ciclo_actual)
+        return len([t for t in self.transacciones if t.get('ciclo') == self.ciclo_actual])
 
     def _registrar_estadisticas_tradicional(self):
         """Método tradicional de registro de estadísticas (fallback)"""
@@ -662,9 +766,7 @@ class Mercado:
             self.precios_historicos[bien].append(precio_promedio)
 
         # Volumen de transacciones
-        transacciones_ciclo = len(
-            [t for t in self.transacciones if t.get('ciclo') == self.ciclo_actual])
-        self.volumen_transacciones.append(transacciones_ciclo)
+        self.volumen_transacciones.append(self._num_transacciones_ciclo())
 
     def calcular_pib_total(self):
         """Calcula y retorna el PIB total actual"""
@@ -680,6 +782,9 @@ class Mercado:
 
         # Inicializar contadores del ciclo actual
         self.volumen_ciclo_actual = 0
+        self.ventas_ciclo_actual = {}
+        if self.acumulador_macro is not None:
+            self.acumulador_macro.iniciar_ciclo()
         if not hasattr(self, 'transacciones_ciclo_actual'):
             self.transacciones_ciclo_actual = []
         else:
@@ -701,14 +806,16 @@ class Mercado:
             try:
                 self.cadena_suministro.inicializar_red()
             except Exception as e:
-                print(f"Advertencia: no se pudo inicializar cadena de suministro: {e}")
+                diagnostico("Advertencia: no se pudo inicializar cadena de suministro: %s", e,
+                            nivel=logging.WARNING)
             self.sistemas_inicializados = True
 
         # 3. Ciclos de sistemas avanzados
         self.sistema_bancario.ciclo_bancario()
         self.economia_sectorial.ciclo_economico_sectorial()
         self.sistema_innovacion.ciclo_innovacion()
-        self.sistema_analytics.ciclo_analytics()
+        if self.analytics_habilitado:
+            self.sistema_analytics.ciclo_analytics()
         if self.sistema_psicologia:
             self.sistema_psicologia.ciclo_psicologia_economica()
             
@@ -718,7 +825,7 @@ class Mercado:
         try:
             self.cadena_suministro.ciclo_cadena()
         except Exception as e:
-            print(f"Advertencia: error en cadena de suministro: {e}")
+            diagnostico("Advertencia: error en cadena de suministro: %s", e, nivel=logging.WARNING)
 
         # 4. Ciclo del gobierno (políticas, impuestos, regulación)
         indicadores_gobierno = self.gobierno.ciclo_gobierno(ciclo)
@@ -745,7 +852,7 @@ class Mercado:
         if self.crisis_financiera_activa and evaluar_recuperacion_crisis(self):
             self.crisis_financiera_activa = False
             self.ciclos_en_crisis = 0
-            print("🎉 CRISIS FINANCIERA RESUELTA - Economía en recuperación")
+            diagnostico("🎉 CRISIS FINANCIERA RESUELTA - Economía en recuperación")
 
         # 5. Actualizar competencia
         self.actualizar_nivel_competencia()
@@ -757,6 +864,10 @@ class Mercado:
         ciclo_estimulo_economico(self)
 
         # 7. Ciclos individuales de cada persona (generan órdenes y decisiones)
+        self.agregados_bienes.recalcular(ciclo)
+        # En modo por lotes las compras de consumidores se resuelven al final en
+        # bloque, directamente contra los inventarios (sin pujas al order book)
+        self.compras_en_lote = modo_compras(self) == MODO_COMPRAS_LOTE
         personas_ordenadas = self.personas[:]
         random.shuffle(personas_ordenadas)  # Orden aleatorio para fairness
 
@@ -764,8 +875,8 @@ class Mercado:
             try:
                 persona.ciclo_persona(ciclo, self)
             except ZeroDivisionError as e:
-                print(
-                    f"Error en ciclo de {getattr(persona, 'nombre', 'Persona desconocida')}: float division by zero - {e}")
+                diagnostico("Error en ciclo de %s: float division by zero - %s",
+                            getattr(persona, 'nombre', 'Persona desconocida'), e, nivel=logging.WARNING)
                 # Intentar corregir automáticamente algunos errores comunes
                 if hasattr(persona, 'precios'):
                     for bien, precio in persona.precios.items():
@@ -775,8 +886,12 @@ class Mercado:
                 if hasattr(persona, 'acciones_emitidas') and persona.acciones_emitidas <= 0:
                     persona.acciones_emitidas = 1  # Evitar división por cero en acciones
             except Exception as e:
-                print(
-                    f"Error en ciclo de {getattr(persona, 'nombre', 'Persona desconocida')}: {e}")
+                diagnostico("Error en ciclo de %s: %s", getattr(persona, 'nombre', 'Persona desconocida'), e,
+                            nivel=logging.WARNING)
+
+        if self.compras_en_lote:
+            self.compras_en_lote = False
+            self._ronda_compras_lote(ciclo)
 
         # 7.5. Matching del order book y liquidación de trades
         if self.order_book_habilitado:
@@ -791,22 +906,21 @@ class Mercado:
 
     def imprimir_resumen_economico(self):
         """Imprime un resumen del estado económico"""
+        if not diagnostico_activo():
+            return
         pib_actual = self.pib_historico[-1] if self.pib_historico else 0
         inflacion_actual = self.inflacion_historica[-1] if self.inflacion_historica else 0
         desempleo_actual = self.desempleo_historico[-1] if self.desempleo_historico else 0
 
-        print(f"\n--- RESUMEN ECONÓMICO (Ciclo {self.ciclo_actual}) ---")
-        print(f"PIB: ${pib_actual:,.2f}")
-        print(f"Inflación: {inflacion_actual:.2%}")
-        print(f"Desempleo: {desempleo_actual:.2%}")
-        print(f"Fase económica: {self.fase_ciclo_economico}")
-        print(f"Empresas activas: {len(self.getEmpresas())}")
-        print(f"Consumidores: {len(self.getConsumidores())}")
+        avisos = ''
         if self.shock_economico_activo:
-            print("⚠️  SHOCK ECONÓMICO ACTIVO")
+            avisos += "\n⚠️  SHOCK ECONÓMICO ACTIVO"
         if self.crisis_financiera_activa:
-            print("⚠️  CRISIS FINANCIERA ACTIVA")
-        print("-" * 50)
+            avisos += "\n⚠️  CRISIS FINANCIERA ACTIVA"
+        diagnostico("--- RESUMEN ECONÓMICO (Ciclo %s) ---\nPIB: $%.2f\nInflación: %.2f%%\n"
+                    "Desempleo: %.2f%%\nFase económica: %s\nEmpresas activas: %d\nConsumidores: %d%s",
+                    self.ciclo_actual, pib_actual, inflacion_actual * 100, desempleo_actual * 100,
+                    self.fase_ciclo_economico, len(self.getEmpresas()), len(self.getConsumidores()), avisos)
 
     def obtener_estadisticas_completas(self):
         """Retorna estadísticas completas del mercado incluyendo sistemas avanzados"""
@@ -827,7 +941,10 @@ class Mercado:
         stats_base['sectores_economicos'] = self.economia_sectorial.obtener_estadisticas_sectoriales()
         stats_base['estructura_economica'] = self.economia_sectorial.obtener_resumen_estructural()
         stats_base['innovacion'] = self.sistema_innovacion.obtener_estadisticas_innovacion()
-        stats_base['analytics_ml'] = self.sistema_analytics.obtener_estadisticas_analytics()
+        if self.analytics_habilitado or self._sistema_analytics is not None:
+            stats_base['analytics_ml'] = self.sistema_analytics.obtener_estadisticas_analytics()
+        else:
+            stats_base['analytics_ml'] = {}
         
         # NUEVO: Estadísticas del sistema hiperrealista
         stats_base['empresas_hiperrealistas'] = self.gestor_empresas_hiperrealistas.obtener_estadisticas_sistema()
@@ -863,7 +980,7 @@ class Mercado:
         
         # Remover empresas en quiebra
         for empresa in empresas_en_quiebra:
-            self.personas.remove(empresa)
+            self.retirar_persona(empresa)
             logging.info(f"Empresa {empresa.nombre} removida del mercado por quiebra")
         
         # Entrada de nuevas empresas (proceso Poisson)
@@ -903,7 +1020,7 @@ class Mercado:
         nueva_empresa.es_entrante = True
         nueva_empresa.ciclo_entrada = ciclo
         
-        self.personas.append(nueva_empresa)
+        self.agregar_persona(nueva_empresa)
         logging.info(f"Nueva empresa {nuevo_nombre} entra al mercado con capital ${nueva_empresa.dinero:.2f}")
 
     def calcular_kpis_empresariales(self, ciclo):
@@ -988,6 +1105,8 @@ class Mercado:
             'ciclo': ciclo
         }
         self.transacciones.append(transaccion)
+        if self.acumulador_macro is not None:
+            self.acumulador_macro.registrar_transaccion(ciclo, costo_total)
         # Evento centralizado
         self.event_bus.publish('transaccion', **transaccion)
 
@@ -1001,5 +1120,51 @@ class Mercado:
             self.transacciones_ciclo_actual.append(transaccion)
             self.volumen_ciclo_actual += costo_total
 
+    def _ronda_compras_lote(self, ciclo):
+        """Compras de todos los consumidores resueltas como una sola ronda"""
+        consumidores = self.getConsumidores()
+        ronda = RondaComprasLote(self)
+        try:
+            plan = ronda.planificar(consumidores, ciclo)
+        except Exception as e:
+            diagnostico("⚠️  Error en ronda de compras por lotes: %s", e, nivel=logging.WARNING)
+            # Nada se ha comprado aún: continuar con método tradicional
+            for consumidor in consumidores:
+                consumidor.ciclo_compras(ciclo, self)
+            return
+        if plan is None:
+            return
+        try:
+            ronda.aplicar(plan)
+        except Exception as e:
+            # Parte de las compras ya está escrita: repetirlas por agente duplicaría gasto y stock
+            diagnostico("⚠️  Error aplicando la ronda de compras por lotes (no se repite): %s", e,
+                        nivel=logging.WARNING)
+
+    def registrar_venta(self, empresa, nombre_bien, importe):
+        """Acumula lo vendido por una empresa en el ciclo (matriz de ventas empresa × bien)"""
+        clave = (empresa.nombre, nombre_bien)
+        self.ventas_ciclo_actual[clave] = self.ventas_ciclo_actual.get(clave, 0.0) + importe
+        if self.acumulador_macro is not None:
+            self.acumulador_macro.registrar_venta(empresa, importe)
+
+    def registrar_transacciones_lote(self, transacciones):
+        """Registra de una vez las transacciones de una ronda de compras por lotes"""
+        if not transacciones:
+            return
+        self.transacciones.extend(transacciones)
+        if self.acumulador_macro is not None:
+            self.acumulador_macro.registrar_transacciones(transacciones)
+        self.event_bus.publish_lote('transaccion', transacciones)
+
+        if not hasattr(self, 'transacciones_ciclo_actual'):
+            self.transacciones_ciclo_actual = []
+        if not hasattr(self, 'volumen_ciclo_actual'):
+            self.volumen_ciclo_actual = 0
+
+        del_ciclo = [t for t in transacciones if t['ciclo'] == self.ciclo_actual]
+        self.transacciones_ciclo_actual.extend(del_ciclo)
+        self.volumen_ciclo_actual += sum(t['costo_total'] for t in del_ciclo)
+
     def getRegistroTransacciones(self):
         return self.transacciones
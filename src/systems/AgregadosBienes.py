@@ -0,0 +1,119 @@
+"""
+Agregados de mercado por bien
+=============================
+
+Estadísticas por bien (precios mínimo/medio/máximo, vendedores, stock total
+y unidades vendidas el ciclo anterior), más el número de consumidores y el
+ingreso medio de los empleados, calculadas una sola vez por ciclo y leídas
+en O(1) por cada empresa, en lugar de que cada empresa recorra a todas sus
+rivales y a todos los consumidores al estimar demanda o ajustar precios.
+"""
+
+from dataclasses import dataclass, field
+from typing import Dict, Optional, Set
+
+
+@dataclass
+class EstadisticasBien:
+    """Foto del mercado de un bien al inicio de la ronda de agentes"""
+    bien: str
+    precio_min: float = 0.0
+    precio_medio: float = 0.0
+    precio_max: float = 0.0
+    num_vendedores: int = 0
+    stock_total: int = 0
+    vendidas_ultimo_ciclo: float = 0.0
+    suma_precios: float = 0.0
+    vendedores: Set[str] = field(default_factory=set)
+    precios_vendedores: Dict[str, float] = field(default_factory=dict)  # solo precios > 0
+
+    def num_competidores(self, empresa) -> int:
+        """Vendedores del bien distintos de ``empresa``"""
+        return self.num_vendedores - (1 if empresa.nombre in self.vendedores else 0)
+
+    def precio_medio_competencia(self, empresa) -> Optional[float]:
+        """Precio medio (> 0) de los competidores de ``empresa``; None si no hay"""
+        suma = self.suma_precios
+        cantidad = len(self.precios_vendedores)
+        propio = self.precios_vendedores.get(empresa.nombre)
+        if propio is not None:
+            suma -= propio
+            cantidad -= 1
+        return suma / cantidad if cantidad > 0 else None
+
+
+class AgregadosBienes:
+    """Servicio de agregados por bien con validez de un ciclo"""
+
+    def __init__(self, mercado):
+        self.mercado = mercado
+        self.ciclo = None
+        self.estadisticas: Dict[str, EstadisticasBien] = {}
+        # Agregados de demanda comunes a todos los bienes
+        self.num_consumidores = 0
+        self.ingreso_promedio_empleados = None
+
+    def recalcular(self, ciclo=None):
+        """Recorre empresas y transacciones recientes una vez y rehace los agregados"""
+        mercado = self.mercado
+        ciclo = mercado.ciclo_actual if ciclo is None else ciclo
+        estadisticas = {}
+
+        for empresa in mercado.getEmpresas():
+            inventario = getattr(empresa, 'bienes', None)
+            if not isinstance(inventario, dict):
+                continue
+            precios = getattr(empresa, 'precios', {}) or {}
+            for bien, unidades in inventario.items():
+                est = estadisticas.get(bien)
+                if est is None:
+                    est = estadisticas[bien] = EstadisticasBien(bien)
+                est.num_vendedores += 1
+                est.vendedores.add(empresa.nombre)
+                est.stock_total += len(unidades) if isinstance(unidades, list) else 0
+                precio = precios.get(bien, 0)
+                if precio > 0:
+                    est.precios_vendedores[empresa.nombre] = precio
+                    est.suma_precios += precio
+                    if est.precio_min == 0.0 or precio < est.precio_min:
+                        est.precio_min = precio
+                    est.precio_max = max(est.precio_max, precio)
+
+        # Unidades vendidas en el ciclo anterior: las transacciones se agregan
+        # en orden, así que basta recorrer la cola del historial
+        ciclo_anterior = ciclo - 1
+        for transaccion in reversed(mercado.transacciones):
+            ciclo_t = transaccion.get('ciclo', 0)
+            if ciclo_t < ciclo_anterior:
+                break
+            if ciclo_t == ciclo_anterior:
+                est = estadisticas.get(transaccion.get('bien'))
+                if est is not None:
+                    est.vendidas_ultimo_ciclo += transaccion.get('cantidad', 0)
+
+        consumidores = mercado.getConsumidores()
+        ingresos = [c.ingreso_mensual for c in consumidores if c.empleado]
+        self.num_consumidores = len(consumidores)
+        self.ingreso_promedio_empleados = sum(ingresos) / len(ingresos) if ingresos else None
+
+        for est in estadisticas.values():
+            if est.precios_vendedores:
+                est.precio_medio = est.suma_precios / len(est.precios_vendedores)
+
+        self.estadisticas = estadisticas
+        self.ciclo = ciclo
+        return estadisticas
+
+    def vigentes(self):
+        """Recalcula si los agregados no corresponden al ciclo actual del mercado"""
+        if self.ciclo != self.mercado.ciclo_actual:
+            self.recalcular()
+        return self
+
+    def obtener(self, bien) -> Optional[EstadisticasBien]:
+        """Estadísticas del bien para el ciclo actual"""
+        return self.vigentes().estadisticas.get(bien)
+
+    def invalidar(self):
+        """Fuerza el recálculo en la próxima lectura"""
+        self.ciclo = None
@@ -19,6 +19,8 @@ from sklearn.model_selection import TimeSeriesSplit
 from sklearn.ensemble import HistGradientBoostingRegressor
 from joblib import dump, load
 import warnings
+from ..utils.SimuladorLogger import diagnostico
+import logging
 warnings.filterwarnings('ignore')
 from src.config.ConfiguradorSimulacion import configurador
 from src.utils.SimuladorLogger import get_simulador_logger
@@ -132,8 +134,8 @@ class PredictorDemanda:
 
         except Exception as e:
             # Si falla todo, usar método sintético puro que siempre funciona
-            print(
-                f"Entrenamiento híbrido falló para {bien}, usando sintético puro: {e}")
+            diagnostico("Entrenamiento híbrido falló para %s, usando sintético puro: %s", bien, e,
+                        componente='ML', nivel=logging.WARNING)
             return self._generar_datos_sinteticos_y_entrenar(mercado, bien, self.num_datos_sinteticos)
 
     def _generar_datos_sinteticos_y_entrenar(self, mercado, bien, num_puntos=20):
@@ -667,8 +669,8 @@ class SistemaAnalyticsML:
             clusters = self.clusterizador.clusterizar_consumidores(self.mercado)
             self.analisis_clusters = self.clusterizador.analizar_clusters(clusters)
 
-        # Guardado automático de modelos
-        if self.save_every_cycles > 0:
+        # Guardado automático de modelos (desactivado en perfil headless)
+        if self.save_every_cycles > 0 and self._persistencia_habilitada():
             debe_guardar = (self.ciclo_analisis % self.save_every_cycles == 0) or ejecutar_por_regimen
             if debe_guardar and self.ciclo_analisis != self._ultimo_guardado_ciclo:
                 resumen = self.guardar_modelos('results/ml_models')
@@ -766,6 +768,10 @@ class SistemaAnalyticsML:
         return stats
 
     # --- Persistencia a nivel sistema ---
+    def _persistencia_habilitada(self) -> bool:
+        """False cuando el mercado corre en perfil headless (sin escrituras a disco)"""
+        return getattr(self.mercado, 'persistencia_habilitada', True)
+
     def guardar_modelos(self, base_dir: str = 'results/ml_models') -> dict:
         """Guarda todos los modelos de predicción entrenados"""
         os.makedirs(base_dir, exist_ok=True)
@@ -809,7 +815,6 @@ class SistemaAnalyticsML:
     # --- Tracking simple de experimentos ---
     def registrar_experimento(self, nombre: str = 'default', detalles: dict | None = None, base_dir: str = 'results/ml_runs') -> str:
         """Registra un experimento simple con métricas básicas"""
-        os.makedirs(base_dir, exist_ok=True)
         run_id = f"{int(time.time())}"
         registro = {
             'id': run_id,
@@ -819,6 +824,10 @@ class SistemaAnalyticsML:
             'detalles': detalles or {}
         }
         self.experimentos.append(registro)
+        if not self._persistencia_habilitada():
+            # Perfil headless: el registro queda solo en memoria
+            return ''
+        os.makedirs(base_dir, exist_ok=True)
         ruta = os.path.join(base_dir, f"experimento_{run_id}.json")
         try:
             with open(ruta, 'w', encoding='utf-8') as f:
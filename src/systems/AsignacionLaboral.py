@@ -0,0 +1,131 @@
+"""
+Asignación laboral por lotes
+============================
+
+Alternativa al emparejamiento secuencial de ``EnhancedLaborMarket`` y
+``MercadoLaboral``: se construye una matriz dispersa trabajador × vacante
+con las mejores candidaturas de cada trabajador y se resuelve la asignación
+de una sola vez por ciclo con una pasada voraz sobre las puntuaciones
+ordenadas. El resultado no depende del orden en que se recorren los agentes
+y, con la misma semilla, produce los mismos emparejamientos.
+
+El modo se elige con ``"performance": {"emparejamiento_laboral": "lote"}``
+(por defecto ``"secuencial"``).
+"""
+
+from dataclasses import dataclass
+from typing import Callable, List, Optional, Tuple
+
+import numpy as np
+
+MODO_SECUENCIAL = 'secuencial'
+MODO_LOTE = 'lote'
+
+# Peso del excedente salarial (oferta sobre salario de reserva) en la puntuación
+PESO_SALARIO = 0.1
+
+# Elementos por bloque al evaluar la matriz densa (acota la memoria temporal)
+ELEMENTOS_POR_BLOQUE = 2_000_000
+
+
+def modo_emparejamiento(mercado) -> str:
+    """Modo de emparejamiento laboral configurado para el mercado"""
+    config_performance = getattr(mercado, 'config_performance', None) or {}
+    return config_performance.get('emparejamiento_laboral', MODO_SECUENCIAL)
+
+
+def puntuacion_con_salario(ajuste: np.ndarray, salarios_ofrecidos: np.ndarray,
+                           salarios_reserva: np.ndarray) -> np.ndarray:
+    """Ajuste de habilidades premiado por el excedente salarial relativo (0-100%)"""
+    reserva = np.maximum(salarios_reserva, 1.0)
+    excedente = np.clip((salarios_ofrecidos - salarios_reserva) / reserva, 0.0, 1.0)
+    return ajuste * (1.0 + PESO_SALARIO * excedente)
+
+
+@dataclass
+class MatrizPuntuaciones:
+    """Candidaturas trabajador × vacante en formato de tripletas (COO)"""
+    filas: np.ndarray
+    columnas: np.ndarray
+    ajuste: np.ndarray       # Probabilidad/nivel de ajuste de la candidatura
+    puntuacion: np.ndarray   # Criterio de orden de la asignación
+    forma: Tuple[int, int]
+
+    @classmethod
+    def por_bloques(cls, num_filas: int, num_columnas: int,
+                    evaluar_bloque: Callable[[int, int], Tuple[np.ndarray, np.ndarray]],
+                    max_candidatos: int) -> 'MatrizPuntuaciones':
+        """Conserva las ``max_candidatos`` mejores columnas factibles de cada fila.
+
+        ``evaluar_bloque(inicio, fin)`` devuelve ``(ajuste, puntuacion)`` densos
+        para las filas ``[inicio, fin)``; las celdas no factibles llevan
+        puntuación ``-inf``.
+        """
+        filas, columnas, ajustes, puntuaciones = [], [], [], []
+        if num_filas and num_columnas and max_candidatos > 0:
+            tamano_bloque = max(1, ELEMENTOS_POR_BLOQUE // num_columnas)
+            k = min(max_candidatos, num_columnas)
+            for inicio in range(0, num_filas, tamano_bloque):
+                fin = min(num_filas, inicio + tamano_bloque)
+                ajuste, puntuacion = evaluar_bloque(inicio, fin)
+                if k < num_columnas:
+                    mejores = np.argpartition(-puntuacion, k - 1, axis=1)[:, :k]
+                else:
+                    mejores = np.broadcast_to(np.arange(num_columnas), (fin - inicio, num_columnas))
+                filas_bloque = np.repeat(np.arange(inicio, fin), mejores.shape[1])
+                columnas_bloque = mejores.ravel()
+                locales = filas_bloque - inicio
+                puntuacion_bloque = puntuacion[locales, columnas_bloque]
+                factibles = np.isfinite(puntuacion_bloque)
+                filas.append(filas_bloque[factibles])
+                columnas.append(columnas_bloque[factibles])
+                ajustes.append(ajuste[locales, columnas_bloque][factibles])
+                puntuaciones.append(puntuacion_bloque[factibles])
+
+        def concatenar(partes, tipo):
+            return np.concatenate(partes) if partes else np.zeros(0, dtype=tipo)
+
+        return cls(concatenar(filas, np.int64), concatenar(columnas, np.int64),
+                   concatenar(ajustes, float), concatenar(puntuaciones, float),
+                   (num_filas, num_columnas))
+
+    def __len__(self):
+        return len(self.filas)
+
+    def filtrar(self, mascara: np.ndarray) -> 'MatrizPuntuaciones':
+        """Subconjunto de candidaturas (p. ej. las que superan las fricciones)"""
+        return MatrizPuntuaciones(self.filas[mascara], self.columnas[mascara],
+                                  self.ajuste[mascara], self.puntuacion[mascara], self.forma)
+
+    def a_csr(self):
+        """Matriz ``scipy.sparse`` de puntuaciones (requiere SciPy)"""
+        from scipy.sparse import csr_matrix
+        return csr_matrix((self.puntuacion, (self.filas, self.columnas)), shape=self.forma)
+
+
+def asignar_voraz(matriz: MatrizPuntuaciones, capacidades: Optional[np.ndarray] = None,
+                  max_asignaciones: Optional[int] = None) -> List[Tuple[int, int]]:
+    """Asignación voraz: recorre las candidaturas de mayor a menor puntuación.
+
+    Cada fila se asigna a lo sumo una vez y cada columna hasta su capacidad
+    (1 por defecto). Los empates se resuelven por índice de fila y luego de
+    columna, así que el resultado es determinista.
+    """
+    if len(matriz) == 0:
+        return []
+    orden = np.lexsort((matriz.columnas, matriz.filas, -matriz.puntuacion))
+    restantes = (np.ones(matriz.forma[1], dtype=np.int64) if capacidades is None
+                 else np.asarray(capacidades, dtype=np.int64).copy())
+    asignada = np.zeros(matriz.forma[0], dtype=bool)
+    limite = len(orden) if max_asignaciones is None else max_asignaciones
+
+    asignaciones = []
+    for fila, columna in zip(matriz.filas[orden].tolist(), matriz.columnas[orden].tolist()):
+        if len(asignaciones) >= limite:
+            break
+        if asignada[fila] or restantes[columna] <= 0:
+            continue
+        asignada[fila] = True
+        restantes[columna] -= 1
+        asignaciones.append((fila, columna))
+    return asignaciones
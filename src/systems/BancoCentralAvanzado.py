@@ -227,36 +227,6 @@ class BancoCentralAvanzado:
         
         return estado
     
-    def _calcular_crecimiento_pib(self) -> float:
-        """Calcula tasa de crecimiento del PIB"""
-        if hasattr(self.mercado, 'pib_historico') and len(self.mercado.pib_historico) >= 2:
-            pib_actual = self.mercado.pib_historico[-1]
-            pib_anterior = self.mercado.pib_historico[-2]
-            if pib_anterior > 0:
-                return (pib_actual - pib_anterior) / pib_anterior
-        return 0.02  # 2% default
-    
-    def _estimar_stock_capital(self) -> float:
-        """Estima el stock de capital total de la economía"""
-        if hasattr(self.mercado, 'empresas'):
-            capital_total = sum(getattr(emp, 'capital', 0) for emp in self.mercado.empresas)
-            return max(capital_total, 1.0)
-        return 1000000  # Default
-    
-    def _estimar_empleo_total(self) -> float:
-        """Estima el empleo total de la economía"""
-        if hasattr(self.mercado, 'consumidores'):
-            empleados = sum(1 for cons in self.mercado.getConsumidores() 
-                          if getattr(cons, 'empleado', False))
-            return max(empleados / len(self.mercado.getConsumidores()), 0.01)
-        return 0.95  # 95% empleo default
-    
-    def _obtener_pib_actual(self) -> float:
-        """Obtiene PIB actual"""
-        if hasattr(self.mercado, 'pib_historico') and self.mercado.pib_historico:
-            return self.mercado.pib_historico[-1]
-        return 1000000  # Default
-        
     def _calcular_regla_taylor(self) -> float:
         """
         Calcula la tasa de interés usando la Regla de Taylor:
@@ -326,6 +296,12 @@ class BancoCentralAvanzado:
                 self.pib_potencial_estimado = self.mercado.pib_historico[0] if self.mercado.pib_historico else 100000
                 return
             
+            acumulador = getattr(self.mercado, 'acumulador_macro', None)
+            if acumulador is not None:
+                # Tendencia con sumas acumuladas: solo se incorporan los ciclos nuevos
+                self.pib_potencial_estimado = acumulador.pib_potencial()
+                return
+
             # Usar regresión simple para estimar tendencia
             n = len(self.mercado.pib_historico)
             x_sum = sum(range(n))
@@ -510,6 +486,11 @@ class BancoCentralAvanzado:
         """Calcula la volatilidad del crecimiento del PIB"""
         if len(self.mercado.pib_historico) < 5:
             return 0.1
+
+        acumulador = getattr(self.mercado, 'acumulador_macro', None)
+        if acumulador is not None:
+            volatilidad = acumulador.volatilidad_crecimiento()
+            return 0.1 if volatilidad is None else volatilidad
             
         crecimientos = []
         for i in range(1, len(self.mercado.pib_historico)):
@@ -593,6 +574,9 @@ class BancoCentralAvanzado:
     def _estimar_empleo_total(self) -> float:
         """Estima el empleo total de la economía"""
         if hasattr(self.mercado, 'consumidores'):
+            acumulador = getattr(self.mercado, 'acumulador_macro', None)
+            if acumulador is not None and acumulador.poblacion > 0:
+                return max(acumulador.tasa_empleo(), 0.01)
             empleados = sum(1 for cons in self.mercado.getConsumidores() 
                           if getattr(cons, 'empleado', False))
             total_consumidores = len(self.mercado.getConsumidores())
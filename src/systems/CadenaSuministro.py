@@ -4,7 +4,8 @@ Gestor de Cadena de Suministro (B2B) entre empresas
 
 Este módulo implementa una capa simple de cadena de suministro inter-empresas:
 - Define insumos requeridos por empresa según sector/bienes
-- Detecta faltantes y genera pedidos B2B a proveedores con stock
+- Detecta faltantes y reúne los pedidos B2B de todas las empresas del ciclo
+- Los liquida contra un índice por bien de proveedores con stock
 - Liquida transferencias de dinero e inventario entre empresas
 - Mantiene métricas básicas de desempeño de la cadena
 
@@ -15,7 +16,8 @@ Está diseñado para funcionar sin dependencias externas, usando el estado de
 from __future__ import annotations
 
 import random
-from typing import Dict, List, Optional
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Set
 
 
 INSUMOS_DEFAULT = {
@@ -25,6 +27,70 @@ INSUMOS_DEFAULT = {
 }
 
 
+def _stock_disponible(inventario) -> int:
+    """Unidades en inventario, sea lista de unidades o contador"""
+    return len(inventario) if isinstance(inventario, list) else int(inventario or 0)
+
+
+@dataclass
+class PedidoB2B:
+    """Pedido de reabastecimiento de un insumo por una empresa"""
+    comprador: object
+    insumo: str
+    cantidad: int
+
+
+@dataclass
+class OfertaProveedor:
+    """Stock de un bien ofrecido por un proveedor en el ciclo"""
+    empresa: object
+    precio: float
+    stock: int
+
+
+class IndiceProveedores:
+    """Proveedores con stock por bien, ordenados por precio (y mayor stock).
+
+    Se construye una vez por ciclo con una sola pasada sobre las empresas y
+    solo para los bienes pedidos; el stock se descuenta como contador a
+    medida que se liquidan los pedidos.
+    """
+
+    def __init__(self, empresas: Iterable, bienes: Set[str]):
+        self._ofertas: Dict[str, List[OfertaProveedor]] = {}
+        self._cabeza: Dict[str, int] = {}
+        candidatos: Dict[str, list] = {}
+        for posicion, empresa in enumerate(empresas):
+            inventario = getattr(empresa, 'bienes', None)
+            if not isinstance(inventario, dict):
+                continue
+            for bien in bienes:
+                if bien not in inventario:
+                    continue
+                stock = _stock_disponible(inventario[bien])
+                if stock <= 0:
+                    continue
+                precio = float(getattr(empresa, 'precios', {}).get(bien, 10))
+                if precio > 0:
+                    candidatos.setdefault(bien, []).append((precio, -stock, posicion, empresa))
+
+        for bien, ofertas in candidatos.items():
+            ofertas.sort(key=lambda t: t[:3])
+            self._ofertas[bien] = [OfertaProveedor(e, precio, -stock) for precio, stock, _, e in ofertas]
+            self._cabeza[bien] = 0
+
+    def mejor_oferta(self, bien: str) -> Optional[OfertaProveedor]:
+        """Oferta más barata del bien que aún tiene stock"""
+        ofertas = self._ofertas.get(bien)
+        if not ofertas:
+            return None
+        cabeza = self._cabeza[bien]
+        while cabeza < len(ofertas) and ofertas[cabeza].stock <= 0:
+            cabeza += 1
+        self._cabeza[bien] = cabeza
+        return ofertas[cabeza] if cabeza < len(ofertas) else None
+
+
 class GestorCadenaSuministro:
     """Coordina compras B2B de insumos y abastecimiento entre empresas."""
 
@@ -73,14 +139,22 @@ class GestorCadenaSuministro:
             finally:
                 self._inicializado = True
 
-        for empresa in self.mercado.getEmpresas():
-            self._procesar_reabastecimiento_empresa(empresa)
+        empresas = self.mercado.getEmpresas()
+        pedidos = [pedido for empresa in empresas for pedido in self._pedidos_empresa(empresa)]
+        if not pedidos:
+            return
+
+        indice = IndiceProveedores(empresas, {pedido.insumo for pedido in pedidos})
+        for pedido in pedidos:
+            self._liquidar_pedido(pedido, indice)
 
     # --- Lógica interna ---
-    def _procesar_reabastecimiento_empresa(self, empresa):
+    def _pedidos_empresa(self, empresa) -> List[PedidoB2B]:
+        """Pedidos de reabastecimiento para los insumos bajo el umbral."""
         if not getattr(empresa, 'insumos_requeridos', None):
-            return
+            return []
 
+        pedidos = []
         for insumo in list(empresa.insumos_requeridos.keys()):
             nivel = int(empresa.inventario_insumos.get(insumo, 0))
             if nivel >= self.umbral_reabastecimiento:
@@ -88,61 +162,47 @@ class GestorCadenaSuministro:
 
             faltante = self.nivel_objetivo_insumo - nivel
             cantidad_a_comprar = max(0, min(self.max_compra_por_ciclo, faltante))
-            if cantidad_a_comprar <= 0:
-                continue
-
-            proveedor, precio = self._buscar_proveedor_con_stock(insumo)
-            if not proveedor or precio <= 0:
-                continue
-
-            costo_total = cantidad_a_comprar * precio
-            if getattr(empresa, 'dinero', 0) < costo_total:
-                # Ajustar a lo que pueda pagar
-                cantidad_a_comprar = int(empresa.dinero // max(1, precio))
-                if cantidad_a_comprar <= 0:
-                    continue
-                costo_total = cantidad_a_comprar * precio
-
-            # Realizar transferencia B2B (dinero e inventario)
-            unidades_transferidas = self._transferir_stock(proveedor, empresa, insumo, cantidad_a_comprar, precio)
-            if unidades_transferidas <= 0:
-                continue
+            if cantidad_a_comprar > 0:
+                pedidos.append(PedidoB2B(empresa, insumo, cantidad_a_comprar))
+        return pedidos
+
+    def _liquidar_pedido(self, pedido: PedidoB2B, indice: IndiceProveedores):
+        """Cruza un pedido contra el proveedor más barato con stock."""
+        empresa, insumo = pedido.comprador, pedido.insumo
+        oferta = indice.mejor_oferta(insumo)
+        if oferta is None:
+            return
+        precio = oferta.precio
 
-            # Registrar métricas y evento
-            empresa.inventario_insumos[insumo] = empresa.inventario_insumos.get(insumo, 0) + unidades_transferidas
-            self.pedidos_realizados += 1
-            self.unidades_abastecidas += unidades_transferidas
-            self.valor_transado += unidades_transferidas * precio
+        cantidad_a_comprar = min(pedido.cantidad, oferta.stock)
+        costo_total = cantidad_a_comprar * precio
+        if getattr(empresa, 'dinero', 0) < costo_total:
+            # Ajustar a lo que pueda pagar
+            cantidad_a_comprar = int(empresa.dinero // max(1, precio))
+            if cantidad_a_comprar <= 0:
+                return
 
-            # Registrar en sistema de transacciones del mercado (B2B)
-            try:
-                self.mercado.registrar_transaccion(empresa, insumo, unidades_transferidas, unidades_transferidas * precio, self.mercado.ciclo_actual)
-            except Exception:
-                pass
-
-    def _buscar_proveedor_con_stock(self, bien: str):
-        """Busca proveedor con stock del bien y retorna (empresa, precio)."""
-        candidatos = []
-        for e in self.mercado.getEmpresas():
-            stock = 0
-            if hasattr(e, 'bienes') and bien in e.bienes:
-                inv = e.bienes[bien]
-                stock = len(inv) if isinstance(inv, list) else int(inv or 0)
-            if stock > 0:
-                precio = float(getattr(e, 'precios', {}).get(bien, 10))
-                if precio > 0:
-                    candidatos.append((e, precio, stock))
+        # Realizar transferencia B2B (dinero e inventario)
+        unidades_transferidas = self._transferir_stock(oferta.empresa, empresa, insumo, cantidad_a_comprar, precio)
+        if unidades_transferidas <= 0:
+            return
+        oferta.stock -= unidades_transferidas
 
-        if not candidatos:
-            return None, 0.0
+        # Registrar métricas y evento
+        empresa.inventario_insumos[insumo] = empresa.inventario_insumos.get(insumo, 0) + unidades_transferidas
+        self.pedidos_realizados += 1
+        self.unidades_abastecidas += unidades_transferidas
+        self.valor_transado += unidades_transferidas * precio
 
-        # Proveedor con mejor precio
-        proveedor, precio, _ = min(candidatos, key=lambda t: t[1])
-        return proveedor, precio
+        # Registrar en sistema de transacciones del mercado (B2B)
+        try:
+            self.mercado.registrar_transaccion(empresa, insumo, unidades_transferidas, unidades_transferidas * precio, self.mercado.ciclo_actual)
+        except Exception:
+            pass
 
     def _transferir_stock(self, proveedor, comprador, bien: str, qty: int, precio_unit: float) -> int:
         inv = proveedor.bienes.get(bien, [])
-        stock = len(inv) if isinstance(inv, list) else int(inv or 0)
+        stock = _stock_disponible(inv)
         unidades = max(0, min(qty, stock))
         if unidades <= 0:
             return 0
@@ -155,11 +215,9 @@ class GestorCadenaSuministro:
         comprador.dinero -= costo
         proveedor.dinero += costo
 
-        # Mover inventario (listas de InventarioBien)
+        # Mover inventario (listas de InventarioBien): las más antiguas primero
         if isinstance(inv, list):
-            for _ in range(unidades):
-                if inv:
-                    inv.pop(0)
+            del inv[:unidades]
         else:
             proveedor.bienes[bien] = max(0, int(proveedor.bienes.get(bien, 0)) - unidades)
 
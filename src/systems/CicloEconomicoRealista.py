@@ -6,7 +6,9 @@ Implementa fases económicas genuinas con transiciones basadas en indicadores re
 import random
 import math
 from enum import Enum
+import numpy as np
 from ..utils.SimuladorLogger import get_simulador_logger
+from ..utils.SimuladorLogger import diagnostico
 
 class FaseEconomica(Enum):
     EXPANSION = "expansion"
@@ -416,7 +418,7 @@ class CicloEconomicoRealista:
     
     def _aplicar_euforia_especulativa(self):
         """Aplica efectos de euforia especulativa durante transición a pico"""
-        print("💰 EUFORIA ESPECULATIVA: Mercados en máximos históricos")
+        diagnostico("💰 EUFORIA ESPECULATIVA: Mercados en máximos históricos")
         
         # Efectos de burbuja especulativa en el mercado
         if hasattr(self.mercado, 'factor_especulativo'):
@@ -460,9 +462,18 @@ class CicloEconomicoRealista:
     
     def _aplicar_shock_confianza(self, factor):
         """Aplica shock de confianza a consumidores y empresas"""
+        from ..models.AlmacenConsumidores import almacen_de
         try:
             # Afectar confianza de consumidores
-            for consumidor in self.mercado.getConsumidores():
+            consumidores = self.mercado.getConsumidores()
+            almacen = almacen_de(self.mercado)
+            indices = almacen.indices(consumidores) if almacen is not None else None
+            if indices is not None:
+                # Los consumidores no tienen confianza propia: se ajusta la propensión en bloque
+                propension = almacen.propension_consumo
+                propension[indices] = np.clip(propension[indices] * (1 + factor), 0.1, 0.95)
+                consumidores = []
+            for consumidor in consumidores:
                 if hasattr(consumidor, 'confianza'):
                     consumidor.confianza = max(0.1, min(1.0, consumidor.confianza + factor))
                 elif hasattr(consumidor, 'propension_consumo'):
@@ -546,6 +557,9 @@ class CicloEconomicoRealista:
     
     def _calcular_tasa_desempleo(self):
         """Calcula tasa de desempleo"""
+        acumulador = getattr(self.mercado, 'acumulador_macro', None)
+        if acumulador is not None:
+            return acumulador.tasa_desempleo() if acumulador.poblacion > 0 else 0.05
         consumidores = self.mercado.getConsumidores()
         if not consumidores:
             return 0.05
@@ -0,0 +1,287 @@
+"""
+Ronda de compras de consumidores por lotes
+==========================================
+
+Alternativa a que cada consumidor, uno tras otro, recorra todos los bienes y
+a todos los vendedores en ``decidir_compra_racional``. La demanda de toda la
+población se calcula de una vez sobre matrices consumidor × bien con la misma
+regla que el agente (utilidad marginal sobre precio, precio de reserva y
+presupuesto, máximo 5 bienes por ciclo) frente al mejor precio vigente de
+cada bien. Después se liquida en hasta 5 rondas (primera opción de cada
+consumidor, segunda, ...) contra los inventarios de las empresas: los
+vendedores se recorren del más barato al más caro y, entre los consumidores
+que aún pueden pagar ese precio, el stock se raciona por prioridad aleatoria.
+Las transacciones se registran en bloque.
+
+Se respetan las mismas restricciones que en la compra por agente: nadie
+gasta más que su presupuesto de consumo ni que su dinero, y ninguna empresa
+vende más unidades de las que tiene.
+
+El modo se elige con ``"performance": {"compras_consumidores": "lote"}``
+(por defecto ``"agente"``). Los sesgos psicológicos individuales (anclaje,
+efecto manada, marcas confiables) solo se aplican en el modo por agente; en
+el modo por lotes el perfil psicológico escala el presupuesto como allí.
+"""
+
+import random
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from ..config.ConfigEconomica import ConfigEconomica
+
+MODO_AGENTE = 'agente'
+MODO_LOTE = 'lote'
+
+MAX_COMPRAS_POR_CICLO = 5
+
+
+def modo_compras(mercado) -> str:
+    """Modo de la ronda de compras de consumidores configurado para el mercado"""
+    config_performance = getattr(mercado, 'config_performance', None) or {}
+    return config_performance.get('compras_consumidores', MODO_AGENTE)
+
+
+@dataclass
+class OfertaBien:
+    """Vendedores con stock de un bien, del más barato al más caro"""
+    empresas: List = field(default_factory=list)
+    precios_base: np.ndarray = None
+    stock: np.ndarray = None
+    factor_iva: float = 1.0
+
+    @property
+    def precio_final(self) -> float:
+        """Mejor precio con IVA (0 si no hay vendedores)"""
+        return float(self.precios_base[0]) * self.factor_iva if self.empresas else 0.0
+
+
+@dataclass
+class PlanCompras:
+    """Compras liquidadas de una ronda, pendientes de escribir en los agentes"""
+    consumidores: List
+    ofertas: Dict[str, OfertaBien]
+    compras: List  # (consumidores atendidos, bien, vendedor, precio_final)
+    dinero: np.ndarray
+    consumido: np.ndarray
+    comprado: np.ndarray
+    almacen: Any
+    indices: Optional[np.ndarray]
+    ciclo: int
+
+
+class RondaComprasLote:
+    """Demanda y liquidación de las compras de todos los consumidores en bloque"""
+
+    def __init__(self, mercado):
+        self.mercado = mercado
+        self.bienes = list(mercado.bienes.keys())
+        self.sistema_fiscal = getattr(mercado, 'sistema_fiscal', None)
+
+    # --- Oferta ---
+    def _construir_ofertas(self) -> Dict[str, OfertaBien]:
+        """Una pasada por las empresas: vendedores con stock de cada bien"""
+        columna = {bien: j for j, bien in enumerate(self.bienes)}
+        candidatos = {bien: [] for bien in self.bienes}
+        for posicion, empresa in enumerate(self.mercado.getEmpresas()):
+            inventario = getattr(empresa, 'bienes', None)
+            if not isinstance(inventario, dict):
+                continue
+            precios = getattr(empresa, 'precios', {}) or {}
+            for bien, unidades in inventario.items():
+                if bien in columna and isinstance(unidades, list) and unidades:
+                    candidatos[bien].append((precios.get(bien, float('inf')), posicion, empresa, len(unidades)))
+
+        ofertas = {}
+        for bien, vendedores in candidatos.items():
+            vendedores.sort(key=lambda t: t[:2])
+            # Como el agente: si el más barato no tiene precio válido, el bien no se ofrece
+            if not vendedores or not (0 < vendedores[0][0] < float('inf')):
+                ofertas[bien] = OfertaBien(precios_base=np.zeros(0), stock=np.zeros(0, dtype=np.int64))
+                continue
+            vendedores = [v for v in vendedores if v[0] < float('inf')]
+            factor_iva = 1.0
+            if self.sistema_fiscal is not None:
+                categoria = self.mercado.bienes[bien].categoria
+                factor_iva = 1 + self.sistema_fiscal.iva_rates.get(categoria, 0.21)
+            ofertas[bien] = OfertaBien([v[2] for v in vendedores],
+                                       np.array([v[0] for v in vendedores], dtype=float),
+                                       np.array([v[3] for v in vendedores], dtype=np.int64),
+                                       factor_iva)
+        return ofertas
+
+    # --- Demanda ---
+    def _estado_consumidores(self, consumidores):
+        """Columnas de dinero, deudas y ahorro (del almacén columnar si existe)"""
+        from ..models.AlmacenConsumidores import almacen_de
+        almacen = almacen_de(self.mercado)
+        indices = almacen.indices(consumidores) if almacen is not None else None
+        if indices is not None:
+            return (almacen.dinero[indices], almacen.propension_consumo[indices],
+                    almacen.deuda[indices], almacen.ahorros[indices], almacen, indices)
+        n = len(consumidores)
+        return (np.fromiter((c.dinero for c in consumidores), dtype=float, count=n),
+                np.fromiter((c.propension_consumo for c in consumidores), dtype=float, count=n),
+                np.fromiter((c.deuda for c in consumidores), dtype=float, count=n),
+                np.fromiter((c.ahorros for c in consumidores), dtype=float, count=n),
+                None, None)
+
+    def _factor_presupuesto_psicologico(self, consumidores) -> np.ndarray:
+        """Estrés reduce y optimismo aumenta el presupuesto, como en la compra con psicología"""
+        factor = np.ones(len(consumidores))
+        if not getattr(self.mercado, 'sistema_psicologia', None):
+            return factor
+        for i, consumidor in enumerate(consumidores):
+            perfil = getattr(consumidor, 'perfil_psicologico', None)
+            if perfil is None:
+                continue
+            if perfil.estres_financiero > 0.6:
+                factor[i] = 0.8
+            elif perfil.optimismo > 0.8:
+                factor[i] = 1.1
+        return factor
+
+    def _factores_categoria(self):
+        """Bonificación de utilidad y de precio de reserva por categoría de cada bien"""
+        categorias_map = getattr(ConfigEconomica, 'CATEGORIAS_BIENES_MAP', None)
+        categorias = [categorias_map.get(bien, 'servicios') if isinstance(categorias_map, dict) else 'servicios'
+                      for bien in self.bienes]
+        basicos = np.array([c == 'alimentos_basicos' for c in categorias])
+        factor_reserva = np.array([1.2 if c == 'alimentos_basicos' else 0.8 if c == 'bienes_duraderos' else 1.0
+                                   for c in categorias])
+        return basicos, factor_reserva
+
+    def calcular_demanda(self, consumidores, ofertas, dinero, presupuesto, deuda, ahorros):
+        """Bienes elegidos por cada consumidor, en orden de preferencia.
+
+        Devuelve una matriz ``(n, MAX_COMPRAS_POR_CICLO)`` de índices de bien
+        (-1 donde no hay opción), junto con la cantidad consumida actual.
+        """
+        n, g = len(consumidores), len(self.bienes)
+        satisfaccion = np.array([[c.satisfaccion_bien.get(bien, 0.5) for bien in self.bienes]
+                                 for c in consumidores], dtype=float).reshape(n, g)
+        consumido = np.array([[c.cantidad_consumida.get(bien, 0) for bien in self.bienes]
+                              for c in consumidores], dtype=float).reshape(n, g)
+        precio = np.array([ofertas[bien].precio_final for bien in self.bienes], dtype=float)
+        basicos, factor_reserva = self._factores_categoria()
+
+        # Misma aritmética que calcular_utilidad_marginal y calcular_precio_reserva
+        utilidad = satisfaccion * ConfigEconomica.UTILIDAD_MARGINAL_DECRECIENTE ** consumido
+        utilidad = np.where(basicos & (consumido == 0), utilidad * 2.0, utilidad)
+        ingreso_disponible = np.maximum(0, dinero - deuda - ahorros * 0.8)
+        reserva = np.maximum(utilidad * ingreso_disponible[:, None] * 0.01 * factor_reserva, precio * 0.5)
+
+        factible = (precio > 0) & (precio <= presupuesto[:, None]) & (precio <= reserva)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            ratio = np.where(factible, utilidad / np.where(precio > 0, precio, 1.0), -np.inf)
+        # Orden estable: a igual ratio se respeta el orden de los bienes, como el agente
+        k = min(MAX_COMPRAS_POR_CICLO, g)
+        orden = np.argsort(-ratio, axis=1, kind='stable')[:, :k]
+        elegido = np.take_along_axis(factible, orden, axis=1)
+        return np.where(elegido, orden, -1), consumido
+
+    # --- Liquidación ---
+    def ejecutar(self, consumidores, ciclo) -> Dict[str, float]:
+        """Calcula la demanda, la liquida contra los inventarios y aplica los resultados"""
+        plan = self.planificar(consumidores, ciclo)
+        if plan is None:
+            return {'compras': 0, 'gasto': 0.0}
+        return self.aplicar(plan)
+
+    def planificar(self, consumidores, ciclo) -> Optional[PlanCompras]:
+        """Demanda y liquidación sobre copias: no modifica agentes ni inventarios.
+
+        Si falla, la ronda puede repetirse agente por agente sin haber comprado
+        nada; ``aplicar`` es el único paso que escribe en el mercado.
+        """
+        if not consumidores or not self.bienes:
+            return None
+        n = len(consumidores)
+        ofertas = self._construir_ofertas()
+        dinero, propension, deuda, ahorros, almacen, indices = self._estado_consumidores(consumidores)
+        dinero = dinero.astype(float).copy()
+        presupuesto = dinero * propension * self._factor_presupuesto_psicologico(consumidores)
+        opciones, consumido = self.calcular_demanda(consumidores, ofertas, dinero, presupuesto, deuda, ahorros)
+
+        # Prioridad aleatoria del ciclo (generador con semilla derivada de ``random``)
+        rng = np.random.default_rng(random.getrandbits(32))
+        prioridad = rng.permutation(n)
+        gastado = np.zeros(n)
+        comprado = np.zeros_like(consumido)
+        compras = []
+
+        for ronda in range(opciones.shape[1]):
+            columna = opciones[:, ronda]
+            for j, bien in enumerate(self.bienes):
+                oferta = ofertas[bien]
+                if not oferta.empresas:
+                    continue
+                demandantes = np.flatnonzero(columna == j)
+                if len(demandantes) == 0:
+                    continue
+                demandantes = demandantes[np.argsort(prioridad[demandantes])]
+                for s in np.flatnonzero(oferta.stock > 0):
+                    precio_final = oferta.precios_base[s] * oferta.factor_iva
+                    # Mismas restricciones que la compra por agente
+                    puede = ((gastado[demandantes] + precio_final <= presupuesto[demandantes]) &
+                             (dinero[demandantes] >= precio_final))
+                    atendidos = demandantes[puede][:oferta.stock[s]]
+                    if len(atendidos) == 0:
+                        continue
+                    oferta.stock[s] -= len(atendidos)
+                    gastado[atendidos] += precio_final
+                    dinero[atendidos] -= precio_final
+                    comprado[atendidos, j] += 1
+                    compras.append((atendidos, j, s, precio_final))
+                    demandantes = demandantes[~np.isin(demandantes, atendidos, assume_unique=True)]
+                    if len(demandantes) == 0:
+                        break
+
+        return PlanCompras(consumidores, ofertas, compras, dinero, consumido, comprado,
+                           almacen, indices, ciclo)
+
+    def aplicar(self, plan: PlanCompras) -> Dict[str, float]:
+        """Escribe dinero, inventarios, consumo e historial y registra las transacciones"""
+        mercado = self.mercado
+        consumidores, ofertas, dinero, ciclo = plan.consumidores, plan.ofertas, plan.dinero, plan.ciclo
+        almacen, indices = plan.almacen, plan.indices
+        consumido, comprado = plan.consumido, plan.comprado
+        registros = []
+        iva_total = 0.0
+        for atendidos, j, s, precio_final in plan.compras:
+            bien = self.bienes[j]
+            oferta = ofertas[bien]
+            empresa = oferta.empresas[s]
+            unidades = len(atendidos)
+            precio_base = float(oferta.precios_base[s])
+            empresa.dinero += precio_base * unidades  # Empresa recibe precio sin IVA
+            del empresa.bienes[bien][:unidades]
+            mercado.registrar_venta(empresa, bien, precio_base * unidades)
+            iva_total += (precio_final - precio_base) * unidades
+            for i in atendidos.tolist():
+                consumidor = consumidores[i]
+                consumidor.bienes[bien] = consumidor.bienes.get(bien, 0) + 1
+                consumidor.historial_compras[bien] = precio_final
+                registros.append({'consumidor': consumidor.nombre, 'bien': bien, 'cantidad': 1,
+                                  'costo_total': precio_final, 'ciclo': ciclo})
+
+        compradores = np.flatnonzero(comprado.any(axis=1))
+        if almacen is not None:
+            almacen.dinero[indices[compradores]] = dinero[compradores]
+        else:
+            for i in compradores.tolist():
+                consumidores[i].dinero = float(dinero[i])
+
+        # Consumo del ciclo y saciedad, como al final de ciclo_persona
+        consumido = np.maximum(0, (consumido + comprado) * ConfigEconomica.FACTOR_SACIEDAD)
+        for consumidor, fila in zip(consumidores, consumido.tolist()):
+            consumidor.cantidad_consumida.update(zip(self.bienes, fila))
+
+        if self.sistema_fiscal is not None and iva_total:
+            from .SistemaFiscal import TipoImpuesto
+            self.sistema_fiscal.recaudacion_por_tipo[TipoImpuesto.IVA] += iva_total
+            self.sistema_fiscal.recaudacion_total += iva_total
+
+        mercado.registrar_transacciones_lote(registros)
+        return {'compras': len(registros), 'gasto': float(sum(r['costo_total'] for r in registros))}
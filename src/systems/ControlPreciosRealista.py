@@ -5,7 +5,12 @@ Sistema que evita cambios de precios abruptos y hiperinflación
 
 import random
 import math
-from collections import defaultdict
+from collections import Counter, defaultdict
+import logging
+
+import numpy as np
+
+from ..utils.SimuladorLogger import diagnostico
 
 class ControladorPreciosRealista:
     """Controla los precios para mantener realismo económico"""
@@ -116,10 +121,14 @@ class ControladorPreciosRealista:
     
     def _calcular_factor_competencia(self, bien_nombre):
         """Factor basado en nivel de competencia"""
-        empresas_con_bien = len([
-            e for e in self.mercado.getEmpresas() 
-            if hasattr(e, 'bienes') and bien_nombre in e.bienes
-        ])
+        indice = getattr(self.mercado, 'indice_oferentes', None)
+        if indice is not None:
+            empresas_con_bien = indice.num_oferentes(bien_nombre)
+        else:
+            empresas_con_bien = len([
+                e for e in self.mercado.getEmpresas() 
+                if hasattr(e, 'bienes') and bien_nombre in e.bienes
+            ])
         
         if empresas_con_bien <= 1:
             return 1.05  # Monopolio: +5% poder de pricing
@@ -140,7 +149,7 @@ class ControladorPreciosRealista:
         
         return 1.0  # Neutral
     
-    def _detectar_hiperinflacion(self):
+    def _detectar_hiperinflacion(self, precio_promedio_actual=None):
         """Detecta condiciones de hiperinflación para activar controles de emergencia"""
         if len(self.mercado.inflacion_historica) < 2:
             return False
@@ -150,7 +159,8 @@ class ControladorPreciosRealista:
         inflacion_actual = self.mercado.inflacion_historica[-1]
         
         # Verificar también precios extremos
-        precio_promedio_actual = self._calcular_precio_promedio_actual()
+        if precio_promedio_actual is None:
+            precio_promedio_actual = self._calcular_precio_promedio_actual()
         if precio_promedio_actual > 1000:  # Precios muy altos
             return True
         
@@ -171,13 +181,8 @@ class ControladorPreciosRealista:
             # Permitir deflación limitada
             return max(precio_propuesto, precio_anterior * 0.95)  # Máximo 5% deflación
     
-    def _aplicar_limites_variacion_mejorados(self, precio_nuevo, precio_anterior):
-        """Aplica límites más estrictos de variación de precios"""
-        if precio_anterior <= 0:
-            return precio_nuevo
-        
-        ratio_cambio = precio_nuevo / precio_anterior
-        
+    def _cambio_maximo_efectivo(self):
+        """Variación máxima por ciclo, más estricta con inflación alta"""
         # Límites MUCHO más estrictos para simulaciones largas
         cambio_maximo = self.cambio_maximo_ciclo  # 0.8% base
         
@@ -188,6 +193,15 @@ class ControladorPreciosRealista:
                 cambio_maximo *= 0.25  # Reducir límites al 25%
             elif inflacion_actual > 0.02:  # Si inflación > 2%
                 cambio_maximo *= 0.5   # Reducir límites al 50%
+        return cambio_maximo
+
+    def _aplicar_limites_variacion_mejorados(self, precio_nuevo, precio_anterior):
+        """Aplica límites más estrictos de variación de precios"""
+        if precio_anterior <= 0:
+            return precio_nuevo
+        
+        ratio_cambio = precio_nuevo / precio_anterior
+        cambio_maximo = self._cambio_maximo_efectivo()
         
         limite_superior = 1 + cambio_maximo
         limite_inferior = 1 - cambio_maximo
@@ -292,8 +306,113 @@ class ControladorPreciosRealista:
             'expectativas_inflacion': self._estimar_inflacion_esperada()
         }
     
+    def _vectorizado_activo(self):
+        config_performance = getattr(self.mercado, 'config_performance', None) or {}
+        return config_performance.get('vectorizar_control_precios', True)
+
     def aplicar_control_masivo_precios(self, ciclo):
         """Aplica control de precios a todas las empresas del mercado"""
+        if self._vectorizado_activo():
+            try:
+                return self._aplicar_control_masivo_vectorizado()
+            except Exception as e:
+                diagnostico("⚠️  Error en control de precios vectorizado: %s", e, componente='Precios',
+                            nivel=logging.WARNING)
+                # Continuar con método tradicional
+        return self._aplicar_control_masivo_escalar()
+
+    def _matriz_precios(self):
+        """Pares empresa × bien con precio, en el orden del recorrido escalar.
+
+        Devuelve ``(pares, precios, filas)``: la lista de ``(empresa, bien)``,
+        el array de precios y el índice de empresa de cada par (la matriz
+        empresa × bien en formato disperso).
+        """
+        pares = []
+        filas = []
+        precios = []
+        for i, empresa in enumerate(self.mercado.getEmpresas()):
+            if hasattr(empresa, 'precios') and empresa.precios:
+                for bien_nombre, precio in empresa.precios.items():
+                    pares.append((empresa, bien_nombre))
+                    precios.append(precio)
+                    filas.append(i)
+        return pares, np.array(precios, dtype=float), np.array(filas, dtype=np.intp)
+
+    @staticmethod
+    def _escribir_precios(pares, nuevos, cambiados=None):
+        """Escribe de vuelta en ``empresa.precios`` solo las entradas indicadas"""
+        indices = range(len(pares)) if cambiados is None else np.flatnonzero(cambiados).tolist()
+        valores = nuevos.tolist()
+        for k in indices:
+            empresa, bien_nombre = pares[k]
+            empresa.precios[bien_nombre] = valores[k]
+        return len(indices)
+
+    def _factores_competencia(self, bienes):
+        """Factor de competencia de cada bien, calculado una vez por bien"""
+        indice = getattr(self.mercado, 'indice_oferentes', None)
+        if indice is not None:
+            oferentes = {bien: indice.num_oferentes(bien) for bien in bienes}
+        else:
+            oferentes = Counter(bien for e in self.mercado.getEmpresas()
+                                if hasattr(e, 'bienes') for bien in e.bienes)
+        return {bien: (1.05 if oferentes.get(bien, 0) <= 1 else
+                       1.02 if oferentes.get(bien, 0) <= 3 else 0.98) for bien in bienes}
+
+    def _aplicar_control_masivo_vectorizado(self):
+        """Control de precios de toda la matriz empresa × bien en una pasada.
+
+        Mismas reglas que ``aplicar_control_precios`` par a par: los factores
+        comunes (expectativas, salarios, ciclo, monetario y límites) se
+        calculan una vez por ciclo, el de competencia una vez por bien, y los
+        límites de variación y absolutos se aplican sobre arrays. La detección
+        de hiperinflación se evalúa con los precios del inicio de la pasada.
+        """
+        pares, precios, filas = self._matriz_precios()
+        if not pares:
+            return 0
+
+        if self._detectar_hiperinflacion(sum(precios.tolist()) / max(1, len(pares))):
+            # En emergencia el precio propuesto es el actual: se mantiene
+            self.activar_controles_emergencia = True
+            for (_, bien_nombre), precio in zip(pares, precios.tolist()):
+                self.precios_anteriores.setdefault(bien_nombre, precio)
+            return 0
+
+        empresas = self.mercado.getEmpresas()
+        crecimiento_salarios = self._estimar_crecimiento_salarios()
+        factor_salarios = np.array([
+            1 + (crecimiento_salarios * 0.6) if hasattr(e, 'empleados') and e.empleados else 1.0
+            for e in empresas])[filas]
+        # Misma secuencia de números aleatorios que el recorrido escalar
+        materias_primas = np.array([1 + random.uniform(-0.02, 0.02) for _ in pares])
+        competencia = self._factores_competencia({bien for _, bien in pares})
+        factor_competencia = np.array([competencia[bien] for _, bien in pares])
+
+        objetivo = (precios * self._calcular_factor_expectativas() * (factor_salarios * materias_primas)
+                    * factor_competencia * self._calcular_factor_ciclo_economico())
+        con_inercia = precios * self.inercia_precios + objetivo * (1 - self.inercia_precios)
+
+        cambio_maximo = self._cambio_maximo_efectivo()
+        with np.errstate(divide='ignore', invalid='ignore'):
+            ratio = con_inercia / precios
+        limitado = np.where(ratio > 1 + cambio_maximo, precios * (1 + cambio_maximo),
+                            np.where(ratio < 1 - cambio_maximo, precios * (1 - cambio_maximo), con_inercia))
+        finales = np.where(precios <= 0, con_inercia, limitado)
+        finales = finales * max(0.95, min(1.05, self.factor_monetario))
+        finales = np.where(finales > self.precio_maximo_permitido, self.precio_maximo_permitido,
+                           np.where(finales < self.precio_minimo_permitido, self.precio_minimo_permitido, finales))
+
+        # La caché guarda, por bien, el último precio controlado
+        self.precios_anteriores.update(zip((bien for _, bien in pares), finales.tolist()))
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            cambiados = np.abs(finales - precios) / precios > 0.001  # >0.1% de cambio
+        return self._escribir_precios(pares, finales, cambiados)
+
+    def _aplicar_control_masivo_escalar(self):
+        """Recorrido par a par con ``aplicar_control_precios``"""
         cambios_aplicados = 0
         
         # Aplicar control a todas las empresas
@@ -341,7 +460,8 @@ class ControladorPreciosRealista:
         
         # RESPUESTA AUTOMÁTICA A HIPERINFLACIÓN
         if inflacion_actual > 0.10:  # Inflación > 10%
-            print(f"⚠️  ALERTA HIPERINFLACIÓN DETECTADA: {inflacion_actual:.1%}")
+            diagnostico("⚠️  ALERTA HIPERINFLACIÓN DETECTADA: %.1f%%", inflacion_actual * 100,
+                        componente='Precios', nivel=logging.WARNING)
             
             # Activar controles de emergencia
             self.activar_controles_emergencia = True
@@ -354,7 +474,8 @@ class ControladorPreciosRealista:
             return True
         
         elif inflacion_actual > 0.05:  # Inflación > 5%
-            print(f"⚠️  ALERTA INFLACIÓN ALTA: {inflacion_actual:.1%}")
+            diagnostico("⚠️  ALERTA INFLACIÓN ALTA: %.1f%%", inflacion_actual * 100, componente='Precios',
+                        nivel=logging.WARNING)
             
             # Ajustes moderados
             self.inercia_precios = min(0.97, self.inercia_precios + 0.02)
@@ -364,36 +485,43 @@ class ControladorPreciosRealista:
         
         elif self.activar_controles_emergencia and inflacion_actual < 0.03:
             # Desactivar controles de emergencia si inflación baja
-            print(f"✅ INFLACIÓN CONTROLADA: {inflacion_actual:.1%} - Desactivando emergencia")
+            diagnostico("✅ INFLACIÓN CONTROLADA: %.1f%% - Desactivando emergencia", inflacion_actual * 100,
+                        componente='Precios')
             self.activar_controles_emergencia = False
             self.inercia_precios = 0.95  # Volver a normal
             self.cambio_maximo_ciclo = 0.015  # Volver a normal
         
         return False
     
-    def activar_deflacion_emergencia(self, intensidad=0.5):
-        """NUEVO: Método para deflación de emergencia llamado por el Banco Central"""
-        factor_deflacion = 1.0 - (0.02 * intensidad)  # Base 2% * intensidad
-        
-        bienes_deflacionados = 0
+    def _escalar_todos_los_precios(self, factor):
+        """Multiplica todos los precios del mercado por ``factor``; devuelve cuántos"""
+        if self._vectorizado_activo():
+            pares, precios, _ = self._matriz_precios()
+            return self._escribir_precios(pares, precios * factor)
+        escalados = 0
         for empresa in self.mercado.getEmpresas():
             if hasattr(empresa, 'precios') and empresa.precios:
                 for bien_nombre in empresa.precios.keys():
                     precio_actual = empresa.precios[bien_nombre]
-                    empresa.precios[bien_nombre] = precio_actual * factor_deflacion
-                    bienes_deflacionados += 1
+                    empresa.precios[bien_nombre] = precio_actual * factor
+                    escalados += 1
+        return escalados
+
+    def activar_deflacion_emergencia(self, intensidad=0.5):
+        """NUEVO: Método para deflación de emergencia llamado por el Banco Central"""
+        factor_deflacion = 1.0 - (0.02 * intensidad)  # Base 2% * intensidad
+        
+        bienes_deflacionados = self._escalar_todos_los_precios(factor_deflacion)
         
         self.activar_controles_emergencia = True  # Activar controles
-        print(f"🏛️ BANCO CENTRAL: Deflación de emergencia aplicada a {bienes_deflacionados} bienes ({(1-factor_deflacion)*100:.1f}%)")
+        diagnostico("🏛️ BANCO CENTRAL: Deflación de emergencia aplicada a %s bienes (%.1f%%)",
+                    bienes_deflacionados, (1-factor_deflacion)*100, componente='Precios')
     
     def _aplicar_deflacion_emergencia(self):
         """Aplica deflación forzada de emergencia en todos los precios"""
         factor_deflacion = 0.98  # 2% de deflación forzada
         
-        for empresa in self.mercado.getEmpresas():
-            if hasattr(empresa, 'precios') and empresa.precios:
-                for bien_nombre, precio_actual in empresa.precios.items():
-                    empresa.precios[bien_nombre] = precio_actual * factor_deflacion
+        self._escalar_todos_los_precios(factor_deflacion)
     
     def _aplicar_limites_absolutos(self, precio):
         """Aplica límites absolutos para evitar precios extremos"""
@@ -426,4 +554,5 @@ class ControladorPreciosRealista:
                     precio_actual = empresa.precios[bien_nombre]
                     empresa.precios[bien_nombre] = precio_actual * factor_deflacion
         
-        print(f"🚨 DEFLACIÓN DE EMERGENCIA APLICADA: {(1-factor_deflacion)*100:.1f}%")
+        diagnostico("🚨 DEFLACIÓN DE EMERGENCIA APLICADA: %.1f%%", (1-factor_deflacion)*100,
+                    componente='Precios')
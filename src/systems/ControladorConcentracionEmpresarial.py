@@ -9,6 +9,150 @@ from typing import Dict, List, Any, Optional
 from dataclasses import dataclass
 import numpy as np
 
+from .MercadoCapitales import HistorialCircular
+
+INDICADORES_CONCENTRACION = ('hhi', 'cr4', 'cr8', 'cuota_dominante')
+
+
+@dataclass
+class ConcentracionMercados:
+    """Indicadores de concentración de un conjunto de mercados (bienes o sectores)"""
+    mercados: List[str]
+    ventas_totales: np.ndarray
+    vendedores: np.ndarray
+    hhi: np.ndarray
+    cr4: np.ndarray
+    cr8: np.ndarray
+    cuota_dominante: np.ndarray
+    empresa_dominante: List[Optional[str]]
+
+    def mercado(self, nombre: str) -> Dict[str, Any]:
+        j = self.mercados.index(nombre)
+        return {'ventas_totales': float(self.ventas_totales[j]), 'vendedores': int(self.vendedores[j]),
+                'hhi': float(self.hhi[j]), 'cr4': float(self.cr4[j]), 'cr8': float(self.cr8[j]),
+                'cuota_dominante': float(self.cuota_dominante[j]),
+                'empresa_dominante': self.empresa_dominante[j]}
+
+    def como_dict(self) -> Dict[str, Dict[str, Any]]:
+        return {nombre: self.mercado(nombre) for nombre in self.mercados}
+
+
+def indicadores_concentracion(mercados: List[str], empresas: List[str],
+                              ventas: np.ndarray) -> ConcentracionMercados:
+    """HHI, CR4, CR8 y cuota dominante de cada columna de una matriz de ventas empresa × mercado"""
+    totales = ventas.sum(axis=0)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        cuotas = np.where(totales > 0, ventas / totales, 0.0)
+    ordenadas = -np.sort(-cuotas, axis=0)
+    dominantes = ventas.argmax(axis=0) if len(empresas) else np.zeros(len(mercados), dtype=np.intp)
+    return ConcentracionMercados(
+        mercados=list(mercados),
+        ventas_totales=totales,
+        vendedores=(ventas > 0).sum(axis=0),
+        hhi=(cuotas ** 2).sum(axis=0),
+        cr4=ordenadas[:4].sum(axis=0),
+        cr8=ordenadas[:8].sum(axis=0),
+        cuota_dominante=cuotas.max(axis=0, initial=0.0),
+        empresa_dominante=[empresas[i] if total > 0 else None
+                           for i, total in zip(dominantes.tolist(), totales.tolist())],
+    )
+
+
+class MotorConcentracion:
+    """Concentración por bien y por sector a partir de la matriz de ventas del ciclo.
+
+    La matriz empresa × bien sale de ``mercado.ventas_ciclo_actual`` (importe
+    vendido por empresa y bien); los sectores se obtienen agregando sus
+    columnas por categoría con una multiplicación de matrices. Cada
+    indicador guarda su historia por mercado en un ``HistorialCircular`` de
+    capacidad fija, así que consultar qué mercados llevan varios ciclos
+    concentrados es una operación sobre una ventana del array.
+    """
+
+    def __init__(self, capacidad_historial: int = 30):
+        self.capacidad_historial = capacidad_historial
+        self.mercados: List[str] = []  # Bienes y luego sectores ('sector:<categoria>')
+        self._fila: Dict[str, int] = {}
+        self.historial: Dict[str, HistorialCircular] = {
+            indicador: HistorialCircular(0, capacidad_historial) for indicador in INDICADORES_CONCENTRACION}
+
+    @staticmethod
+    def matriz_ventas(mercado):
+        """(empresas, bienes, matriz de ventas empresa × bien) del ciclo actual"""
+        ventas = getattr(mercado, 'ventas_ciclo_actual', None) or {}
+        empresas = [e.nombre for e in mercado.getEmpresas()]
+        filas = {nombre: i for i, nombre in enumerate(empresas)}
+        bienes = list(getattr(mercado, 'bienes', {}) or {})
+        columnas = {bien: j for j, bien in enumerate(bienes)}
+        for empresa, bien in ventas:
+            # Empresas que vendieron y ya salieron del mercado, o bienes fuera del catálogo
+            if empresa not in filas:
+                filas[empresa] = len(empresas)
+                empresas.append(empresa)
+            if bien not in columnas:
+                columnas[bien] = len(bienes)
+                bienes.append(bien)
+        matriz = np.zeros((len(empresas), len(bienes)))
+        if ventas:
+            i = np.fromiter((filas[e] for e, _ in ventas), dtype=np.intp, count=len(ventas))
+            j = np.fromiter((columnas[b] for _, b in ventas), dtype=np.intp, count=len(ventas))
+            np.add.at(matriz, (i, j), np.fromiter(ventas.values(), dtype=float, count=len(ventas)))
+        return empresas, bienes, matriz
+
+    def calcular(self, mercado):
+        """Indicadores por bien y por sector del ciclo; también los añade al historial"""
+        empresas, bienes, ventas = self.matriz_ventas(mercado)
+        catalogo = getattr(mercado, 'bienes', {}) or {}
+        categorias = [getattr(catalogo.get(bien), 'categoria', None) or 'otros' for bien in bienes]
+        sectores = list(dict.fromkeys(categorias))
+        pertenencia = np.zeros((len(bienes), len(sectores)))
+        pertenencia[np.arange(len(bienes)), [sectores.index(c) for c in categorias]] = 1
+
+        por_bien = indicadores_concentracion(bienes, empresas, ventas)
+        por_sector = indicadores_concentracion(sectores, empresas, ventas @ pertenencia)
+        self._registrar(por_bien.mercados + [f"sector:{s}" for s in sectores], por_bien, por_sector)
+        return por_bien, por_sector
+
+    def _registrar(self, mercados, por_bien, por_sector):
+        nuevos = [m for m in mercados if m not in self._fila]
+        if nuevos:
+            for mercado in nuevos:
+                self._fila[mercado] = len(self.mercados)
+                self.mercados.append(mercado)
+            self._ampliar_historial()
+        filas = np.fromiter((self._fila[m] for m in mercados), dtype=np.intp, count=len(mercados))
+        for indicador, historial in self.historial.items():
+            # Mercados sin dato este ciclo (p. ej. un bien retirado del catálogo) quedan en NaN
+            valores = np.full(len(self.mercados), np.nan)
+            valores[filas] = np.concatenate([getattr(por_bien, indicador), getattr(por_sector, indicador)])
+            historial.agregar(valores)
+
+    def _ampliar_historial(self):
+        for indicador, anterior in self.historial.items():
+            nuevo = HistorialCircular(len(self.mercados), self.capacidad_historial)
+            ventana = anterior.ventana()
+            for k in range(ventana.shape[1]):
+                columna = np.full(len(self.mercados), np.nan)
+                columna[:ventana.shape[0]] = ventana[:, k]
+                nuevo.agregar(columna)
+            self.historial[indicador] = nuevo
+
+    def serie(self, mercado: str, indicador: str = 'hhi') -> np.ndarray:
+        """Historia de un indicador para un bien (o ``'sector:<categoria>'``)"""
+        fila = self._fila.get(mercado)
+        return self.historial[indicador].serie(fila) if fila is not None else np.empty(0)
+
+    def mercados_concentrados(self, umbral_hhi: float, ciclos: int = 3, incluir_sectores: bool = False) -> List[str]:
+        """Mercados con HHI por encima del umbral en cada uno de los últimos ``ciclos`` ciclos"""
+        ventana = self.historial['hhi'].ventana(ciclos)
+        if ventana.shape[1] < ciclos:
+            return []
+        with np.errstate(invalid='ignore'):
+            persistentes = (ventana > umbral_hhi).all(axis=1)
+        return [m for m, si in zip(self.mercados, persistentes.tolist())
+                if si and (incluir_sectores or not m.startswith('sector:'))]
+
+
 @dataclass
 class ConfigCreacionEmpresas:
     """Configuración para creación dinámica de empresas"""
@@ -20,6 +164,7 @@ class ConfigCreacionEmpresas:
     factor_mercado: float = 0.1
     umbral_concentracion_hhi: float = 0.6
     cooldown_creacion_ciclos: int = 5
+    ciclos_concentracion_mercado: int = 3  # Ciclos seguidos sobre el umbral para intervenir un bien
 
 class ControladorConcentracionEmpresarial:
     """Sistema que previene monopolización y fomenta competencia"""
@@ -31,6 +176,7 @@ class ControladorConcentracionEmpresarial:
         self.ultimo_ciclo_creacion = {}
         self.contador_empresas_globales = 0
         self.historia_concentracion = []
+        self.motor = MotorConcentracion(capacidad_historial=30)
         
     def controlar_concentracion_ciclo(self, simulador, ciclo: int) -> Dict[str, Any]:
         """Controla la concentración empresarial en cada ciclo"""
@@ -73,48 +219,48 @@ class ControladorConcentracionEmpresarial:
     
     def _analizar_concentracion(self, simulador) -> Dict[str, Any]:
         """Analiza el nivel actual de concentración del mercado"""
-        # Obtener empresas activas (no en quiebra y con dinero suficiente)
-        empresas = simulador.getEmpresas()
-        empresas_activas = []
-        for e in empresas:
-            # Una empresa está "activa" si no está en quiebra y tiene recursos mínimos
-            if hasattr(e, 'en_quiebra') and not e.en_quiebra and e.dinero > 1000:
-                empresas_activas.append(e)
-            elif not hasattr(e, 'en_quiebra') and e.dinero > 1000:
-                empresas_activas.append(e)
-        
-        if len(empresas_activas) < 2:
-            return analisis  # No hay suficientes empresas para analizar concentración
+        # Una empresa está "activa" si no está en quiebra y tiene recursos mínimos
+        empresas_activas = [e for e in simulador.getEmpresas()
+                            if not getattr(e, 'en_quiebra', False) and e.dinero > 1000]
         
         analisis = {
             'empresas_activas': len(empresas_activas),
             'hhi_actual': 0.0,
             'empresa_dominante_cuota': 0.0,
+            'cr4': 0.0,
+            'cr8': 0.0,
             'distribucion_tamanos': [],
             'mercado_total': 0.0
         }
         
-        if not empresas_activas:
-            return analisis
+        # Concentración de cada bien y sector según las ventas del ciclo
+        if hasattr(simulador, 'ventas_ciclo_actual'):
+            por_bien, por_sector = self.motor.calcular(simulador)
+            analisis['por_bien'] = por_bien
+            analisis['por_sector'] = por_sector
+            analisis['mercados_concentrados'] = self.motor.mercados_concentrados(
+                self.config.umbral_concentracion_hhi, self.config.ciclos_concentracion_mercado)
         
-        # Calcular cuotas de mercado (basado en capital o empleados)
-        tamanos_empresas = []
-        for empresa in empresas_activas:
-            tamano = self._calcular_tamano_empresa(empresa)
-            tamanos_empresas.append(tamano)
+        if len(empresas_activas) < 2:
+            return analisis  # No hay suficientes empresas para analizar concentración
         
-        analisis['mercado_total'] = sum(tamanos_empresas)
+        # Cuotas de mercado agregadas (basadas en capital o empleados)
+        tamanos = np.fromiter((self._calcular_tamano_empresa(e) for e in empresas_activas),
+                              dtype=float, count=len(empresas_activas))
+        analisis['mercado_total'] = float(tamanos.sum())
         
         if analisis['mercado_total'] > 0:
-            # Calcular cuotas de mercado
-            cuotas = [tamano / analisis['mercado_total'] for tamano in tamanos_empresas]
-            analisis['distribucion_tamanos'] = cuotas
+            cuotas = tamanos / analisis['mercado_total']
+            ordenadas = -np.sort(-cuotas)
+            analisis['distribucion_tamanos'] = cuotas.tolist()
             
-            # Calcular Índice Herfindahl-Hirschman (HHI)
-            analisis['hhi_actual'] = sum(cuota ** 2 for cuota in cuotas)
+            # Índice Herfindahl-Hirschman (HHI)
+            analisis['hhi_actual'] = float(cuotas @ cuotas)
+            analisis['cr4'] = float(ordenadas[:4].sum())
+            analisis['cr8'] = float(ordenadas[:8].sum())
             
             # Empresa dominante
-            analisis['empresa_dominante_cuota'] = max(cuotas) if cuotas else 0.0
+            analisis['empresa_dominante_cuota'] = float(ordenadas[0])
         
         return analisis
     
@@ -126,12 +272,17 @@ class ControladorConcentracionEmpresarial:
         elif hasattr(empresa, 'capital'):
             return empresa.capital
         elif hasattr(empresa, 'produccion'):
-            return empresa.produccion
+            return self._magnitud(empresa.produccion)
         elif hasattr(empresa, 'capacidad_produccion'):
-            return empresa.capacidad_produccion
+            return self._magnitud(empresa.capacidad_produccion)
         else:
             return 1000.0  # Valor por defecto
     
+    @staticmethod
+    def _magnitud(valor) -> float:
+        # EmpresaProductora guarda la capacidad por bien
+        return float(sum(valor.values())) if isinstance(valor, dict) else valor
+    
     def _evaluar_necesidad_intervencion(self, analisis: Dict, ciclo: int) -> Dict[str, Any]:
         """Evalúa si se necesita intervención anti-monopolio"""
         evaluacion = {
@@ -175,6 +326,15 @@ class ControladorConcentracionEmpresarial:
                 evaluacion['urgencia'] = 1
                 evaluacion['empresas_a_crear'] = 1
         
+        # Criterio 5: Bienes concretos concentrados varios ciclos seguidos
+        mercados_objetivo = analisis.get('mercados_concentrados', [])
+        evaluacion['mercados_objetivo'] = mercados_objetivo
+        if not evaluacion['necesaria'] and mercados_objetivo:
+            evaluacion['necesaria'] = True
+            evaluacion['razon'] = f"Mercados concentrados: {', '.join(mercados_objetivo[:3])}"
+            evaluacion['urgencia'] = 1
+            evaluacion['empresas_a_crear'] = min(2, len(mercados_objetivo))
+        
         # Verificar cooldown
         if evaluacion['necesaria']:
             tiempo_desde_ultima = ciclo - self.ultimo_ciclo_creacion.get('global', 0)
@@ -190,7 +350,8 @@ class ControladorConcentracionEmpresarial:
         
         for i in range(necesidad['empresas_a_crear']):
             try:
-                nueva_empresa = self._crear_empresa_individual(simulador, i, ciclo, necesidad['urgencia'])
+                nueva_empresa = self._crear_empresa_individual(simulador, i, ciclo, necesidad['urgencia'],
+                                                               necesidad.get('mercados_objetivo'))
                 if nueva_empresa:
                     empresas_creadas.append(nueva_empresa)
                     
@@ -203,10 +364,11 @@ class ControladorConcentracionEmpresarial:
             
         return empresas_creadas
     
-    def _crear_empresa_individual(self, simulador, indice: int, ciclo: int, urgencia: int) -> Optional[Dict]:
+    def _crear_empresa_individual(self, simulador, indice: int, ciclo: int, urgencia: int,
+                                  mercados_objetivo: Optional[List[str]] = None) -> Optional[Dict]:
         """Crea una empresa individual optimizada"""
         try:
-            from src.models.Empresa import Empresa
+            from src.models.EmpresaProductora import EmpresaProductora
             
             # Generar parámetros de la empresa
             empresa_id = f"Antimonopolio_{ciclo}_{indice}"
@@ -221,15 +383,12 @@ class ControladorConcentracionEmpresarial:
             multiplicador_urgencia = {1: 1.0, 2: 1.3, 3: 1.6}.get(urgencia, 1.0)
             capital_inicial = capital_base * multiplicador_urgencia
             
-            # Crear empresa
-            nueva_empresa = Empresa(
-                id=empresa_id,
-                capital=capital_inicial,
-                capacidad_produccion=random.randint(100, 300)
-            )
+            # Crear empresa productora con acciones, como las entrantes del mercado laboral
+            nueva_empresa = EmpresaProductora.crear_con_acciones(empresa_id, simulador, 500)
+            nueva_empresa.dinero = capital_inicial
             
             # Configurar parámetros optimizados
-            self._configurar_empresa_competitiva(nueva_empresa, simulador, urgencia)
+            self._configurar_empresa_competitiva(nueva_empresa, simulador, urgencia, mercados_objetivo)
             
             # Añadir al mercado
             simulador.agregar_persona(nueva_empresa)
@@ -238,7 +397,8 @@ class ControladorConcentracionEmpresarial:
             detalles = {
                 'id': empresa_id,
                 'capital': capital_inicial,
-                'capacidad': nueva_empresa.capacidad_produccion,
+                'capacidad': self._magnitud(nueva_empresa.capacidad_produccion),
+                'bienes': list(nueva_empresa.capacidad_produccion),
                 'urgencia': urgencia,
                 'ciclo_creacion': ciclo
             }
@@ -252,53 +412,61 @@ class ControladorConcentracionEmpresarial:
             self.logger.error(f"Error creando empresa individual: {e}")
             return None
     
-    def _configurar_empresa_competitiva(self, empresa, simulador, urgencia: int):
+    def _configurar_empresa_competitiva(self, empresa, simulador, urgencia: int,
+                                        mercados_objetivo: Optional[List[str]] = None):
         """Configura una empresa para ser competitiva"""
         # Configuración básica
         empresa.activa = True
+        empresa.es_entrante = True
         
-        # Eficiencia basada en análisis del mercado
-        if hasattr(empresa, 'eficiencia'):
-            # Eficiencia ligeramente superior para compensar desventaja inicial
-            empresa.eficiencia = random.uniform(0.75, 0.95)
+        # Eficiencia ligeramente superior para compensar desventaja inicial
+        empresa.eficiencia_produccion = min(empresa.eficiencia_maxima,
+                                            empresa.eficiencia_produccion * random.uniform(1.0, 1.03))
         
-        # Productividad laboral competitiva
-        if hasattr(empresa, 'productividad_laboral'):
-            empresa.productividad_laboral = random.uniform(0.85, 1.05)
+        # Estrategia inicial de precios (ligeramente competitiva)
+        factor_precio = random.uniform(0.9, 1.0)
+        for bien in empresa.precios:
+            empresa.precios[bien] = max(1, empresa.precios[bien] * factor_precio)
         
-        # Empleados iniciales
-        if hasattr(empresa, 'empleados'):
-            num_empleados_inicial = random.randint(5, 20)
-            empresa.empleados = [f"Empleado_{i}" for i in range(num_empleados_inicial)]
+        # Entrar en los bienes concentrados que motivaron la intervención
+        if mercados_objetivo:
+            productos = [b for b in mercados_objetivo if b in empresa.capacidad_produccion]
+            productos = productos[:random.randint(1, 3)]
+        else:
+            # Especialización en los productos con menos productores
+            productores = {bien: 0 for bien in empresa.capacidad_produccion}
+            for otra in simulador.getEmpresas():
+                for bien in getattr(otra, 'capacidad_produccion', ()):
+                    if bien in productores:
+                        productores[bien] += 1
+            menos_competidos = sorted(productores, key=productores.get)
+            productos = menos_competidos[:random.randint(1, 3)]
         
-        # Estrategia inicial de precios (ligeramente competitiva)
-        if hasattr(empresa, 'factor_precio'):
-            empresa.factor_precio = random.uniform(0.9, 1.1)
+        if productos:
+            self._especializar(empresa, productos, urgencia)
+    
+    @staticmethod
+    def _especializar(empresa, productos: List[str], urgencia: int):
+        """Concentra la capacidad de la empresa en ``productos``: solo ofrece esos bienes"""
+        capacidad_total = sum(empresa.capacidad_produccion.values())
+        capacidad_por_bien = max(1, int(capacidad_total / len(productos) * (0.2 + 0.1 * urgencia)))
+        for bien in productos:
+            empresa.capacidad_produccion[bien] = max(empresa.capacidad_produccion[bien], capacidad_por_bien)
         
-        # Especialización en productos menos saturados
-        if hasattr(simulador, 'bienes') and simulador.bienes:
-            # Seleccionar productos con menor competencia
-            productos_disponibles = []
-            for bien_nombre in simulador.bienes.keys():
-                # Contar productores existentes
-                productores = sum(1 for e in simulador.getEmpresas() 
-                                if hasattr(e, 'productos_fabricados') and bien_nombre in e.productos_fabricados)
-                productos_disponibles.append((bien_nombre, productores))
-            
-            # Ordenar por menor competencia
-            productos_disponibles.sort(key=lambda x: x[1])
-            
-            # Asignar productos menos competidos
-            if productos_disponibles and hasattr(empresa, 'productos_fabricados'):
-                productos_a_fabricar = [p[0] for p in productos_disponibles[:random.randint(1, 3)]]
-                empresa.productos_fabricados = productos_a_fabricar
+        # Como en EmpresaProductoraHiperrealista, se quitan los demás bienes de
+        # todos los diccionarios por producto para que no se produzcan ni ofrezcan
+        for por_bien in (empresa.capacidad_produccion, empresa.produccion_actual, empresa.precios,
+                         empresa.costos_unitarios, empresa.costos_variables, empresa.bienes):
+            for bien in [b for b in por_bien if b not in productos]:
+                del por_bien[bien]
     
     def _actualizar_historial(self, analisis: Dict):
         """Actualiza el historial de concentración"""
         self.historia_concentracion.append({
             'empresas_activas': analisis['empresas_activas'],
             'hhi': analisis['hhi_actual'],
-            'cuota_dominante': analisis['empresa_dominante_cuota']
+            'cuota_dominante': analisis['empresa_dominante_cuota'],
+            'mercados_concentrados': len(analisis.get('mercados_concentrados', []))
         })
         
         # Mantener solo últimos 30 registros
@@ -320,5 +488,7 @@ class ControladorConcentracionEmpresarial:
                 'cooldown_ciclos': self.config.cooldown_creacion_ciclos
             },
             'historia_reciente': historia_reciente,
+            'mercados_concentrados': self.motor.mercados_concentrados(
+                self.config.umbral_concentracion_hhi, self.config.ciclos_concentracion_mercado),
             'empresas_creadas_detalles': list(self.empresas_creadas.values())[-5:]
         }
@@ -5,6 +5,7 @@ y simulación de corridas bancarias.
 """
 
 from typing import Dict, List
+from ..utils.SimuladorLogger import diagnostico
 
 
 def detectar_burbuja_precios(mercado, bien: str = None, ventana: int = 5, umbral: float = 0.5) -> bool:
@@ -90,8 +91,8 @@ def evaluar_recuperacion_crisis(mercado) -> bool:
 
     # Condición 1: Crisis muy prolongada (recuperación forzada)
     if hasattr(mercado, 'ciclos_en_crisis') and mercado.ciclos_en_crisis > 15:
-        print(
-            f"🔄 Forzando salida de crisis tras {mercado.ciclos_en_crisis} ciclos")
+        diagnostico("🔄 Forzando salida de crisis tras %s ciclos", mercado.ciclos_en_crisis,
+                    componente='Crisis')
         return True
 
     # Condición 2: PIB creciente por 2+ ciclos consecutivos
@@ -104,7 +105,7 @@ def evaluar_recuperacion_crisis(mercado) -> bool:
         pib_positivo = ultimos_pibs[-1] > 100  # PIB mínimo absoluto
 
         if crecimiento1 and crecimiento2 and pib_positivo:
-            print("📈 Recuperación detectada: PIB creciente sostenido")
+            diagnostico("📈 Recuperación detectada: PIB creciente sostenido", componente='Crisis')
             return True
 
     # Condición 3: Actividad económica sostenida
@@ -114,8 +115,8 @@ def evaluar_recuperacion_crisis(mercado) -> bool:
             if t.get('ciclo', 0) >= mercado.ciclo_actual - 3
         ]
         if len(transacciones_recientes) > 150:  # Más actividad requerida
-            print(
-                f"💼 Actividad económica recuperada: {len(transacciones_recientes)} transacciones")
+            diagnostico("💼 Actividad económica recuperada: %s transacciones", len(transacciones_recientes),
+                        componente='Crisis')
             return True
 
     # Condición 4: Sistema bancario estable
@@ -123,7 +124,7 @@ def evaluar_recuperacion_crisis(mercado) -> bool:
         bancos_solventes = sum(1 for banco in mercado.sistema_bancario.bancos
                                if banco.calcular_ratio_solvencia() > 0.1)
         if bancos_solventes >= len(mercado.sistema_bancario.bancos) * 0.8:
-            print("🏦 Sistema bancario estabilizado")
+            diagnostico("🏦 Sistema bancario estabilizado", componente='Crisis')
             return True
 
     return False
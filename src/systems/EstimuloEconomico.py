@@ -2,6 +2,8 @@
 Sistema de Estímulo Económico para activar la economía cuando está estancada
 """
 import random
+import logging
+from ..utils.SimuladorLogger import diagnostico
 
 
 def detectar_estancamiento_economico(mercado):
@@ -16,7 +18,7 @@ def detectar_estancamiento_economico(mercado):
 
 def aplicar_estimulo_emergencia(mercado):
     """Aplica estímulos de emergencia para reactivar la economía estancada"""
-    print("🚨 ECONOMÍA ESTANCADA - Aplicando estímulos de emergencia...")
+    diagnostico("🚨 ECONOMÍA ESTANCADA - Aplicando estímulos de emergencia...", componente='Crisis')
 
     # 1. Compras gubernamentales masivas
     _realizar_compras_gubernamentales(mercado)
@@ -30,7 +32,7 @@ def aplicar_estimulo_emergencia(mercado):
     # 4. Forzar producción mínima
     _forzar_produccion_minima(mercado)
 
-    print("✅ Estímulos de emergencia aplicados")
+    diagnostico("✅ Estímulos de emergencia aplicados", componente='Crisis')
 
 
 def _realizar_compras_gubernamentales(mercado):
@@ -72,9 +74,10 @@ def _realizar_compras_gubernamentales(mercado):
                 mercado.registrar_transaccion(
                     mercado.gobierno, bien_elegido, cantidad_compra, costo_total, mercado.ciclo_actual
                 )
+                mercado.registrar_venta(empresa, bien_elegido, costo_total)
 
-                print(
-                    f"  🏛️ Gobierno compró {cantidad_compra} {bien_elegido} de {empresa.nombre}")
+                diagnostico("  🏛️ Gobierno compró %s %s de %s", cantidad_compra, bien_elegido, empresa.nombre,
+                            componente='Crisis')
 
 
 def _subsidiar_empresas(mercado):
@@ -119,8 +122,8 @@ def _forzar_produccion_minima(mercado):
                         empresa.producir_bien_mejorado(
                             bien, cantidad_minima, mercado)
                     except Exception as e:
-                        print(
-                            f"    ⚠️ Error forzando producción en {empresa.nombre}: {e}")
+                        diagnostico("    ⚠️ Error forzando producción en %s: %s", empresa.nombre, e,
+                                    componente='Crisis', nivel=logging.WARNING)
 
 
 def ciclo_estimulo_economico(mercado):
@@ -154,3 +157,4 @@ def _aplicar_estimulos_menores(mercado):
                     mercado.registrar_transaccion(
                         mercado.gobierno, bien_random, 2, precio * 2, mercado.ciclo_actual
                     )
+                    mercado.registrar_venta(empresa_random, bien_random, precio * 2)
@@ -130,7 +130,7 @@ class GestorDiversificacionEmpresarial:
         nueva_empresa.tipo_diversificacion = tipo
         nueva_empresa.ciclo_entrada = ciclo
         
-        self.mercado.personas.append(nueva_empresa)
+        self.mercado.agregar_persona(nueva_empresa)
         self.empresas_creadas += 1
         
         self.logger.info(f"Empresa competidora creada: {nombre_base} ({tipo}) con ${nueva_empresa.dinero:.0f}")
@@ -224,7 +224,7 @@ class GestorDiversificacionEmpresarial:
         empresa_spinoff.empresa_madre = empresa_grande.nombre
         empresa_spinoff.ciclo_entrada = ciclo
         
-        self.mercado.personas.append(empresa_spinoff)
+        self.mercado.agregar_persona(empresa_spinoff)
         self.split_ups_realizados += 1
         
         self.logger.info(f"Split-up realizado: {nombre_spinoff} con ${capital_transferido:.0f} y {len(productos_spinoff)} productos")
@@ -5,7 +5,102 @@ Implementa rescates, fusiones y liquidaciones ordenadas
 
 import random
 import math
-from ..utils.SimuladorLogger import get_simulador_logger
+import logging
+
+import numpy as np
+
+from ..utils.SimuladorLogger import get_simulador_logger, diagnostico
+
+
+class CarterasFusion:
+    """Carteras de productos de las empresas como matriz de incidencia empresa × bien.
+
+    Se construye una vez por pasada de rescate: el solapamiento de todas las
+    empresas en crisis con todas las del mercado sale de una sola
+    multiplicación de matrices, y tras cada rescate o fusión solo se
+    refrescan las filas de las empresas afectadas. ``socio`` devuelve el
+    mismo candidato que el recorrido con conjuntos de
+    ``_son_compatibles_fusion``: la empresa sana más capitalizada con un
+    solapamiento dentro del rango, la primera en orden de mercado si empatan.
+    """
+
+    def __init__(self, empresas, empresas_crisis=(), capital_minimo=20000, rango_solapamiento=(0.2, 0.8)):
+        self.empresas = list(empresas)
+        self.capital_minimo = capital_minimo
+        self.rango_solapamiento = rango_solapamiento
+        self._posicion = {id(e): i for i, e in enumerate(self.empresas)}
+        self._columnas = {}
+        for empresa in self.empresas:
+            for bien in getattr(empresa, 'bienes', None) or ():
+                self._columnas.setdefault(bien, len(self._columnas))
+
+        n = len(self.empresas)
+        # 0/1 en float para que el solapamiento use BLAS
+        self.cartera = np.zeros((n, len(self._columnas)))
+        self.con_bienes = np.zeros(n, dtype=bool)
+        self.dinero = np.full(n, -np.inf)
+        self.activa = np.ones(n, dtype=bool)
+        for i, empresa in enumerate(self.empresas):
+            self._leer_empresa(i, empresa)
+        self.tamanos = self.cartera.sum(axis=1)
+
+        # Solapamiento de cada empresa en crisis con todo el mercado
+        self._filas_crisis = {}
+        posiciones = []
+        for empresa in empresas_crisis:
+            i = self._posicion.get(id(empresa))
+            if i is not None and id(empresa) not in self._filas_crisis:
+                self._filas_crisis[id(empresa)] = len(posiciones)
+                posiciones.append(i)
+        self._posiciones_crisis = np.array(posiciones, dtype=np.intp)
+        self.interseccion = self.cartera[self._posiciones_crisis] @ self.cartera.T
+
+    def _leer_empresa(self, i, empresa):
+        bienes = getattr(empresa, 'bienes', None)
+        self.con_bienes[i] = hasattr(empresa, 'bienes')
+        self.cartera[i] = 0
+        if bienes:
+            nuevos = [b for b in bienes if b not in self._columnas]
+            if nuevos:
+                for bien in nuevos:
+                    self._columnas[bien] = len(self._columnas)
+                self.cartera = np.pad(self.cartera, ((0, 0), (0, len(nuevos))))
+            self.cartera[i, [self._columnas[b] for b in bienes]] = 1
+        self.dinero[i] = empresa.dinero if hasattr(empresa, 'dinero') else -np.inf
+
+    def refrescar(self, empresa, activa=True):
+        """Vuelve a leer cartera y capital de una empresa tras un rescate o fusión"""
+        i = self._posicion.get(id(empresa))
+        if i is None:
+            return
+        self._leer_empresa(i, empresa)
+        self.activa[i] = activa
+        self.tamanos[i] = self.cartera[i].sum()
+        if len(self._posiciones_crisis):
+            self.interseccion[:, i] = self.cartera[self._posiciones_crisis] @ self.cartera[i]
+        fila = self._filas_crisis.get(id(empresa))
+        if fila is not None:
+            self.interseccion[fila] = self.cartera @ self.cartera[i]
+
+    def socio(self, empresa_crisis):
+        """Empresa sana compatible para fusión con más capital, o None"""
+        i = self._posicion.get(id(empresa_crisis))
+        if i is None or not self.con_bienes[i]:
+            return None
+        fila = self._filas_crisis.get(id(empresa_crisis))
+        interseccion = self.interseccion[fila] if fila is not None else self.cartera @ self.cartera[i]
+
+        union = self.tamanos[i] + self.tamanos - interseccion
+        with np.errstate(divide='ignore', invalid='ignore'):
+            solapamiento = interseccion / union
+        minimo, maximo = self.rango_solapamiento
+        candidatos = ((solapamiento >= minimo) & (solapamiento <= maximo) & (self.dinero > self.capital_minimo)
+                      & self.activa & self.con_bienes)
+        candidatos[i] = False
+        if not candidatos.any():
+            return None
+        return self.empresas[int(np.argmax(np.where(candidatos, self.dinero, -np.inf)))]
+
 
 class GestorRescateEmpresarial:
     """Gestiona rescates empresariales para mantener estabilidad económica"""
@@ -26,6 +121,14 @@ class GestorRescateEmpresarial:
         
         self.logger = get_simulador_logger()
         
+        # Carteras de la pasada en curso (se crean al buscar el primer socio)
+        self._carteras = None
+        self._empresas_crisis_pasada = ()
+        
+    def _busqueda_vectorizada_activa(self):
+        config_performance = getattr(self.mercado, 'config_performance', None) or {}
+        return config_performance.get('vectorizar_busqueda_fusiones', True)
+    
     def evaluar_y_rescatar_empresas(self, ciclo):
         """Evalúa empresas en crisis y aplica medidas de rescate"""
         
@@ -40,24 +143,34 @@ class GestorRescateEmpresarial:
         
         # Evaluar cada empresa para rescate
         rescates_ejecutados = 0
-        for empresa in empresas_en_crisis:
-            if rescates_ejecutados >= self.max_rescates_por_ciclo:
-                break
-                
-            decision = self._evaluar_empresa_para_rescate(empresa, fondo_disponible)
-            
-            if decision['accion'] == 'RESCATAR':
-                if self._ejecutar_rescate(empresa, decision['monto'], ciclo):
-                    fondo_disponible -= decision['monto']
-                    rescates_ejecutados += 1
-                    
-            elif decision['accion'] == 'FUSIONAR':
-                socio_potencial = decision.get('socio')
-                if socio_potencial and self._ejecutar_fusion(empresa, socio_potencial, ciclo):
-                    rescates_ejecutados += 1
+        self._empresas_crisis_pasada = empresas_en_crisis
+        try:
+            for empresa in empresas_en_crisis:
+                if rescates_ejecutados >= self.max_rescates_por_ciclo:
+                    break
                     
-            elif decision['accion'] == 'LIQUIDAR':
-                self._ejecutar_liquidacion_ordenada(empresa, ciclo)
+                decision = self._evaluar_empresa_para_rescate(empresa, fondo_disponible)
+                
+                if decision['accion'] == 'RESCATAR':
+                    if self._ejecutar_rescate(empresa, decision['monto'], ciclo):
+                        fondo_disponible -= decision['monto']
+                        rescates_ejecutados += 1
+                    if self._carteras is not None:
+                        self._carteras.refrescar(empresa)
+                        
+                elif decision['accion'] == 'FUSIONAR':
+                    socio_potencial = decision.get('socio')
+                    if socio_potencial and self._ejecutar_fusion(empresa, socio_potencial, ciclo):
+                        rescates_ejecutados += 1
+                    if self._carteras is not None and socio_potencial:
+                        self._carteras.refrescar(empresa, activa=empresa in self.mercado.personas)
+                        self._carteras.refrescar(socio_potencial)
+                        
+                elif decision['accion'] == 'LIQUIDAR':
+                    self._ejecutar_liquidacion_ordenada(empresa, ciclo)
+        finally:
+            self._carteras = None
+            self._empresas_crisis_pasada = ()
         
         # Log resumen de actividad
         if rescates_ejecutados > 0:
@@ -216,6 +329,25 @@ class GestorRescateEmpresarial:
     
     def _buscar_socio_fusion(self, empresa_crisis):
         """Busca una empresa compatible para fusión"""
+        if self._busqueda_vectorizada_activa():
+            try:
+                if self._carteras is None:
+                    crisis = self._empresas_crisis_pasada or (empresa_crisis,)
+                    self._carteras = CarterasFusion(self.mercado.getEmpresas(), crisis)
+                    if not self._empresas_crisis_pasada:
+                        # Búsqueda suelta, fuera de una pasada de rescate: no se reutiliza
+                        carteras, self._carteras = self._carteras, None
+                        return carteras.socio(empresa_crisis)
+                return self._carteras.socio(empresa_crisis)
+            except Exception as e:
+                diagnostico("⚠️  Error en búsqueda vectorizada de socio de fusión: %s", e,
+                            componente='Rescate', nivel=logging.WARNING)
+                self._carteras = None
+                # Continuar con método tradicional
+        return self._buscar_socio_fusion_escalar(empresa_crisis)
+    
+    def _buscar_socio_fusion_escalar(self, empresa_crisis):
+        """Recorrido empresa a empresa con ``_son_compatibles_fusion``"""
         candidatos = []
         
         for empresa in self.mercado.getEmpresas():
@@ -305,7 +437,7 @@ class GestorRescateEmpresarial:
             
             # Eliminar empresa en crisis del mercado
             if empresa_crisis in self.mercado.personas:
-                self.mercado.personas.remove(empresa_crisis)
+                self.mercado.retirar_persona(empresa_crisis)
             
             # Registrar fusión
             fusion = {
@@ -386,7 +518,7 @@ class GestorRescateEmpresarial:
         
         for empresa in empresas_a_liquidar:
             if empresa in self.mercado.personas:
-                self.mercado.personas.remove(empresa)
+                self.mercado.retirar_persona(empresa)
             self.logger.log_sistema(f"🗑️ LIQUIDACIÓN FINAL: {empresa.nombre} removida del mercado")
     
     def obtener_estadisticas_rescate(self):
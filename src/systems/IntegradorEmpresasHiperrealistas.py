@@ -326,10 +326,18 @@ class GestorEmpresasHiperrealistas:
         """Gestiona la competencia empresarial intensificada"""
         # Identificar mercados altamente competitivos
         mercados_competitivos = {}
+        indice = getattr(self.mercado, 'indice_oferentes', None)
         
         for bien in self.mercado.bienes:
+            if indice is not None:
+                # Solo las empresas con existencias del bien, sin recorrer el mercado
+                if indice.num_con_existencias(bien) <= 2:
+                    continue
+                candidatas = indice.con_existencias(bien)
+            else:
+                candidatas = self.mercado.getEmpresas()
             empresas_competidoras = [
-                e for e in self.mercado.getEmpresas()
+                e for e in candidatas
                 if bien in e.precios and len(e.bienes.get(bien, [])) > 0
             ]
             
@@ -1102,7 +1110,7 @@ class SistemaFusionesAdquisiciones:
     def _remover_empresa_objetivo(self, empresa_objetivo):
         """Remueve la empresa objetivo del mercado"""
         if empresa_objetivo in self.mercado.personas:
-            self.mercado.personas.remove(empresa_objetivo)
+            self.mercado.retirar_persona(empresa_objetivo)
 
 
 class ObservatorioEmpresarial:
@@ -5,10 +5,15 @@ Implementa bolsa de valores, derivados, análisis fundamental/técnico y burbuja
 
 import random
 import math
+import logging
+from collections.abc import Sequence
 from enum import Enum
 from dataclasses import dataclass
 from typing import Dict, List, Optional
-from ..utils.SimuladorLogger import get_simulador_logger
+
+import numpy as np
+
+from ..utils.SimuladorLogger import get_simulador_logger, diagnostico
 
 
 class TipoInstrumento(Enum):
@@ -51,9 +56,118 @@ class Instrumento:
             self.historia_precios = [self.precio_inicial]
 
 
+class HistorialCircular:
+    """Historia de precios de todas las acciones en un buffer circular NumPy.
+
+    Cada columna es un período y todas las series avanzan a la vez. Cada
+    valor se escribe dos veces (posición ``j`` y ``j + capacidad``), así que
+    los últimos ``k`` períodos siempre son un tramo contiguo del array y
+    ``ventana`` los devuelve como vista, sin copiar ni desplazar elementos.
+    """
+
+    def __init__(self, num_series: int, capacidad: int = 20):
+        self.capacidad = capacidad
+        self._datos = np.zeros((num_series, 2 * capacidad))
+        self._siguiente = 0  # Columna donde se escribirá el próximo período
+        self.longitud = 0
+
+    @classmethod
+    def desde_series(cls, series, capacidad: int = 20) -> 'HistorialCircular':
+        """Crea el buffer con la cola común de varias historias existentes"""
+        historial = cls(len(series), capacidad)
+        if series:
+            comun = min(capacidad, min(len(s) for s in series))
+            for k in range(comun, 0, -1):
+                historial.agregar([s[-k] for s in series])
+        return historial
+
+    def agregar(self, valores):
+        """Añade un período (un valor por serie)"""
+        j = self._siguiente
+        self._datos[:, j] = valores
+        self._datos[:, j + self.capacidad] = valores
+        self._siguiente = (j + 1) % self.capacidad
+        self.longitud = min(self.longitud + 1, self.capacidad)
+
+    def ventana(self, k: Optional[int] = None) -> np.ndarray:
+        """Vista de solo lectura (series × k) de los últimos k períodos, del más antiguo al más reciente"""
+        k = self.longitud if k is None else min(k, self.longitud)
+        fin = self._siguiente + self.capacidad
+        vista = self._datos[:, fin - k:fin]
+        vista.flags.writeable = False
+        return vista
+
+    def serie(self, fila: int) -> np.ndarray:
+        """Vista de la historia completa de una serie"""
+        return self.ventana()[fila]
+
+
+class VistaHistorial(Sequence):
+    """Historia de una acción leída directamente del ``HistorialCircular`` de la bolsa"""
+
+    def __init__(self, historial: HistorialCircular, fila: int):
+        self._historial = historial
+        self._fila = fila
+
+    def __len__(self):
+        return self._historial.longitud
+
+    def __getitem__(self, indice):
+        valores = self._historial.serie(self._fila)
+        if isinstance(indice, slice):
+            return valores[indice]
+        return float(valores[indice])
+
+    def __repr__(self):
+        return f"VistaHistorial({self._historial.serie(self._fila).tolist()})"
+
+
+class _CampoCotizacion:
+    """Atributo de ``Accion`` que, una vez listada, vive en un array de la bolsa.
+
+    Antes de listarse el valor se guarda en la propia instancia; después,
+    lecturas y escrituras van a la posición de la acción en el array, de modo
+    que el trading y las métricas leen los mismos datos que la actualización
+    vectorizada de precios.
+    """
+
+    def __init__(self, array: str, opcional: bool = False):
+        self.array = array
+        self.opcional = opcional  # NaN en el array equivale a None
+
+    def __set_name__(self, propietario, nombre):
+        self.privado = f"_{nombre}"
+
+    def __get__(self, obj, tipo=None):
+        if obj is None:
+            return self
+        bolsa = obj.__dict__.get('_bolsa')
+        if bolsa is None:
+            return obj.__dict__.get(self.privado)
+        valor = getattr(bolsa, self.array)[obj._indice].item()
+        if self.opcional and valor != valor:
+            return None
+        return valor
+
+    def __set__(self, obj, valor):
+        bolsa = obj.__dict__.get('_bolsa')
+        if bolsa is None:
+            obj.__dict__[self.privado] = valor
+        else:
+            getattr(bolsa, self.array)[obj._indice] = np.nan if valor is None else valor
+
+
 class Accion(Instrumento):
     """Acción de empresa con métricas fundamentales"""
-    
+
+    # Respaldados por los arrays de BolsaValores una vez listada
+    precio_actual = _CampoCotizacion('precios')
+    volumen_diario = _CampoCotizacion('volumenes')
+    pe_ratio = _CampoCotizacion('pe_ratios', opcional=True)
+    dividend_yield = _CampoCotizacion('dividend_yields', opcional=True)
+    roe = _CampoCotizacion('roes', opcional=True)
+    debt_to_equity = _CampoCotizacion('debt_to_equities', opcional=True)
+
     def __init__(self, empresa, ticker: str):
         self.empresa = empresa
         precio_inicial = self.calcular_precio_teorico(empresa)
@@ -111,6 +225,7 @@ class FondoInversion:
         self.nombre = nombre
         self.tipo = tipo_inversor
         self.capital = capital_inicial
+        self.capital_inicial = capital_inicial
         self.cartera = {}  # {ticker: cantidad}
         self.valor_cartera = capital_inicial
         
@@ -156,7 +271,11 @@ class BolsaValores:
         self.en_burbuja = False
         self.probabilidad_crash = 0.02  # 2% por ciclo
         self.factor_burbuja = 1.0
-        
+
+        # Cotizaciones de todas las acciones listadas, una posición por ticker
+        self.capacidad_historial = 20  # Últimos 20 períodos
+        self._construir_arrays()
+
         self.logger.log_configuracion("Bolsa de Valores inicializada")
         
     def listar_empresas(self):
@@ -177,7 +296,9 @@ class BolsaValores:
                 self._asignar_a_indice(accion)
                 
                 empresas_listadas += 1
-        
+
+        self._construir_arrays()
+
         # Crear fondos de inversión
         self._crear_fondos_inversion()
         
@@ -197,7 +318,47 @@ class BolsaValores:
             self.indices["BANKING"].append(accion.ticker)
         else:
             self.indices["INDUSTRIAL"].append(accion.ticker)
-    
+
+    def _construir_arrays(self):
+        """Vuelca las acciones listadas a arrays y enlaza cada Accion a su posición"""
+        acciones = list(self.acciones.values())
+        # Leer valores e historias antes de re-enlazar (pueden venir de arrays previos)
+        valores = [(a.precio_actual, a.volumen_diario, a.pe_ratio, a.dividend_yield,
+                    a.roe, a.debt_to_equity) for a in acciones]
+        historias = [list(a.historia_precios) for a in acciones]
+
+        n = len(acciones)
+        self.tickers = [a.ticker for a in acciones]
+        self.indice_ticker = {ticker: i for i, ticker in enumerate(self.tickers)}
+        columnas = list(zip(*valores)) or [()] * 6
+
+        def opcional(col):
+            return np.array([np.nan if v is None else v for v in col], dtype=float)
+
+        self.precios = np.array(columnas[0], dtype=float)
+        self.volumenes = np.array(columnas[1], dtype=np.int64)
+        self.pe_ratios = opcional(columnas[2])
+        self.dividend_yields = opcional(columnas[3])
+        self.roes = opcional(columnas[4])
+        self.debt_to_equities = opcional(columnas[5])
+        self.precios_iniciales = np.array([a.precio_inicial for a in acciones], dtype=float)
+        self.acciones_circulacion = np.array([a.acciones_circulacion for a in acciones], dtype=float)
+        self.rendimientos = np.zeros(n)
+        self.volatilidades = np.zeros(n)
+        self.historial = HistorialCircular.desde_series(historias, self.capacidad_historial)
+
+        # Pertenencia índice × acción para calcular todos los índices con un producto
+        self.pertenencia_indices = np.zeros((len(self.indices), n))
+        for fila, tickers in enumerate(self.indices.values()):
+            for ticker in tickers:
+                if ticker in self.indice_ticker:
+                    self.pertenencia_indices[fila, self.indice_ticker[ticker]] = 1.0
+
+        for i, accion in enumerate(acciones):
+            accion._bolsa = self
+            accion._indice = i
+            accion.historia_precios = VistaHistorial(self.historial, i)
+
     def _crear_fondos_inversion(self):
         """Crea fondos de inversión institucionales"""
         # Fondo de pensiones (conservador)
@@ -327,9 +488,9 @@ class BolsaValores:
         # Caída entre 20-50%
         factor_crash = random.uniform(0.5, 0.8)
         
-        for ticker, accion in self.acciones.items():
-            accion.precio_actual *= factor_crash
-            accion.historia_precios.append(accion.precio_actual)
+        precios_anteriores = self.precios.copy()
+        self.precios *= factor_crash
+        self._registrar_precios(precios_anteriores)
         
         # Pánico: vender todo
         for fondo in self.fondos_inversion:
@@ -351,6 +512,84 @@ class BolsaValores:
     
     def _actualizar_precios_acciones(self):
         """Actualiza precios de todas las acciones"""
+        if len(self.tickers) != len(self.acciones):
+            self._construir_arrays()
+        precios_anteriores = self.precios.copy()
+
+        config_performance = getattr(self.mercado, 'config_performance', None) or {}
+        actualizado = False
+        if config_performance.get('vectorizar_bolsa_valores', True):
+            try:
+                self._actualizar_precios_vectorizado()
+                actualizado = True
+            except Exception as e:
+                diagnostico("⚠️  Error en actualización vectorizada de acciones: %s", e, componente='Bolsa',
+                            nivel=logging.WARNING)
+                # Continuar con método tradicional
+        if not actualizado:
+            self._actualizar_precios_escalar()
+
+        self._registrar_precios(precios_anteriores)
+
+    def _actualizar_precios_vectorizado(self):
+        """Fundamentales + sentimiento + ruido + momentum de todas las acciones en un solo paso.
+
+        Los sorteos salen de un ``np.random.Generator`` sembrado con
+        ``random.getrandbits(32)``: con la misma semilla la simulación es
+        reproducible, pero la trayectoria de precios no coincide con la del
+        método escalar, que sortea con ``random`` acción por acción. Todo se
+        calcula antes de escribir en los arrays, así que un fallo a mitad deja
+        las cotizaciones intactas para el método tradicional.
+        """
+        acciones = [self.acciones[ticker] for ticker in self.tickers]
+        n = len(acciones)
+        if n == 0:
+            return
+        tiene_dinero = np.fromiter((hasattr(a.empresa, 'dinero') for a in acciones), dtype=bool, count=n)
+        dinero = np.fromiter((getattr(a.empresa, 'dinero', 0.0) for a in acciones), dtype=float, count=n)
+        # Semilla derivada de ``random`` para que las ejecuciones con seed sean reproducibles
+        rng = np.random.default_rng(random.getrandbits(32))
+
+        # Precio fundamental (mismo criterio que Accion.calcular_precio_teorico)
+        multiplo_pb = rng.uniform(1.2, 3.5, n)
+        precio_fundamental = np.where(dinero > 0, np.maximum(1.0, dinero / 1000000 * multiplo_pb), 10.0)
+
+        factor_sentimiento = 0.8 + (self.sentimiento_mercado * 0.4)
+        factor_volatilidad = rng.normal(1.0, self.volatilidad_mercado, n)
+        factor_burbuja = self.factor_burbuja if self.en_burbuja else 1.0
+
+        # Momentum (análisis técnico básico) sobre la ventana de 5 períodos
+        if self.historial.longitud >= 5:
+            ventana = self.historial.ventana(5)
+            factor_momentum = 1 + ((ventana[:, -1] - ventana[:, 0]) / ventana[:, 0]) * 0.1
+        else:
+            factor_momentum = 1.0
+
+        nuevo_precio = precio_fundamental * factor_sentimiento * factor_volatilidad * factor_burbuja * factor_momentum
+
+        # Límites de variación diaria (±15%) y precio mínimo $0.1
+        nuevo_precio = np.clip(nuevo_precio, self.precios * 0.85, self.precios * 1.15)
+        precios = np.maximum(0.1, nuevo_precio)
+
+        # Métricas fundamentales (mismo criterio que Accion.actualizar_metricas_fundamentales)
+        utilidades_estimadas = np.maximum(1, dinero * 0.05)
+        pe_ratio = (precios * self.acciones_circulacion) / utilidades_estimadas
+        dividend_yield = np.where(pe_ratio < 25, rng.uniform(0.02, 0.06, n), 0.01)
+        debt_to_equity = rng.uniform(0.2, 1.5, n)
+        pe_ratios = np.where(tiene_dinero, pe_ratio, self.pe_ratios)
+        roes = np.where(tiene_dinero, utilidades_estimadas / np.maximum(1, dinero), self.roes)
+        dividend_yields = np.where(tiene_dinero, dividend_yield, self.dividend_yields)
+        debt_to_equities = np.where(tiene_dinero, debt_to_equity, self.debt_to_equities)
+
+        # === Escritura de cotizaciones ===
+        self.precios[:] = precios
+        self.pe_ratios[:] = pe_ratios
+        self.roes[:] = roes
+        self.dividend_yields[:] = dividend_yields
+        self.debt_to_equities[:] = debt_to_equities
+
+    def _actualizar_precios_escalar(self):
+        """Actualiza las acciones una a una (método tradicional)"""
         for ticker, accion in self.acciones.items():
             # Precio fundamental
             precio_fundamental = accion.calcular_precio_teorico(accion.empresa)
@@ -377,15 +616,20 @@ class BolsaValores:
                              min(accion.precio_actual + max_cambio, nuevo_precio))
             
             accion.precio_actual = max(0.1, nuevo_precio)  # Precio mínimo $0.1
-            accion.historia_precios.append(accion.precio_actual)
-            
-            # Mantener solo últimos 20 precios
-            if len(accion.historia_precios) > 20:
-                accion.historia_precios.pop(0)
             
             # Actualizar métricas fundamentales
             accion.actualizar_metricas_fundamentales()
-    
+
+    def _registrar_precios(self, precios_anteriores):
+        """Añade el período al historial y actualiza rendimientos y volatilidades"""
+        self.rendimientos = np.divide(self.precios, precios_anteriores,
+                                      out=np.ones_like(self.precios),
+                                      where=precios_anteriores > 0) - 1
+        self.historial.agregar(self.precios)
+        if self.historial.longitud >= 3:
+            log_rendimientos = np.diff(np.log(self.historial.ventana()), axis=1)
+            self.volatilidades = log_rendimientos.std(axis=1)
+
     def _ejecutar_trading_institucional(self):
         """Ejecuta trading de fondos institucionales"""
         for fondo in self.fondos_inversion:
@@ -446,36 +690,32 @@ class BolsaValores:
     
     def _seleccionar_accion_compra(self, fondo: FondoInversion) -> str:
         """Selecciona acción para comprar basada en estrategia del fondo"""
-        acciones_disponibles = list(self.acciones.keys())
+        acciones_disponibles = self.tickers
         
         if not acciones_disponibles:
             return None
             
         if fondo.tipo == TipoInversor.INSTITUCIONAL:
             # Conservador: buscar P/E bajo y dividend yield alto
-            mejor_accion = None
-            mejor_score = -1
-            
-            for ticker in acciones_disponibles:
-                accion = self.acciones[ticker]
-                if accion.pe_ratio and accion.dividend_yield:
-                    score = (1 / accion.pe_ratio) + accion.dividend_yield
-                    if score > mejor_score:
-                        mejor_score = score
-                        mejor_accion = ticker
+            validas = (np.nan_to_num(self.pe_ratios) != 0) & (np.nan_to_num(self.dividend_yields) != 0)
+            if validas.any():
+                with np.errstate(divide='ignore', invalid='ignore'):
+                    score = np.where(validas, 1 / self.pe_ratios + self.dividend_yields, -np.inf)
+                mejor = int(np.argmax(score))
+                if score[mejor] > -1:
+                    return acciones_disponibles[mejor]
             
-            return mejor_accion or random.choice(acciones_disponibles)
+            return random.choice(acciones_disponibles)
             
         elif fondo.tipo == TipoInversor.ESPECULATIVO:
             # Agresivo: buscar momentum y volatilidad
             acciones_momentum = []
             
-            for ticker in acciones_disponibles:
-                accion = self.acciones[ticker]
-                if len(accion.historia_precios) >= 3:
-                    cambio_reciente = (accion.precio_actual - accion.historia_precios[-3]) / accion.historia_precios[-3]
-                    if cambio_reciente > 0.05:  # Subió >5% en últimos 3 períodos
-                        acciones_momentum.append(ticker)
+            if self.historial.longitud >= 3:
+                referencia = self.historial.ventana(3)[:, 0]
+                cambio_reciente = (self.precios - referencia) / referencia
+                # Subió >5% en últimos 3 períodos
+                acciones_momentum = [acciones_disponibles[i] for i in np.flatnonzero(cambio_reciente > 0.05)]
             
             return random.choice(acciones_momentum) if acciones_momentum else random.choice(acciones_disponibles)
         
@@ -505,58 +745,69 @@ class BolsaValores:
             
         # Retail tiende a ser más emocional
         if self.sentimiento_mercado > 0.7 and random.random() < 0.8:  # Comprar en euforia
-            ticker_compra = random.choice(list(self.acciones.keys()))
-            accion = self.acciones[ticker_compra]
-            cantidad = int(capital_inversion / accion.precio_actual)
+            i = random.randrange(len(self.tickers))
+            cantidad = int(capital_inversion / self.precios[i])
             
             if cantidad > 0:
-                costo = cantidad * accion.precio_actual
+                costo = cantidad * float(self.precios[i])
                 consumidor.dinero -= costo
-                accion.volumen_diario += cantidad
+                self.volumenes[i] += cantidad
                 
         elif self.sentimiento_mercado < 0.3 and random.random() < 0.6:  # Vender en pánico
             # Simular venta durante pánico del mercado
-            acciones_para_vender = [a for a in self.acciones.values() if a.precio_actual > a.precio_inicial * 0.5]
-            if acciones_para_vender:
-                accion_venta = random.choice(acciones_para_vender)
+            acciones_para_vender = np.flatnonzero(self.precios > self.precios_iniciales * 0.5)
+            if len(acciones_para_vender):
+                i = random.choice(acciones_para_vender)
                 cantidad_venta = random.randint(1, 20)
                 
                 # Reducir precio por presión de venta
                 factor_venta = 0.98  # 2% reducción por venta
-                accion_venta.precio_actual *= factor_venta
-                accion_venta.volumen_diario += cantidad_venta
+                self.precios[i] *= factor_venta
+                self.volumenes[i] += cantidad_venta
     
     def _actualizar_metricas_mercado(self):
         """Actualiza métricas generales del mercado"""
-        self.volumen_total_diario = sum(accion.volumen_diario for accion in self.acciones.values())
+        self.volumen_total_diario = int(self.volumenes.sum())
         
         # Reset volumen diario
-        for accion in self.acciones.values():
-            accion.volumen_diario = 0
+        self.volumenes[:] = 0
+
+        self._valorar_fondos()
+
+    def _valorar_fondos(self):
+        """Valora todas las carteras con un producto posiciones × precios"""
+        if not self.fondos_inversion:
+            return
+        posiciones = np.zeros((len(self.fondos_inversion), len(self.tickers)))
+        for f, fondo in enumerate(self.fondos_inversion):
+            for ticker, cantidad in fondo.cartera.items():
+                i = self.indice_ticker.get(ticker)
+                if i is None:  # Acción ya no listada
+                    continue
+                posiciones[f, i] = cantidad
+
+        valores_cartera = posiciones @ self.precios
+        # Volatilidad de cada cartera actual sobre la historia disponible
+        historia_carteras = posiciones @ self.historial.ventana()
+        for f, fondo in enumerate(self.fondos_inversion):
+            fondo.valor_cartera = fondo.capital + float(valores_cartera[f])
+            fondo.rendimiento_acumulado = fondo.valor_cartera / fondo.capital_inicial - 1
+            historia = historia_carteras[f]
+            if len(historia) >= 3 and (historia > 0).all():
+                fondo.volatilidad = float(np.diff(np.log(historia)).std())
     
     def _calcular_indices(self):
         """Calcula valores de índices bursátiles"""
+        # Promedio ponderado por capitalización de todos los índices a la vez
+        if len(self.tickers) != len(self.acciones):
+            self._construir_arrays()
+        capitalizacion = self.pertenencia_indices @ (self.precios * self.acciones_circulacion)
+        acciones_totales = self.pertenencia_indices @ self.acciones_circulacion
+
         indices_valores = {}
-        
-        for nombre_indice, tickers in self.indices.items():
-            if not tickers:
-                indices_valores[nombre_indice] = 100
-                continue
-                
-            # Promedio ponderado por capitalización
-            valor_total = 0
-            cap_total = 0
-            
-            for ticker in tickers:
-                if ticker in self.acciones:
-                    accion = self.acciones[ticker]
-                    cap = accion.precio_actual * accion.acciones_circulacion
-                    valor_total += cap
-                    cap_total += accion.acciones_circulacion
-            
-            if cap_total > 0:
-                precio_promedio = valor_total / cap_total
-                indices_valores[nombre_indice] = precio_promedio
+        for fila, nombre_indice in enumerate(self.indices):
+            if acciones_totales[fila] > 0:
+                indices_valores[nombre_indice] = float(capitalizacion[fila] / acciones_totales[fila])
             else:
                 indices_valores[nombre_indice] = 100
         
@@ -572,7 +823,7 @@ class BolsaValores:
             'en_burbuja': self.en_burbuja,
             'indices': indices_valores,
             'num_acciones_listadas': len(self.acciones),
-            'capitalizacion_total': sum(a.precio_actual * a.acciones_circulacion for a in self.acciones.values())
+            'capitalizacion_total': float(self.precios @ self.acciones_circulacion)
         }
     
     def obtener_estadisticas_mercado(self):
@@ -580,17 +831,15 @@ class BolsaValores:
         if not self.acciones:
             return {}
             
-        precios_actuales = [a.precio_actual for a in self.acciones.values()]
-        precios_iniciales = [a.precio_inicial for a in self.acciones.values()]
-        
-        rendimiento_promedio = sum((pa/pi - 1) for pa, pi in zip(precios_actuales, precios_iniciales)) / len(precios_actuales)
+        rendimiento_promedio = float(np.mean(self.precios / self.precios_iniciales - 1))
         
         return {
             'sentimiento_mercado': self.sentimiento_mercado,
             'volatilidad_mercado': self.volatilidad_mercado,
             'acciones_listadas': len(self.acciones),
-            'capitalizacion_total': sum(a.precio_actual * a.acciones_circulacion for a in self.acciones.values()),
+            'capitalizacion_total': float(self.precios @ self.acciones_circulacion),
             'rendimiento_promedio': rendimiento_promedio,
+            'volatilidad_promedio_acciones': float(np.mean(self.volatilidades)),
             'volumen_promedio_diario': self.volumen_total_diario,
             'en_burbuja': self.en_burbuja,
             'fondos_activos': len(self.fondos_inversion)
@@ -3,6 +3,11 @@ import random
 from dataclasses import dataclass, field
 from typing import Dict, List, Optional
 
+import numpy as np
+
+from ..utils.SimuladorLogger import diagnostico
+from .AsignacionLaboral import MODO_LOTE, MatrizPuntuaciones, asignar_voraz, modo_emparejamiento
+
 
 @dataclass
 class PerfilHabilidadesSectoriales:
@@ -87,8 +92,7 @@ class MercadoLaboral:
             max(1, len(self.mercado.getConsumidores()))
 
         if tasa_desempleo > 0.10:  # Si desempleo > 10%
-            print(
-                f"🔄 Facilitando contrataciones masivas (desempleo: {tasa_desempleo:.1%})")
+            diagnostico("🔄 Facilitando contrataciones masivas (desempleo: %.1f%%)", tasa_desempleo * 100)
 
             contrataciones_exitosas = 0
             objetivo_contrataciones = min(
@@ -99,37 +103,90 @@ class MercadoLaboral:
                 e for e in empresas if e.dinero > 20000]  # Capital mínimo
             empresas_viables.sort(key=lambda x: x.dinero, reverse=True)
 
-            for empresa in empresas_viables:
-                if contrataciones_exitosas >= objetivo_contrataciones:
-                    break
+            if modo_emparejamiento(self.mercado) == MODO_LOTE:
+                contrataciones_exitosas = self._contrataciones_masivas_lote(
+                    desempleados, empresas_viables, objetivo_contrataciones)
+            else:
+                contrataciones_exitosas = self._contrataciones_masivas_secuencial(
+                    desempleados, empresas_viables, objetivo_contrataciones)
 
-                # Cada empresa puede contratar hasta 3 empleados por ciclo
-                max_contrataciones_empresa = min(
-                    3, int(empresa.dinero / 30000))
-                contrataciones_empresa = 0
+            if contrataciones_exitosas > 0:
+                diagnostico("✅ %s contrataciones de emergencia realizadas", contrataciones_exitosas)
 
-                # Seleccionar candidatos aleatorios
-                candidatos_disponibles = [
-                    d for d in desempleados if not d.empleado]
-                random.shuffle(candidatos_disponibles)
+    def _contrataciones_masivas_secuencial(self, desempleados, empresas_viables, objetivo_contrataciones) -> int:
+        """Cada empresa, de mayor a menor capital, contrata candidatos al azar"""
+        contrataciones_exitosas = 0
+        for empresa in empresas_viables:
+            if contrataciones_exitosas >= objetivo_contrataciones:
+                break
 
-                for candidato in candidatos_disponibles[:max_contrataciones_empresa]:
-                    if contrataciones_empresa >= max_contrataciones_empresa:
-                        break
+            # Cada empresa puede contratar hasta 3 empleados por ciclo
+            max_contrataciones_empresa = min(
+                3, int(empresa.dinero / 30000))
+            contrataciones_empresa = 0
 
-                    if empresa.contratar(candidato):
-                        contrataciones_exitosas += 1
-                        contrataciones_empresa += 1
+            # Seleccionar candidatos aleatorios
+            candidatos_disponibles = [
+                d for d in desempleados if not d.empleado]
+            random.shuffle(candidatos_disponibles)
 
-                        # Subsidio gubernamental por contratación de emergencia
-                        if hasattr(self.mercado, 'gobierno'):
-                            subsidio = candidato.ingreso_mensual * 0.5  # 50% del salario
-                            empresa.dinero += subsidio
-                            self.mercado.gobierno.presupuesto -= subsidio
+            for candidato in candidatos_disponibles[:max_contrataciones_empresa]:
+                if contrataciones_empresa >= max_contrataciones_empresa:
+                    break
 
-            if contrataciones_exitosas > 0:
-                print(
-                    f"✅ {contrataciones_exitosas} contrataciones de emergencia realizadas")
+                if empresa.contratar(candidato):
+                    contrataciones_exitosas += 1
+                    contrataciones_empresa += 1
+
+                    # Subsidio gubernamental por contratación de emergencia
+                    if hasattr(self.mercado, 'gobierno'):
+                        subsidio = candidato.ingreso_mensual * 0.5  # 50% del salario
+                        empresa.dinero += subsidio
+                        self.mercado.gobierno.presupuesto -= subsidio
+        return contrataciones_exitosas
+
+    def _contrataciones_masivas_lote(self, desempleados, empresas_viables, objetivo_contrataciones) -> int:
+        """Contrataciones de emergencia resueltas como una sola asignación.
+
+        Cada empresa viable ofrece hasta 3 plazas (una por cada $30K); cada
+        desempleado, ordenado por nombre, puntúa las empresas por su nivel de
+        habilidad en el sector de la empresa y conserva las 3 mejores. La
+        asignación voraz reparte las plazas hasta ``objetivo_contrataciones``.
+        """
+        trabajadores = sorted((d for d in desempleados if not d.empleado), key=lambda d: d.nombre)
+        empresas_viables = sorted(empresas_viables, key=lambda e: (-e.dinero, getattr(e, 'nombre', '')))
+        plazas = np.array([min(3, int(e.dinero / 30000)) for e in empresas_viables], dtype=np.int64)
+        empresas_viables = [e for e, p in zip(empresas_viables, plazas) if p > 0]
+        plazas = plazas[plazas > 0]
+        if not trabajadores or not empresas_viables:
+            return 0
+
+        sectores = [getattr(getattr(e, 'sector', None), 'nombre', None) for e in empresas_viables]
+        habilidades = np.array([[(getattr(t, 'habilidades_sectoriales', None) or {}).get(sector, 0.0)
+                                 for sector in sectores] for t in trabajadores], dtype=float)
+        # Semilla derivada de ``random`` para que las ejecuciones con seed sean reproducibles
+        rng = np.random.default_rng(random.getrandbits(32))
+
+        def evaluar_bloque(inicio, fin):
+            nivel = habilidades[inicio:fin]
+            # Ruido mínimo para repartir a los trabajadores entre empresas equivalentes
+            return nivel, nivel + rng.random(nivel.shape) * 1e-9
+
+        candidaturas = MatrizPuntuaciones.por_bloques(len(trabajadores), len(empresas_viables),
+                                                      evaluar_bloque, max_candidatos=3)
+        contrataciones_exitosas = 0
+        for fila, columna in asignar_voraz(candidaturas, capacidades=plazas,
+                                           max_asignaciones=objetivo_contrataciones):
+            empresa, candidato = empresas_viables[columna], trabajadores[fila]
+            if empresa.contratar(candidato):
+                contrataciones_exitosas += 1
+
+                # Subsidio gubernamental por contratación de emergencia
+                if hasattr(self.mercado, 'gobierno'):
+                    subsidio = candidato.ingreso_mensual * 0.5  # 50% del salario
+                    empresa.dinero += subsidio
+                    self.mercado.gobierno.presupuesto -= subsidio
+        return contrataciones_exitosas
 
     def ciclo_mercado_laboral(self):
         """Ciclo principal del mercado laboral con contrataciones y despidos dinámicos"""
@@ -387,10 +444,12 @@ class MercadoLaboral:
                 if random.random() < probabilidad_ajustada:
                     if empresa_objetivo.contratar(candidato):
                         contrataciones_realizadas += 1
-                        print(f"📋 {empresa_nombre} contrató a {candidato.nombre} (prioridad activada)")
+                        diagnostico("📋 %s contrató a %s (prioridad activada)", empresa_nombre,
+                                    candidato.nombre)
             
             if contrataciones_realizadas > 0:
-                print(f"✅ Empresa {empresa_nombre} completó {contrataciones_realizadas} contrataciones prioritarias")
+                diagnostico("✅ Empresa %s completó %s contrataciones prioritarias", empresa_nombre,
+                            contrataciones_realizadas)
 
     def obtener_empresas_mejor_reputacion(self, limite: int = 5) -> List[str]:
         """
@@ -455,7 +514,8 @@ class MercadoLaboral:
         else:
             self.incentivos_activos['general'] = multiplicador
         
-        print(f"💰 Incentivos de contratación aplicados - Sector: {sector or 'General'}, Multiplicador: {multiplicador}x")
+        diagnostico("💰 Incentivos de contratación aplicados - Sector: %s, Multiplicador: %sx",
+                    sector or 'General', multiplicador)
         
         # Procesar contrataciones con incentivos
         desempleados = [c for c in self.mercado.getConsumidores() if not c.empleado]
@@ -495,4 +555,4 @@ class MercadoLaboral:
                         contrataciones_incentivadas += 1
         
         if contrataciones_incentivadas > 0:
-            print(f"✅ {contrataciones_incentivadas} contrataciones incentivadas realizadas")
+            diagnostico("✅ %s contrataciones incentivadas realizadas", contrataciones_incentivadas)
@@ -5,8 +5,13 @@ Implementa ajustes de precios realistas basados en oferta, demanda y competencia
 
 import random
 import math
+import logging
 from collections import defaultdict
+
+import numpy as np
+
 from ..config.ConfigEconomica import ConfigEconomica
+from ..utils.SimuladorLogger import diagnostico
 
 
 class SistemaPreciosDinamicos:
@@ -196,7 +201,13 @@ class SistemaPreciosDinamicos:
         """Factor basado en competencia de precios"""
         # Encontrar otras empresas que venden el mismo bien
         competidores = []
-        for otra_empresa in self.mercado.getEmpresas():
+        indice = getattr(self.mercado, 'indice_oferentes', None)
+        if indice is not None:
+            oferta = indice.ofertas.get(bien_nombre)
+            candidatas = oferta.oferentes.values() if oferta is not None else ()
+        else:
+            candidatas = self.mercado.getEmpresas()
+        for otra_empresa in candidatas:
             if otra_empresa != empresa and hasattr(otra_empresa, 'precios'):
                 if bien_nombre in otra_empresa.precios:
                     competidores.append(otra_empresa.precios[bien_nombre])
@@ -305,8 +316,8 @@ class SistemaPreciosDinamicos:
 
     def aplicar_shock_precios(self, tipo_shock='aleatorio', intensidad=0.2):
         """Aplica un shock de precios al mercado"""
-        print(
-            f"💥 Aplicando shock de precios: {tipo_shock} (intensidad: {intensidad})")
+        diagnostico("💥 Aplicando shock de precios: %s (intensidad: %s)", tipo_shock, intensidad,
+                    componente='Precios')
 
         if tipo_shock == 'materias_primas':
             # Shock en bienes intermedios y básicos
@@ -362,12 +373,129 @@ class SistemaPreciosDinamicos:
         }
 
 
+class MotorPreciosVectorizado:
+    """Ronda de precios de todo el mercado sobre una matriz densa empresa × bien.
+
+    Aplica las mismas reglas que ``calcular_precio_dinamico`` (stock, demanda,
+    competencia, macro, inflación, volatilidad, tope de ±2% y piso de costos),
+    pero el promedio de la competencia sale de sumas por columna en lugar de
+    recorrer todas las empresas para cada par empresa-bien: O(E·B) en vez de
+    O(E²·B).
+
+    Todas las empresas se evalúan contra los precios del inicio de la ronda;
+    el recorrido escalar ve los precios ya actualizados de las empresas
+    anteriores, así que los resultados difieren solo en ese efecto de orden.
+    """
+
+    def __init__(self, sistema):
+        self.sistema = sistema
+        self.empresas = []
+        self.indice_bienes = {}
+        self.precios = np.zeros((0, 0))
+        self.presente = np.zeros((0, 0), dtype=bool)
+
+    def construir_matriz(self, empresas):
+        """Vuelca ``empresa.precios`` a la matriz; ausencias quedan en NaN"""
+        self.empresas = [e for e in empresas if hasattr(e, 'precios')]
+        self.indice_bienes = {}
+        for empresa in self.empresas:
+            for bien_nombre in empresa.precios:
+                self.indice_bienes.setdefault(bien_nombre, len(self.indice_bienes))
+
+        self.precios = np.full((len(self.empresas), len(self.indice_bienes)), np.nan)
+        for i, empresa in enumerate(self.empresas):
+            for bien_nombre, precio in empresa.precios.items():
+                self.precios[i, self.indice_bienes[bien_nombre]] = precio
+        self.presente = ~np.isnan(self.precios)
+        return self.precios
+
+    def promedio_competencia(self):
+        """Precio medio de los competidores de cada empresa en cada bien (NaN si no hay)"""
+        suma = np.nansum(self.precios, axis=0)
+        cantidad = self.presente.sum(axis=0)
+        propios = np.where(self.presente, self.precios, 0.0)
+        competidores = cantidad[None, :] - self.presente
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return np.where(competidores > 0, (suma[None, :] - propios) / competidores, np.nan)
+
+    def actualizar(self, mercado):
+        """Calcula y escribe los nuevos precios; devuelve el número de precios actualizados"""
+        sistema = self.sistema
+        self.construir_matriz(mercado.getEmpresas())
+        num_empresas, num_bienes = self.precios.shape
+        if self.precios.size == 0:
+            return 0
+
+        # Demanda reciente por (vendedor, bien) con una sola pasada
+        demanda_por_par = defaultdict(float)
+        for t in mercado.transacciones[-20:]:
+            demanda_por_par[(t.get('vendedor'), t.get('bien'))] += t.get('cantidad', 0)
+
+        actualizable = np.zeros((num_empresas, num_bienes), dtype=bool)
+        inventario = np.zeros((num_empresas, num_bienes))
+        demanda = np.zeros((num_empresas, num_bienes))
+        piso = np.zeros((num_empresas, num_bienes))
+        volatilidad = np.ones((num_empresas, num_bienes))
+
+        # Misma secuencia de números aleatorios que el recorrido escalar
+        for i, empresa in enumerate(self.empresas):
+            if not hasattr(empresa, 'bienes'):
+                continue
+            costos = getattr(empresa, 'costos_unitarios', None)
+            for bien_nombre in empresa.precios:
+                j = self.indice_bienes[bien_nombre]
+                if bien_nombre not in sistema.precios_base:
+                    sistema.precios_base[bien_nombre] = random.uniform(10, 50)
+                actualizable[i, j] = True
+                inventario[i, j] = len(empresa.bienes.get(bien_nombre, []))
+                demanda[i, j] = demanda_por_par.get((empresa.nombre, bien_nombre), 0)
+                if costos is not None and bien_nombre in costos:
+                    piso[i, j] = costos[bien_nombre] * 1.05
+                else:
+                    piso[i, j] = sistema.precios_base.get(bien_nombre, 1) * 0.5
+                volatilidad[i, j] = random.uniform(0.99, 1.01)
+
+        factor_stock = np.select(
+            [inventario > 50, inventario > 20, inventario < 5, inventario < 10],
+            [0.96, 0.98, 1.04, 1.02], default=1.0)
+        factor_demanda = np.select(
+            [demanda == 0, demanda > 20, demanda > 10],
+            [0.96, 1.04, 1.02], default=0.99)
+
+        promedio = self.promedio_competencia()
+        with np.errstate(divide='ignore', invalid='ignore'):
+            ratio = self.precios / promedio
+        con_competencia = ~np.isnan(promedio) & (promedio > 0)
+        factor_competencia = np.where(
+            con_competencia & (ratio > 1.2), 0.9,
+            np.where(con_competencia & (ratio < 0.8), 1.1, 1.0))
+
+        multiplicador = (
+            factor_stock * 0.20 +
+            factor_demanda * 0.20 +
+            factor_competencia * 0.20 +
+            sistema._calcular_factor_macroeconomico() * 0.10 +
+            sistema._calcular_factor_inflacionario() * 0.15 +
+            1.0 * 0.10 +
+            volatilidad * 0.05
+        )
+        cambio = np.clip(multiplicador - 1.0, -0.02, 0.02)
+        nuevos = np.maximum(self.precios * (1 + cambio), piso)
+
+        filas, columnas = np.nonzero(actualizable)
+        nombres_bienes = list(self.indice_bienes)
+        for i, j in zip(filas.tolist(), columnas.tolist()):
+            self.empresas[i].precios[nombres_bienes[j]] = float(nuevos[i, j])
+        self.precios = np.where(actualizable, nuevos, self.precios)
+        return len(filas)
+
+
 def integrar_sistema_precios_dinamicos(mercado):
     """Función para integrar el sistema de precios dinámicos al mercado"""
     if not hasattr(mercado, 'sistema_precios'):
         mercado.sistema_precios = SistemaPreciosDinamicos(mercado)
         mercado.sistema_precios.inicializar_precios_base()
-        print("✅ Sistema de precios dinámicos integrado")
+        diagnostico("✅ Sistema de precios dinámicos integrado", componente='Precios')
 
     return mercado.sistema_precios
 
@@ -380,6 +508,17 @@ def actualizar_precios_mercado(mercado):
     sistema = mercado.sistema_precios
     sistema.ajustar_volatilidad_mercado()
 
+    config_performance = getattr(mercado, 'config_performance', None) or {}
+    if config_performance.get('vectorizar_precios_dinamicos', True):
+        try:
+            if not hasattr(sistema, 'motor_vectorizado'):
+                sistema.motor_vectorizado = MotorPreciosVectorizado(sistema)
+            return sistema.motor_vectorizado.actualizar(mercado)
+        except Exception as e:
+            diagnostico("⚠️  Error en motor vectorizado de precios: %s", e, componente='Precios',
+                        nivel=logging.WARNING)
+            # Continuar con método tradicional
+
     precios_actualizados = 0
 
     for empresa in mercado.getEmpresas():
@@ -4,6 +4,10 @@ Implementa sectores primario, secundario y terciario con cadenas productivas
 """
 import random
 from enum import Enum
+from types import MappingProxyType
+
+import numpy as np
+
 from ..config.ConfigEconomica import ConfigEconomica
 
 
@@ -137,13 +141,103 @@ class Sector:
                         empresa.costos_unitarios[bien] *= intensidad
 
 
+class ModeloInsumoProducto:
+    """Modelo de Leontief sobre una matriz densa de coeficientes técnicos.
+
+    ``coeficientes[i, j]`` es el insumo del sector (o bien) ``i`` requerido por
+    unidad de producto de ``j``. La inversa de Leontief (I - A)^-1 se cachea y
+    solo se recalcula cuando cambian los coeficientes, así que multiplicadores,
+    encadenamientos y propagación de shocks son productos matriz-vector.
+    Sirve igual para sectores que para una matriz a nivel de bienes.
+    """
+
+    def __init__(self, nombres, coeficientes=None):
+        self.nombres = list(nombres)
+        self.indice = {nombre: i for i, nombre in enumerate(self.nombres)}
+        n = len(self.nombres)
+        self.coeficientes = np.zeros((n, n)) if coeficientes is None else np.array(coeficientes, dtype=float)
+        if self.coeficientes.shape != (n, n):
+            raise ValueError(f"La matriz de coeficientes debe ser {n}x{n}")
+        self._inversa = None
+
+    @classmethod
+    def desde_relaciones(cls, nombres, relaciones):
+        """Construye el modelo desde ``{comprador: {proveedor: coeficiente}}``"""
+        modelo = cls(nombres)
+        for comprador, compras in relaciones.items():
+            for proveedor, coeficiente in compras.items():
+                if comprador in modelo.indice and proveedor in modelo.indice:
+                    modelo.coeficientes[modelo.indice[proveedor], modelo.indice[comprador]] = coeficiente
+        return modelo
+
+    def como_relaciones(self):
+        """Vista ``{comprador: {proveedor: coeficiente}}`` de los coeficientes no nulos"""
+        relaciones = {}
+        for j, comprador in enumerate(self.nombres):
+            compras = {self.nombres[i]: float(self.coeficientes[i, j])
+                       for i in np.flatnonzero(self.coeficientes[:, j])}
+            if compras:
+                relaciones[comprador] = compras
+        return relaciones
+
+    def establecer_coeficiente(self, proveedor, comprador, valor):
+        """Cambia un coeficiente técnico e invalida la inversa cacheada"""
+        self.coeficientes[self.indice[proveedor], self.indice[comprador]] = valor
+        self._inversa = None
+
+    def establecer_coeficientes(self, coeficientes):
+        """Reemplaza la matriz completa de coeficientes"""
+        coeficientes = np.array(coeficientes, dtype=float)
+        if coeficientes.shape != self.coeficientes.shape:
+            raise ValueError(f"La matriz de coeficientes debe ser {self.coeficientes.shape}")
+        self.coeficientes = coeficientes
+        self._inversa = None
+
+    @property
+    def inversa_leontief(self):
+        """(I - A)^-1, calculada solo si los coeficientes cambiaron"""
+        if self._inversa is None:
+            identidad = np.eye(len(self.nombres))
+            try:
+                self._inversa = np.linalg.inv(identidad - self.coeficientes)
+            except np.linalg.LinAlgError as e:
+                raise ValueError(f"La matriz insumo-producto no es productiva: {e}")
+        return self._inversa
+
+    def demanda_intermedia(self, produccion):
+        """Insumos que cada sector vende al resto para producir ``produccion`` (A·x)"""
+        return self.coeficientes @ np.asarray(produccion, dtype=float)
+
+    def produccion_requerida(self, demanda_final):
+        """Producción total necesaria para atender ``demanda_final`` (L·d)"""
+        return self.inversa_leontief @ np.asarray(demanda_final, dtype=float)
+
+    def multiplicadores_producto(self):
+        """Producción total generada por unidad de demanda final de cada sector"""
+        return self.inversa_leontief.sum(axis=0)
+
+    def encadenamientos_hacia_atras(self):
+        """Índices de Rasmussen hacia atrás (> 1: arrastra más que el promedio)"""
+        inversa = self.inversa_leontief
+        return inversa.sum(axis=0) * len(self.nombres) / inversa.sum()
+
+    def encadenamientos_hacia_adelante(self):
+        """Índices de Rasmussen hacia adelante (> 1: abastece más que el promedio)"""
+        inversa = self.inversa_leontief
+        return inversa.sum(axis=1) * len(self.nombres) / inversa.sum()
+
+    def propagar_shock_costos(self, variacion_costos):
+        """Variación de precios por el modelo de precios de Leontief (L^T·Δv)"""
+        return self.inversa_leontief.T @ np.asarray(variacion_costos, dtype=float)
+
+
 class EconomiaMultisectorial:
     """Coordinador de la economía multi-sectorial"""
 
     def __init__(self, mercado):
         self.mercado = mercado
         self.sectores = {}
-        self.matriz_insumo_producto = {}
+        self.insumo_producto = ModeloInsumoProducto([])
         self.ciclo_sectorial = 0
 
         # Crear sectores principales
@@ -171,6 +265,20 @@ class EconomiaMultisectorial:
         self.sectores['finanzas'] = Sector(
             'Finanzas', TipoSector.TERCIARIO, 1.3)
 
+    @property
+    def matriz_insumo_producto(self):
+        """Relaciones ``{comprador: {proveedor: coeficiente}}`` derivadas de la matriz densa.
+
+        Es una vista de solo lectura: para cambiar coeficientes se usa
+        ``insumo_producto.establecer_coeficiente`` o se asigna la propiedad entera.
+        """
+        return MappingProxyType({comprador: MappingProxyType(compras)
+                                 for comprador, compras in self.insumo_producto.como_relaciones().items()})
+
+    @matriz_insumo_producto.setter
+    def matriz_insumo_producto(self, relaciones):
+        self.insumo_producto = ModeloInsumoProducto.desde_relaciones(list(self.sectores), relaciones)
+
     def _construir_matriz_insumo_producto(self):
         """Construye la matriz de relaciones entre sectores"""
         # Simplificada: qué porcentaje de cada sector compra de otros
@@ -215,23 +323,33 @@ class EconomiaMultisectorial:
             else:
                 return 'servicios'  # Por defecto
 
+    def _vector_pib_sectorial(self):
+        return np.array([self.sectores[nombre].pib_sectorial for nombre in self.insumo_producto.nombres],
+                        dtype=float)
+
     def calcular_efectos_intersectoriales(self):
         """Calcula efectos de propagación entre sectores"""
-        efectos = {}
-
-        for sector_origen, compras in self.matriz_insumo_producto.items():
-            if sector_origen in self.sectores:
-                pib_origen = self.sectores[sector_origen].pib_sectorial
-
-                for sector_destino, coeficiente in compras.items():
-                    if sector_destino in self.sectores:
-                        efecto = pib_origen * coeficiente
-
-                        if sector_destino not in efectos:
-                            efectos[sector_destino] = 0
-                        efectos[sector_destino] += efecto
-
-        return efectos
+        modelo = self.insumo_producto
+        efectos = modelo.demanda_intermedia(self._vector_pib_sectorial())
+        # Solo sectores que abastecen a alguno (como en la matriz de relaciones)
+        proveedores = np.flatnonzero(modelo.coeficientes.any(axis=1))
+        return {modelo.nombres[i]: float(efectos[i]) for i in proveedores}
+
+    def obtener_multiplicadores_sectoriales(self):
+        """Multiplicador de producto y encadenamientos hacia atrás/adelante por sector"""
+        modelo = self.insumo_producto
+        multiplicadores = modelo.multiplicadores_producto()
+        atras = modelo.encadenamientos_hacia_atras()
+        adelante = modelo.encadenamientos_hacia_adelante()
+        return {
+            nombre: {
+                'multiplicador': float(multiplicadores[i]),
+                'encadenamiento_atras': float(atras[i]),
+                'encadenamiento_adelante': float(adelante[i]),
+                'sector_clave': bool(atras[i] > 1 and adelante[i] > 1),
+            }
+            for i, nombre in enumerate(modelo.nombres)
+        }
 
     def simular_shock_sectorial(self, sector_afectado, tipo_shock, intensidad, duracion=3):
         """Simula un shock que afecta a un sector específico"""
@@ -241,15 +359,23 @@ class EconomiaMultisectorial:
 
             # Efectos de propagación
             if tipo_shock == 'productividad' and intensidad < 1.0:
-                # Shock negativo se propaga a sectores dependientes
-                efectos = self.calcular_efectos_intersectoriales()
-
-                for sector_nombre, efecto_size in efectos.items():
-                    if efecto_size > 0:  # Solo si hay dependencia
-                        factor_propagacion = 1.0 - (1.0 - intensidad) * 0.3
-                        self.sectores[sector_nombre].aplicar_shock_sectorial(
-                            tipo_shock, factor_propagacion
-                        )
+                # Shock negativo se propaga a los sectores que usan sus insumos,
+                # en proporción a su exposición vía el modelo de precios de Leontief
+                modelo = self.insumo_producto
+                k = modelo.indice[sector_afectado]
+                shock = np.zeros(len(modelo.nombres))
+                shock[k] = 1.0
+                exposicion = modelo.propagar_shock_costos(shock)
+                exposicion[k] = 0.0
+                maxima = exposicion.max()
+                if maxima <= 0:
+                    return
+
+                for i in np.flatnonzero(exposicion > 0):
+                    factor_propagacion = 1.0 - (1.0 - intensidad) * 0.3 * exposicion[i] / maxima
+                    self.sectores[modelo.nombres[i]].aplicar_shock_sectorial(
+                        tipo_shock, factor_propagacion
+                    )
 
     def ciclo_economico_sectorial(self):
         """Ejecuta el ciclo económico desde perspectiva sectorial"""
@@ -336,7 +462,9 @@ class EconomiaMultisectorial:
             'nivel_desarrollo': self._calcular_nivel_desarrollo(
                 participacion_primario, participacion_secundario, participacion_terciario
             ),
-            'diversificacion': self._calcular_diversificacion(stats)
+            'diversificacion': self._calcular_diversificacion(stats),
+            'sectores_clave': [nombre for nombre, datos in self.obtener_multiplicadores_sectoriales().items()
+                               if datos['sector_clave']]
         }
 
     def _calcular_nivel_desarrollo(self, primario, secundario, terciario):
@@ -5,8 +5,12 @@ Implementa impuestos progresivos, IVA, política fiscal automática y redistribu
 
 import random
 import math
+import logging
 from enum import Enum
-from ..utils.SimuladorLogger import get_simulador_logger
+
+import numpy as np
+
+from ..utils.SimuladorLogger import get_simulador_logger, diagnostico
 
 
 class TipoImpuesto(Enum):
@@ -106,7 +110,29 @@ class SistemaFiscal:
         return self._generar_reporte_fiscal(ciclo)
     
     def _recaudar_impuestos(self, ciclo):
-        """Recauda todos los tipos de impuestos"""
+        """Recauda todos los tipos de impuestos y devuelve el desglose del ciclo"""
+        recaudacion_ciclo = None
+        config_performance = getattr(self.mercado, 'config_performance', None) or {}
+        if config_performance.get('vectorizar_recaudacion_fiscal', True):
+            try:
+                recaudacion_ciclo = self._recaudar_impuestos_vectorizado(ciclo)
+            except Exception as e:
+                diagnostico("⚠️  Error en recaudación vectorizada: %s", e, componente='Fiscal',
+                            nivel=logging.WARNING)
+                # Continuar con método tradicional
+        if recaudacion_ciclo is None:
+            recaudacion_ciclo = self._recaudar_impuestos_escalar(ciclo)
+
+        # Actualizar recaudación total
+        for tipo, monto in recaudacion_ciclo.items():
+            self.recaudacion_por_tipo[tipo] += monto
+            self.recaudacion_total += monto
+
+        self.logger.log_sistema(f"Fiscal - Ciclo {ciclo}: Recaudación ${sum(recaudacion_ciclo.values()):,.0f}")
+        return recaudacion_ciclo
+
+    def _recaudar_impuestos_escalar(self, ciclo):
+        """Recaudación agente por agente (método tradicional)"""
         recaudacion_ciclo = {tipo: 0 for tipo in TipoImpuesto}
         
         # === IMPUESTO A LA RENTA (PERSONAS) ===
@@ -148,12 +174,90 @@ class SistemaFiscal:
                     consumidor.dinero -= impuesto_patrim
                     recaudacion_ciclo[TipoImpuesto.PATRIMONIO] += impuesto_patrim
         
-        # Actualizar recaudación total
-        for tipo, monto in recaudacion_ciclo.items():
-            self.recaudacion_por_tipo[tipo] += monto
-            self.recaudacion_total += monto
-        
-        self.logger.log_sistema(f"Fiscal - Ciclo {ciclo}: Recaudación ${sum(recaudacion_ciclo.values()):,.0f}")
+        return recaudacion_ciclo
+
+    def _recaudar_impuestos_vectorizado(self, ciclo):
+        """Misma recaudación que el método tradicional sobre arrays de ingresos, utilidades y patrimonio.
+
+        Cada agente se lee y se escribe una sola vez; los tramos de renta se
+        resuelven con ``np.searchsorted`` sobre el impuesto acumulado por tramo.
+        Los saldos se escriben al final, con todo calculado: si algo falla antes
+        nadie ha pagado y el método tradicional puede recaudar sin cobrar dos veces.
+        """
+        from ..models.AlmacenConsumidores import almacen_de
+        recaudacion_ciclo = {tipo: 0 for tipo in TipoImpuesto}
+
+        # === PERSONAS: renta, seguridad social empleado y patrimonio ===
+        consumidores = self.mercado.getConsumidores()
+        modificados = None
+        if consumidores:
+            # Con almacén columnar se leen y escriben las columnas directamente
+            almacen = almacen_de(self.mercado)
+            indices = almacen.indices(consumidores) if almacen is not None else None
+            if indices is not None:
+                empleado = almacen.empleado[indices]
+                ingreso = almacen.ingreso_mensual[indices]
+                dinero = almacen.dinero[indices]
+            else:
+                empleado = np.fromiter((bool(c.empleado) for c in consumidores), dtype=bool, count=len(consumidores))
+                ingreso = np.fromiter((c.ingreso_mensual for c in consumidores), dtype=float, count=len(consumidores))
+                dinero = np.fromiter((c.dinero for c in consumidores), dtype=float, count=len(consumidores))
+
+            gravados = empleado & (ingreso > 0)
+            renta = np.where(gravados, self._calcular_impuesto_renta_vectorizado(ingreso), 0.0)
+            contrib_empleado = np.where(gravados, ingreso * self.contrib_social_empleado, 0.0)
+            dinero = np.where(gravados, dinero - renta - contrib_empleado, dinero)
+            recaudacion_ciclo[TipoImpuesto.RENTA] = float(renta.sum())
+            recaudacion_ciclo[TipoImpuesto.SEGURIDAD_SOCIAL] = float(contrib_empleado.sum())
+
+            modificados = gravados
+            if ciclo % 12 == 0:  # Una vez al año
+                con_patrimonio = dinero > self.umbral_patrimonio
+                patrimonio = np.where(con_patrimonio,
+                                      (dinero - self.umbral_patrimonio) * self.impuesto_patrimonio, 0.0)
+                dinero = dinero - patrimonio
+                recaudacion_ciclo[TipoImpuesto.PATRIMONIO] = float(patrimonio.sum())
+                modificados = modificados | con_patrimonio
+
+        # === EMPRESAS: corporativo y seguridad social empleador ===
+        empresas = [e for e in self.mercado.getEmpresas() if hasattr(e, 'dinero') and e.dinero > 0]
+        if empresas:
+            capital = np.fromiter((e.dinero for e in empresas), dtype=float, count=len(empresas))
+            nomina = np.fromiter(
+                (sum(empleado.ingreso_mensual for empleado in getattr(e, 'empleados', ()))
+                 for e in empresas), dtype=float, count=len(empresas))
+
+            impuesto_corp = np.maximum(0, capital * 0.05) * self.impuesto_corporativo
+            contrib_empleador = nomina * self.contrib_social_empleador
+            capital = capital - impuesto_corp - contrib_empleador
+            recaudacion_ciclo[TipoImpuesto.CORPORATIVO] = float(impuesto_corp.sum())
+            recaudacion_ciclo[TipoImpuesto.SEGURIDAD_SOCIAL] += float(contrib_empleador.sum())
+
+        # === Escritura de saldos ===
+        if modificados is not None:
+            if indices is not None:
+                almacen.dinero[indices[modificados]] = dinero[modificados]
+            else:
+                for i in np.flatnonzero(modificados).tolist():
+                    consumidores[i].dinero = float(dinero[i])
+        if empresas:
+            for empresa, saldo in zip(empresas, capital.tolist()):
+                empresa.dinero = saldo
+
+        return recaudacion_ciclo
+
+    def _calcular_impuesto_renta_vectorizado(self, ingresos):
+        """Impuesto progresivo para un array de ingresos (tramos contiguos de ``escalas_renta``)"""
+        minimos = np.array([escala_min for escala_min, _, _ in self.escalas_renta], dtype=float)
+        maximos = np.array([escala_max for _, escala_max, _ in self.escalas_renta], dtype=float)
+        tasas = np.array([tasa for _, _, tasa in self.escalas_renta], dtype=float)
+        # Impuesto acumulado al inicio de cada tramo
+        acumulado = np.concatenate(([0.0], np.cumsum((maximos - minimos)[:-1] * tasas[:-1])))
+
+        ingresos = np.asarray(ingresos, dtype=float)
+        tramo = np.clip(np.searchsorted(minimos, ingresos, side='left') - 1, 0, len(tasas) - 1)
+        impuesto = acumulado[tramo] + (ingresos - minimos[tramo]) * tasas[tramo]
+        return np.where(ingresos > minimos[0], impuesto, 0.0)
     
     def _calcular_impuesto_renta(self, ingreso_anual):
         """Calcula impuesto a la renta con escalas progresivas"""
@@ -309,6 +413,9 @@ class SistemaFiscal:
     
     def _calcular_tasa_desempleo(self):
         """Calcula la tasa de desempleo actual"""
+        acumulador = getattr(self.mercado, 'acumulador_macro', None)
+        if acumulador is not None:
+            return acumulador.tasa_desempleo()
         consumidores = self.mercado.getConsumidores()
         desempleados = len([c for c in consumidores if not c.empleado])
         return desempleados / len(consumidores) if consumidores else 0
@@ -171,7 +171,9 @@ class SistemaIntegracionMejoras:
                 )
             
             # Añadir al mercado usando el método correcto
-            if hasattr(simulador, 'personas'):
+            if hasattr(simulador, 'agregar_persona'):
+                simulador.agregar_persona(nueva_empresa)
+            elif hasattr(simulador, 'personas'):
                 simulador.personas.append(nueva_empresa)
             elif hasattr(simulador, 'empresas'):
                 simulador.empresas.append(nueva_empresa)
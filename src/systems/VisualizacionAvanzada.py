@@ -1,15 +1,17 @@
 """
 Sistema de Visualización Avanzada para el Simulador Económico
 Incluye dashboards interactivos, múltiples métricas y exportación de datos
+
+matplotlib y pandas se importan dentro de los métodos que grafican o
+exportan, de modo que el seguimiento de métricas no los carga.
 """
 
-import matplotlib.pyplot as plt
 import numpy as np
-import pandas as pd
 import json
 import csv
 from datetime import datetime
 import os
+from ..utils.SimuladorLogger import diagnostico
 
 
 class DashboardEconomico:
@@ -133,6 +135,8 @@ class DashboardEconomico:
 
     def crear_dashboard_completo(self, ciclo_actual, guardar_archivo=True, prefijo=None):
         """Crea un dashboard completo con múltiples gráficos"""
+        import matplotlib.pyplot as plt
+
         fig, ((ax1, ax2), (ax3, ax4), (ax5, ax6)
               ) = plt.subplots(3, 2, figsize=(16, 12))
         fig.suptitle(
@@ -208,7 +212,7 @@ class DashboardEconomico:
             filename = f'results/{prefix}dashboard_economico_completo_{timestamp}.png'
             os.makedirs('results', exist_ok=True)
             plt.savefig(filename, dpi=300, bbox_inches='tight')
-            print(f"📊 Dashboard guardado: {filename}")
+            diagnostico("📊 Dashboard guardado: %s", filename)
 
         plt.show()
         return fig
@@ -231,11 +235,12 @@ class DashboardEconomico:
 
         data['ciclo'] = list(range(max_len))
 
+        import pandas as pd
         df = pd.DataFrame(data)
 
         os.makedirs('results', exist_ok=True)
         df.to_csv(filename, index=False)
-        print(f"📄 Datos exportados a: {filename}")
+        diagnostico("📄 Datos exportados a: %s", filename)
         return filename
 
     def exportar_configuracion_json(self, filename=None):
@@ -265,7 +270,7 @@ class DashboardEconomico:
         with open(filename, 'w', encoding='utf-8') as f:
             json.dump(config_datos, f, indent=2, ensure_ascii=False)
 
-        print(f"⚙️ Configuración exportada a: {filename}")
+        diagnostico("⚙️ Configuración exportada a: %s", filename)
         return filename
 
     def generar_reporte_textual(self):
@@ -339,12 +344,16 @@ class VisualizadorTiempoReal:
     """Visualizador para métricas en tiempo real durante la simulación"""
 
     def __init__(self):
+        import matplotlib.pyplot as plt
+
         self.fig, self.axes = plt.subplots(2, 2, figsize=(12, 8))
         self.fig.suptitle('📈 Simulación Económica en Tiempo Real')
         plt.ion()  # Modo interactivo
 
     def actualizar_grafico_tiempo_real(self, dashboard):
         """Actualiza los gráficos en tiempo real"""
+        import matplotlib.pyplot as plt
+
         # Limpiar axes
         for ax in self.axes.flat:
             ax.clear()
@@ -383,6 +392,8 @@ class VisualizadorTiempoReal:
 
     def cerrar(self):
         """Cierra la visualización en tiempo real"""
+        import matplotlib.pyplot as plt
+
         plt.ioff()
         plt.close(self.fig)
 
@@ -413,9 +424,9 @@ def exportar_resultados_completos(dashboard, prefijo="simulacion"):
     with open(reporte_file, 'w', encoding='utf-8') as f:
         f.write(reporte)
 
-    print(f"📁 Resultados exportados:")
-    print(f"  - Datos: {csv_file}")
-    print(f"  - Configuración: {json_file}")
-    print(f"  - Reporte: {reporte_file}")
+    diagnostico("📁 Resultados exportados:")
+    diagnostico("  - Datos: %s", csv_file)
+    diagnostico("  - Configuración: %s", json_file)
+    diagnostico("  - Reporte: %s", reporte_file)
 
     return csv_file, json_file, reporte_file
@@ -12,12 +12,19 @@ This module implements an enhanced labor market system with:
 Author: Enhanced Labor Market Team
 """
 
+import bisect
+import heapq
 import random
 import math
 from dataclasses import dataclass, field
 from typing import Dict, List, Optional, Tuple
 from enum import Enum
 
+import numpy as np
+
+from .AsignacionLaboral import (MODO_LOTE, MatrizPuntuaciones, asignar_voraz,
+                                modo_emparejamiento, puntuacion_con_salario)
+
 
 class JobMatchingStatus(Enum):
     """Status of job matching process"""
@@ -92,6 +99,147 @@ class WorkerProfile:
         self.search_intensity = min(1.0, base_intensity * fatigue_factor)
 
 
+class VacancyBucket:
+    """
+    Vacancies of one (sector, skill level band), ordered by wage (highest first).
+
+    Requirements are kept as a vacancy × skill matrix of effective levels
+    (``inf`` where a skill is not required, which contributes a zero term),
+    so the match probability of a worker against the whole bucket is a few
+    array operations instead of one Python call per vacancy.
+    """
+
+    def __init__(self):
+        self.vacancies: List[JobVacancy] = []
+        self.neg_wages: List[float] = []
+        self.sequences: List[int] = []
+        self.skill_floors: Dict[str, float] = {}  # Lowest effective requirement per skill
+        self.min_duration: Optional[int] = None
+        self.has_unconditional = False  # Some vacancy without requirements (match 0.5)
+        self._arrays = None  # Built lazily after insertions
+
+    def add(self, vacancy: JobVacancy, sequence: int) -> None:
+        position = bisect.bisect_right(self.neg_wages, -vacancy.wage_offered)
+        self.neg_wages.insert(position, -vacancy.wage_offered)
+        self.vacancies.insert(position, vacancy)
+        self.sequences.insert(position, sequence)
+        for skill, level in vacancy.skill_requirements.items():
+            level = max(0.1, level)
+            self.skill_floors[skill] = min(level, self.skill_floors.get(skill, level))
+        if not vacancy.skill_requirements:
+            self.has_unconditional = True
+        duration = vacancy.posting_duration
+        self.min_duration = duration if self.min_duration is None else min(self.min_duration, duration)
+        self._arrays = None
+
+    def remove(self, vacancy: JobVacancy) -> None:
+        """Mark a filled vacancy so it is no longer offered"""
+        arrays = self.arrays()
+        for position, candidate in enumerate(self.vacancies):
+            if candidate is vacancy:
+                arrays['open'][position] = False
+                return
+
+    def arrays(self) -> Dict:
+        if self._arrays is None:
+            skills = list(self.skill_floors)
+            column = {skill: j for j, skill in enumerate(skills)}
+            levels = np.full((len(self.vacancies), len(skills)), np.inf)
+            for i, vacancy in enumerate(self.vacancies):
+                for skill, level in vacancy.skill_requirements.items():
+                    levels[i, column[skill]] = max(0.1, level)
+            self._arrays = {
+                'skills': skills,
+                'levels': levels,
+                'counts': np.array([len(v.skill_requirements) for v in self.vacancies], dtype=float),
+                'durations': np.array([v.posting_duration for v in self.vacancies], dtype=float),
+                'sequences': np.array(self.sequences, dtype=np.int64),
+                'open': np.array([v.status == JobMatchingStatus.VACANT for v in self.vacancies], dtype=bool),
+            }
+        return self._arrays
+
+    def match_upper_bound(self, skills: Dict[str, float]) -> float:
+        """Highest match probability any vacancy in the bucket can give these skills"""
+        best_term = max((min(1.0, skills.get(skill, 0.0) / floor)
+                         for skill, floor in self.skill_floors.items()), default=0.0)
+        bound = best_term - 0.05 * (self.min_duration or 0)
+        return max(bound, 0.5) if self.has_unconditional else bound
+
+    def match_probabilities(self, skills: Dict[str, float], reservation_wage: float):
+        """
+        Open vacancies paying at least ``reservation_wage`` and their match
+        probabilities, with the arithmetic of
+        ``JobVacancy.calculate_match_probability``.
+        """
+        arrays = self.arrays()
+        # Vacancies paying at least the reservation wage form a prefix
+        end = bisect.bisect_right(self.neg_wages, -reservation_wage)
+        worker_levels = np.array([skills.get(skill, 0.0) for skill in arrays['skills']], dtype=float)
+        counts = arrays['counts'][:end]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            terms = np.minimum(1.0, worker_levels / arrays['levels'][:end])
+            base_match = terms.sum(axis=1) / counts
+        match = np.where(counts > 0, np.maximum(0.1, base_match - 0.05 * arrays['durations'][:end]), 0.5)
+        return np.flatnonzero(arrays['open'][:end]), match
+
+
+class VacancyBook:
+    """
+    Open vacancies indexed by sector and skill level band.
+
+    A worker is only evaluated against buckets whose best possible match
+    clears the threshold, and within a bucket only against the wage-ordered
+    prefix of vacancies paying at least their reservation wage.
+    """
+
+    def __init__(self, vacancies: List[JobVacancy] = (), level_bands: int = 5):
+        self.level_bands = level_bands
+        self.buckets: Dict[Tuple[str, int], VacancyBucket] = {}
+        self._sequence = 0
+        for vacancy in vacancies:
+            self.add(vacancy)
+
+    def bucket_key(self, vacancy: JobVacancy) -> Tuple[str, int]:
+        """Sector and band of the vacancy's main skill requirement"""
+        requirements = vacancy.skill_requirements
+        level = requirements.get(vacancy.sector, max(requirements.values(), default=0.0))
+        band = min(self.level_bands - 1, max(0, int(level * self.level_bands)))
+        return vacancy.sector, band
+
+    def add(self, vacancy: JobVacancy) -> None:
+        """Index a vacancy; its posting order breaks ties between equal matches"""
+        self.buckets.setdefault(self.bucket_key(vacancy), VacancyBucket()).add(vacancy, self._sequence)
+        self._sequence += 1
+
+    def remove(self, vacancy: JobVacancy) -> None:
+        """Stop offering a filled vacancy"""
+        bucket = self.buckets.get(self.bucket_key(vacancy))
+        if bucket is not None:
+            bucket.remove(vacancy)
+
+    def best_matches(self, profile: WorkerProfile, limit: int = 3,
+                     min_match: float = 0.3) -> List[Tuple[JobVacancy, float]]:
+        """
+        Best open vacancies for a worker, ranked as ``matching_process``
+        always has: match probability above ``min_match``, wage at least the
+        reservation wage, higher match first and earlier posting on ties.
+        """
+        found = []
+        for bucket in self.buckets.values():
+            if not bucket.vacancies or bucket.match_upper_bound(profile.skills) <= min_match:
+                continue
+            rows, match = bucket.match_probabilities(profile.skills, profile.reservation_wage)
+            rows = rows[match[rows] > min_match]
+            if len(rows) > limit:
+                # Only this bucket's own best ``limit`` can make the overall cut
+                order = np.lexsort((bucket.arrays()['sequences'][rows], -match[rows]))
+                rows = rows[order[:limit]]
+            found.extend((float(match[i]), bucket.sequences[i], bucket.vacancies[i]) for i in rows)
+
+        best = heapq.nsmallest(limit, found, key=lambda c: (-c[0], c[1]))
+        return [(vacancy, match_prob) for match_prob, _, vacancy in best]
+
+
 class EnhancedLaborMarket:
     """
     Enhanced Labor Market with DMP-style matching and advanced wage formation
@@ -107,6 +255,8 @@ class EnhancedLaborMarket:
             'productivity_factor': 1.0,
             'inflation_adjustment': 0.02
         }
+        self._company_index = None  # Employer lookup by name during matching
+        self.batch_candidates = 10  # Vacancies kept per worker in batch matching
         self.matching_efficiency = 0.6  # Base matching efficiency
         self.search_frictions = 0.15    # Search friction parameter
         
@@ -222,9 +372,6 @@ class EnhancedLaborMarket:
         Execute DMP-style matching process between workers and vacancies
         Returns: Dictionary with matching statistics
         """
-        matches_made = 0
-        applications_processed = 0
-        
         # Get unemployed workers
         unemployed_workers = [c for c in self.market.getConsumidores() if not getattr(c, 'empleado', False)]
         
@@ -235,6 +382,30 @@ class EnhancedLaborMarket:
                 profile.unemployment_duration += 1
                 profile.update_search_intensity(1 - self.metrics['unemployment_rate'])
         
+        self._company_index = {emp.nombre: emp for emp in self.market.getEmpresas() if hasattr(emp, 'nombre')}
+        if modo_emparejamiento(self.market) == MODO_LOTE:
+            matches_made, applications_processed = self._batch_matching(unemployed_workers)
+        else:
+            matches_made, applications_processed = self._sequential_matching(unemployed_workers)
+        self._company_index = None
+        
+        # Age and clean up vacancies
+        self._age_vacancies()
+        
+        return {
+            'matches_made': matches_made,
+            'applications_processed': applications_processed,
+            'active_vacancies': len([v for v in self.vacancies if v.status == JobMatchingStatus.VACANT])
+        }
+    
+    def _sequential_matching(self, unemployed_workers) -> Tuple[int, int]:
+        """Workers search one after another and apply to their best vacancies"""
+        matches_made = 0
+        applications_processed = 0
+        
+        # Index open vacancies once per round
+        vacancy_book = VacancyBook(self.vacancies)
+        
         # Matching algorithm - workers search and apply to vacancies
         for worker in unemployed_workers:
             if worker.nombre not in self.worker_profiles:
@@ -247,26 +418,10 @@ class EnhancedLaborMarket:
             if not search_success:
                 continue
             
-            # Find suitable vacancies
-            suitable_vacancies = []
-            for vacancy in self.vacancies:
-                if vacancy.status != JobMatchingStatus.VACANT:
-                    continue
-                
-                match_prob = vacancy.calculate_match_probability(profile.skills)
-                wage_acceptable = vacancy.wage_offered >= profile.reservation_wage
-                
-                if match_prob > 0.3 and wage_acceptable:  # Minimum match threshold
-                    suitable_vacancies.append((vacancy, match_prob))
-            
-            if not suitable_vacancies:
-                continue
+            # Best suitable vacancies (max 3 applications), only from compatible buckets
+            suitable_vacancies = vacancy_book.best_matches(profile, limit=3, min_match=0.3)
             
-            # Sort by match probability and apply to best matches
-            suitable_vacancies.sort(key=lambda x: x[1], reverse=True)
-            applications_this_worker = min(3, len(suitable_vacancies))  # Max 3 applications
-            
-            for vacancy, match_prob in suitable_vacancies[:applications_this_worker]:
+            for vacancy, match_prob in suitable_vacancies:
                 applications_processed += 1
                 vacancy.applications_received += 1
                 
@@ -279,26 +434,122 @@ class EnhancedLaborMarket:
                     if self._execute_hiring(worker, vacancy):
                         matches_made += 1
                         vacancy.status = JobMatchingStatus.MATCHED
+                        vacancy_book.remove(vacancy)
                         profile.unemployment_duration = 0  # Reset unemployment duration
                         break  # Worker found job, stop searching
         
-        # Age and clean up vacancies
-        self._age_vacancies()
+        return matches_made, applications_processed
+    
+    def _batch_matching(self, unemployed_workers) -> Tuple[int, int]:
+        """
+        Solve the round as a batched assignment over a sparse score matrix.
+        
+        Searching workers (sorted by id, so the result does not depend on
+        consumer order) keep their best acceptable vacancies (match above
+        0.3, wage at least their reservation wage). In each pass every worker
+        applies to their best vacancy still open; applications survive the
+        market frictions with the same probability as in the sequential
+        loop, and each vacancy goes to the surviving applicant with the best
+        match and wage surplus. As before, a worker stops after a hire or
+        after 3 applications that did not turn into an offer.
+        """
+        workers = sorted((w for w in unemployed_workers if w.nombre in self.worker_profiles),
+                         key=lambda w: w.nombre)
+        vacancies = [v for v in self.vacancies if v.status == JobMatchingStatus.VACANT]
+        if not workers or not vacancies:
+            return 0, 0
+        profiles = [self.worker_profiles[w.nombre] for w in workers]
+        # Generator seeded from ``random`` so seeded runs stay reproducible
+        rng = np.random.default_rng(random.getrandbits(32))
+        
+        searching = rng.random(len(profiles)) < np.array([p.search_intensity for p in profiles])
+        workers = [w for w, s in zip(workers, searching) if s]
+        profiles = [p for p, s in zip(profiles, searching) if s]
+        if not workers:
+            return 0, 0
+        
+        # Requirement matrix over the skills any vacancy asks for
+        skills = sorted({skill for v in vacancies for skill in v.skill_requirements})
+        column = {skill: j for j, skill in enumerate(skills)}
+        levels = np.full((len(vacancies), len(skills)), np.inf)
+        for i, vacancy in enumerate(vacancies):
+            for skill, level in vacancy.skill_requirements.items():
+                levels[i, column[skill]] = max(0.1, level)
+        counts = np.array([len(v.skill_requirements) for v in vacancies], dtype=float)
+        durations = np.array([v.posting_duration for v in vacancies], dtype=float)
+        wages = np.array([v.wage_offered for v in vacancies], dtype=float)
+        worker_skills = np.array([[p.skills.get(skill, 0.0) for skill in skills] for p in profiles],
+                                 dtype=float).reshape(len(profiles), len(skills))
+        reservation = np.array([p.reservation_wage for p in profiles], dtype=float)
+        
+        def evaluate(start, end):
+            # Same arithmetic as JobVacancy.calculate_match_probability
+            total = np.zeros((end - start, len(vacancies)))
+            for j in range(len(skills)):
+                total += np.minimum(1.0, worker_skills[start:end, j, None] / levels[None, :, j])
+            with np.errstate(divide='ignore', invalid='ignore'):
+                match = np.maximum(0.1, total / counts - 0.05 * durations)
+            match = np.where(counts > 0, match, 0.5)
+            feasible = (match > 0.3) & (wages >= reservation[start:end, None])
+            # Workers rank vacancies by match; a tiny seeded jitter spreads
+            # them over equally matched vacancies instead of piling onto one
+            ranking = match + rng.random(match.shape) * 1e-9
+            return match, np.where(feasible, ranking, -np.inf)
+        
+        candidates = MatrizPuntuaciones.por_bloques(len(profiles), len(vacancies), evaluate,
+                                                    max_candidatos=self.batch_candidates)
+        # Each worker's candidates contiguous and best first
+        order = np.lexsort((candidates.columnas, -candidates.puntuacion, candidates.filas))
+        candidates = candidates.filtrar(order)
+        rows = np.arange(len(profiles))
+        next_candidate = np.searchsorted(candidates.filas, rows, side='left')
+        last_candidate = np.searchsorted(candidates.filas, rows, side='right')
+        applications_left = np.full(len(profiles), 3)
+        hired = np.zeros(len(profiles), dtype=bool)
+        filled = np.zeros(len(vacancies), dtype=bool)
+        friction_factor = (1 - self.search_frictions) * self.matching_efficiency
         
-        return {
-            'matches_made': matches_made,
-            'applications_processed': applications_processed,
-            'active_vacancies': len([v for v in self.vacancies if v.status == JobMatchingStatus.VACANT])
-        }
+        matches_made = 0
+        applications_processed = 0
+        while True:
+            # Skip candidates already filled in earlier passes
+            for row in np.flatnonzero(~hired & (applications_left > 0) & (next_candidate < last_candidate)):
+                while next_candidate[row] < last_candidate[row] and filled[candidates.columnas[next_candidate[row]]]:
+                    next_candidate[row] += 1
+            active = np.flatnonzero(~hired & (applications_left > 0) & (next_candidate < last_candidate))
+            if len(active) == 0:
+                break
+            
+            applications = candidates.filtrar(next_candidate[active])
+            next_candidate[active] += 1
+            applications_processed += len(applications)
+            for col, received in zip(*np.unique(applications.columnas, return_counts=True)):
+                vacancies[col].applications_received += int(received)
+            
+            # Market frictions decide which applications turn into offers; each
+            # vacancy takes the offer with the best match and wage surplus
+            offer = rng.random(len(applications)) < applications.ajuste * friction_factor
+            applications_left[applications.filas[~offer]] -= 1
+            offers = applications.filtrar(offer)
+            offers.puntuacion = puntuacion_con_salario(offers.ajuste, wages[offers.columnas],
+                                                       reservation[offers.filas])
+            for row, col in asignar_voraz(offers):
+                vacancy = vacancies[col]
+                if self._execute_hiring(workers[row], vacancy):
+                    matches_made += 1
+                    hired[row] = True
+                    filled[col] = True
+                    vacancy.status = JobMatchingStatus.MATCHED
+                    profiles[row].unemployment_duration = 0
+                else:
+                    applications_left[row] -= 1
+        
+        return matches_made, applications_processed
     
     def _execute_hiring(self, worker, vacancy: JobVacancy) -> bool:
         """Execute the actual hiring process"""
-        # Find the company
-        company = None
-        for emp in self.market.getEmpresas():
-            if (hasattr(emp, 'nombre') and emp.nombre == vacancy.company_id):
-                company = emp
-                break
+        # Find the company (O(1) during a matching round)
+        company = self._find_company(vacancy.company_id)
         
         if not company or not hasattr(company, 'contratar'):
             return False
@@ -323,6 +574,15 @@ class EnhancedLaborMarket:
         
         return success
     
+    def _find_company(self, company_id: str):
+        """Resolve a vacancy's employer by name"""
+        if self._company_index is not None:
+            return self._company_index.get(company_id)
+        for emp in self.market.getEmpresas():
+            if hasattr(emp, 'nombre') and emp.nombre == company_id:
+                return emp
+        return None
+    
     def _negotiate_wage(self, worker, vacancy: JobVacancy) -> float:
         """Negotiate wage between worker and employer"""
         profile = self.worker_profiles.get(worker.nombre)
@@ -0,0 +1,168 @@
+"""
+Almacén local de resultados de simulación
+=========================================
+
+Memoización por contenido de las ejecuciones: guarda en disco los KPIs
+finales y las series por ciclo (``ResultadoSimulacion``) indexados por una
+clave derivada de la configuración combinada, la semilla efectiva y la
+versión del código. Dos ejecuciones idénticas comparten clave, así que la
+segunda se responde desde el almacén sin volver a simular; la CLI
+(``--headless``), ``run_escenarios.py``, la calibración y la API lo consultan
+antes de simular.
+
+El almacén es un LRU en disco: cada lectura renueva la fecha del archivo y al
+guardar se eliminan las entradas menos usadas por encima de ``max_entradas``.
+Se configura en la sección ``cache_resultados`` (``habilitado``,
+``directorio``, ``max_entradas``).
+"""
+
+import functools
+import hashlib
+import json
+import os
+from typing import Any, Dict, Optional
+
+from .SimulacionReport import ResultadoSimulacion
+
+DIRECTORIO_POR_DEFECTO = os.path.join('results', 'almacen_resultados')
+MAX_ENTRADAS_POR_DEFECTO = 200
+
+# Secciones que no cambian el resultado de una ejecución: perfil de salida,
+# exportación, parámetros del ensamble y el propio almacén
+SECCIONES_SIN_EFECTO = ('ejecucion', 'cache_resultados', 'exportacion_columnar', 'ensamble_montecarlo')
+
+_RAIZ = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+@functools.lru_cache(maxsize=None)
+def version_codigo() -> str:
+    """Hash del código fuente del simulador (``src/`` y ``main.py``).
+
+    Cualquier cambio en el código invalida las entradas anteriores aunque la
+    configuración sea la misma; no depende de que haya un repositorio git.
+    """
+    h = hashlib.sha256()
+    rutas = [os.path.join(_RAIZ, 'main.py')]
+    for directorio, subdirectorios, archivos in os.walk(os.path.join(_RAIZ, 'src')):
+        subdirectorios[:] = sorted(d for d in subdirectorios if d != '__pycache__')
+        rutas.extend(os.path.join(directorio, a) for a in sorted(archivos) if a.endswith('.py'))
+    for ruta in rutas:
+        try:
+            with open(ruta, 'rb') as f:
+                contenido = f.read()
+        except OSError:
+            continue
+        h.update(os.path.relpath(ruta, _RAIZ).encode('utf-8'))
+        h.update(contenido)
+    return h.hexdigest()[:16]
+
+
+def clave_ejecucion(config: Dict[str, Any], seed: Optional[int] = None,
+                    version: Optional[str] = None) -> Optional[str]:
+    """Hash SHA-256 de la configuración canónica, la semilla y la versión del código.
+
+    ``seed`` tiene prioridad sobre ``simulacion.seed`` (como ``--seed`` en la
+    CLI). Sin semilla la ejecución no es reproducible y no hay clave (None).
+    """
+    simulacion = dict(config.get('simulacion', {}) or {})
+    seed_config = simulacion.pop('seed', None)
+    seed = seed if seed is not None else seed_config
+    if seed is None:
+        return None
+    canonica = {k: v for k, v in config.items() if k not in SECCIONES_SIN_EFECTO}
+    canonica['simulacion'] = simulacion
+    datos = json.dumps({'config': canonica, 'seed': int(seed), 'version': version or version_codigo()},
+                       sort_keys=True, separators=(',', ':'), default=str)
+    return hashlib.sha256(datos.encode('utf-8')).hexdigest()
+
+
+def _fecha_uso(entrada) -> float:
+    try:
+        return entrada.stat().st_mtime
+    except OSError:
+        return 0.0
+
+
+class AlmacenResultados:
+    """Resultados de simulación en un directorio local, un JSON por clave, con desalojo LRU"""
+
+    def __init__(self, directorio: str = DIRECTORIO_POR_DEFECTO,
+                 max_entradas: Optional[int] = MAX_ENTRADAS_POR_DEFECTO):
+        self.directorio = directorio
+        self.max_entradas = max_entradas
+
+    @classmethod
+    def desde_config(cls, config: Dict[str, Any]) -> Optional['AlmacenResultados']:
+        """Almacén según la sección ``cache_resultados``; None si está deshabilitado"""
+        seccion = config.get('cache_resultados', {}) or {}
+        if not seccion.get('habilitado', True):
+            return None
+        return cls(seccion.get('directorio', DIRECTORIO_POR_DEFECTO),
+                   seccion.get('max_entradas', MAX_ENTRADAS_POR_DEFECTO))
+
+    def ruta(self, clave: str) -> str:
+        return os.path.join(self.directorio, f"{clave}.json")
+
+    def contiene(self, clave: Optional[str]) -> bool:
+        return clave is not None and os.path.exists(self.ruta(clave))
+
+    def obtener_entrada(self, clave: Optional[str]) -> Optional[Dict[str, Any]]:
+        """Entrada completa (resultado y metadatos); renueva su posición en el LRU"""
+        if clave is None:
+            return None
+        ruta = self.ruta(clave)
+        try:
+            with open(ruta, encoding='utf-8') as f:
+                datos = json.load(f)
+            os.utime(ruta)
+        except (OSError, ValueError):
+            return None
+        return datos
+
+    def obtener(self, clave: Optional[str]) -> Optional[ResultadoSimulacion]:
+        """Resultado guardado para la clave, o None si no existe o está dañado"""
+        datos = self.obtener_entrada(clave)
+        if datos is None:
+            return None
+        return ResultadoSimulacion(**datos['resultado'])
+
+    def guardar(self, clave: str, resultado: ResultadoSimulacion,
+                metadatos: Optional[Dict[str, Any]] = None) -> str:
+        """Escribe el resultado de forma atómica (archivo temporal + rename)"""
+        os.makedirs(self.directorio, exist_ok=True)
+        ruta = self.ruta(clave)
+        temporal = f"{ruta}.{os.getpid()}.tmp"
+        with open(temporal, 'w', encoding='utf-8') as f:
+            json.dump({'clave': clave, 'metadatos': metadatos or {}, 'resultado': resultado.to_dict()},
+                      f, separators=(',', ':'), default=str)
+        os.replace(temporal, ruta)
+        self._desalojar()
+        return ruta
+
+    def eliminar(self, clave: Optional[str]) -> bool:
+        """Borra la entrada de la clave; False si no existía"""
+        if clave is None:
+            return False
+        try:
+            os.remove(self.ruta(clave))
+        except OSError:
+            return False
+        return True
+
+    def _desalojar(self):
+        """Elimina las entradas menos usadas recientemente por encima de ``max_entradas``"""
+        if not self.max_entradas:
+            return
+        try:
+            entradas = [e for e in os.scandir(self.directorio) if e.name.endswith('.json')]
+        except OSError:
+            return
+        exceso = len(entradas) - self.max_entradas
+        if exceso <= 0:
+            return
+        entradas.sort(key=_fecha_uso)
+        for entrada in entradas[:exceso]:
+            try:
+                os.remove(entrada.path)
+            except OSError:
+                pass
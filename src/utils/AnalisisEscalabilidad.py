@@ -0,0 +1,384 @@
+"""
+Análisis de Escalabilidad del Simulador
+=======================================
+
+Barre el tamaño de la economía (consumidores, bienes del catálogo y empresas
+productoras) sobre una grilla, mide ciclos/segundo, RSS pico y tiempo por
+subsistema en cada punto, y ajusta exponentes empíricos de complejidad
+``t ∝ n^k`` (pendiente log-log) por dimensión y por subsistema.
+
+Cada punto se ejecuta por defecto en un proceso hijo (``spawn``) para que el
+RSS pico sea el de esa economía y no el acumulado de los puntos anteriores.
+El reporte indica qué subsistema "se rompe primero": el de mayor exponente
+y el que domina el ciclo al extrapolar al siguiente orden de magnitud.
+"""
+
+import itertools
+import json
+import os
+import time
+from dataclasses import dataclass, field, asdict
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+from .SimuladorLogger import diagnostico
+
+
+DIMENSIONES = ('consumidores', 'bienes', 'empresas')
+
+# Punto central de la grilla: cada dimensión se barre con las otras fijas aquí
+PUNTO_BASE = {'consumidores': 250, 'bienes': 20, 'empresas': 5}
+
+BARRIDOS_POR_DEFECTO = {
+    'consumidores': (125, 250, 500, 1000, 2000),
+    'bienes': (10, 20, 40),
+    'empresas': (3, 5, 10, 20),
+}
+
+# Subsistema -> funciones (archivo, nombre) cuyo tiempo acumulado se suma.
+# Las funciones de un mismo subsistema no se anidan entre sí; entre
+# subsistemas sí puede haber anidamiento (el Gini se calcula dentro del
+# dashboard), por lo que los tiempos no deben sumarse entre subsistemas.
+SUBSISTEMAS = {
+    'consumidores': [('Consumidor.py', 'ciclo_persona')],
+    'empresas': [('EmpresaProductora.py', 'ciclo_persona'),
+                 ('EmpresaProductoraHiperrealista.py', 'ciclo_empresa_hiperrealista')],
+    'estadisticas_mercado': [('Mercado.py', 'registrar_estadisticas')],
+    'dashboard': [('VisualizacionAvanzada.py', 'actualizar_metricas')],
+    'gini': [('VisualizacionAvanzada.py', '_calcular_gini_simple')],
+    'mercado_laboral': [('labor_market.py', 'labor_market_cycle'),
+                        ('MercadoLaboral.py', 'ciclo_mercado_laboral')],
+    'precios': [('PreciosDinamicos.py', 'actualizar_precios_mercado'),
+                ('ControlPreciosRealista.py', 'aplicar_control_masivo_precios')],
+    'banca': [('SistemaBancario.py', 'ciclo_bancario')],
+    'gobierno': [('Gobierno.py', 'ciclo_gobierno')],
+    'cadena_suministro': [('CadenaSuministro.py', 'ciclo_cadena')],
+    'bolsa': [('MercadoCapitales.py', 'ejecutar_ciclo_bursatil')],
+    'fiscal': [('SistemaFiscal.py', 'ejecutar_ciclo_fiscal')],
+    'empresas_hiperrealistas': [('IntegradorEmpresasHiperrealistas.py', 'ciclo_empresas_hiperrealistas')],
+    'sectores': [('SectoresEconomicos.py', 'ciclo_economico_sectorial')],
+}
+
+
+@dataclass
+class PuntoEscalado:
+    """Mediciones de una ejecución de la grilla"""
+    consumidores: int
+    bienes: int
+    empresas: int
+    ciclos: int
+    tiempo_ciclos: float = 0.0
+    ciclos_por_segundo: float = 0.0
+    rss_pico_mb: Optional[float] = None
+    tiempo_inicializacion: float = 0.0
+    subsistemas: Dict[str, float] = field(default_factory=dict)  # segundos por ciclo (perfilado)
+    error: Optional[str] = None
+
+    @property
+    def segundos_por_ciclo(self) -> float:
+        return self.tiempo_ciclos / self.ciclos if self.ciclos else 0.0
+
+    def valor(self, dimension: str) -> int:
+        return getattr(self, dimension)
+
+    def to_dict(self) -> Dict[str, Any]:
+        datos = asdict(self)
+        datos['segundos_por_ciclo'] = self.segundos_por_ciclo
+        return datos
+
+
+def generar_grid(barridos: Optional[Dict[str, Tuple[int, ...]]] = None,
+                 base: Optional[Dict[str, int]] = None,
+                 completo: bool = False) -> List[Dict[str, int]]:
+    """Genera los puntos a medir.
+
+    Por defecto barre una dimensión a la vez alrededor de ``base`` (coste
+    lineal en el número de valores); con ``completo=True`` genera el producto
+    cartesiano de todos los barridos.
+    """
+    barridos = {**BARRIDOS_POR_DEFECTO, **(barridos or {})}
+    base = {**PUNTO_BASE, **(base or {})}
+
+    if completo:
+        valores = [sorted(set(barridos[d])) for d in DIMENSIONES]
+        return [dict(zip(DIMENSIONES, combinacion)) for combinacion in itertools.product(*valores)]
+
+    puntos = []
+    vistos = set()
+    for dimension in DIMENSIONES:
+        for valor in sorted(set(barridos[dimension])):
+            punto = {**base, dimension: valor}
+            clave = tuple(punto[d] for d in DIMENSIONES)
+            if clave not in vistos:
+                vistos.add(clave)
+                puntos.append(punto)
+    return puntos
+
+
+def configuracion_punto(consumidores: int, bienes: int, empresas: int,
+                        ciclos: int, seed: int = 42):
+    """Configuración headless y determinista para un punto de la grilla"""
+    from src.config.ConfiguradorSimulacion import ConfiguradorSimulacion
+    config = ConfiguradorSimulacion()
+    sim = config.config['simulacion']
+    sim['num_ciclos'] = ciclos
+    sim['num_consumidores'] = consumidores
+    sim['num_bienes'] = bienes
+    sim['num_empresas_productoras'] = empresas
+    sim['seed'] = seed
+    config.config['machine_learning']['activar'] = False
+    config.config['agentes_ia']['activar'] = False
+    config.activar_perfil_headless()
+    config.aplicar_seed_global(seed)
+    return config
+
+
+def tiempos_por_subsistema(stats) -> Dict[str, float]:
+    """Suma el tiempo acumulado (cumtime) de las funciones de cada subsistema.
+
+    ``stats`` es un ``pstats.Stats``; sus entradas son
+    ``(archivo, línea, función) -> (cc, nc, tt, ct, llamadores)``.
+    """
+    tiempos = {nombre: 0.0 for nombre in SUBSISTEMAS}
+    indice = {}
+    for nombre, funciones in SUBSISTEMAS.items():
+        for archivo, funcion in funciones:
+            indice[(archivo, funcion)] = nombre
+
+    for (archivo, _linea, funcion), (_cc, _nc, _tt, ct, _llamadores) in stats.stats.items():
+        nombre = indice.get((os.path.basename(archivo), funcion))
+        if nombre:
+            tiempos[nombre] += ct
+    return tiempos
+
+
+def _rss_pico_mb() -> Optional[float]:
+    """RSS pico del proceso actual en MB (None si no se puede medir)"""
+    try:
+        import resource
+        import sys
+        pico = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # Linux informa en KB, macOS en bytes
+        return pico / (1024 * 1024) if sys.platform == 'darwin' else pico / 1024
+    except Exception:
+        pass
+    try:
+        import psutil
+        return psutil.Process(os.getpid()).memory_info().rss / 1024 / 1024
+    except Exception:
+        return None
+
+
+def medir_punto(parametros: Dict[str, int], ciclos: int = 3, perfilar: bool = True,
+                seed: int = 42) -> PuntoEscalado:
+    """Ejecuta un punto en el proceso actual.
+
+    La corrida cronometrada va sin profiler; si ``perfilar`` es True se repite
+    bajo cProfile para repartir el tiempo entre subsistemas.
+    """
+    from main import ejecutar_simulacion_headless
+
+    punto = PuntoEscalado(parametros['consumidores'], parametros['bienes'],
+                          parametros['empresas'], ciclos)
+    try:
+        config = configuracion_punto(punto.consumidores, punto.bienes, punto.empresas, ciclos, seed)
+        resultado = ejecutar_simulacion_headless(config)
+        punto.tiempo_inicializacion = resultado.kpis.get('tiempo_inicializacion', 0.0)
+        punto.tiempo_ciclos = resultado.tiempo_total - punto.tiempo_inicializacion
+        punto.ciclos_por_segundo = resultado.kpis.get('ciclos_por_segundo', 0.0)
+
+        if perfilar:
+            import cProfile
+            import pstats
+            config = configuracion_punto(punto.consumidores, punto.bienes, punto.empresas, ciclos, seed)
+            profiler = cProfile.Profile()
+            profiler.enable()
+            try:
+                ejecutar_simulacion_headless(config)
+            finally:
+                profiler.disable()
+            tiempos = tiempos_por_subsistema(pstats.Stats(profiler))
+            punto.subsistemas = {k: v / ciclos for k, v in tiempos.items()}
+    except Exception as e:
+        punto.error = f"{type(e).__name__}: {e}"
+    punto.rss_pico_mb = _rss_pico_mb()
+    return punto
+
+
+def _medir_punto_en_hijo(parametros, ciclos, perfilar, seed, cola):
+    """Punto de entrada del proceso hijo (debe ser de nivel de módulo para spawn)"""
+    punto = medir_punto(parametros, ciclos, perfilar, seed)
+    cola.put(punto.to_dict())
+
+
+def medir_punto_aislado(parametros: Dict[str, int], ciclos: int = 3, perfilar: bool = True,
+                        seed: int = 42, timeout: Optional[float] = None) -> PuntoEscalado:
+    """Ejecuta un punto en un proceso hijo nuevo para aislar el RSS pico"""
+    import multiprocessing as mp
+    import queue
+
+    contexto = mp.get_context('spawn')
+    cola = contexto.Queue()
+    proceso = contexto.Process(target=_medir_punto_en_hijo,
+                               args=(parametros, ciclos, perfilar, seed, cola))
+    proceso.start()
+    try:
+        datos = cola.get(timeout=timeout)
+    except queue.Empty:
+        datos = None
+    proceso.join(5)
+    if proceso.is_alive():
+        proceso.terminate()
+        proceso.join()
+
+    if datos is None:
+        punto = PuntoEscalado(parametros['consumidores'], parametros['bienes'],
+                              parametros['empresas'], ciclos)
+        punto.error = f"El proceso hijo terminó sin resultado (exitcode={proceso.exitcode})"
+        return punto
+    datos.pop('segundos_por_ciclo', None)
+    return PuntoEscalado(**datos)
+
+
+def ajustar_exponente(tamanos, tiempos) -> Optional[float]:
+    """Pendiente de log(tiempo) frente a log(tamaño); None si no hay datos suficientes"""
+    pares = [(n, t) for n, t in zip(tamanos, tiempos) if n and n > 0 and t and t > 0]
+    if len({n for n, _ in pares}) < 2:
+        return None
+    x = np.log([n for n, _ in pares])
+    y = np.log([t for _, t in pares])
+    pendiente, _ = np.polyfit(x, y, 1)
+    return float(pendiente)
+
+
+def _puntos_de_barrido(puntos: List[PuntoEscalado], dimension: str) -> List[PuntoEscalado]:
+    """Puntos donde solo varía ``dimension`` (las otras en su valor más frecuente)"""
+    validos = [p for p in puntos if p.error is None]
+    otras = [d for d in DIMENSIONES if d != dimension]
+    if not validos:
+        return []
+    grupos: Dict[Tuple[int, ...], List[PuntoEscalado]] = {}
+    for p in validos:
+        grupos.setdefault(tuple(p.valor(d) for d in otras), []).append(p)
+    # El grupo con más valores distintos de la dimensión es el barrido principal
+    mejor = max(grupos.values(), key=lambda g: len({p.valor(dimension) for p in g}))
+    return sorted(mejor, key=lambda p: p.valor(dimension))
+
+
+def analizar_escalabilidad(puntos: List[PuntoEscalado]) -> Dict[str, Any]:
+    """Ajusta exponentes por dimensión (ciclo completo y subsistemas) y detecta el cuello de botella"""
+    analisis = {}
+    for dimension in DIMENSIONES:
+        barrido = _puntos_de_barrido(puntos, dimension)
+        tamanos = [p.valor(dimension) for p in barrido]
+        if len(set(tamanos)) < 2:
+            continue
+
+        exponentes = {}
+        proyeccion = {}
+        n_max = max(tamanos)
+        for subsistema in SUBSISTEMAS:
+            tiempos = [p.subsistemas.get(subsistema, 0.0) for p in barrido]
+            k = ajustar_exponente(tamanos, tiempos)
+            if k is None:
+                continue
+            exponentes[subsistema] = k
+            # Extrapolación al siguiente orden de magnitud: t(10n) = t(n) * 10^k
+            proyeccion[subsistema] = tiempos[-1] * 10 ** k
+
+        primero = max(exponentes, key=exponentes.get) if exponentes else None
+        dominante = max(proyeccion, key=proyeccion.get) if proyeccion else None
+        analisis[dimension] = {
+            'tamanos': tamanos,
+            'segundos_por_ciclo': [p.segundos_por_ciclo for p in barrido],
+            'ciclos_por_segundo': [p.ciclos_por_segundo for p in barrido],
+            'rss_pico_mb': [p.rss_pico_mb for p in barrido],
+            'exponente_ciclo': ajustar_exponente(tamanos, [p.segundos_por_ciclo for p in barrido]),
+            'exponente_rss': ajustar_exponente(tamanos, [p.rss_pico_mb for p in barrido]),
+            'exponentes_subsistemas': dict(sorted(exponentes.items(), key=lambda kv: -kv[1])),
+            'proyeccion_10x': {'tamano': n_max * 10, 'segundos_por_ciclo': proyeccion},
+            'subsistema_mayor_exponente': primero,
+            'subsistema_dominante_10x': dominante,
+        }
+    return analisis
+
+
+def generar_reporte_escalabilidad(puntos: List[PuntoEscalado], analisis: Dict[str, Any],
+                                  directorio: str = "results/perf",
+                                  timestamp: Optional[str] = None) -> Tuple[Path, Path]:
+    """Escribe el reporte markdown y los datos crudos en JSON"""
+    timestamp = timestamp or datetime.now().strftime("%Y%m%d_%H%M%S")
+    salida = Path(directorio)
+    salida.mkdir(parents=True, exist_ok=True)
+    archivo_json = salida / f"scaling_{timestamp}.json"
+    archivo_md = salida / f"scaling_{timestamp}.md"
+
+    with open(archivo_json, 'w', encoding='utf-8') as f:
+        json.dump({'timestamp': timestamp,
+                   'puntos': [p.to_dict() for p in puntos],
+                   'analisis': analisis}, f, indent=2, ensure_ascii=False)
+
+    def _fmt(valor, patron="{:.2f}"):
+        return "n/d" if valor is None else patron.format(valor)
+
+    with open(archivo_md, 'w', encoding='utf-8') as f:
+        f.write("# Análisis de Escalabilidad\n\n")
+        f.write(f"**Timestamp:** {timestamp}\n\n")
+
+        f.write("## Resumen\n\n")
+        f.write("| Dimensión | Exponente ciclo | Exponente RSS | Mayor exponente | Domina a 10x |\n")
+        f.write("|---|---|---|---|---|\n")
+        for dimension, datos in analisis.items():
+            primero = datos['subsistema_mayor_exponente']
+            k_primero = datos['exponentes_subsistemas'].get(primero) if primero else None
+            f.write(f"| {dimension} | {_fmt(datos['exponente_ciclo'])} | {_fmt(datos['exponente_rss'])} "
+                    f"| {primero or 'n/d'} ({_fmt(k_primero)}) | {datos['subsistema_dominante_10x'] or 'n/d'} |\n")
+
+        for dimension, datos in analisis.items():
+            f.write(f"\n## Barrido: {dimension}\n\n")
+            f.write("| Tamaño | s/ciclo | ciclos/s | RSS pico (MB) |\n|---|---|---|---|\n")
+            for n, s, c, r in zip(datos['tamanos'], datos['segundos_por_ciclo'],
+                                  datos['ciclos_por_segundo'], datos['rss_pico_mb']):
+                f.write(f"| {n} | {s:.3f} | {c:.2f} | {_fmt(r, '{:.0f}')} |\n")
+            if datos['exponentes_subsistemas']:
+                proyeccion = datos['proyeccion_10x']
+                f.write(f"\n| Subsistema | Exponente | s/ciclo proyectado a {proyeccion['tamano']} |\n")
+                f.write("|---|---|---|\n")
+                for subsistema, k in datos['exponentes_subsistemas'].items():
+                    f.write(f"| {subsistema} | {k:.2f} | "
+                            f"{proyeccion['segundos_por_ciclo'].get(subsistema, 0.0):.3f} |\n")
+
+        errores = [p for p in puntos if p.error]
+        if errores:
+            f.write("\n## Puntos con error\n\n")
+            for p in errores:
+                f.write(f"- {p.consumidores}/{p.bienes}/{p.empresas}: {p.error}\n")
+
+        f.write("\n## Interpretación\n\n")
+        f.write("- Exponente ≈ 1: lineal en la dimensión; > 1: superlineal, candidato a vectorizar o indexar.\n")
+        f.write("- Los tiempos por subsistema provienen de una corrida bajo cProfile (cumtime por ciclo);\n")
+        f.write("  el Gini se mide dentro del dashboard, así que los subsistemas no deben sumarse.\n")
+    return archivo_md, archivo_json
+
+
+def ejecutar_barrido(barridos: Optional[Dict[str, Tuple[int, ...]]] = None,
+                     base: Optional[Dict[str, int]] = None, completo: bool = False,
+                     ciclos: int = 3, perfilar: bool = True, aislar: bool = True,
+                     seed: int = 42) -> List[PuntoEscalado]:
+    """Mide todos los puntos de la grilla"""
+    puntos = []
+    grid = generar_grid(barridos, base, completo)
+    for i, parametros in enumerate(grid, 1):
+        inicio = time.time()
+        if aislar:
+            punto = medir_punto_aislado(parametros, ciclos, perfilar, seed)
+        else:
+            punto = medir_punto(parametros, ciclos, perfilar, seed)
+        estado = punto.error or f"{punto.ciclos_por_segundo:.2f} ciclos/s"
+        diagnostico("  [%s/%s] consumidores=%s bienes=%s empresas=%s: %s (%.1fs)", i, len(grid),
+                    parametros['consumidores'], parametros['bienes'], parametros['empresas'], estado,
+                    time.time() - inicio, componente='Rendimiento')
+        puntos.append(punto)
+    return puntos
@@ -0,0 +1,366 @@
+"""
+Suite de Benchmarks del Núcleo de Simulación
+============================================
+
+Micro-benchmarks parametrizados de los subsistemas calientes (order book,
+ronda de compras de consumidores, ciclo productivo de empresas, PIB e índice
+de precios, ronda de precios dinámicos, cobro de cuotas bancarias, matching
+laboral) y macro-benchmarks de ciclos completos en perfil headless.
+
+Los resultados se guardan como baselines JSON indexados por commit
+(``results/benchmarks/baselines.json``) y se comparan contra una baseline
+anterior: un benchmark cuya mediana empeora más que ``umbral_regresion``
+se reporta como regresión.
+"""
+
+import json
+import random
+import subprocess
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+from .SimuladorLogger import diagnostico
+
+
+TAMANOS_MACRO = (250, 1000, 5000, 20000)
+
+
+@dataclass
+class Benchmark:
+    """Definición de un benchmark: ``preparar`` no se cronometra, ``ejecutar`` sí"""
+    nombre: str
+    preparar: Callable[[], Any]
+    ejecutar: Callable[[Any], Any]
+    parametros: Dict[str, Any] = field(default_factory=dict)
+    tipo: str = 'micro'
+
+    @property
+    def clave(self) -> str:
+        if not self.parametros:
+            return self.nombre
+        params = ','.join(f"{k}={v}" for k, v in sorted(self.parametros.items()))
+        return f"{self.nombre}[{params}]"
+
+
+@dataclass
+class ResultadoBenchmark:
+    """Tiempos (segundos) de las repeticiones de un benchmark"""
+    clave: str
+    tipo: str
+    parametros: Dict[str, Any]
+    tiempos: List[float]
+
+    @property
+    def mediana(self) -> float:
+        return float(np.median(self.tiempos)) if self.tiempos else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        tiempos = np.asarray(self.tiempos, dtype=float)
+        return {
+            'tipo': self.tipo,
+            'parametros': self.parametros,
+            'repeticiones': len(self.tiempos),
+            'mediana': self.mediana,
+            'minimo': float(tiempos.min()) if tiempos.size else 0.0,
+            'media': float(tiempos.mean()) if tiempos.size else 0.0,
+            'desviacion': float(tiempos.std()) if tiempos.size else 0.0,
+        }
+
+
+def commit_actual(raiz: Optional[str] = None) -> str:
+    """Hash corto del commit actual (con sufijo -dirty si hay cambios sin commitear)"""
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=raiz,
+                                capture_output=True, text=True, timeout=10).stdout.strip()
+        if not commit:
+            return 'desconocido'
+        sucio = subprocess.run(['git', 'status', '--porcelain', '--untracked-files=no'], cwd=raiz,
+                               capture_output=True, text=True, timeout=30).stdout.strip()
+        return f"{commit}-dirty" if sucio else commit
+    except Exception:
+        return 'desconocido'
+
+
+# === CONSTRUCCIÓN DE ESCENARIOS SINTÉTICOS ===
+
+def crear_mercado_sintetico(num_consumidores: int, num_empresas: int = 10,
+                            num_bienes: int = 10, seed: int = 42):
+    """Mercado pequeño y determinista con empresas productoras y consumidores"""
+    from src.models.Mercado import Mercado
+    from src.models.Bien import Bien
+    from src.models.Consumidor import Consumidor
+    from src.models.EmpresaProductora import EmpresaProductora
+
+    random.seed(seed)
+    np.random.seed(seed)
+    categorias = ['alimentos_basicos', 'alimentos_lujo', 'tecnologia']
+    bienes = {f"bien_{i}": Bien(f"bien_{i}", categorias[i % len(categorias)])
+              for i in range(num_bienes)}
+    mercado = Mercado(bienes)
+    mercado.persistencia_habilitada = False
+    for i in range(num_empresas):
+        mercado.agregar_persona(EmpresaProductora(f"Productora_{i}", mercado))
+    for i in range(num_consumidores):
+        mercado.agregar_persona(Consumidor(f"Consumidor_{i}", mercado))
+    return mercado
+
+
+def _preparar_orderbook(num_ordenes: int):
+    rng = random.Random(7)
+    ordenes = []
+    for i in range(num_ordenes):
+        lado = 'bid' if i % 2 == 0 else 'ask'
+        base = 100.0 if lado == 'bid' else 101.0
+        ordenes.append((lado, round(base + rng.uniform(-5, 5), 2), rng.randint(1, 10), f"agente_{i}"))
+    return ordenes
+
+
+def _ejecutar_orderbook(ordenes):
+    from src.systems.OrderBook import OrderBook
+    libro = OrderBook('bien_0')
+    for lado, precio, cantidad, agente in ordenes:
+        libro.submit(lado, precio, cantidad, agente)
+    return libro.match()
+
+
+def _preparar_compras(num_consumidores: int):
+    mercado = crear_mercado_sintetico(num_consumidores)
+    for empresa in mercado.getEmpresas():
+        for bien in mercado.bienes:
+            empresa.producir_bien_mejorado(bien, 50, mercado)
+    return mercado
+
+
+def _ejecutar_compras(mercado):
+    for consumidor in mercado.getConsumidores():
+        consumidor.decidir_compra_racional(mercado, 1)
+
+
+def _ejecutar_produccion(mercado):
+    for empresa in mercado.getEmpresas():
+        plan = empresa.planificar_produccion(mercado)
+        for bien, cantidad in plan.items():
+            if cantidad > 0:
+                empresa.producir_bien_mejorado(bien, cantidad, mercado)
+
+
+def _preparar_indicadores(num_transacciones: int):
+    mercado = crear_mercado_sintetico(50)
+    rng = random.Random(11)
+    bienes = list(mercado.bienes)
+    consumidores = mercado.getConsumidores()
+    mercado.ciclo_actual = 1
+    for _ in range(num_transacciones):
+        mercado.transacciones.append({
+            'consumidor': rng.choice(consumidores).nombre,
+            'bien': rng.choice(bienes),
+            'cantidad': rng.randint(1, 5),
+            'costo_total': rng.uniform(10, 200),
+            'ciclo': 1,
+        })
+    return mercado
+
+
+def _ejecutar_indicadores(mercado):
+    return mercado.calcular_pib_total(), mercado.calcular_indice_precios()
+
+
+def _preparar_precios(num_empresas: int):
+    from src.systems.PreciosDinamicos import integrar_sistema_precios_dinamicos
+    mercado = crear_mercado_sintetico(0, num_empresas=num_empresas, num_bienes=20)
+    integrar_sistema_precios_dinamicos(mercado)
+    return mercado
+
+
+def _ejecutar_precios(mercado):
+    from src.systems.PreciosDinamicos import actualizar_precios_mercado
+    return actualizar_precios_mercado(mercado)
+
+
+def _preparar_cuotas(num_prestamos: int):
+    from src.systems.SistemaBancario import Banco
+    banco = Banco('Banco_Benchmark', capital_inicial=10_000_000)
+    rng = random.Random(13)
+
+    class _Deudor:
+        def __init__(self, dinero):
+            self.dinero = dinero
+
+    for i in range(num_prestamos):
+        monto = rng.uniform(1000, 20000)
+        banco._prestamos[i] = {
+            'monto': monto,
+            'tasa_anual': 0.08,
+            'plazo_meses': 24,
+            'cuota_mensual': banco._calcular_cuota(monto, 0.08, 24),
+            'saldo_pendiente': monto,
+            'meses_restantes': 24,
+            'solicitante': _Deudor(rng.uniform(0, 3000)),
+        }
+    return banco
+
+
+def _preparar_matching(num_consumidores: int):
+    from src.systems.labor_market import EnhancedLaborMarket
+    mercado = crear_mercado_sintetico(num_consumidores)
+    mercado_laboral = EnhancedLaborMarket(mercado)
+    sectores = ['manufactura', 'servicios', 'tecnologia']
+    for i, empresa in enumerate(mercado.getEmpresas()):
+        for j in range(max(1, num_consumidores // 50)):
+            mercado_laboral.post_vacancy(empresa, sectores[(i + j) % len(sectores)])
+    random.seed(17)
+    return mercado_laboral
+
+
+def _preparar_macro(num_consumidores: int, num_ciclos: int):
+    from src.config.ConfiguradorSimulacion import ConfiguradorSimulacion
+    config = ConfiguradorSimulacion()
+    config.config['simulacion']['num_ciclos'] = num_ciclos
+    config.config['simulacion']['num_consumidores'] = num_consumidores
+    config.config['simulacion']['seed'] = 42
+    config.config['machine_learning']['activar'] = False
+    config.config['agentes_ia']['activar'] = False
+    config.aplicar_seed_global(42)
+    return config
+
+
+def _ejecutar_macro(config):
+    from main import ejecutar_simulacion_headless
+    return ejecutar_simulacion_headless(config)
+
+
+def benchmarks_micro(escala: int = 1) -> List[Benchmark]:
+    """Micro-benchmarks por subsistema; ``escala`` multiplica el tamaño del problema"""
+    n_ordenes = 2000 * escala
+    n_consumidores = 250 * escala
+    n_transacciones = 5000 * escala
+    n_prestamos = 5000 * escala
+    n_empresas = 200 * escala
+    return [
+        Benchmark('orderbook_submit_match', lambda: _preparar_orderbook(n_ordenes),
+                  _ejecutar_orderbook, {'ordenes': n_ordenes}),
+        Benchmark('ronda_compras_consumidores', lambda: _preparar_compras(n_consumidores),
+                  _ejecutar_compras, {'consumidores': n_consumidores}),
+        Benchmark('ciclo_produccion_empresas', lambda: crear_mercado_sintetico(n_consumidores),
+                  _ejecutar_produccion, {'empresas': 10, 'bienes': 10}),
+        Benchmark('pib_indice_precios', lambda: _preparar_indicadores(n_transacciones),
+                  _ejecutar_indicadores, {'transacciones': n_transacciones}),
+        Benchmark('ronda_precios_dinamicos', lambda: _preparar_precios(n_empresas),
+                  _ejecutar_precios, {'empresas': n_empresas, 'bienes': 20}),
+        Benchmark('cobro_cuotas_bancarias', lambda: _preparar_cuotas(n_prestamos),
+                  lambda banco: banco.cobrar_cuotas(), {'prestamos': n_prestamos}),
+        Benchmark('matching_laboral', lambda: _preparar_matching(n_consumidores),
+                  lambda ml: ml.matching_process(), {'consumidores': n_consumidores}),
+    ]
+
+
+def benchmarks_macro(tamanos=TAMANOS_MACRO, num_ciclos: int = 3) -> List[Benchmark]:
+    """Ciclos completos (perfil headless) para distintos números de consumidores"""
+    return [
+        Benchmark('simulacion_completa',
+                  (lambda n=n: _preparar_macro(n, num_ciclos)),
+                  _ejecutar_macro,
+                  {'consumidores': n, 'ciclos': num_ciclos}, tipo='macro')
+        for n in tamanos
+    ]
+
+
+class SuiteBenchmarks:
+    """Ejecuta benchmarks, guarda baselines por commit y detecta regresiones"""
+
+    def __init__(self, directorio: str = "results/benchmarks", repeticiones: int = 5,
+                 calentamiento: int = 1, umbral_regresion: float = 0.20):
+        self.directorio = Path(directorio)
+        self.repeticiones = repeticiones
+        self.calentamiento = calentamiento
+        self.umbral_regresion = umbral_regresion
+        self.benchmarks: List[Benchmark] = []
+
+    @property
+    def ruta_baselines(self) -> Path:
+        return self.directorio / 'baselines.json'
+
+    def registrar(self, benchmarks: List[Benchmark]):
+        self.benchmarks.extend(benchmarks)
+
+    def medir(self, benchmark: Benchmark, repeticiones: Optional[int] = None) -> ResultadoBenchmark:
+        """Mide un benchmark preparando un estado nuevo en cada repetición"""
+        repeticiones = repeticiones or self.repeticiones
+        if benchmark.tipo == 'macro':
+            repeticiones = max(1, min(repeticiones, 3))
+        tiempos = []
+        for i in range(self.calentamiento + repeticiones):
+            estado = benchmark.preparar()
+            inicio = time.perf_counter()
+            benchmark.ejecutar(estado)
+            duracion = time.perf_counter() - inicio
+            if i >= self.calentamiento or benchmark.tipo == 'macro':
+                tiempos.append(duracion)
+            if benchmark.tipo == 'macro' and len(tiempos) >= repeticiones:
+                # Los macro-benchmarks no hacen calentamiento: son demasiado caros
+                break
+        return ResultadoBenchmark(benchmark.clave, benchmark.tipo, benchmark.parametros, tiempos)
+
+    def ejecutar(self, filtro: Optional[str] = None) -> Dict[str, ResultadoBenchmark]:
+        resultados = {}
+        for benchmark in self.benchmarks:
+            if filtro and filtro not in benchmark.clave:
+                continue
+            resultado = self.medir(benchmark)
+            resultados[resultado.clave] = resultado
+            diagnostico("⏱️  %s: mediana %.2f ms (%s rep.)", resultado.clave, resultado.mediana * 1000,
+                        len(resultado.tiempos), componente='Rendimiento')
+        return resultados
+
+    # --- Baselines ---
+    def cargar_baselines(self) -> Dict[str, Any]:
+        if not self.ruta_baselines.exists():
+            return {}
+        with open(self.ruta_baselines, 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    def guardar_baseline(self, resultados: Dict[str, ResultadoBenchmark], commit: str) -> Path:
+        """Añade (o reemplaza) la baseline del commit conservando las anteriores"""
+        self.directorio.mkdir(parents=True, exist_ok=True)
+        baselines = self.cargar_baselines()
+        entrada = baselines.get(commit, {'resultados': {}})
+        entrada['timestamp'] = datetime.now().isoformat(timespec='seconds')
+        entrada['resultados'].update({k: r.to_dict() for k, r in resultados.items()})
+        baselines[commit] = entrada
+        with open(self.ruta_baselines, 'w', encoding='utf-8') as f:
+            json.dump(baselines, f, indent=2, ensure_ascii=False)
+        return self.ruta_baselines
+
+    def seleccionar_baseline(self, commit_base: Optional[str] = None,
+                             excluir: Optional[str] = None) -> Tuple[Optional[str], Dict[str, Any]]:
+        """Baseline pedida o, por defecto, la más reciente distinta de ``excluir``"""
+        baselines = self.cargar_baselines()
+        if commit_base:
+            return (commit_base, baselines[commit_base]['resultados']) if commit_base in baselines else (None, {})
+        candidatos = [(v.get('timestamp', ''), k) for k, v in baselines.items() if k != excluir]
+        if not candidatos:
+            return None, {}
+        _, commit = max(candidatos)
+        return commit, baselines[commit]['resultados']
+
+    def comparar(self, resultados: Dict[str, ResultadoBenchmark],
+                 baseline: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Compara medianas contra la baseline; marca regresión si supera el umbral"""
+        comparacion = []
+        for clave, resultado in resultados.items():
+            base = baseline.get(clave)
+            if not base or base.get('mediana', 0) <= 0:
+                continue
+            variacion = resultado.mediana / base['mediana'] - 1
+            comparacion.append({
+                'clave': clave,
+                'actual': resultado.mediana,
+                'baseline': base['mediana'],
+                'variacion': variacion,
+                'regresion': variacion > self.umbral_regresion,
+            })
+        return comparacion
@@ -0,0 +1,95 @@
+"""
+Canal acotado de métricas por ciclo
+===================================
+
+``Mercado.registrar_estadisticas`` publica aquí los indicadores del ciclo
+(PIB, inflación, desempleo, ...) para que la API pueda transmitirlos mientras
+la simulación sigue en marcha, sin esperar a ``generar_resultados_finales``.
+
+El canal es un búfer circular en memoria con números de secuencia: publicar
+nunca bloquea ni espera a los lectores. Si un lector va más lento que la
+simulación, los registros más antiguos se descartan y el lector salta al más
+reciente (``descartados`` cuenta cuántos se perdió). Una nueva publicación del
+mismo ciclo sustituye a la anterior en lugar de ocupar otra posición.
+"""
+
+import threading
+from collections import deque
+from typing import Any, Dict, List, Optional, Tuple
+
+CAPACIDAD_POR_DEFECTO = 256
+
+
+def _ultimo(serie, defecto=0.0):
+    return serie[-1] if serie else defecto
+
+
+def metricas_ciclo(mercado) -> Dict[str, Any]:
+    """Indicadores del último ciclo registrado (solo lecturas O(1) del mercado)"""
+    return {
+        'ciclo': mercado.ciclo_actual,
+        'pib': float(_ultimo(mercado.pib_historico)),
+        'inflacion': float(_ultimo(mercado.inflacion_historica)),
+        'desempleo': float(_ultimo(mercado.desempleo_historico)),
+        'indice_precios': float(_ultimo(getattr(mercado, 'indices_precios_historicos', []))),
+        'transacciones': int(_ultimo(mercado.volumen_transacciones, 0)),
+        'fase_ciclo': getattr(mercado, 'fase_ciclo_economico', None),
+        'crisis_financiera': bool(getattr(mercado, 'crisis_financiera_activa', False)),
+    }
+
+
+class CanalMetricas:
+    """Búfer circular de registros con lectores independientes por secuencia"""
+
+    def __init__(self, capacidad: int = CAPACIDAD_POR_DEFECTO):
+        self.capacidad = max(1, capacidad)
+        self._registros: deque = deque(maxlen=self.capacidad)  # (secuencia, registro)
+        self._secuencia = 0
+        self._condicion = threading.Condition()
+        self.cerrado = False
+
+    def publicar(self, registro: Dict[str, Any]):
+        """Añade un registro sin bloquear; el del mismo ciclo se fusiona con el pendiente"""
+        with self._condicion:
+            if self.cerrado:
+                return
+            if (self._registros and registro.get('ciclo') is not None
+                    and self._registros[-1][1].get('ciclo') == registro.get('ciclo')):
+                # Misma posición y secuencia: no cuenta como publicación perdida
+                self._registros[-1] = (self._registros[-1][0], registro)
+            else:
+                self._secuencia += 1
+                self._registros.append((self._secuencia, registro))
+            self._condicion.notify_all()
+
+    def cerrar(self):
+        """Marca el final de la ejecución; los lectores terminan tras vaciar el búfer"""
+        with self._condicion:
+            self.cerrado = True
+            self._condicion.notify_all()
+
+    def esperar_cierre(self, timeout: Optional[float] = None) -> bool:
+        """Espera a que el productor cierre el canal; True si se cerró a tiempo"""
+        with self._condicion:
+            return self._condicion.wait_for(lambda: self.cerrado, timeout)
+
+    def leer(self, desde: int = 0, timeout: Optional[float] = None) -> Tuple[List[Dict[str, Any]], int, int]:
+        """Registros con secuencia mayor que ``desde``.
+
+        Espera hasta ``timeout`` segundos si no hay nada nuevo. Devuelve
+        ``(registros, ultima_secuencia, descartados)``, donde ``descartados``
+        son las publicaciones que el lector se perdió por ir retrasado.
+        """
+        with self._condicion:
+            if self._secuencia <= desde and not self.cerrado:
+                self._condicion.wait(timeout)
+            nuevos = [(s, r) for s, r in self._registros if s > desde]
+            if not nuevos:
+                return [], max(desde, self._secuencia), 0
+            descartados = nuevos[0][0] - desde - 1
+            return [r for _, r in nuevos], nuevos[-1][0], max(0, descartados)
+
+    def terminado(self, desde: int) -> bool:
+        """True si el canal está cerrado y el lector ya vio todo"""
+        with self._condicion:
+            return self.cerrado and desde >= self._secuencia
@@ -0,0 +1,317 @@
+"""
+Ensamble Monte-Carlo de simulaciones
+====================================
+
+Ejecuta réplicas de una misma configuración con semillas distintas sobre un
+pool de procesos y resume cada serie por ciclo (PIB, inflación, desempleo)
+en bandas: media, desviación, intervalo de confianza de la media y cuantiles.
+
+Las series de cada réplica se incorporan a acumuladores en línea según van
+llegando y después se descartan, así que la memoria no crece con el número de
+réplicas:
+
+- media y varianza por ciclo con el algoritmo de Welford;
+- cuantiles por ciclo con el estimador P² (Jain y Chlamtac), cinco
+  marcadores por cuantil y ciclo.
+
+El ensamble se detiene antes de ``replicas_max`` cuando, tras
+``replicas_min`` réplicas, el semiancho del intervalo de confianza de todas
+las series en todos los ciclos cae por debajo de
+``tolerancia_relativa * |media| + tolerancia_absoluta``. Las réplicas que
+ya estaban en marcha se incorporan igualmente.
+
+Con un ``AlmacenResultados`` cada réplica se memoiza por su semilla: repetir
+un ensamble (o ampliarlo) solo simula las semillas nuevas. Se configura en la
+sección ``ensamble_montecarlo``.
+"""
+
+import copy
+import math
+import multiprocessing
+import os
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from dataclasses import asdict, dataclass, field
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+
+from .AlmacenResultados import AlmacenResultados, clave_ejecucion
+from .GestorTrabajos import ejecutar_simulacion_configurada
+from .SimulacionReport import ResultadoSimulacion
+
+SERIES_POR_DEFECTO = ('pib', 'inflacion', 'desempleo')
+CUANTILES_POR_DEFECTO = (0.05, 0.5, 0.95)
+
+
+class CuantilesP2:
+    """Estimador P² de un cuantil, vectorizado sobre las posiciones de la serie"""
+
+    def __init__(self, p: float):
+        self.p = p
+        self._iniciales: List[np.ndarray] = []
+        self.q = None  # alturas de los 5 marcadores, forma (5, ciclos)
+        self.n = None  # posiciones reales
+        self.deseadas = None
+        self.incrementos = np.array([0.0, p / 2, p, (1 + p) / 2, 1.0])[:, None]
+
+    def agregar(self, x: np.ndarray):
+        if self.q is None:
+            self._iniciales.append(np.asarray(x, dtype=float))
+            if len(self._iniciales) == 5:
+                self.q = np.sort(np.vstack(self._iniciales), axis=0)
+                ciclos = self.q.shape[1]
+                self.n = np.tile(np.arange(1.0, 6.0)[:, None], (1, ciclos))
+                self.deseadas = np.tile(1 + 4 * self.incrementos, (1, ciclos))
+                self._iniciales = []
+            return
+
+        q, n = self.q, self.n
+        q[0] = np.minimum(q[0], x)
+        q[4] = np.maximum(q[4], x)
+        celda = (q[1:4] <= x).sum(axis=0)  # q[celda] <= x < q[celda + 1]
+        n += np.arange(5)[:, None] > celda
+        self.deseadas += self.incrementos
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            for i in (1, 2, 3):
+                d = self.deseadas[i] - n[i]
+                ajustar = (((d >= 1) & (n[i + 1] - n[i] > 1)) |
+                           ((d <= -1) & (n[i - 1] - n[i] < -1)))
+                if not ajustar.any():
+                    continue
+                s = np.sign(d)
+                parabolica = q[i] + s / (n[i + 1] - n[i - 1]) * (
+                    (n[i] - n[i - 1] + s) * (q[i + 1] - q[i]) / (n[i + 1] - n[i]) +
+                    (n[i + 1] - n[i] - s) * (q[i] - q[i - 1]) / (n[i] - n[i - 1]))
+                vecino = np.where(s > 0, q[i + 1], q[i - 1])
+                n_vecino = np.where(s > 0, n[i + 1], n[i - 1])
+                lineal = q[i] + s * (vecino - q[i]) / (n_vecino - n[i])
+                valida = (q[i - 1] < parabolica) & (parabolica < q[i + 1])
+                q[i] = np.where(ajustar, np.where(valida, parabolica, lineal), q[i])
+                n[i] = np.where(ajustar, n[i] + s, n[i])
+
+    def valor(self) -> np.ndarray:
+        if self.q is not None:
+            return self.q[2].copy()
+        if not self._iniciales:
+            return np.array([])
+        # Con menos de cinco observaciones el cuantil es exacto
+        return np.quantile(np.vstack(self._iniciales), self.p, axis=0)
+
+
+class AcumuladorSerie:
+    """Media, varianza (Welford) y cuantiles (P²) por ciclo de una serie"""
+
+    def __init__(self, cuantiles: Sequence[float] = CUANTILES_POR_DEFECTO):
+        self.n = 0
+        self.media = None
+        self.m2 = None
+        self.cuantiles = {p: CuantilesP2(p) for p in cuantiles}
+
+    @property
+    def ciclos(self) -> Optional[int]:
+        """Longitud de la serie del ensamble (None antes de la primera réplica)"""
+        return None if self.media is None else len(self.media)
+
+    def agregar(self, valores):
+        x = np.asarray(valores, dtype=float)
+        if self.media is None:
+            self.media = np.zeros_like(x)
+            self.m2 = np.zeros_like(x)
+        elif len(x) != len(self.media):
+            raise ValueError(f"La réplica tiene {len(x)} ciclos y el ensamble {len(self.media)}")
+        self.n += 1
+        delta = x - self.media
+        self.media += delta / self.n
+        self.m2 += delta * (x - self.media)
+        for estimador in self.cuantiles.values():
+            estimador.agregar(x)
+
+    def desviacion(self) -> np.ndarray:
+        if self.n < 2:
+            return np.zeros_like(self.media)
+        return np.sqrt(self.m2 / (self.n - 1))
+
+    def semiancho(self, nivel_confianza: float) -> np.ndarray:
+        """Semiancho del intervalo de confianza de la media (t de Student)"""
+        if self.n < 2:
+            return np.full_like(self.media, np.inf)
+        return valor_critico(nivel_confianza, self.n - 1) * self.desviacion() / math.sqrt(self.n)
+
+    def bandas(self, nivel_confianza: float) -> Dict[str, List[float]]:
+        semiancho = self.semiancho(nivel_confianza)
+        bandas = {
+            'media': self.media.tolist(),
+            'desviacion': self.desviacion().tolist(),
+            'ic_inferior': (self.media - semiancho).tolist(),
+            'ic_superior': (self.media + semiancho).tolist(),
+        }
+        for p, estimador in self.cuantiles.items():
+            bandas[f"p{round(p * 100):02d}"] = estimador.valor().tolist()
+        return bandas
+
+
+def valor_critico(nivel_confianza: float, grados_libertad: int) -> float:
+    """Cuantil bilateral de la t de Student (normal si scipy no está disponible)"""
+    try:
+        from scipy.stats import t
+        return float(t.ppf((1 + nivel_confianza) / 2, grados_libertad))
+    except ImportError:
+        from statistics import NormalDist
+        return NormalDist().inv_cdf((1 + nivel_confianza) / 2)
+
+
+@dataclass
+class ResultadoEnsamble:
+    """Bandas por ciclo de cada serie y resumen del ensamble"""
+    bandas: Dict[str, Dict[str, List[float]]]
+    replicas: int
+    semillas: List[int]
+    convergido: bool
+    nivel_confianza: float
+    fallidas: Dict[int, str] = field(default_factory=dict)
+    desde_almacen: int = 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+class EnsambleMonteCarlo:
+    """Réplicas en paralelo de una configuración con parada por precisión"""
+
+    def __init__(self, config: Dict[str, Any], max_procesos: Optional[int] = None,
+                 almacen: Optional[AlmacenResultados] = None,
+                 series: Sequence[str] = SERIES_POR_DEFECTO,
+                 cuantiles: Sequence[float] = CUANTILES_POR_DEFECTO,
+                 nivel_confianza: float = 0.95, replicas_min: int = 8,
+                 tolerancia_relativa: float = 0.05, tolerancia_absoluta: float = 0.25,
+                 ejecutor: Callable[..., Dict[str, Any]] = ejecutar_simulacion_configurada):
+        self.config = copy.deepcopy(config)
+        self.max_procesos = max_procesos or max(1, (os.cpu_count() or 2) // 2)
+        self.almacen = almacen
+        self.series = tuple(series)
+        self.nivel_confianza = nivel_confianza
+        self.replicas_min = max(2, replicas_min)
+        self.tolerancia_relativa = tolerancia_relativa
+        self.tolerancia_absoluta = tolerancia_absoluta
+        self.ejecutor = ejecutor
+        self.acumuladores = {serie: AcumuladorSerie(cuantiles) for serie in self.series}
+        self.semillas: List[int] = []
+        self.fallidas: Dict[int, str] = {}
+        self.desde_almacen = 0
+
+    @classmethod
+    def desde_config(cls, config: Dict[str, Any], **opciones) -> 'EnsambleMonteCarlo':
+        """Ensamble con los parámetros de la sección ``ensamble_montecarlo``"""
+        seccion = config.get('ensamble_montecarlo', {}) or {}
+        parametros = {
+            'max_procesos': seccion.get('procesos'),
+            'almacen': AlmacenResultados.desde_config(config),
+            'series': seccion.get('series', SERIES_POR_DEFECTO),
+            'cuantiles': seccion.get('cuantiles', CUANTILES_POR_DEFECTO),
+            'nivel_confianza': seccion.get('nivel_confianza', 0.95),
+            'replicas_min': seccion.get('replicas_min', 8),
+            'tolerancia_relativa': seccion.get('tolerancia_relativa', 0.05),
+            'tolerancia_absoluta': seccion.get('tolerancia_absoluta', 0.25),
+        }
+        parametros.update(opciones)
+        return cls(config, **parametros)
+
+    @property
+    def replicas(self) -> int:
+        return len(self.semillas)
+
+    def agregar(self, seed: int, resultado: ResultadoSimulacion) -> bool:
+        """Incorpora las series de una réplica a los acumuladores.
+
+        Si alguna serie no tiene los ciclos del ensamble la réplica se descarta
+        entera (queda en ``fallidas``) antes de tocar ningún acumulador.
+        """
+        series = {serie: resultado.series.get(serie, []) for serie in self.acumuladores}
+        for serie, valores in series.items():
+            ciclos = self.acumuladores[serie].ciclos
+            if ciclos is not None and len(valores) != ciclos:
+                self.fallidas[seed] = (f"La serie '{serie}' tiene {len(valores)} ciclos "
+                                       f"y el ensamble {ciclos}")
+                return False
+        for serie, valores in series.items():
+            self.acumuladores[serie].agregar(valores)
+        self.semillas.append(seed)
+        return True
+
+    def convergido(self) -> bool:
+        """True si todos los intervalos de confianza están dentro de la tolerancia"""
+        if self.replicas < self.replicas_min:
+            return False
+        for acumulador in self.acumuladores.values():
+            limite = self.tolerancia_relativa * np.abs(acumulador.media) + self.tolerancia_absoluta
+            if np.any(acumulador.semiancho(self.nivel_confianza) > limite):
+                return False
+        return True
+
+    def resultado(self) -> ResultadoEnsamble:
+        bandas = ({serie: acumulador.bandas(self.nivel_confianza)
+                   for serie, acumulador in self.acumuladores.items()} if self.replicas else {})
+        return ResultadoEnsamble(bandas=bandas, replicas=self.replicas, semillas=list(self.semillas),
+                                 convergido=self.convergido(), nivel_confianza=self.nivel_confianza,
+                                 fallidas=dict(self.fallidas), desde_almacen=self.desde_almacen)
+
+    def _config_replica(self, seed: int) -> Dict[str, Any]:
+        config = copy.deepcopy(self.config)
+        config.setdefault('simulacion', {})['seed'] = int(seed)
+        return config
+
+    def ejecutar(self, semillas: Iterable[int],
+                 al_completar_replica: Optional[Callable[['EnsambleMonteCarlo', int], None]] = None
+                 ) -> ResultadoEnsamble:
+        """Simula las semillas hasta agotarlas o alcanzar la precisión pedida.
+
+        Nunca hay más de ``max_procesos`` réplicas en vuelo: cada vez que una
+        termina se incorpora a los acumuladores y, si el ensamble aún no ha
+        convergido, se lanza la siguiente semilla.
+        """
+        semillas = iter(semillas)
+        en_vuelo: Dict[Any, tuple] = {}
+        contexto = multiprocessing.get_context('spawn')
+
+        def incorporar(seed, resultado):
+            if self.agregar(seed, resultado) and al_completar_replica is not None:
+                al_completar_replica(self, seed)
+
+        with ProcessPoolExecutor(max_workers=self.max_procesos, mp_context=contexto) as pool:
+            def lanzar_siguiente() -> bool:
+                # Las semillas ya guardadas en el almacén se incorporan sin ocupar el pool
+                for seed in semillas:
+                    config = self._config_replica(seed)
+                    clave = clave_ejecucion(config) if self.almacen is not None else None
+                    guardado = self.almacen.obtener(clave) if clave is not None else None
+                    if guardado is not None:
+                        self.desde_almacen += 1
+                        incorporar(seed, guardado)
+                        if self.convergido():
+                            return False
+                        continue
+                    en_vuelo[pool.submit(self.ejecutor, config)] = (seed, clave)
+                    return True
+                return False
+
+            for _ in range(self.max_procesos):
+                if not lanzar_siguiente():
+                    break
+
+            while en_vuelo:
+                terminados, _ = wait(en_vuelo, return_when=FIRST_COMPLETED)
+                for futuro in terminados:
+                    seed, clave = en_vuelo.pop(futuro)
+                    try:
+                        resultado = ResultadoSimulacion(**futuro.result())
+                    except Exception as e:
+                        self.fallidas[seed] = f"{type(e).__name__}: {e}"
+                    else:
+                        if clave is not None:
+                            self.almacen.guardar(clave, resultado, metadatos={'ensamble': True})
+                        incorporar(seed, resultado)
+                    if not self.convergido():
+                        lanzar_siguiente()
+
+        return self.resultado()
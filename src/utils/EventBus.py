@@ -22,6 +22,11 @@ class EventBus:
     def publish(self, tipo: str, **data):
         self.eventos.append(Evento(tipo=tipo, data=data, ts=time.time()))
 
+    def publish_lote(self, tipo: str, registros: List[Dict[str, Any]]):
+        """Publica varios eventos del mismo tipo con una sola marca de tiempo"""
+        ts = time.time()
+        self.eventos.extend(Evento(tipo=tipo, data=data, ts=ts) for data in registros)
+
     def all(self) -> List[Dict[str, Any]]:
         return [
             {
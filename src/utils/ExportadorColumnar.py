@@ -0,0 +1,255 @@
+"""
+Exportación columnar de resultados por ciclo
+============================================
+
+Escribe durante la ejecución las tablas de la simulación en formato columnar,
+particionadas por ejecución y rango de ciclos::
+
+    <directorio>/<id_ejecucion>/
+        _manifiesto.json
+        macro/ciclos_00001_00010.parquet
+        consumidores/ciclos_00001_00010.parquet
+        empresas/...
+        transacciones/...
+
+Tablas:
+
+- ``macro``: una fila por ciclo con los indicadores de ``metricas_ciclo``.
+- ``consumidores`` / ``empresas``: panel por agente y ciclo (dinero, empleo...).
+- ``transacciones``: libro de transacciones del ciclo.
+
+Cada ``ciclos_por_particion`` ciclos las columnas acumuladas se vuelcan a un
+nuevo archivo y se actualiza el manifiesto, de modo que la memoria no crece
+con la duración de la simulación y las particiones ya cerradas pueden leerse
+mientras la ejecución sigue. Con ``pyarrow`` instalado cada partición es un
+archivo Parquet; sin él, un directorio con un ``.npy`` por columna, que
+``leer_tabla`` abre con ``mmap_mode='r'``.
+
+Se activa con ``"exportacion_columnar": {"activar": true}``.
+"""
+
+import json
+import os
+from typing import Any, Dict, Iterable, List, Optional
+
+import numpy as np
+
+from .CanalMetricas import metricas_ciclo
+
+DIRECTORIO_POR_DEFECTO = os.path.join('results', 'columnar')
+CICLOS_POR_PARTICION_POR_DEFECTO = 10
+TABLAS = ('macro', 'consumidores', 'empresas', 'transacciones')
+MANIFIESTO = '_manifiesto.json'
+
+CAMPOS_CONSUMIDOR = ('dinero', 'ingreso_mensual', 'empleado', 'ahorros', 'deuda')
+
+
+def _pyarrow():
+    """Módulos de pyarrow (``pa``, ``pq``) o None si no está instalado"""
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        return None
+    return pa, pq
+
+
+def formato_disponible() -> str:
+    return 'parquet' if _pyarrow() is not None else 'npy'
+
+
+def _columna(valores) -> np.ndarray:
+    """Array NumPy de una columna; textos como unicode de ancho fijo (mapeable)"""
+    arr = np.asarray(valores)
+    return _textos(valores) if arr.dtype == object else arr
+
+
+def _textos(valores) -> np.ndarray:
+    return np.asarray([('' if v is None else str(v)) for v in valores], dtype=str)
+
+
+def _panel_consumidores(mercado, ciclo: int) -> Dict[str, np.ndarray]:
+    consumidores = mercado.getConsumidores()
+    n = len(consumidores)
+    columnas = {'ciclo': np.full(n, ciclo, dtype=np.int32),
+                'nombre': _textos([c.nombre for c in consumidores])}
+    almacen = getattr(mercado, 'almacen_consumidores', None)
+    indices = almacen.indices(consumidores) if almacen is not None and n else None
+    if indices is not None:
+        # Almacén columnar activo: copia directa de las columnas
+        for campo in CAMPOS_CONSUMIDOR:
+            columnas[campo] = almacen.columnas[campo][indices]
+    else:
+        for campo in CAMPOS_CONSUMIDOR:
+            tipo = bool if campo == 'empleado' else float
+            columnas[campo] = np.fromiter((getattr(c, campo, 0) or 0 for c in consumidores),
+                                          dtype=tipo, count=n)
+    return columnas
+
+
+def _panel_empresas(mercado, ciclo: int) -> Dict[str, np.ndarray]:
+    empresas = mercado.getEmpresas()
+    n = len(empresas)
+    return {
+        'ciclo': np.full(n, ciclo, dtype=np.int32),
+        'nombre': _textos([e.nombre for e in empresas]),
+        'dinero': np.fromiter((getattr(e, 'dinero', 0) or 0 for e in empresas), dtype=float, count=n),
+        'empleados': np.fromiter((len(getattr(e, 'empleados', ()) or ()) for e in empresas),
+                                 dtype=np.int32, count=n),
+    }
+
+
+def _libro_transacciones(transacciones: List[Dict[str, Any]]) -> Dict[str, np.ndarray]:
+    n = len(transacciones)
+    return {
+        'ciclo': np.fromiter((t.get('ciclo', 0) for t in transacciones), dtype=np.int32, count=n),
+        'consumidor': _textos([t.get('consumidor') for t in transacciones]),
+        'bien': _textos([t.get('bien') for t in transacciones]),
+        'cantidad': np.fromiter((t.get('cantidad', 0) for t in transacciones), dtype=float, count=n),
+        'costo_total': np.fromiter((t.get('costo_total', 0) for t in transacciones), dtype=float, count=n),
+    }
+
+
+class ExportadorColumnar:
+    """Acumula columnas por ciclo y las vuelca en particiones por rango de ciclos"""
+
+    def __init__(self, directorio: str, id_ejecucion: str,
+                 ciclos_por_particion: int = CICLOS_POR_PARTICION_POR_DEFECTO,
+                 tablas: Iterable[str] = TABLAS, formato: Optional[str] = None):
+        self.directorio = os.path.join(directorio, id_ejecucion)
+        self.id_ejecucion = id_ejecucion
+        self.ciclos_por_particion = max(1, int(ciclos_por_particion))
+        self.tablas = tuple(t for t in tablas if t in TABLAS)
+        self.formato = formato or formato_disponible()
+        self._pendiente: Dict[str, List[Dict[str, np.ndarray]]] = {t: [] for t in self.tablas}
+        self._primer_ciclo: Optional[int] = None
+        self._ultimo_ciclo: Optional[int] = None
+        self._posicion_transacciones = 0
+        self.particiones: Dict[str, List[Dict[str, Any]]] = {t: [] for t in self.tablas}
+        os.makedirs(self.directorio, exist_ok=True)
+
+    @classmethod
+    def desde_config(cls, config, id_ejecucion: str) -> Optional['ExportadorColumnar']:
+        """Exportador según la sección ``exportacion_columnar``; None si no está activado"""
+        seccion = config.obtener_seccion('exportacion_columnar') if hasattr(config, 'obtener_seccion') \
+            else (config.get('exportacion_columnar') or {})
+        if not seccion.get('activar', False):
+            return None
+        return cls(seccion.get('directorio', DIRECTORIO_POR_DEFECTO), id_ejecucion,
+                   seccion.get('ciclos_por_particion', CICLOS_POR_PARTICION_POR_DEFECTO),
+                   seccion.get('tablas', TABLAS))
+
+    def registrar_ciclo(self, mercado, ciclo: int):
+        """Añade las filas del ciclo recién terminado y vuelca si se completó la partición"""
+        if self._primer_ciclo is None:
+            self._primer_ciclo = ciclo
+        self._ultimo_ciclo = ciclo
+
+        if 'macro' in self._pendiente:
+            fila = metricas_ciclo(mercado)
+            fila['ciclo'] = ciclo
+            self._pendiente['macro'].append({k: _columna([v]) for k, v in fila.items()})
+        if 'consumidores' in self._pendiente:
+            self._pendiente['consumidores'].append(_panel_consumidores(mercado, ciclo))
+        if 'empresas' in self._pendiente:
+            self._pendiente['empresas'].append(_panel_empresas(mercado, ciclo))
+        if 'transacciones' in self._pendiente:
+            # El libro del mercado solo crece: se exporta lo añadido desde el último ciclo
+            nuevas = mercado.transacciones[self._posicion_transacciones:]
+            self._posicion_transacciones = len(mercado.transacciones)
+            self._pendiente['transacciones'].append(_libro_transacciones(nuevas))
+
+        if ciclo - self._primer_ciclo + 1 >= self.ciclos_por_particion:
+            self.volcar()
+
+    def volcar(self):
+        """Escribe las filas pendientes como una partición por tabla"""
+        if self._primer_ciclo is None:
+            return
+        nombre = f"ciclos_{self._primer_ciclo:05d}_{self._ultimo_ciclo:05d}"
+        for tabla, bloques in self._pendiente.items():
+            columnas = {clave: np.concatenate([b[clave] for b in bloques]) for clave in bloques[0]} \
+                if bloques else {}
+            filas = len(next(iter(columnas.values()))) if columnas else 0
+            archivo = self._escribir(tabla, nombre, columnas)
+            self.particiones[tabla].append({'archivo': archivo, 'ciclo_desde': self._primer_ciclo,
+                                            'ciclo_hasta': self._ultimo_ciclo, 'filas': filas})
+            bloques.clear()
+        self._primer_ciclo = self._ultimo_ciclo = None
+        self._escribir_manifiesto()
+
+    def _escribir(self, tabla: str, nombre: str, columnas: Dict[str, np.ndarray]) -> str:
+        os.makedirs(os.path.join(self.directorio, tabla), exist_ok=True)
+        if self.formato == 'parquet':
+            pa, pq = _pyarrow()
+            relativa = os.path.join(tabla, f"{nombre}.parquet")
+            pq.write_table(pa.table(columnas), os.path.join(self.directorio, relativa))
+            return relativa
+        relativa = os.path.join(tabla, nombre)
+        ruta = os.path.join(self.directorio, relativa)
+        os.makedirs(ruta, exist_ok=True)
+        for clave, valores in columnas.items():
+            np.save(os.path.join(ruta, f"{clave}.npy"), valores)
+        return relativa
+
+    def _escribir_manifiesto(self):
+        ruta = os.path.join(self.directorio, MANIFIESTO)
+        temporal = f"{ruta}.tmp"
+        with open(temporal, 'w', encoding='utf-8') as f:
+            json.dump({'id_ejecucion': self.id_ejecucion, 'formato': self.formato,
+                       'ciclos_por_particion': self.ciclos_por_particion,
+                       'tablas': self.particiones}, f, indent=2)
+        os.replace(temporal, ruta)
+
+    def cerrar(self) -> str:
+        """Vuelca la última partición incompleta; devuelve el directorio de la ejecución"""
+        self.volcar()
+        self._escribir_manifiesto()
+        return self.directorio
+
+
+def leer_manifiesto(directorio_ejecucion: str) -> Dict[str, Any]:
+    with open(os.path.join(directorio_ejecucion, MANIFIESTO), encoding='utf-8') as f:
+        return json.load(f)
+
+
+def _leer_particion(directorio_ejecucion: str, formato: str, archivo: str,
+                    columnas: Optional[List[str]]) -> Dict[str, np.ndarray]:
+    ruta = os.path.join(directorio_ejecucion, archivo)
+    if formato == 'parquet':
+        _, pq = _pyarrow()
+        tabla = pq.read_table(ruta, columns=columnas, memory_map=True)
+        return {nombre: tabla.column(nombre).to_numpy() for nombre in tabla.column_names}
+    nombres = columnas or [a[:-len('.npy')] for a in sorted(os.listdir(ruta)) if a.endswith('.npy')]
+    return {nombre: np.load(os.path.join(ruta, f"{nombre}.npy"), mmap_mode='r') for nombre in nombres}
+
+
+def leer_tabla(directorio_ejecucion: str, tabla: str, ciclo_desde: Optional[int] = None,
+               ciclo_hasta: Optional[int] = None,
+               columnas: Optional[List[str]] = None) -> Dict[str, np.ndarray]:
+    """Columnas de ``tabla`` filtradas por rango de ciclos.
+
+    Solo se abren las particiones que solapan el rango (el resto ni se toca)
+    y dentro de ellas las columnas pedidas, mapeadas en memoria.
+    """
+    manifiesto = leer_manifiesto(directorio_ejecucion)
+    desde = ciclo_desde if ciclo_desde is not None else -np.inf
+    hasta = ciclo_hasta if ciclo_hasta is not None else np.inf
+    pedidas = None if columnas is None else list(dict.fromkeys(['ciclo', *columnas]))
+    partes = [_leer_particion(directorio_ejecucion, manifiesto['formato'], p['archivo'], pedidas)
+              for p in manifiesto['tablas'].get(tabla, [])
+              if p['filas'] and p['ciclo_hasta'] >= desde and p['ciclo_desde'] <= hasta]
+    if not partes:
+        return {}
+    resultado = {}
+    for nombre in partes[0]:
+        valores = partes[0][nombre] if len(partes) == 1 else np.concatenate([p[nombre] for p in partes])
+        resultado[nombre] = valores
+    if ciclo_desde is not None or ciclo_hasta is not None:
+        ciclos = resultado['ciclo']
+        mascara = (ciclos >= desde) & (ciclos <= hasta)
+        if not mascara.all():
+            resultado = {nombre: valores[mascara] for nombre, valores in resultado.items()}
+    if columnas is not None and 'ciclo' not in columnas:
+        resultado.pop('ciclo', None)
+    return resultado
@@ -0,0 +1,349 @@
+"""
+Gestor de trabajos de simulación
+================================
+
+Ejecuta simulaciones como trabajos en segundo plano sobre un pool acotado de
+procesos locales, para que la API responda de inmediato con un id y pueda
+atender muchas peticiones a la vez:
+
+- ``enviar`` devuelve el trabajo al instante; si ya hay un resultado para la
+  misma configuración, semilla y versión del código en el
+  ``AlmacenResultados`` (o un trabajo idéntico en curso) no se vuelve a simular.
+- Cada proceso escribe su progreso por ciclo en ``progreso.json`` dentro del
+  directorio del trabajo; ``estado`` lo lee al consultar.
+- ``cancelar`` descarta los trabajos pendientes y, para los que ya corren,
+  deja una marca que el proceso comprueba al terminar cada ciclo.
+- Las métricas de cada ciclo viajan del proceso hijo al servidor por una cola
+  acotada (``put_nowait``: si está llena se descartan, la simulación nunca
+  espera) y se reparten en un ``CanalMetricas`` por trabajo.
+- Al terminar, los KPIs y las series quedan en el almacén de resultados (o en
+  el propio trabajo si el gestor no tiene almacén).
+- Los trabajos terminados se olvidan (registro, canal y directorio) pasado
+  ``ttl_terminados`` segundos o cuando hay más de ``max_terminados``.
+"""
+
+import json
+import multiprocessing
+import os
+import queue
+import shutil
+import threading
+import time
+import uuid
+from concurrent.futures import CancelledError, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Optional
+
+from .AlmacenResultados import AlmacenResultados, clave_ejecucion
+from .CanalMetricas import CanalMetricas
+from .SimulacionReport import ResultadoSimulacion
+
+PENDIENTE = 'pendiente'
+EJECUTANDO = 'ejecutando'
+COMPLETADO = 'completado'
+CANCELADO = 'cancelado'
+ERROR = 'error'
+
+DIRECTORIO_TRABAJOS = os.path.join('results', 'trabajos')
+CAPACIDAD_COLA_METRICAS = 1024
+TTL_TRABAJOS_TERMINADOS = 3600.0
+MAX_TRABAJOS_TERMINADOS = 200
+# Espera máxima a que lleguen las últimas métricas del hijo antes de cerrar el canal
+ESPERA_FIN_METRICAS = 2.0
+TERMINALES = (COMPLETADO, CANCELADO, ERROR)
+
+# Cola de métricas del proceso hijo, recibida al crear el proceso del pool
+_cola_metricas = None
+
+
+class TrabajoCancelado(Exception):
+    """El trabajo se canceló mientras se ejecutaba"""
+
+
+def ejecutar_simulacion_configurada(config: Dict[str, Any], al_terminar_ciclo=None,
+                                    canal_metricas=None) -> Dict[str, Any]:
+    """Simulación headless a partir de un diccionario de configuración ya combinado"""
+    from src.config.ConfiguradorSimulacion import ConfiguradorSimulacion
+    from main import ejecutar_simulacion_headless
+
+    configurador = ConfiguradorSimulacion()
+    configurador.config = json.loads(json.dumps(config))
+    configurador.aplicar_seed_global()
+    resultado = ejecutar_simulacion_headless(configurador, al_terminar_ciclo=al_terminar_ciclo,
+                                             canal_metricas=canal_metricas)
+    return resultado.to_dict()
+
+
+def _escribir_json(ruta: str, datos: Dict[str, Any]):
+    temporal = f"{ruta}.tmp"
+    with open(temporal, 'w', encoding='utf-8') as f:
+        json.dump(datos, f)
+    os.replace(temporal, ruta)
+
+
+class EmisorMetricas:
+    """Lado del proceso hijo del canal de métricas: envía sin bloquear"""
+
+    def __init__(self, cola, id_trabajo: str):
+        self.cola = cola
+        self.id_trabajo = id_trabajo
+        self.descartados = 0
+
+    def publicar(self, registro: Dict[str, Any]):
+        try:
+            self.cola.put_nowait((self.id_trabajo, registro))
+        except queue.Full:
+            self.descartados += 1
+
+    def cerrar(self):
+        # El fin de ejecución no se puede perder: espera un momento si la cola está llena
+        try:
+            self.cola.put((self.id_trabajo, None), timeout=5)
+        except queue.Full:
+            pass
+
+
+def _inicializar_proceso(cola):
+    global _cola_metricas
+    _cola_metricas = cola
+
+
+def _ejecutar_trabajo(config: Dict[str, Any], directorio: str,
+                      ejecutor: Callable[..., Dict[str, Any]], id_trabajo: str = '') -> Dict[str, Any]:
+    """Punto de entrada en el proceso hijo: progreso, métricas y cancelación cooperativa"""
+    ruta_progreso = os.path.join(directorio, 'progreso.json')
+    marca_cancelar = os.path.join(directorio, 'cancelar')
+    inicio = time.time()
+
+    def al_terminar_ciclo(mercado, ciclo, num_ciclos):
+        _escribir_json(ruta_progreso, {'ciclo': ciclo, 'num_ciclos': num_ciclos,
+                                       'segundos': time.time() - inicio})
+        if os.path.exists(marca_cancelar):
+            raise TrabajoCancelado(f"Cancelado en el ciclo {ciclo}")
+
+    _escribir_json(ruta_progreso, {'ciclo': 0, 'num_ciclos': None, 'segundos': 0.0})
+    emisor = EmisorMetricas(_cola_metricas, id_trabajo) if _cola_metricas is not None else None
+    try:
+        return ejecutor(config, al_terminar_ciclo=al_terminar_ciclo, canal_metricas=emisor)
+    finally:
+        if emisor is not None:
+            emisor.cerrar()
+
+
+@dataclass
+class Trabajo:
+    """Estado de un trabajo enviado al gestor"""
+    id: str
+    clave: str
+    config: Dict[str, Any]
+    directorio: str
+    estado: str = PENDIENTE
+    creado: float = field(default_factory=time.time)
+    terminado: Optional[float] = None
+    desde_cache: bool = False
+    memoizable: bool = True
+    error: Optional[str] = None
+    futuro: Any = field(default=None, repr=False)
+    resultado: Optional[ResultadoSimulacion] = field(default=None, repr=False)  # Solo sin almacén
+
+
+class GestorTrabajos:
+    """Cola de simulaciones sobre un ``ProcessPoolExecutor`` acotado.
+
+    Con ``almacen=None`` no se memoiza: cada envío se ejecuta y su resultado
+    vive en el propio trabajo hasta que se desaloja.
+    """
+
+    def __init__(self, max_procesos: Optional[int] = None,
+                 almacen: Optional[AlmacenResultados] = None,
+                 directorio: str = DIRECTORIO_TRABAJOS,
+                 ejecutor: Callable[..., Dict[str, Any]] = ejecutar_simulacion_configurada,
+                 ttl_terminados: Optional[float] = TTL_TRABAJOS_TERMINADOS,
+                 max_terminados: Optional[int] = MAX_TRABAJOS_TERMINADOS):
+        self.max_procesos = max_procesos or max(1, (os.cpu_count() or 2) // 2)
+        self.almacen = almacen
+        self.directorio = directorio
+        self.ejecutor = ejecutor
+        self.ttl_terminados = ttl_terminados
+        self.max_terminados = max_terminados
+        self.trabajos: Dict[str, Trabajo] = {}
+        self.canales: Dict[str, CanalMetricas] = {}
+        self._en_curso: Dict[str, Trabajo] = {}  # clave -> trabajo pendiente o en ejecución
+        self._lock = threading.Lock()
+        self._pool = None
+        self._cola_metricas = None
+
+    def _obtener_pool(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            # 'spawn': los hijos no heredan hilos ni el estado del servidor
+            contexto = multiprocessing.get_context('spawn')
+            self._cola_metricas = contexto.Queue(maxsize=CAPACIDAD_COLA_METRICAS)
+            self._pool = ProcessPoolExecutor(max_workers=self.max_procesos, mp_context=contexto,
+                                             initializer=_inicializar_proceso,
+                                             initargs=(self._cola_metricas,))
+            threading.Thread(target=self._repartir_metricas, args=(self._cola_metricas,),
+                             name='metricas-trabajos', daemon=True).start()
+        return self._pool
+
+    def _repartir_metricas(self, cola):
+        """Hilo del servidor: mueve las métricas de los hijos al canal de cada trabajo"""
+        while True:
+            try:
+                mensaje = cola.get()
+            except (EOFError, OSError, ValueError):
+                return
+            if mensaje is None:
+                return
+            id_trabajo, registro = mensaje
+            canal = self.canales.get(id_trabajo)
+            if canal is None:
+                continue
+            if registro is None:
+                canal.cerrar()
+            else:
+                canal.publicar(registro)
+
+    # --- API ---
+    def enviar(self, config: Dict[str, Any]) -> Trabajo:
+        """Registra un trabajo y lo pone en cola; responde desde el almacén si ya existe"""
+        id_trabajo = uuid.uuid4().hex[:12]
+        clave = clave_ejecucion(config)
+        memoizable = clave is not None
+        if not memoizable:
+            # Sin semilla no es reproducible: resultado propio, sin compartir
+            clave = f"trabajo-{id_trabajo}"
+        trabajo = Trabajo(id_trabajo, clave, config, os.path.join(self.directorio, id_trabajo),
+                          memoizable=memoizable)
+        self._desalojar_terminados()
+
+        with self._lock:
+            en_curso = self._en_curso.get(clave)
+            if en_curso is not None:
+                return en_curso
+            if memoizable and self.almacen is not None and self.almacen.contiene(clave):
+                trabajo.estado = COMPLETADO
+                trabajo.desde_cache = True
+                trabajo.terminado = time.time()
+                self.trabajos[id_trabajo] = trabajo
+                return trabajo
+
+            os.makedirs(trabajo.directorio, exist_ok=True)
+            self.trabajos[id_trabajo] = trabajo
+            self.canales[id_trabajo] = CanalMetricas()
+            self._en_curso[clave] = trabajo
+            trabajo.futuro = self._obtener_pool().submit(_ejecutar_trabajo, config, trabajo.directorio,
+                                                         self.ejecutor, id_trabajo)
+        trabajo.futuro.add_done_callback(lambda futuro, t=trabajo: self._al_terminar(t, futuro))
+        return trabajo
+
+    def _al_terminar(self, trabajo: Trabajo, futuro):
+        estado, error = COMPLETADO, None
+        try:
+            resultado = ResultadoSimulacion(**futuro.result())
+            if self.almacen is None:
+                trabajo.resultado = resultado
+            else:
+                self.almacen.guardar(trabajo.clave, resultado,
+                                     metadatos={'trabajo': trabajo.id, 'config': trabajo.config})
+        except (CancelledError, TrabajoCancelado):
+            estado = CANCELADO
+        except Exception as e:
+            estado, error = ERROR, f"{type(e).__name__}: {e}"
+        canal = self.canales.get(trabajo.id)
+        if canal is not None:
+            # Si el hijo llegó a ejecutarlo, su marca de fin sigue a la última métrica;
+            # sin marca (no llegó a correr, murió o la cola estaba llena) se cierra igual
+            if not (futuro.cancelled() or isinstance(futuro.exception(), BrokenProcessPool)):
+                canal.esperar_cierre(ESPERA_FIN_METRICAS)
+            canal.cerrar()
+        with self._lock:
+            trabajo.estado, trabajo.error = estado, error
+            trabajo.terminado = time.time()
+            if self._en_curso.get(trabajo.clave) is trabajo:
+                del self._en_curso[trabajo.clave]
+        self._desalojar_terminados()
+
+    def _desalojar_terminados(self, ahora: Optional[float] = None):
+        """Olvida los trabajos terminados hace más de ``ttl_terminados`` y los que exceden ``max_terminados``"""
+        ahora = time.time() if ahora is None else ahora
+        with self._lock:
+            terminados = sorted((t for t in self.trabajos.values() if t.terminado is not None),
+                                key=lambda t: t.terminado)
+            exceso = len(terminados) - self.max_terminados if self.max_terminados is not None else 0
+            desalojados = [t for i, t in enumerate(terminados)
+                           if i < exceso or (self.ttl_terminados is not None
+                                             and ahora - t.terminado > self.ttl_terminados)]
+            for trabajo in desalojados:
+                del self.trabajos[trabajo.id]
+                canal = self.canales.pop(trabajo.id, None)
+                if canal is not None:
+                    canal.cerrar()
+        for trabajo in desalojados:
+            if not trabajo.desde_cache:
+                shutil.rmtree(trabajo.directorio, ignore_errors=True)
+            if self.almacen is not None and not trabajo.memoizable and trabajo.estado == COMPLETADO:
+                # Nadie más puede pedir el resultado de un trabajo sin semilla
+                self.almacen.eliminar(trabajo.clave)
+
+    def obtener(self, id_trabajo: str) -> Optional[Trabajo]:
+        return self.trabajos.get(id_trabajo)
+
+    def canal(self, id_trabajo: str) -> Optional[CanalMetricas]:
+        """Canal de métricas por ciclo del trabajo (None si se sirvió desde el almacén)"""
+        return self.canales.get(id_trabajo)
+
+    def progreso(self, trabajo: Trabajo) -> Dict[str, Any]:
+        """Último ciclo completado según el proceso que ejecuta el trabajo"""
+        try:
+            with open(os.path.join(trabajo.directorio, 'progreso.json'), encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {'ciclo': 0, 'num_ciclos': None}
+
+    def estado(self, id_trabajo: str) -> Optional[Dict[str, Any]]:
+        trabajo = self.obtener(id_trabajo)
+        if trabajo is None:
+            return None
+        estado = trabajo.estado
+        if estado == PENDIENTE and trabajo.futuro is not None and trabajo.futuro.running():
+            estado = EJECUTANDO
+        progreso = ({'ciclo': None, 'num_ciclos': None} if trabajo.desde_cache
+                    else self.progreso(trabajo))
+        return {
+            'id': trabajo.id,
+            'estado': estado,
+            'desde_cache': trabajo.desde_cache,
+            'progreso': progreso,
+            'error': trabajo.error,
+            'creado': trabajo.creado,
+            'terminado': trabajo.terminado,
+        }
+
+    def resultado(self, id_trabajo: str) -> Optional[ResultadoSimulacion]:
+        """Resultado de un trabajo completado (None si no existe o no ha terminado)"""
+        trabajo = self.obtener(id_trabajo)
+        if trabajo is None or trabajo.estado != COMPLETADO:
+            return None
+        if self.almacen is None:
+            return trabajo.resultado
+        return self.almacen.obtener(trabajo.clave)
+
+    def cancelar(self, id_trabajo: str) -> bool:
+        """Cancela un trabajo pendiente o en ejecución; False si ya había terminado"""
+        trabajo = self.obtener(id_trabajo)
+        if trabajo is None or trabajo.estado in TERMINALES:
+            return False
+        if not trabajo.futuro.cancel():
+            # Ya en ejecución: el proceso lo detecta al terminar el ciclo en curso
+            open(os.path.join(trabajo.directorio, 'cancelar'), 'w').close()
+        return True
+
+    def cerrar(self, esperar: bool = True):
+        if self._pool is not None:
+            self._pool.shutdown(wait=esperar, cancel_futures=True)
+            self._pool = None
+            self._cola_metricas.put(None)
+            self._cola_metricas = None
+        for canal in self.canales.values():
+            canal.cerrar()
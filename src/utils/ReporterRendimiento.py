@@ -13,9 +13,8 @@ import csv
 from datetime import datetime
 from pathlib import Path
 from typing import Dict, List, Any, Optional, Tuple
-import matplotlib.pyplot as plt
-import pandas as pd
 import numpy as np
+from .SimuladorLogger import diagnostico
 
 
 class ReporterRendimiento:
@@ -39,7 +38,7 @@ class ReporterRendimiento:
         self.tiempos_secciones = {}
         self.contadores_operaciones = {}
         
-        print(f"📊 Iniciando seguimiento de rendimiento: {nombre_simulacion}")
+        diagnostico("📊 Iniciando seguimiento de rendimiento: %s", nombre_simulacion, componente='Rendimiento')
     
     def registrar_tiempo_ciclo(self, ciclo: int, tiempo_ciclo: float, 
                               metricas_adicionales: Optional[Dict] = None):
@@ -83,7 +82,8 @@ class ReporterRendimiento:
             'contadores_operaciones': self.contadores_operaciones
         }
         
-        print(f"📊 Seguimiento finalizado: {tiempo_total:.2f}s total, {resumen['ciclos_por_segundo']:.2f} ciclos/s")
+        diagnostico("📊 Seguimiento finalizado: %.2fs total, %.2f ciclos/s", tiempo_total,
+                    resumen['ciclos_por_segundo'], componente='Rendimiento')
         return resumen
     
     def generar_reporte_completo(self, resumen_metricas: Dict[str, Any],
@@ -141,7 +141,7 @@ class ReporterRendimiento:
             for archivo in archivos:
                 f.write(f"- `{archivo}`\n")
         
-        print(f"📄 Reporte completo generado: {reporte_file}")
+        diagnostico("📄 Reporte completo generado: %s", reporte_file, componente='Rendimiento')
         return str(reporte_file)
     
     def _calcular_metricas_eficiencia(self, resumen: Dict[str, Any]) -> Dict[str, float]:
@@ -337,11 +337,8 @@ class ReporterRendimiento:
                 baseline = json.load(baseline_file)
             
             # Comparar métricas clave
-            mejora_tiempo = ((baseline['tiempo_total'] - resumen['tiempo_total']) / 
-                           baseline['tiempo_total'] * 100) if baseline['tiempo_total'] > 0 else 0
-            
-            mejora_cps = ((resumen['ciclos_por_segundo'] - baseline['ciclos_por_segundo']) / 
-                         baseline['ciclos_por_segundo'] * 100) if baseline['ciclos_por_segundo'] > 0 else 0
+            mejora_tiempo = -self._variacion_porcentual(resumen['tiempo_total'], baseline['tiempo_total'])
+            mejora_cps = self._variacion_porcentual(resumen['ciclos_por_segundo'], baseline['ciclos_por_segundo'])
             
             f.write(f"- **Baseline:** {baseline.get('timestamp', 'Desconocido')}\n")
             f.write(f"- **Tiempo Total:** {resumen['tiempo_total']:.2f}s vs {baseline['tiempo_total']:.2f}s\n")
@@ -362,6 +359,46 @@ class ReporterRendimiento:
         except Exception as e:
             f.write(f"⚠️ Error al cargar baseline: {e}\n\n")
     
+    @staticmethod
+    def _variacion_porcentual(actual: float, base: float) -> float:
+        """Variación porcentual de ``actual`` respecto a ``base`` (0 si base no es positiva)"""
+        return (actual - base) / base * 100 if base > 0 else 0
+
+    def generar_reporte_benchmarks(self, comparacion: List[Dict[str, Any]], resultados: Dict[str, Dict[str, Any]],
+                                   commit: str, commit_base: Optional[str], umbral: float) -> str:
+        """Genera reporte markdown de una corrida de la suite de benchmarks"""
+        reporte_file = self.output_dir / f"benchmark_report_{self.timestamp}.md"
+        with open(reporte_file, 'w', encoding='utf-8') as f:
+            f.write(f"# Reporte de Benchmarks - {commit}\n\n")
+            f.write(f"**Fecha:** {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n")
+            f.write("## ⏱️ Resultados\n\n")
+            f.write("| Benchmark | Mediana (ms) | Mínimo (ms) | Repeticiones |\n")
+            f.write("|-----------|--------------|-------------|--------------|\n")
+            for clave, r in resultados.items():
+                f.write(f"| {clave} | {r['mediana'] * 1000:.2f} | {r['minimo'] * 1000:.2f} | {r['repeticiones']} |\n")
+            f.write("\n## ⚖️ Comparación con Baseline\n\n")
+            self._escribir_comparacion_benchmarks(f, comparacion, commit_base, umbral)
+        return str(reporte_file)
+
+    def _escribir_comparacion_benchmarks(self, f, comparacion: List[Dict[str, Any]],
+                                         commit_base: Optional[str], umbral: float):
+        """Escribe la comparación por benchmark contra la baseline de otro commit"""
+        if not commit_base or not comparacion:
+            f.write("⚠️ Sin baseline comparable; esta corrida queda como referencia.\n\n")
+            return
+        f.write(f"- **Baseline:** {commit_base} (umbral de regresión {umbral:.0%})\n\n")
+        f.write("| Benchmark | Actual (ms) | Baseline (ms) | Variación | Estado |\n")
+        f.write("|-----------|-------------|---------------|-----------|--------|\n")
+        for c in comparacion:
+            estado = "❌ Regresión" if c['regresion'] else ("✅ Mejora" if c['variacion'] < 0 else "🟡 Estable")
+            f.write(f"| {c['clave']} | {c['actual'] * 1000:.2f} | {c['baseline'] * 1000:.2f} | "
+                    f"{self._variacion_porcentual(c['actual'], c['baseline']):+.1f}% | {estado} |\n")
+        regresiones = [c for c in comparacion if c['regresion']]
+        if regresiones:
+            f.write(f"\n❌ **{len(regresiones)} benchmark(s) con degradación de rendimiento**\n\n")
+        else:
+            f.write("\n✅ **Sin regresiones de rendimiento**\n\n")
+
     def _generar_archivos_datos(self, resumen: Dict[str, Any]) -> List[str]:
         """Genera archivos de datos adicionales"""
         archivos_generados = []
@@ -390,6 +427,8 @@ class ReporterRendimiento:
     
     def _generar_graficos_rendimiento(self, resumen: Dict[str, Any]):
         """Genera gráficos de análisis de rendimiento"""
+        import matplotlib.pyplot as plt
+
         plt.style.use('default')
         fig, ((ax1, ax2), (ax3, ax4)) = plt.subplots(2, 2, figsize=(15, 12))
         
@@ -450,7 +489,7 @@ class ReporterRendimiento:
         plt.savefig(chart_file, dpi=300, bbox_inches='tight')
         plt.close()
         
-        print(f"📈 Gráficos de rendimiento guardados: {chart_file}")
+        diagnostico("📈 Gráficos de rendimiento guardados: %s", chart_file, componente='Rendimiento')
 
 
 # Decorator para medir tiempo de funciones automáticamente
@@ -1,5 +1,8 @@
+import os
 from dataclasses import dataclass, field
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
+
+import numpy as np
 
 
 @dataclass
@@ -42,3 +45,95 @@ class SimulacionReport:
             'inventario_ratio_ultimo': self.inventario_promedio_ratio[-1] if self.inventario_promedio_ratio else 0.0,
             'costos_ajuste_totales': self.costos_ajuste_precio_totales[-1] if self.costos_ajuste_precio_totales else 0.0,
         }
+
+
+@dataclass
+class ResultadoSimulacion:
+    """Resultado estructurado de una ejecución: series por ciclo y KPIs finales.
+
+    Todas las métricas viven en memoria; ``guardar_columnar`` escribe, si se
+    pide, un único archivo comprimido con una columna por serie.
+    """
+    series: Dict[str, List[float]] = field(default_factory=dict)
+    kpis: Dict[str, float] = field(default_factory=dict)
+    num_ciclos: int = 0
+    tiempo_total: float = 0.0
+    seed: Optional[int] = None
+    perfil: str = 'completo'
+
+    @classmethod
+    def desde_mercado(cls, mercado, num_ciclos: int, tiempo_total: float,
+                      seed: Optional[int] = None, perfil: str = 'completo') -> 'ResultadoSimulacion':
+        """Construye el resultado a partir de las métricas acumuladas por el dashboard"""
+        dashboard = getattr(mercado, 'dashboard', None)
+        series = {k: list(v) for k, v in getattr(dashboard, 'metricas_historicas', {}).items()}
+        if not series.get('pib'):
+            # Sin dashboard: usar los históricos del propio mercado
+            series['pib'] = list(mercado.pib_historico)
+            series['inflacion'] = [i * 100 for i in mercado.inflacion_historica]
+            series['desempleo'] = [d * 100 for d in mercado.desempleo_historico]
+        series['ciclo'] = list(range(1, len(series['pib']) + 1))
+
+        pib = series['pib']
+        inflacion = series.get('inflacion', [])
+        desempleo = series.get('desempleo', [])
+        kpis = {
+            'pib_final': float(pib[-1]) if pib else 0.0,
+            'pib_promedio': float(np.mean(pib)) if pib else 0.0,
+            'crecimiento_pib': float(pib[-1] / pib[0] - 1) if len(pib) > 1 and pib[0] > 0 else 0.0,
+            'inflacion_promedio': float(np.mean(inflacion)) if inflacion else 0.0,
+            'inflacion_final': float(inflacion[-1]) if inflacion else 0.0,
+            'desempleo_promedio': float(np.mean(desempleo)) if desempleo else 0.0,
+            'desempleo_final': float(desempleo[-1]) if desempleo else 0.0,
+            'transacciones_totales': len(mercado.transacciones),
+            'empresas_activas_final': len(mercado.getEmpresas()),
+            'consumidores_final': len(mercado.getConsumidores()),
+            'tiempo_total': float(tiempo_total),
+            'segundos_por_ciclo': float(tiempo_total / num_ciclos) if num_ciclos else 0.0,
+        }
+        # Throughput del bucle de ciclos, sin la construcción de la economía
+        tiempo_inicializacion = float(getattr(mercado, 'tiempo_inicializacion', 0.0) or 0.0)
+        tiempo_ciclos = tiempo_total - tiempo_inicializacion
+        kpis['tiempo_inicializacion'] = tiempo_inicializacion
+        kpis['ciclos_por_segundo'] = float(num_ciclos / tiempo_ciclos) if tiempo_ciclos > 0 else 0.0
+        gini = series.get('indice_gini', [])
+        if gini:
+            kpis['gini_final'] = float(gini[-1])
+        return cls(series=series, kpis=kpis, num_ciclos=num_ciclos,
+                   tiempo_total=float(tiempo_total), seed=seed, perfil=perfil)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'series': self.series,
+            'kpis': self.kpis,
+            'num_ciclos': self.num_ciclos,
+            'tiempo_total': self.tiempo_total,
+            'seed': self.seed,
+            'perfil': self.perfil,
+        }
+
+    def guardar_columnar(self, ruta: str) -> str:
+        """Guarda series y KPIs en un único archivo .npz comprimido (una columna por serie)"""
+        if not ruta.endswith('.npz'):
+            ruta = f"{ruta}.npz"
+        directorio = os.path.dirname(ruta)
+        if directorio:
+            os.makedirs(directorio, exist_ok=True)
+        columnas = {f"serie__{k}": np.asarray(v, dtype=float) for k, v in self.series.items()}
+        columnas.update({f"kpi__{k}": np.asarray(v, dtype=float) for k, v in self.kpis.items()})
+        columnas['meta__num_ciclos'] = np.asarray(self.num_ciclos)
+        columnas['meta__seed'] = np.asarray(-1 if self.seed is None else self.seed)
+        np.savez_compressed(ruta, **columnas)
+        return ruta
+
+    @classmethod
+    def cargar_columnar(cls, ruta: str) -> 'ResultadoSimulacion':
+        """Reconstruye un resultado guardado con ``guardar_columnar``"""
+        with np.load(ruta) as datos:
+            series = {k[len('serie__'):]: datos[k].tolist() for k in datos.files if k.startswith('serie__')}
+            kpis = {k[len('kpi__'):]: float(datos[k]) for k in datos.files if k.startswith('kpi__')}
+            seed = int(datos['meta__seed']) if 'meta__seed' in datos.files else -1
+            num_ciclos = int(datos['meta__num_ciclos']) if 'meta__num_ciclos' in datos.files else 0
+        return cls(series=series, kpis=kpis, num_ciclos=num_ciclos,
+                   tiempo_total=kpis.get('tiempo_total', 0.0),
+                   seed=None if seed < 0 else seed, perfil='headless')
@@ -1,63 +1,234 @@
 """
 Sistema de Logging para el Simulador Económico
 Proporciona logging detallado con diferentes niveles y rotación automática
+
+Por defecto la escritura es asíncrona: el hilo de simulación solo encola
+registros ya filtrados y un hilo de fondo los escribe por lotes (archivo de
+texto, consola y, opcionalmente, un sink JSON-lines). Cada componente
+('Mercado', 'Empresa', ...) tiene su propio nivel, de modo que los puntos
+calientes pueden comprobar ``habilitado(componente)`` antes de construir el
+mensaje. Las advertencias repetitivas se limitan por ventana de tiempo.
 """
 
+import json
 import logging
+import logging.handlers
 import os
+import queue
+import re
+import threading
 import time
 from datetime import datetime
 
 
+COMPONENTES = ['Mercado', 'Empresa', 'Consumidor',
+               'Banco', 'Crisis', 'ML', 'Precios', 'Fiscal', 'Bolsa',
+               'IA', 'Config', 'Rendimiento', 'Calibracion']
+
+
+class FiltroRepeticiones(logging.Filter):
+    """Limita advertencias repetitivas por plantilla de mensaje.
+
+    Como máximo ``max_por_ventana`` registros de la misma plantilla (números
+    normalizados) pasan cada ``ventana_s`` segundos; el primero que pasa tras
+    la ventana indica cuántos se suprimieron.
+    """
+
+    _NUMEROS = re.compile(r'[\d.,]+')
+
+    def __init__(self, ventana_s=10.0, max_por_ventana=5, nivel_minimo=logging.WARNING):
+        super().__init__()
+        self.ventana_s = ventana_s
+        self.max_por_ventana = max_por_ventana
+        self.nivel_minimo = nivel_minimo
+        self._estado = {}  # clave -> [inicio_ventana, emitidos, suprimidos]
+
+    def filter(self, record):
+        if record.levelno < self.nivel_minimo:
+            return True
+        # El mismo registro puede pasar por varios handlers: decidir una sola vez
+        decision = getattr(record, '_filtro_repeticiones', None)
+        if decision is not None:
+            return decision
+
+        clave = (record.name, self._NUMEROS.sub('#', str(record.msg))[:160])
+        ahora = time.monotonic()
+        estado = self._estado.get(clave)
+        if estado is None or ahora - estado[0] >= self.ventana_s:
+            suprimidos = estado[2] if estado else 0
+            self._estado[clave] = [ahora, 1, 0]
+            if suprimidos:
+                record.msg = f"{record.msg} ({suprimidos} repeticiones suprimidas)"
+            decision = True
+        elif estado[1] < self.max_por_ventana:
+            estado[1] += 1
+            decision = True
+        else:
+            estado[2] += 1
+            decision = False
+        record._filtro_repeticiones = decision
+        return decision
+
+
+class ManejadorLotes(logging.FileHandler):
+    """FileHandler que escribe un lote completo y hace un solo flush por lote"""
+
+    def emitir_lote(self, registros):
+        lineas = [self.format(r) + self.terminator
+                  for r in registros if r.levelno >= self.level]
+        if not lineas:
+            return
+        try:
+            if self.stream is None:
+                self.stream = self._open()
+            self.stream.write(''.join(lineas))
+            self.stream.flush()
+        except Exception:
+            self.handleError(registros[-1])
+
+
+class ManejadorJSONL(ManejadorLotes):
+    """Sink estructurado: un objeto JSON por línea"""
+
+    def format(self, record):
+        return json.dumps({
+            'ts': record.created,
+            'nivel': record.levelname,
+            'componente': record.name.rsplit('.', 1)[-1],
+            'mensaje': record.getMessage(),
+        }, ensure_ascii=False)
+
+
+class EscritorAsincrono(threading.Thread):
+    """Hilo de fondo que drena la cola de registros en lotes"""
+
+    def __init__(self, cola, manejadores, tam_lote=512):
+        super().__init__(name='SimuladorLogger-escritor', daemon=True)
+        self.cola = cola
+        self.manejadores = manejadores
+        self.tam_lote = tam_lote
+
+    def run(self):
+        terminar = False
+        while not terminar:
+            lote = [self.cola.get()]
+            try:
+                while len(lote) < self.tam_lote:
+                    lote.append(self.cola.get_nowait())
+            except queue.Empty:
+                pass
+            if None in lote:
+                terminar = True
+                lote = [r for r in lote if r is not None]
+            if lote:
+                self._escribir(lote)
+
+    def _escribir(self, lote):
+        for manejador in self.manejadores:
+            if hasattr(manejador, 'emitir_lote'):
+                manejador.emitir_lote(lote)
+            else:
+                for registro in lote:
+                    if registro.levelno >= manejador.level:
+                        manejador.handle(registro)
+
+
+class ManejadorCola(logging.handlers.QueueHandler):
+    """QueueHandler dueño del hilo escritor: al cerrarse drena y cierra los sinks"""
+
+    def __init__(self, manejadores):
+        super().__init__(queue.SimpleQueue())
+        self.manejadores = manejadores
+        self.escritor = EscritorAsincrono(self.queue, manejadores)
+        self.escritor.start()
+
+    def close(self):
+        if self.escritor.is_alive():
+            self.queue.put(None)
+            self.escritor.join(timeout=5)
+        for manejador in self.manejadores:
+            manejador.close()
+        super().close()
+
+
 class SimuladorLogger:
     """Maneja el sistema de logging del simulador económico"""
 
-    def __init__(self, log_dir="logs", log_level=logging.INFO):
+    def __init__(self, log_dir="logs", log_level=logging.INFO, asincrono=True,
+                 jsonl=False, niveles_componentes=None):
         self.log_dir = log_dir
         self.log_level = log_level
+        self.asincrono = asincrono
+        self.jsonl = jsonl
+        self.niveles_componentes = niveles_componentes or {}
         self.logger = None
         self.setup_logging()
 
     def setup_logging(self):
         """Configura el sistema de logging"""
-        # Crear directorio de logs si no existe
-        if not os.path.exists(self.log_dir):
-            os.makedirs(self.log_dir)
-
-        # Nombre del archivo de log con timestamp
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        log_filename = f"simulacion_{timestamp}.log"
-        log_path = os.path.join(self.log_dir, log_filename)
+        # log_dir=None: sin archivo de log (perfil headless)
+        log_filename = None
+        if self.log_dir is not None:
+            # Crear directorio de logs si no existe
+            if not os.path.exists(self.log_dir):
+                os.makedirs(self.log_dir)
+
+            # Nombre del archivo de log con timestamp
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            log_filename = f"simulacion_{timestamp}.log"
+            log_path = os.path.join(self.log_dir, log_filename)
 
         # Configurar logger principal
         self.logger = logging.getLogger('SimuladorEconomico')
         self.logger.setLevel(self.log_level)
 
-        # Limpiar handlers anteriores
+        # Limpiar handlers anteriores (cerrarlos detiene su hilo escritor)
         for handler in self.logger.handlers[:]:
             self.logger.removeHandler(handler)
+            handler.close()
 
         # Configurar formato de logging
         formatter = logging.Formatter(
             '%(asctime)s | %(levelname)-8s | %(name)-20s | %(message)s',
             datefmt='%Y-%m-%d %H:%M:%S'
         )
+        manejadores = []
 
         # Handler para archivo
-        file_handler = logging.FileHandler(
-            log_path, mode='w', encoding='utf-8')
-        file_handler.setLevel(self.log_level)
-        file_handler.setFormatter(formatter)
-        self.logger.addHandler(file_handler)
+        if log_filename is not None:
+            file_handler = ManejadorLotes(
+                log_path, mode='w', encoding='utf-8', delay=True)
+            file_handler.setLevel(self.log_level)
+            file_handler.setFormatter(formatter)
+            manejadores.append(file_handler)
+
+            # Sink estructurado opcional (JSON-lines)
+            if self.jsonl:
+                jsonl_handler = ManejadorJSONL(
+                    os.path.splitext(log_path)[0] + '.jsonl', mode='w',
+                    encoding='utf-8', delay=True)
+                jsonl_handler.setLevel(self.log_level)
+                manejadores.append(jsonl_handler)
 
         # Handler para consola (solo INFO y superior)
         console_handler = logging.StreamHandler()
-        console_handler.setLevel(logging.INFO)
+        console_handler.setLevel(max(logging.INFO, self.log_level))
         console_formatter = logging.Formatter(
             '🔧 %(levelname)s: %(message)s'
         )
         console_handler.setFormatter(console_formatter)
-        self.logger.addHandler(console_handler)
+        manejadores.append(console_handler)
+
+        # Advertencias repetitivas limitadas antes de llegar a cualquier sink
+        filtro = FiltroRepeticiones()
+        if self.asincrono:
+            handler_cola = ManejadorCola(manejadores)
+            handler_cola.addFilter(filtro)
+            self.logger.addHandler(handler_cola)
+        else:
+            for handler in manejadores:
+                handler.addFilter(filtro)
+                self.logger.addHandler(handler)
         # Evitar propagación al logger raíz para evitar duplicados
         self.logger.propagate = False
 
@@ -65,18 +236,24 @@ class SimuladorLogger:
         self.setup_specialized_loggers(formatter)
 
         self.logger.info(
-            f"Sistema de logging iniciado - Archivo: {log_filename}")
+            f"Sistema de logging iniciado - Archivo: {log_filename or 'ninguno'}")
 
     def setup_specialized_loggers(self, formatter):
         """Configura loggers especializados para diferentes componentes"""
-        components = ['Mercado', 'Empresa', 'Consumidor',
-                      'Banco', 'Crisis', 'ML', 'Precios']
-
-        for component in components:
+        for component in COMPONENTES:
             comp_logger = logging.getLogger(f'SimuladorEconomico.{component}')
-            comp_logger.setLevel(self.log_level)
+            comp_logger.setLevel(self.niveles_componentes.get(component, self.log_level))
             comp_logger.propagate = True  # Propagar al logger padre
 
+    def establecer_nivel_componente(self, component, nivel):
+        """Cambia el nivel de un componente (p. ej. 'Empresa' a WARNING en lotes)"""
+        self.niveles_componentes[component] = nivel
+        logging.getLogger(f'SimuladorEconomico.{component}').setLevel(nivel)
+
+    def habilitado(self, component, nivel=logging.DEBUG):
+        """True si el componente emitiría un registro de ese nivel"""
+        return logging.getLogger(f'SimuladorEconomico.{component}').isEnabledFor(nivel)
+
     def get_logger(self, component=None):
         """Obtiene un logger para un componente específico"""
         if component:
@@ -202,12 +379,16 @@ class SimuladorLogger:
         """Log de error simplificado"""
         self.logger.error(f"ERROR: {mensaje}")
 
+    def log_debug(self, mensaje):
+        """Log de depuración"""
+        self.logger.debug(f"DEBUG: {mensaje}")
+
     def close(self):
         """Cierra el sistema de logging"""
         if self.logger:
-            for handler in self.logger.handlers:
-                handler.close()
+            for handler in self.logger.handlers[:]:
                 self.logger.removeHandler(handler)
+                handler.close()
 
 
 # Instancia global del logger
@@ -222,6 +403,13 @@ def get_simulador_logger():
     return _simulador_logger
 
 
+def set_simulador_logger(instancia):
+    """Fija la instancia global (evita que los sistemas reconfiguren el logger)"""
+    global _simulador_logger
+    _simulador_logger = instancia
+    return instancia
+
+
 def init_logging(log_level=logging.INFO):
     """Inicializa el sistema de logging"""
     global _simulador_logger
@@ -235,3 +423,35 @@ def close_logging():
     if _simulador_logger:
         _simulador_logger.close()
         _simulador_logger = None
+
+
+_loggers_componente = {}
+
+
+def _logger_componente(componente):
+    comp_logger = _loggers_componente.get(componente)
+    if comp_logger is None:
+        comp_logger = _loggers_componente[componente] = logging.getLogger(
+            f'SimuladorEconomico.{componente}')
+    return comp_logger
+
+
+def diagnostico_activo(componente='Mercado', nivel=logging.INFO):
+    """True si ``diagnostico`` emitiría a ese nivel: para saltarse resúmenes costosos de preparar"""
+    return _logger_componente(componente).isEnabledFor(nivel)
+
+
+def diagnostico(mensaje, *args, componente='Mercado', nivel=logging.INFO):
+    """Reemplazo de ``print`` para diagnósticos del simulador.
+
+    ``mensaje`` es una plantilla con formato ``%`` del logging y ``args`` sus
+    valores: el nivel del componente se comprueba antes de formatear, así que
+    en ejecuciones silenciosas (nivel WARNING o superior) un diagnóstico
+    desactivado no construye el texto ni llega a ningún sink::
+
+        diagnostico("Error procesando agente %s: %s", agente.nombre, e,
+                    componente='Rendimiento', nivel=logging.WARNING)
+    """
+    comp_logger = _logger_componente(componente)
+    if comp_logger.isEnabledFor(nivel):
+        comp_logger.log(nivel, mensaje, *args)
@@ -2,8 +2,8 @@
 Módulo de Vectorización Optimizada para Simulador de Mercado
 ============================================================
 
-Contiene funciones vectorizadas usando NumPy y pandas para mejorar
-el rendimiento de las operaciones más costosas del simulador.
+Contiene funciones vectorizadas usando NumPy (y pandas, importado solo
+donde se necesita) para mejorar el rendimiento de las operaciones más costosas del simulador.
 
 Objetivo: Reducir tiempo de ejecución en 20-40% mediante:
 - Vectorización de cálculos de agregados (PIB, índices, etc.)
@@ -12,11 +12,12 @@ Objetivo: Reducir tiempo de ejecución en 20-40% mediante:
 """
 
 import numpy as np
-import pandas as pd
 from typing import List, Dict, Any, Tuple, Optional
 import multiprocessing as mp
 from functools import partial
 import warnings
+from .SimuladorLogger import diagnostico
+import logging
 
 # Suprimir warnings de NumPy para operaciones vectorizadas
 warnings.filterwarnings('ignore', category=RuntimeWarning)
@@ -43,7 +44,7 @@ class VectorizadorEconomico:
     def calcular_pib_vectorizado(self, transacciones: List[Dict], empresas: List[Any],
                                 gobierno: Any = None) -> float:
         """
-        Cálculo vectorizado del PIB usando pandas para mayor velocidad
+        Cálculo vectorizado del PIB usando NumPy para mayor velocidad
         
         Args:
             transacciones: Lista de transacciones del ciclo
@@ -56,11 +57,9 @@ class VectorizadorEconomico:
         try:
             # 1. CONSUMO - Vectorizar suma de transacciones
             if transacciones:
-                df_transacciones = pd.DataFrame(transacciones)
-                if 'costo_total' in df_transacciones.columns:
-                    pib_consumo = df_transacciones['costo_total'].sum()
-                else:
-                    pib_consumo = 0
+                costos = np.fromiter((t.get('costo_total', 0) or 0 for t in transacciones),
+                                     dtype=float, count=len(transacciones))
+                pib_consumo = costos.sum()
             else:
                 pib_consumo = 0
             
@@ -87,7 +86,8 @@ class VectorizadorEconomico:
             
         except Exception as e:
             # Fallback al cálculo tradicional en caso de error
-            print(f"⚠️  Error en cálculo vectorizado PIB: {e}")
+            diagnostico("⚠️  Error en cálculo vectorizado PIB: %s", e, componente='Rendimiento',
+                        nivel=logging.WARNING)
             return self._calcular_pib_fallback(transacciones, empresas, gobierno)
     
     def _calcular_inversion_vectorizada(self, empresas: List[Any]) -> float:
@@ -124,7 +124,8 @@ class VectorizadorEconomico:
             return 0.0
             
         except Exception as e:
-            print(f"⚠️  Error en cálculo vectorizado inversión: {e}")
+            diagnostico("⚠️  Error en cálculo vectorizado inversión: %s", e, componente='Rendimiento',
+                        nivel=logging.WARNING)
             return 0.0
     
     def calcular_indice_precios_vectorizado(self, empresas: List[Any]) -> float:
@@ -148,23 +149,25 @@ class VectorizadorEconomico:
                         if 0 < precio <= 1000000:
                             # Determinar peso según categoría
                             peso = self._obtener_peso_bien(bien)
-                            precios_data.append({'precio': precio, 'peso': peso, 'bien': bien})
+                            precios_data.append((precio, peso))
             
             if not precios_data:
                 return 100.0  # Índice base
             
-            # Convertir a DataFrame para operaciones vectorizadas
-            df = pd.DataFrame(precios_data)
+            # Convertir a array para operaciones vectorizadas
+            datos = np.asarray(precios_data, dtype=float)
+            precios, pesos = datos[:, 0], datos[:, 1]
             
             # Cálculo vectorizado del índice ponderado
-            if df['peso'].sum() > 0:
-                indice = (df['precio'] * df['peso']).sum() / df['peso'].sum()
+            if pesos.sum() > 0:
+                indice = (precios * pesos).sum() / pesos.sum()
                 return float(indice)
             
             return 100.0
             
         except Exception as e:
-            print(f"⚠️  Error en cálculo vectorizado índice precios: {e}")
+            diagnostico("⚠️  Error en cálculo vectorizado índice precios: %s", e, componente='Rendimiento',
+                        nivel=logging.WARNING)
             return 100.0
     
     def _obtener_peso_bien(self, nombre_bien: str) -> float:
@@ -228,7 +231,8 @@ class VectorizadorEconomico:
             return resultado_final
             
         except Exception as e:
-            print(f"⚠️  Error en procesamiento paralelo: {e}")
+            diagnostico("⚠️  Error en procesamiento paralelo: %s", e, componente='Rendimiento',
+                        nivel=logging.WARNING)
             # Fallback a procesamiento secuencial
             return self._procesar_agentes_secuencial(agentes, funcion_ciclo, ciclo, mercado)
     
@@ -241,7 +245,8 @@ class VectorizadorEconomico:
                 resultado = funcion_ciclo(agente, ciclo, mercado)
                 resultados.append(resultado)
             except Exception as e:
-                print(f"Error procesando agente {getattr(agente, 'nombre', 'Desconocido')}: {e}")
+                diagnostico("Error procesando agente %s: %s", getattr(agente, 'nombre', 'Desconocido'), e,
+                            componente='Rendimiento', nivel=logging.WARNING)
                 resultados.append(None)
         return resultados
     
@@ -256,7 +261,8 @@ class VectorizadorEconomico:
                 resultado = agente.ciclo_persona(ciclo, mercado)
                 resultados.append(resultado)
             except Exception as e:
-                print(f"Error en chunk procesando {getattr(agente, 'nombre', 'Desconocido')}: {e}")
+                diagnostico("Error en chunk procesando %s: %s", getattr(agente, 'nombre', 'Desconocido'), e,
+                            componente='Rendimiento', nivel=logging.WARNING)
                 resultados.append(None)
         return resultados
     
@@ -309,7 +315,8 @@ class VectorizadorEconomico:
                 stats['dinero_consumidores_promedio'] = float(np.mean(dineros_consumidores))
             
         except Exception as e:
-            print(f"⚠️  Error en estadísticas vectorizadas: {e}")
+            diagnostico("⚠️  Error en estadísticas vectorizadas: %s", e, componente='Rendimiento',
+                        nivel=logging.WARNING)
             # Estadísticas mínimas de fallback
             stats = {
                 'pib': 0.0,
@@ -337,6 +344,8 @@ class VectorizadorEconomico:
         try:
             if not ordenes_compra or not ordenes_venta:
                 return []
+
+            import pandas as pd
             
             # Convertir a DataFrames para operaciones vectorizadas
             df_compra = pd.DataFrame(ordenes_compra)
@@ -382,7 +391,8 @@ class VectorizadorEconomico:
             return trades
             
         except Exception as e:
-            print(f"⚠️  Error en matching vectorizado: {e}")
+            diagnostico("⚠️  Error en matching vectorizado: %s", e, componente='Rendimiento',
+                        nivel=logging.WARNING)
             return []
     
     def _calcular_pib_fallback(self, transacciones: List[Dict], empresas: List[Any],
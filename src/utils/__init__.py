@@ -1,5 +1,5 @@
 # Utilidades para el Simulador Económico
-from .SimuladorLogger import SimuladorLogger, get_simulador_logger, init_logging, close_logging
+from .SimuladorLogger import SimuladorLogger, get_simulador_logger, init_logging, close_logging, diagnostico
 
 __all__ = ['SimuladorLogger', 'get_simulador_logger',
-           'init_logging', 'close_logging']
+           'init_logging', 'close_logging', 'diagnostico']
@@ -5,20 +5,18 @@ Desarrolla optimización y validación de parámetros para métricas macroeconó
 
 import os
 import sys
+import copy
 import json
 import time
 import logging
 import argparse
 import numpy as np
-import pandas as pd
 from datetime import datetime
 from pathlib import Path
 from typing import Dict, List, Tuple, Any, Optional
 from dataclasses import dataclass, asdict
-import optuna
-from optuna.samplers import TPESampler, GridSampler
-from optuna.pruners import MedianPruner
 import itertools
+from src.utils.SimuladorLogger import diagnostico
 
 # Agregar el directorio raíz al path para imports
 current_dir = Path(__file__).parent
@@ -27,6 +25,7 @@ sys.path.append(str(root_dir))
 
 from src.config.DatosEconomicosReales import CalibradorEconomicoRealista, IndicadoresEconomicosReales
 from src.config.ConfiguradorSimulacion import ConfiguradorSimulacion
+from src.utils.AlmacenResultados import AlmacenResultados, clave_ejecucion
 
 
 @dataclass
@@ -55,6 +54,7 @@ class CalibrationConfig:
     # Configuración de simulación
     simulation_cycles: int = 20  # Reducido para calibración rápida
     base_config_file: str = "config_simulacion.json"
+    seed: Optional[int] = 42  # Misma semilla en todos los trials (comparables y memoizables)
     
     # Métricas objetivo
     target_metrics: Dict[str, Tuple[float, float]] = None  # {metric: (target, weight)}
@@ -159,7 +159,9 @@ class CalibrationRunner:
     
     def apply_parameters_to_config(self, parameters: Dict[str, float], base_config: Dict) -> Dict:
         """Aplica parámetros de calibración a la configuración base"""
-        config = base_config.copy()
+        # Copia profunda: la simulación recalibra secciones en sitio y no debe
+        # arrastrar cambios de un trial al siguiente (ni a su clave de memoización)
+        config = copy.deepcopy(base_config)
         
         # Aplicar parámetros económicos básicos
         if 'pib_inicial' in parameters:
@@ -222,6 +224,17 @@ class CalibrationRunner:
             # Crear configurador temporal
             configurador = ConfiguradorSimulacion()
             configurador.config = config_dict
+            # Semilla fija: cada trial es reproducible y memoizable
+            seed = configurador.aplicar_seed_global(self.config.seed)
+            
+            # Consultar el almacén de resultados antes de simular
+            almacen = AlmacenResultados.desde_config(config_dict)
+            clave = clave_ejecucion(config_dict, seed) if almacen is not None else None
+            entrada = almacen.obtener_entrada(clave) if clave is not None else None
+            metricas_guardadas = (entrada or {}).get('metadatos', {}).get('metricas_calibracion')
+            if metricas_guardadas:
+                self.logger.info("Trial resuelto desde el almacén de resultados")
+                return metricas_guardadas
             
             # Importar función de simulación
             from main import ejecutar_simulacion_completa
@@ -231,12 +244,17 @@ class CalibrationRunner:
             logging.getLogger().setLevel(logging.ERROR)
             
             try:
-                # Ejecutar simulación - retorna el objeto mercado directamente
-                mercado = ejecutar_simulacion_completa(configurador, prefijo_resultados="calibration_temp")
+                # Perfil headless: solo interesan las métricas, sin archivos intermedios
+                configurador.activar_perfil_headless()
+                mercado = ejecutar_simulacion_completa(configurador)
                 
                 # Extraer métricas directamente del mercado
                 metrics = self.extract_metrics_from_mercado(mercado)
                 
+                if clave is not None and metrics != self.get_default_failure_metrics():
+                    almacen.guardar(clave, mercado.resultado,
+                                    metadatos={'metricas_calibracion': metrics, 'parametros': parameters})
+                
                 return metrics
                 
             finally:
@@ -455,7 +473,11 @@ class CalibrationRunner:
             
             return score
         
-        # Configurar estudio Optuna
+        # Configurar estudio Optuna (importado solo para búsqueda bayesiana)
+        import optuna
+        from optuna.samplers import TPESampler
+        from optuna.pruners import MedianPruner
+
         study = optuna.create_study(
             direction='maximize',
             sampler=TPESampler(seed=42),
@@ -568,6 +590,7 @@ class CalibrationRunner:
             row['trial_number'] = result.trial_number
             data.append(row)
         
+        import pandas as pd
         df = pd.DataFrame(data)
         
         # Guardar CSV completo
@@ -681,7 +704,7 @@ def create_preset_configs():
         preset_file = f"{presets_dir}/{name}.json"
         with open(preset_file, 'w', encoding='utf-8') as f:
             json.dump(asdict(config), f, indent=2, ensure_ascii=False)
-        print(f"Preset '{name}' guardado en: {preset_file}")
+        diagnostico("Preset '%s' guardado en: %s", name, preset_file, componente='Calibracion')
 
 
 def main():
@@ -707,6 +730,7 @@ def main():
     
     # Crear presets si se solicita
     if args.create_presets:
+        logging.basicConfig(level=logging.INFO, format='%(message)s')
         create_preset_configs()
         return
     
@@ -725,7 +749,8 @@ def main():
                     config_dict = json.load(f)
                 config = CalibrationConfig(**config_dict)
             else:
-                print(f"Preset '{args.preset}' no encontrado. Usando configuración por defecto.")
+                diagnostico("Preset '%s' no encontrado. Usando configuración por defecto.", args.preset,
+                            componente='Calibracion', nivel=logging.WARNING)
                 config = CalibrationConfig()
         else:
             # Configuración por defecto
@@ -742,13 +767,13 @@ def main():
         runner = CalibrationRunner(config)
         results = runner.run_calibration()
         
-        print(f"\n🎯 Calibración completada exitosamente!")
-        print(f"📊 Total de trials: {len(results)}")
-        print(f"🏆 Mejor score: {max(r.score for r in results):.4f}")
-        print(f"📁 Resultados en: {config.results_dir}")
+        diagnostico("🎯 Calibración completada exitosamente!", componente='Calibracion')
+        diagnostico("📊 Total de trials: %s", len(results), componente='Calibracion')
+        diagnostico("🏆 Mejor score: %.4f", max(r.score for r in results), componente='Calibracion')
+        diagnostico("📁 Resultados en: %s", config.results_dir, componente='Calibracion')
         
     except Exception as e:
-        print(f"❌ Error en calibración: {e}")
+        diagnostico("❌ Error en calibración: %s", e, componente='Calibracion', nivel=logging.WARNING)
         import traceback
         traceback.print_exc()
         sys.exit(1)
@@ -13,7 +13,7 @@ import os
 # Add root directory to path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
 
-from src.systems.labor_market import EnhancedLaborMarket, JobVacancy, WorkerProfile
+from src.systems.labor_market import EnhancedLaborMarket, JobVacancy, WorkerProfile, VacancyBook, JobMatchingStatus
 from src.models.Mercado import Mercado
 from src.models.Bien import Bien
 from src.models.Consumidor import Consumidor
@@ -347,5 +347,133 @@ class TestLaborMarketUnemploymentRange(unittest.TestCase):
         self.assertGreaterEqual(unemployment_rate, 0.08)
 
 
+class TestVacancyBook(unittest.TestCase):
+    """The indexed vacancy book must rank vacancies like the linear scan"""
+
+    def _linear_best_matches(self, vacancies, profile, limit=3, min_match=0.3):
+        suitable = []
+        for vacancy in vacancies:
+            if vacancy.status != JobMatchingStatus.VACANT:
+                continue
+            match_prob = vacancy.calculate_match_probability(profile.skills)
+            if match_prob > min_match and vacancy.wage_offered >= profile.reservation_wage:
+                suitable.append((vacancy, match_prob))
+        suitable.sort(key=lambda x: x[1], reverse=True)
+        return suitable[:limit]
+
+    def test_best_matches_equal_linear_scan(self):
+        import random
+        rng = random.Random(11)
+        sectors = ['manufactura', 'servicios', 'tecnologia']
+        vacancies = []
+        for i in range(300):
+            sector = sectors[i % 3]
+            requirements = {sector: rng.uniform(0.2, 0.9)}
+            if i % 4:
+                requirements['general'] = rng.uniform(0.1, 0.5)
+            if i % 50 == 0:
+                requirements = {}
+            vacancies.append(JobVacancy(f"Empresa_{i % 7}", sector, rng.choice([2000, 2500, 3000]),
+                                        requirements, posting_duration=rng.randint(0, 6)))
+        book = VacancyBook(vacancies)
+
+        for j in range(100):
+            skills = {s: rng.uniform(0.0, 0.9) for s in rng.sample(sectors + ['general'], rng.randint(1, 4))}
+            profile = WorkerProfile(f"W{j}", skills, reservation_wage=rng.uniform(1800, 3100))
+            esperado = self._linear_best_matches(vacancies, profile)
+            obtenido = book.best_matches(profile)
+            self.assertEqual([v for v, _ in obtenido], [v for v, _ in esperado])
+            for (_, p1), (_, p2) in zip(obtenido, esperado):
+                self.assertAlmostEqual(p1, p2)
+
+        # Filled vacancies are no longer offered
+        profile = WorkerProfile("W", {s: 0.9 for s in sectors + ['general']}, reservation_wage=0)
+        mejor = book.best_matches(profile, limit=1)[0][0]
+        mejor.status = JobMatchingStatus.MATCHED
+        book.remove(mejor)
+        self.assertNotIn(mejor, [v for v, _ in book.best_matches(profile, limit=10)])
+
+    def test_hiring_resolves_company_from_index(self):
+        mercado = Mercado({"pan": Bien("pan", "alimentos")})
+        empresa = EmpresaProductora("Empresa_X", mercado, {"pan": Bien("pan", "alimentos")})
+        mercado.agregar_persona(empresa)
+        labor_market = EnhancedLaborMarket(mercado)
+
+        labor_market._company_index = {"Empresa_X": empresa}
+        self.assertIs(labor_market._find_company("Empresa_X"), empresa)
+        self.assertIsNone(labor_market._find_company("Otra"))
+        # Outside a matching round it falls back to scanning the market
+        labor_market._company_index = None
+        self.assertIs(labor_market._find_company("Empresa_X"), empresa)
+
+
+
+class TestBatchMatching(unittest.TestCase):
+    """Batched assignment mode ("emparejamiento_laboral": "lote")"""
+
+    def _build_market(self, reverse=False):
+        import random
+        random.seed(5)
+        bienes = {"pan": Bien("pan", "alimentos_basicos")}
+        mercado = Mercado(bienes)
+        mercado.config_performance = {'emparejamiento_laboral': 'lote'}
+        servicios = EconomiaMultisectorial(mercado).sectores['servicios']
+        empresas = [EmpresaProductora(f"Empresa_{i}", mercado, bienes) for i in range(4)]
+        for empresa in empresas:
+            empresa.sector = servicios
+        consumidores = [Consumidor(f"Consumidor_{i:02d}", mercado) for i in range(40)]
+        for i, consumidor in enumerate(consumidores):
+            consumidor.empleado = False
+            consumidor.habilidades_sectoriales = {servicios.nombre: 0.3 + (i % 6) * 0.1}
+        for persona in empresas + (consumidores[::-1] if reverse else consumidores):
+            mercado.agregar_persona(persona)
+        for empresa in empresas:
+            empresa.dinero = 500000
+
+        labor_market = EnhancedLaborMarket(mercado)
+        for i, nombre in enumerate(sorted(labor_market.worker_profiles)):
+            profile = labor_market.worker_profiles[nombre]
+            profile.skills = {'general': 0.3 + (i % 7) * 0.1, 'servicios': 0.2 + (i % 5) * 0.15}
+            profile.reservation_wage = 1000
+        random.seed(9)
+        for i, empresa in enumerate(empresas * 3):
+            labor_market.post_vacancy(empresa, 'servicios', {'general': 0.4, 'servicios': 0.3 + 0.1 * (i % 3)})
+        random.seed(13)
+        return mercado, labor_market
+
+    def test_batch_matching_is_independent_of_consumer_order(self):
+        resultados = []
+        for reverse in (False, True):
+            mercado, labor_market = self._build_market(reverse)
+            stats = labor_market.matching_process()
+            empleados = sorted((e.nombre, c.nombre) for e in mercado.getEmpresas() for c in e.empleados)
+            resultados.append((stats['matches_made'], stats['applications_processed'], empleados))
+
+        self.assertGreater(resultados[0][0], 0)
+        self.assertEqual(resultados[0], resultados[1])
+
+    def test_batch_matching_respects_vacancies_and_application_budget(self):
+        mercado, labor_market = self._build_market()
+        num_vacancies = len(labor_market.vacancies)
+        stats = labor_market.matching_process()
+
+        self.assertLessEqual(stats['matches_made'], num_vacancies)
+        self.assertLessEqual(stats['applications_processed'], 3 * len(labor_market.worker_profiles))
+        contratados = [c for e in mercado.getEmpresas() for c in e.empleados]
+        self.assertEqual(len(contratados), stats['matches_made'])
+
+    def test_emergency_hiring_in_batch_mode(self):
+        import random
+        from src.systems.MercadoLaboral import MercadoLaboral
+        mercado, _ = self._build_market()
+        random.seed(3)
+        MercadoLaboral(mercado).facilitar_contrataciones_masivas()
+
+        contratados = [c for e in mercado.getEmpresas() for c in e.empleados]
+        self.assertGreater(len(contratados), 0)
+        self.assertEqual(len(contratados), len(set(contratados)))
+        self.assertLessEqual(len(contratados), 12)  # 3 plazas por cada una de las 4 empresas
+
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
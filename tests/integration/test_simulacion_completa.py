@@ -205,6 +205,94 @@ class TestIntegracionCompleta(unittest.TestCase):
         return total
 
 
+class TestPerfilHeadless(unittest.TestCase):
+    """Tests del perfil de ejecución headless (sin escrituras intermedias)"""
+
+    def test_simulacion_headless_devuelve_resultado(self):
+        """La ejecución headless devuelve series y KPIs y solo escribe el archivo columnar"""
+        import tempfile
+        from main import ejecutar_simulacion_headless
+        from src.utils.SimulacionReport import ResultadoSimulacion
+
+        config = ConfiguradorSimulacion()
+        config.config['simulacion']['num_ciclos'] = 3
+        config.config['simulacion']['num_consumidores'] = 30
+        config.config['machine_learning']['activar'] = False
+        config.config['agentes_ia']['activar'] = False
+
+        resultados_antes = set(os.listdir('results')) if os.path.isdir('results') else set()
+        with tempfile.TemporaryDirectory() as tmp:
+            resultado = ejecutar_simulacion_headless(config, os.path.join(tmp, 'run'))
+
+            self.assertEqual(resultado.perfil, 'headless')
+            self.assertEqual(len(resultado.series['pib']), 3)
+            self.assertEqual(resultado.series['ciclo'], [1, 2, 3])
+            self.assertIn('pib_final', resultado.kpis)
+            self.assertIn('desempleo_promedio', resultado.kpis)
+
+            ruta = os.path.join(tmp, 'run.npz')
+            self.assertEqual(os.listdir(tmp), ['run.npz'])
+            recargado = ResultadoSimulacion.cargar_columnar(ruta)
+            self.assertEqual(recargado.series['ciclo'], [1.0, 2.0, 3.0])
+            self.assertAlmostEqual(recargado.kpis['pib_final'], resultado.kpis['pib_final'])
+
+        resultados_despues = set(os.listdir('results')) if os.path.isdir('results') else set()
+        self.assertEqual(resultados_antes, resultados_despues)
+
+    def test_control_concentracion_por_ciclo_opcional(self):
+        """El controlador de concentración solo se ejecuta cada ciclo si se activa"""
+        import tempfile
+        from unittest import mock
+        from main import ejecutar_simulacion_headless
+        from src.systems.ControladorConcentracionEmpresarial import ControladorConcentracionEmpresarial
+
+        def ejecutar(activar):
+            config = ConfiguradorSimulacion()
+            config.config['simulacion'].update(num_ciclos=2, num_consumidores=30)
+            config.config['machine_learning']['activar'] = False
+            config.config['agentes_ia']['activar'] = False
+            if activar is not None:
+                config.config['mejoras_integrales']['control_concentracion']['controlar_cada_ciclo'] = activar
+            resultado = {'empresas_creadas': 0, 'razon_intervencion': ''}
+            with tempfile.TemporaryDirectory() as tmp, \
+                    mock.patch.object(ControladorConcentracionEmpresarial, 'controlar_concentracion_ciclo',
+                                      return_value=resultado) as controlar:
+                ejecutar_simulacion_headless(config, os.path.join(tmp, 'run'))
+            return controlar.call_count
+
+        self.assertEqual(ejecutar(None), 0)
+        self.assertEqual(ejecutar(True), 2)
+
+    def test_simulacion_memoizada_reutiliza_resultado(self):
+        """Una segunda ejecución idéntica se sirve del almacén sin simular"""
+        import tempfile
+        from unittest import mock
+        import main
+        from src.utils.AlmacenResultados import AlmacenResultados, clave_ejecucion
+
+        def configurar():
+            # La simulación recalibra la config en sitio: un configurador por ejecución
+            config = ConfiguradorSimulacion()
+            config.config['simulacion'].update(num_ciclos=2, num_consumidores=30, seed=11)
+            config.config['machine_learning']['activar'] = False
+            config.config['agentes_ia']['activar'] = False
+            config.aplicar_seed_global()
+            return config
+
+        with tempfile.TemporaryDirectory() as tmp:
+            almacen = AlmacenResultados(tmp)
+            config = configurar()
+            clave = clave_ejecucion(config.config)
+            primero = main.ejecutar_simulacion_memoizada(config, almacen=almacen)
+            self.assertTrue(almacen.contiene(clave))
+
+            with mock.patch.object(main, 'ejecutar_simulacion_headless',
+                                   side_effect=AssertionError("no debería simular")):
+                segundo = main.ejecutar_simulacion_memoizada(configurar(), almacen=almacen)
+            self.assertEqual(segundo.series['pib'], primero.series['pib'])
+            self.assertEqual(segundo.kpis, primero.kpis)
+
+
 class TestBenchmarkPerformance(unittest.TestCase):
     """Tests de benchmark y performance"""
     
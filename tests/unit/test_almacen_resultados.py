@@ -0,0 +1,63 @@
+"""
+Tests del Almacén de Resultados
+===============================
+
+Memoización por contenido de las ejecuciones (AlmacenResultados).
+"""
+
+import unittest
+import sys
+import os
+import tempfile
+
+# Añadir el directorio raíz al path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+
+class TestAlmacenResultados(unittest.TestCase):
+    """Memoización de ejecuciones por contenido"""
+
+    def _resultado(self, pib):
+        from src.utils.SimulacionReport import ResultadoSimulacion
+        return ResultadoSimulacion(series={'pib': [pib]}, kpis={'pib_final': pib}, num_ciclos=1,
+                                   tiempo_total=0.0, seed=1, perfil='headless')
+
+    def test_clave_canonica(self):
+        """La clave ignora el orden y el perfil de salida, y cambia con semilla y versión"""
+        from src.utils.AlmacenResultados import clave_ejecucion
+        config = {'simulacion': {'num_ciclos': 5, 'seed': 1}, 'economia': {'pib_inicial': 1, 'x': 2}}
+        reordenada = {'economia': {'x': 2, 'pib_inicial': 1}, 'simulacion': {'seed': 1, 'num_ciclos': 5},
+                      'ejecucion': {'perfil': 'headless'}, 'cache_resultados': {'max_entradas': 3}}
+        clave = clave_ejecucion(config)
+        self.assertEqual(clave, clave_ejecucion(reordenada))
+        self.assertEqual(clave, clave_ejecucion(config, seed=1))
+        self.assertNotEqual(clave, clave_ejecucion(config, seed=2))
+        self.assertNotEqual(clave, clave_ejecucion(config, version='otra'))
+        self.assertIsNone(clave_ejecucion({'simulacion': {'num_ciclos': 5}}))
+
+    def test_desalojo_lru(self):
+        """Al superar max_entradas se elimina la entrada usada hace más tiempo"""
+        import time
+        from src.utils.AlmacenResultados import AlmacenResultados
+        with tempfile.TemporaryDirectory() as tmp:
+            almacen = AlmacenResultados(tmp, max_entradas=2)
+            almacen.guardar('a', self._resultado(1.0))
+            almacen.guardar('b', self._resultado(2.0))
+            os.utime(almacen.ruta('a'), (time.time() - 100, time.time() - 100))
+            os.utime(almacen.ruta('b'), (time.time() - 50, time.time() - 50))
+            self.assertEqual(almacen.obtener('a').kpis['pib_final'], 1.0)  # 'a' pasa a ser reciente
+            almacen.guardar('c', self._resultado(3.0))
+            self.assertTrue(almacen.contiene('a'))
+            self.assertFalse(almacen.contiene('b'))
+            self.assertTrue(almacen.contiene('c'))
+
+    def test_desde_config(self):
+        """La sección cache_resultados puede deshabilitar el almacén"""
+        from src.utils.AlmacenResultados import AlmacenResultados
+        self.assertIsNone(AlmacenResultados.desde_config({'cache_resultados': {'habilitado': False}}))
+        almacen = AlmacenResultados.desde_config({'cache_resultados': {'directorio': 'x', 'max_entradas': 5}})
+        self.assertEqual((almacen.directorio, almacen.max_entradas), ('x', 5))
+
+
+if __name__ == '__main__':
+    unittest.main()
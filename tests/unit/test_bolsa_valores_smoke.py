@@ -1,3 +1,4 @@
+import numpy as np
 import pytest
 
 from src.models.Mercado import Mercado
@@ -20,3 +21,98 @@ def test_bolsa_inicializa_y_lista_empresas():
     assert len(bolsa.acciones) >= 2
     reporte = bolsa.ejecutar_ciclo_bursatil(1)
     assert 'indices' in reporte
+
+
+def test_historial_circular_ventanas_sin_copia():
+    from src.systems.MercadoCapitales import HistorialCircular
+
+    historial = HistorialCircular(2, capacidad=4)
+    for t in range(1, 8):
+        historial.agregar([t, 10 * t])
+
+    assert historial.longitud == 4
+    ventana = historial.ventana()
+    assert ventana.tolist() == [[4, 5, 6, 7], [40, 50, 60, 70]]
+    assert historial.ventana(2).tolist() == [[6, 7], [60, 70]]
+    # Las ventanas son vistas de solo lectura sobre el buffer
+    assert ventana.base is not None
+    assert not ventana.flags.writeable
+
+
+def _bolsa_con_empresas(num_empresas):
+    bienes = {'Arroz': object()}
+    mercado = Mercado(bienes)
+    for i in range(num_empresas):
+        empresa = Empresa(f'E{i:03d}', mercado, bienes={'Arroz': []})
+        empresa.dinero = 100000 * (i + 1)
+        mercado.agregar_persona(empresa)
+    bolsa = BolsaValores(mercado)
+    bolsa.listar_empresas()
+    return mercado, bolsa
+
+
+@pytest.mark.parametrize('vectorizado', [True, False])
+def test_actualizacion_precios_arrays_y_acciones_consistentes(vectorizado):
+    mercado, bolsa = _bolsa_con_empresas(5)
+    mercado.config_performance = {'vectorizar_bolsa_valores': vectorizado}
+
+    for ciclo in range(1, 26):
+        precios_previos = bolsa.precios.copy()
+        bolsa._actualizar_precios_acciones()
+        assert (bolsa.precios <= precios_previos * 1.15 + 1e-9).all()
+        assert (bolsa.precios >= np.minimum(precios_previos * 0.85, 0.1) - 1e-9).all()
+
+    for i, ticker in enumerate(bolsa.tickers):
+        accion = bolsa.acciones[ticker]
+        assert accion.precio_actual == bolsa.precios[i]
+        assert len(accion.historia_precios) == bolsa.capacidad_historial
+        assert accion.historia_precios[-1] == accion.precio_actual
+        assert accion.pe_ratio == pytest.approx(bolsa.pe_ratios[i])
+    assert bolsa.rendimientos == pytest.approx(bolsa.precios / bolsa.historial.ventana(2)[:, 0] - 1)
+
+
+def test_indices_y_carteras_en_bloque():
+    _, bolsa = _bolsa_con_empresas(4)
+    bolsa.ejecutar_ciclo_bursatil(1)
+
+    esperado = sum(bolsa.acciones[t].precio_actual for t in bolsa.tickers) / len(bolsa.tickers)
+    assert bolsa._calcular_indices()['GENERAL'] == pytest.approx(esperado)
+    for fondo in bolsa.fondos_inversion:
+        valor = fondo.capital + sum(c * bolsa.acciones[t].precio_actual for t, c in fondo.cartera.items())
+        assert fondo.valor_cartera == pytest.approx(valor)
+
+
+def test_fondo_con_accion_retirada_se_valora_sin_ella():
+    _, bolsa = _bolsa_con_empresas(3)
+    fondo = bolsa.fondos_inversion[0]
+    ticker = bolsa.tickers[0]
+    fondo.cartera = {ticker: 10, 'RETIRADA': 50}
+
+    bolsa._valorar_fondos()
+
+    assert fondo.valor_cartera == pytest.approx(fondo.capital + 10 * bolsa.acciones[ticker].precio_actual)
+
+
+def test_fallo_vectorizado_no_deja_arrays_a_medias():
+    from unittest import mock
+
+    _, bolsa = _bolsa_con_empresas(4)
+    antes = {nombre: getattr(bolsa, nombre).copy()
+             for nombre in ('precios', 'pe_ratios', 'roes', 'dividend_yields', 'debt_to_equities')}
+    np_where = np.where
+    llamadas = []
+
+    def where_que_falla(*args):
+        # Falla al calcular los ROE, después de los precios y los P/E
+        llamadas.append(args)
+        if len(llamadas) == 4:
+            raise RuntimeError('fallo inyectado')
+        return np_where(*args)
+
+    with mock.patch.object(np, 'where', side_effect=where_que_falla), \
+            mock.patch.object(bolsa, '_actualizar_precios_escalar') as escalar:
+        bolsa._actualizar_precios_acciones()
+
+    escalar.assert_called_once()
+    for nombre, valores in antes.items():
+        np.testing.assert_array_equal(getattr(bolsa, nombre), valores)
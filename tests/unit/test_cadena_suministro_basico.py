@@ -40,3 +40,38 @@ def test_cadena_inicializa_y_abastece_minimo():
     assert comprador.inventario_insumos['Materias_Primas'] > 0
     assert cadena.pedidos_realizados >= 1
     assert cadena.unidades_abastecidas > 0
+
+
+def test_pedidos_se_liquidan_contra_el_proveedor_mas_barato():
+    bienes = {'Materias_Primas': object(), 'Energia': object()}
+    mercado = Mercado(bienes)
+
+    caro = Empresa('Caro', mercado, bienes={'Materias_Primas': [1] * 30})
+    caro.precios['Materias_Primas'] = 20
+    barato = Empresa('Barato', mercado, bienes={'Materias_Primas': [1] * 8})
+    barato.precios['Materias_Primas'] = 5
+    compradores = [Empresa(f'Comprador_{i}', mercado, bienes={}) for i in range(2)]
+    for empresa in [caro, barato] + compradores:
+        empresa.dinero = 100000
+        mercado.agregar_persona(empresa)
+
+    cadena = GestorCadenaSuministro(mercado)
+    for empresa in [caro, barato] + compradores:
+        empresa.insumos_requeridos = {'Materias_Primas': {'consumo_por_unidad': 1}} if empresa in compradores else {}
+        empresa.inventario_insumos = {'Materias_Primas': 0} if empresa in compradores else {}
+    cadena._inicializado = True
+    cadena.max_compra_por_ciclo = 6
+
+    mercado.ciclo_actual = 1
+    cadena.ciclo_cadena()
+
+    # El primer comprador vacía casi al barato; el segundo toma lo que queda
+    assert compradores[0].inventario_insumos['Materias_Primas'] == 6
+    assert compradores[1].inventario_insumos['Materias_Primas'] == 2
+    assert len(barato.bienes['Materias_Primas']) == 0
+    assert len(caro.bienes['Materias_Primas']) == 30
+    assert cadena.valor_transado == 8 * 5
+
+    # Agotado el barato, el siguiente ciclo compra al caro
+    cadena.ciclo_cadena()
+    assert len(caro.bienes['Materias_Primas']) == 30 - 2 * 6
@@ -0,0 +1,75 @@
+"""
+Tests del Canal de Métricas
+===========================
+
+Canal acotado de métricas por ciclo que alimenta el streaming de la API.
+"""
+
+import unittest
+import sys
+import os
+
+# Añadir el directorio raíz al path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from src.models.Mercado import Mercado
+from src.models.Bien import Bien
+from src.models.Consumidor import Consumidor
+
+
+class TestCanalMetricas(unittest.TestCase):
+    """Canal acotado de métricas por ciclo"""
+
+    def test_lector_lento_salta_a_lo_reciente(self):
+        """Publicar nunca bloquea: un lector retrasado pierde lo antiguo y lo sabe"""
+        from src.utils.CanalMetricas import CanalMetricas
+        canal = CanalMetricas(capacidad=4)
+        for ciclo in range(1, 11):
+            canal.publicar({'ciclo': ciclo})
+        registros, cursor, descartados = canal.leer(0, timeout=0)
+        self.assertEqual([r['ciclo'] for r in registros], [7, 8, 9, 10])
+        self.assertEqual(descartados, 6)
+        self.assertEqual(canal.leer(cursor, timeout=0)[0], [])
+
+    def test_mismo_ciclo_se_fusiona(self):
+        """Una segunda publicación del mismo ciclo reemplaza a la pendiente"""
+        from src.utils.CanalMetricas import CanalMetricas
+        canal = CanalMetricas()
+        canal.publicar({'ciclo': 1, 'pib': 10.0})
+        canal.publicar({'ciclo': 1, 'pib': 12.0})
+        canal.cerrar()
+        registros, cursor, _ = canal.leer(0)
+        self.assertEqual(registros, [{'ciclo': 1, 'pib': 12.0}])
+        self.assertTrue(canal.terminado(cursor))
+
+    def test_fusion_no_cuenta_como_descarte(self):
+        """Las publicaciones fusionadas no inflan ``descartados``"""
+        from src.utils.CanalMetricas import CanalMetricas
+        canal = CanalMetricas(capacidad=2)
+        for ciclo in range(1, 4):
+            canal.publicar({'ciclo': ciclo, 'pib': 1.0})
+            canal.publicar({'ciclo': ciclo, 'pib': 2.0})
+        registros, cursor, descartados = canal.leer(0, timeout=0)
+        self.assertEqual([r['ciclo'] for r in registros], [2, 3])
+        self.assertEqual(descartados, 1)
+        self.assertEqual(cursor, 3)
+
+    def test_mercado_publica_al_registrar_estadisticas(self):
+        """registrar_estadisticas envía PIB, inflación y desempleo del ciclo"""
+        from src.utils.CanalMetricas import CanalMetricas
+        bienes = {'Pan': Bien('Pan', 'alimentos_basicos')}
+        mercado = Mercado(bienes)
+        mercado.agregar_persona(Consumidor('C1', mercado))
+        mercado.canal_metricas = CanalMetricas()
+        mercado.ciclo_actual = 1
+        mercado.registrar_estadisticas()
+        registros, _, _ = mercado.canal_metricas.leer(0, timeout=0)
+        self.assertEqual(len(registros), 1)
+        self.assertEqual(registros[0]['ciclo'], 1)
+        self.assertEqual(registros[0]['pib'], mercado.pib_historico[-1])
+        self.assertIn('inflacion', registros[0])
+        self.assertIn('desempleo', registros[0])
+
+
+if __name__ == '__main__':
+    unittest.main()
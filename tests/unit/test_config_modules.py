@@ -193,6 +193,18 @@ class TestConfiguradorSimulacion(unittest.TestCase):
         sim_config = self.configurador.obtener_seccion("simulacion")
         self.assertIsInstance(sim_config, dict)
 
+    def test_perfil_ejecucion_headless(self):
+        """Test del perfil de ejecución headless"""
+        self.assertIn(self.configurador.obtener_perfil_ejecucion(), ('completo', 'headless'))
+
+        self.configurador.activar_perfil_headless('results/run.npz')
+        self.assertTrue(self.configurador.es_headless())
+        self.assertEqual(self.configurador.obtener_parametro('ejecucion', 'archivo_columnar'), 'results/run.npz')
+
+        # Un perfil desconocido se normaliza a 'completo'
+        cfg = self.configurador._validar_y_normalizar({'ejecucion': {'perfil': 'desconocido'}})
+        self.assertEqual(cfg['ejecucion']['perfil'], 'completo')
+
 
 class TestIndicadoresEconomicosReales(unittest.TestCase):
     """Tests para IndicadoresEconomicosReales"""
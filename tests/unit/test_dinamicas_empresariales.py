@@ -167,6 +167,49 @@ class TestCostosAjustePrecios:
             assert len(empresa.historial_cambios_precio[bien_test]) > 0
 
 
+class TestAgregadosBienes:
+    """Tests para los agregados por bien compartidos entre empresas"""
+
+    def test_agregados_coinciden_con_recorrido_directo(self, mercado_basico):
+        mercado = mercado_basico
+        empresas = [EmpresaProductora(f'Empresa_{i}', mercado) for i in range(4)]
+        for i, empresa in enumerate(empresas):
+            mercado.agregar_persona(empresa)
+            empresa.precios['pan'] = 10 + i
+            empresa.bienes['pan'] = [object()] * (i + 1)
+        mercado.ciclo_actual = 3
+        mercado.transacciones = [
+            {'bien': 'pan', 'cantidad': 2, 'ciclo': 1},
+            {'bien': 'pan', 'cantidad': 4, 'ciclo': 2},
+            {'bien': 'cafe', 'cantidad': 1, 'ciclo': 2},
+        ]
+
+        est = mercado.agregados_bienes.obtener('pan')
+        assert est.num_vendedores == 4
+        assert (est.precio_min, est.precio_medio, est.precio_max) == (10, 11.5, 13)
+        assert est.stock_total == 10
+        assert est.vendidas_ultimo_ciclo == 4
+
+        # El promedio de la competencia excluye el precio propio
+        assert est.num_competidores(empresas[0]) == 3
+        assert est.precio_medio_competencia(empresas[0]) == pytest.approx(12.0)
+
+    def test_agregados_se_recalculan_una_vez_por_ciclo(self, mercado_basico):
+        mercado = mercado_basico
+        for i in range(3):
+            mercado.agregar_persona(EmpresaProductora(f'Empresa_{i}', mercado))
+        agregados = mercado.agregados_bienes
+
+        with patch.object(agregados, 'recalcular', wraps=agregados.recalcular) as recalcular:
+            for empresa in mercado.getEmpresas():
+                for bien in mercado.bienes:
+                    assert empresa.calcular_demanda_estimada(bien, mercado) >= 1
+            assert recalcular.call_count == 1
+            mercado.ciclo_actual += 1
+            mercado.getEmpresas()[0].calcular_demanda_estimada('pan', mercado)
+            assert recalcular.call_count == 2
+
+
 class TestRotacionEmpresarial:
     """Tests para entrada y salida de empresas"""
     
@@ -0,0 +1,89 @@
+"""
+Tests del Ensamble Monte Carlo
+==============================
+
+Réplicas en paralelo con acumuladores en línea (EnsambleMonteCarlo).
+"""
+
+import unittest
+import sys
+import os
+import tempfile
+
+# Añadir el directorio raíz al path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+
+def _ejecutor_aleatorio(config, al_terminar_ciclo=None, canal_metricas=None):
+    """Ejecutor de prueba para el ensamble: series ruidosas dependientes de la semilla"""
+    import numpy as np
+    seed = config['simulacion']['seed']
+    num_ciclos = config['simulacion']['num_ciclos']
+    rng = np.random.default_rng(seed)
+    series = {'pib': (1000 + rng.normal(0, 10, num_ciclos)).tolist(),
+              'inflacion': (2 + rng.normal(0, 0.5, num_ciclos)).tolist(),
+              'desempleo': (8 + rng.normal(0, 1, num_ciclos)).tolist()}
+    return {'series': series, 'kpis': {}, 'num_ciclos': num_ciclos, 'tiempo_total': 0.0,
+            'seed': seed, 'perfil': 'headless'}
+
+
+def _ejecutor_truncado(config, al_terminar_ciclo=None, canal_metricas=None):
+    """Como ``_ejecutor_aleatorio``, pero la semilla 2 se queda un ciclo corta de inflación"""
+    datos = _ejecutor_aleatorio(config, al_terminar_ciclo, canal_metricas)
+    if datos['seed'] == 2:
+        datos['series']['inflacion'] = datos['series']['inflacion'][:-1]
+    return datos
+
+
+class TestEnsambleMonteCarlo(unittest.TestCase):
+    """Réplicas en paralelo con acumuladores en línea"""
+
+    def test_acumulador_coincide_con_estadistica_exacta(self):
+        """Welford es exacto y P² se aproxima a los cuantiles muestrales"""
+        import numpy as np
+        from src.utils.EnsambleMonteCarlo import AcumuladorSerie
+        datos = np.random.default_rng(0).normal([0, 50], [1, 10], size=(1000, 2))
+        acumulador = AcumuladorSerie((0.1, 0.5, 0.9))
+        for fila in datos:
+            acumulador.agregar(fila)
+        bandas = acumulador.bandas(0.95)
+        np.testing.assert_allclose(bandas['media'], datos.mean(axis=0))
+        np.testing.assert_allclose(bandas['desviacion'], datos.std(axis=0, ddof=1))
+        for p in (0.1, 0.5, 0.9):
+            exacto = np.quantile(datos, p, axis=0)
+            np.testing.assert_allclose(bandas[f"p{round(p * 100):02d}"], exacto, atol=0.1 * datos.std(axis=0).max())
+
+    def test_parada_temprana_y_memoizacion(self):
+        """El ensamble para al converger y repetirlo usa las réplicas guardadas"""
+        from src.utils.AlmacenResultados import AlmacenResultados
+        from src.utils.EnsambleMonteCarlo import EnsambleMonteCarlo
+        config = {'simulacion': {'num_ciclos': 5}}
+        with tempfile.TemporaryDirectory() as tmp:
+            almacen = AlmacenResultados(tmp)
+            opciones = dict(max_procesos=2, almacen=almacen, replicas_min=4,
+                            tolerancia_relativa=0.1, ejecutor=_ejecutor_aleatorio)
+            resultado = EnsambleMonteCarlo(config, **opciones).ejecutar(range(100))
+            self.assertTrue(resultado.convergido)
+            self.assertLess(resultado.replicas, 100)
+            self.assertEqual(resultado.desde_almacen, 0)
+            self.assertEqual(len(resultado.bandas['pib']['media']), 5)
+
+            repetido = EnsambleMonteCarlo(config, **opciones).ejecutar(range(100))
+            self.assertEqual(repetido.desde_almacen, repetido.replicas)
+            self.assertLessEqual(set(repetido.semillas), set(resultado.semillas))
+
+    def test_replica_con_otros_ciclos_queda_en_fallidas(self):
+        """Una réplica con una serie más corta se descarta sin tocar ningún acumulador"""
+        from src.utils.EnsambleMonteCarlo import EnsambleMonteCarlo
+        config = {'simulacion': {'num_ciclos': 5}}
+        ensamble = EnsambleMonteCarlo(config, max_procesos=1, replicas_min=100,
+                                      ejecutor=_ejecutor_truncado)
+        resultado = ensamble.ejecutar(range(4))
+        self.assertEqual(resultado.semillas, [0, 1, 3])
+        self.assertIn('inflacion', resultado.fallidas[2])
+        for serie, acumulador in ensamble.acumuladores.items():
+            self.assertEqual(acumulador.n, 3, serie)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,84 @@
+"""
+Tests del Exportador Columnar
+=============================
+
+Exportación columnar particionada por rango de ciclos (ExportadorColumnar).
+"""
+
+import unittest
+import sys
+import os
+import tempfile
+
+# Añadir el directorio raíz al path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from src.models.Mercado import Mercado
+from src.models.Bien import Bien
+from src.models.Consumidor import Consumidor
+from src.models.Empresa import Empresa
+
+
+class TestExportadorColumnar(unittest.TestCase):
+    """Exportación columnar particionada por rango de ciclos"""
+
+    def _mercado(self):
+        mercado = Mercado({'Pan': Bien('Pan', 'alimentos_basicos')})
+        for i in range(4):
+            mercado.agregar_persona(Consumidor(f'C{i}', mercado))
+        mercado.agregar_persona(Empresa('E1', mercado))
+        return mercado
+
+    def _simular(self, exportador, mercado, ciclos):
+        for ciclo in range(1, ciclos + 1):
+            mercado.ciclo_actual = ciclo
+            consumidor = mercado.getConsumidores()[ciclo % 4]
+            mercado.registrar_transaccion(consumidor, 'Pan', 2, 10.0 * ciclo, ciclo)
+            mercado.registrar_estadisticas()
+            exportador.registrar_ciclo(mercado, ciclo)
+
+    def test_particiones_y_lectura_por_rango(self):
+        """Cada partición cubre su rango de ciclos y la lectura solo abre las que solapan"""
+        import numpy as np
+        from src.utils import ExportadorColumnar as modulo
+        with tempfile.TemporaryDirectory() as tmp:
+            exportador = modulo.ExportadorColumnar(tmp, 'run', ciclos_por_particion=2, formato='npy')
+            mercado = self._mercado()
+            self._simular(exportador, mercado, 5)
+            ruta = exportador.cerrar()
+
+            manifiesto = modulo.leer_manifiesto(ruta)
+            rangos = [(p['ciclo_desde'], p['ciclo_hasta']) for p in manifiesto['tablas']['macro']]
+            self.assertEqual(rangos, [(1, 2), (3, 4), (5, 5)])
+
+            macro = modulo.leer_tabla(ruta, 'macro')
+            self.assertEqual(macro['ciclo'].tolist(), [1, 2, 3, 4, 5])
+            self.assertAlmostEqual(float(macro['pib'][-1]), mercado.pib_historico[-1])
+
+            panel = modulo.leer_tabla(ruta, 'consumidores', ciclo_desde=3, ciclo_hasta=3,
+                                      columnas=['nombre', 'dinero'])
+            self.assertEqual(sorted(panel), ['dinero', 'nombre'])
+            self.assertEqual(sorted(panel['nombre'].tolist()), ['C0', 'C1', 'C2', 'C3'])
+
+            libro = modulo.leer_tabla(ruta, 'transacciones', ciclo_desde=4)
+            self.assertEqual(libro['ciclo'].tolist(), [4, 5])
+            self.assertEqual(libro['costo_total'].tolist(), [40.0, 50.0])
+            self.assertEqual(libro['consumidor'].tolist(), ['C0', 'C1'])
+
+            # Las columnas de una sola partición se devuelven mapeadas en memoria
+            ultima = modulo.leer_tabla(ruta, 'empresas', ciclo_desde=5)
+            self.assertIsInstance(ultima['dinero'], np.memmap)
+
+    def test_desde_config(self):
+        """Sin activar en la sección exportacion_columnar no hay exportador"""
+        from src.utils.ExportadorColumnar import ExportadorColumnar
+        self.assertIsNone(ExportadorColumnar.desde_config({'exportacion_columnar': {}}, 'run'))
+        with tempfile.TemporaryDirectory() as tmp:
+            exportador = ExportadorColumnar.desde_config(
+                {'exportacion_columnar': {'activar': True, 'directorio': tmp, 'tablas': ['macro']}}, 'run')
+            self.assertEqual(exportador.tablas, ('macro',))
+            self.assertEqual(exportador.directorio, os.path.join(tmp, 'run'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,175 @@
+"""
+Tests del Gestor de Trabajos
+============================
+
+Trabajos de simulación en segundo plano (GestorTrabajos).
+"""
+
+import unittest
+import sys
+import os
+import tempfile
+
+# Añadir el directorio raíz al path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+
+def _ejecutor_rapido(config, al_terminar_ciclo=None, canal_metricas=None):
+    """Ejecutor de prueba para GestorTrabajos: recorre ciclos sin simular"""
+    import time
+    num_ciclos = config['simulacion']['num_ciclos']
+    for ciclo in range(1, num_ciclos + 1):
+        time.sleep(config['simulacion'].get('pausa', 0.0))
+        if canal_metricas is not None:
+            canal_metricas.publicar({'ciclo': ciclo, 'pib': float(ciclo)})
+        if al_terminar_ciclo is not None:
+            al_terminar_ciclo(None, ciclo, num_ciclos)
+    return {'series': {'ciclo': list(range(1, num_ciclos + 1))},
+            'kpis': {'pib_final': float(num_ciclos)}, 'num_ciclos': num_ciclos,
+            'tiempo_total': 0.0, 'seed': config['simulacion'].get('seed'), 'perfil': 'headless'}
+
+
+class TestGestorTrabajos(unittest.TestCase):
+    """Trabajos en segundo plano con almacén de resultados"""
+
+    def setUp(self):
+        from src.utils.AlmacenResultados import AlmacenResultados
+        from src.utils.GestorTrabajos import GestorTrabajos
+        self.tmp = tempfile.TemporaryDirectory()
+        self.almacen = AlmacenResultados(os.path.join(self.tmp.name, 'almacen'))
+        self.gestor = GestorTrabajos(max_procesos=1, almacen=self.almacen,
+                                     directorio=os.path.join(self.tmp.name, 'trabajos'),
+                                     ejecutor=_ejecutor_rapido)
+
+    def tearDown(self):
+        self.gestor.cerrar()
+        self.tmp.cleanup()
+
+    def _esperar(self, trabajo, timeout=60):
+        import time
+        limite = time.time() + timeout
+        while trabajo.estado in ('pendiente', 'ejecutando') and time.time() < limite:
+            time.sleep(0.05)
+        return self.gestor.estado(trabajo.id)
+
+    def test_trabajo_completo_y_repeticion_desde_almacen(self):
+        """Un trabajo termina con progreso completo; el idéntico se sirve del almacén"""
+        config = {'simulacion': {'num_ciclos': 4, 'seed': 7}}
+        trabajo = self.gestor.enviar(config)
+        estado = self._esperar(trabajo)
+        self.assertEqual(estado['estado'], 'completado')
+        self.assertEqual(estado['progreso']['ciclo'], 4)
+        self.assertEqual(self.gestor.resultado(trabajo.id).kpis['pib_final'], 4.0)
+        self.assertTrue(self.almacen.contiene(trabajo.clave))
+
+        repetido = self.gestor.enviar({'simulacion': {'seed': 7, 'num_ciclos': 4}})
+        self.assertNotEqual(repetido.id, trabajo.id)
+        self.assertTrue(repetido.desde_cache)
+        self.assertEqual(self.gestor.estado(repetido.id)['estado'], 'completado')
+        self.assertEqual(self.gestor.resultado(repetido.id).num_ciclos, 4)
+
+        otra_semilla = self.gestor.enviar({'simulacion': {'num_ciclos': 4, 'seed': 8}})
+        self.assertFalse(otra_semilla.desde_cache)
+        self._esperar(otra_semilla)
+
+    def test_sin_almacen_no_memoiza(self):
+        """Con la caché deshabilitada cada envío se simula y el resultado vive en el trabajo"""
+        from src.utils.AlmacenResultados import AlmacenResultados
+        from src.utils.GestorTrabajos import GestorTrabajos
+        self.assertIsNone(AlmacenResultados.desde_config({'cache_resultados': {'habilitado': False}}))
+        self.gestor.cerrar()
+        self.gestor = GestorTrabajos(max_procesos=1, almacen=None,
+                                     directorio=os.path.join(self.tmp.name, 'trabajos'),
+                                     ejecutor=_ejecutor_rapido)
+
+        config = {'simulacion': {'num_ciclos': 3, 'seed': 7}}
+        trabajo = self.gestor.enviar(config)
+        self.assertEqual(self._esperar(trabajo)['estado'], 'completado')
+        self.assertEqual(self.gestor.resultado(trabajo.id).kpis['pib_final'], 3.0)
+
+        repetido = self.gestor.enviar(config)
+        self.assertFalse(repetido.desde_cache)
+        self.assertEqual(self._esperar(repetido)['estado'], 'completado')
+        self.assertFalse(os.path.exists(os.path.join(self.tmp.name, 'almacen')))
+
+        self.gestor._desalojar_terminados(ahora=repetido.terminado + 10 ** 6)
+        self.assertIsNone(self.gestor.resultado(trabajo.id))
+
+    def test_cancelar_trabajo_en_ejecucion_y_pendiente(self):
+        """Cancelar detiene el trabajo en curso tras su ciclo y descarta el que espera"""
+        en_curso = self.gestor.enviar({'simulacion': {'num_ciclos': 200, 'pausa': 0.05}})
+        pendiente = self.gestor.enviar({'simulacion': {'num_ciclos': 200, 'pausa': 0.05, 'seed': 1}})
+        self.assertTrue(self.gestor.cancelar(pendiente.id))
+        import time
+        limite = time.time() + 60
+        while self.gestor.estado(en_curso.id)['progreso']['ciclo'] < 1 and time.time() < limite:
+            time.sleep(0.05)
+        self.assertEqual(self.gestor.estado(en_curso.id)['estado'], 'ejecutando')
+        self.assertTrue(self.gestor.cancelar(en_curso.id))
+
+        estado = self._esperar(en_curso)
+        self.assertEqual(estado['estado'], 'cancelado')
+        self.assertLess(estado['progreso']['ciclo'], 200)
+        self.assertEqual(self._esperar(pendiente)['estado'], 'cancelado')
+        self.assertIsNone(self.gestor.resultado(en_curso.id))
+        self.assertFalse(self.almacen.contiene(en_curso.clave))
+        self.assertFalse(self.gestor.cancelar(en_curso.id))
+
+    def test_metricas_por_ciclo_llegan_al_canal(self):
+        """El canal del trabajo recibe las métricas de cada ciclo y se cierra al terminar"""
+        trabajo = self.gestor.enviar({'simulacion': {'num_ciclos': 5, 'seed': 3}})
+        self._esperar(trabajo)
+        canal = self.gestor.canal(trabajo.id)
+        registros, cursor, descartados = canal.leer(0, timeout=10)
+        self.assertEqual([r['ciclo'] for r in registros], [1, 2, 3, 4, 5])
+        self.assertEqual(descartados, 0)
+        import time
+        limite = time.time() + 10
+        while not canal.terminado(cursor) and time.time() < limite:
+            time.sleep(0.05)
+        self.assertTrue(canal.terminado(cursor))
+
+    def test_canal_se_cierra_aunque_falte_la_marca_de_fin(self):
+        """Si la marca de fin del hijo se pierde, el gestor cierra el canal al terminar"""
+        from concurrent.futures import Future
+        from unittest import mock
+        from src.utils import GestorTrabajos as modulo
+        from src.utils.CanalMetricas import CanalMetricas
+        trabajo = modulo.Trabajo('t1', 'trabajo-t1', {}, os.path.join(self.tmp.name, 't1'), memoizable=False)
+        self.gestor.trabajos[trabajo.id] = trabajo
+        self.gestor.canales[trabajo.id] = canal = CanalMetricas()
+        canal.publicar({'ciclo': 1})
+        futuro = Future()
+        futuro.set_exception(RuntimeError('fallo en el hijo'))
+        with mock.patch.object(modulo, 'ESPERA_FIN_METRICAS', 0.01):
+            self.gestor._al_terminar(trabajo, futuro)
+        self.assertEqual(trabajo.estado, 'error')
+        registros, cursor, _ = canal.leer(0, timeout=0)
+        self.assertEqual(len(registros), 1)
+        self.assertTrue(canal.terminado(cursor))
+
+    def test_desaloja_trabajos_terminados(self):
+        """Los terminados se olvidan por cantidad y por antigüedad, con su canal y directorio"""
+        import time
+        self.gestor.max_terminados = 1
+        primero = self.gestor.enviar({'simulacion': {'num_ciclos': 2, 'seed': 11}})
+        self._esperar(primero)
+        segundo = self.gestor.enviar({'simulacion': {'num_ciclos': 2}})
+        self._esperar(segundo)
+
+        self.assertIsNone(self.gestor.obtener(primero.id))
+        self.assertIsNone(self.gestor.canal(primero.id))
+        self.assertFalse(os.path.exists(primero.directorio))
+        self.assertTrue(self.almacen.contiene(primero.clave))  # Memoizable: sigue en el almacén
+        self.assertEqual(self.gestor.estado(segundo.id)['estado'], 'completado')
+        self.assertTrue(self.almacen.contiene(segundo.clave))
+
+        self.gestor._desalojar_terminados(ahora=time.time() + self.gestor.ttl_terminados + 1)
+        self.assertEqual(self.gestor.trabajos, {})
+        self.assertEqual(self.gestor.canales, {})
+        self.assertFalse(os.path.exists(segundo.directorio))
+        self.assertFalse(self.almacen.contiene(segundo.clave))  # Sin semilla nadie más lo pedirá
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -157,5 +157,116 @@ class TestMercado(unittest.TestCase):
         self.assertIsNotNone(self.mercado.sistema_innovacion)
 
 
+
+class TestAlmacenConsumidores(unittest.TestCase):
+    """Campos de consumidores respaldados por columnas NumPy"""
+
+    def setUp(self):
+        self.mercado = Mercado({"pan": Bien("pan", "alimentos_basicos")})
+        self.consumidores = [Consumidor(f"C{i}", self.mercado) for i in range(3)]
+        for i, consumidor in enumerate(self.consumidores):
+            consumidor.dinero = 1000 * (i + 1)
+            self.mercado.agregar_persona(consumidor)
+
+    def test_atributos_leen_y_escriben_en_columnas(self):
+        almacen = self.mercado.activar_almacen_consumidores()
+        self.assertEqual(len(almacen), 3)
+        self.assertEqual([c.dinero for c in self.consumidores], [1000.0, 2000.0, 3000.0])
+
+        self.consumidores[1].dinero -= 500
+        indices = almacen.indices(self.consumidores)
+        self.assertEqual(almacen.dinero[indices].tolist(), [1000.0, 1500.0, 3000.0])
+
+        # Una operación sobre la columna se ve desde los agentes
+        almacen.empleado[indices] = False
+        almacen.ingreso_mensual[indices] = 0
+        self.assertFalse(any(c.empleado for c in self.consumidores))
+        self.assertIs(type(self.consumidores[0].empleado), bool)
+
+    def test_nuevos_consumidores_y_retirados(self):
+        almacen = self.mercado.activar_almacen_consumidores()
+        nuevos = [Consumidor(f"N{i}", self.mercado) for i in range(20)]
+        for consumidor in nuevos:
+            consumidor.ahorros = 7
+            self.mercado.agregar_persona(consumidor)
+        self.assertEqual(len(almacen), 23)
+        self.assertEqual(nuevos[-1].ahorros, 7)
+
+        retirado = self.consumidores[0]
+        self.mercado.personas.remove(retirado)
+        almacen.liberar(retirado)
+        self.assertEqual(len(almacen), 22)
+        self.assertEqual(retirado.dinero, 1000.0)
+        retirado.dinero = 5
+        self.assertIsNone(almacen.indices([retirado]))
+        self.assertEqual(self.consumidores[1].dinero, 2000.0)
+
+
+class TestIndiceOferentes(unittest.TestCase):
+    """Índice bien -> empresas mantenido con producción, ventas, altas y bajas"""
+
+    def setUp(self):
+        self.mercado = Mercado({"pan": Bien("pan", "alimentos_basicos"),
+                                "cafe": Bien("cafe", "alimentos_lujo")})
+        self.empresas = [Empresa(f"E{i}", self.mercado) for i in range(3)]
+        for empresa in self.empresas:
+            empresa.bienes["pan"] = []
+            self.mercado.agregar_persona(empresa)
+        self.empresas[0].bienes["pan"].extend(["u"] * 4)
+
+    def _comprobar(self, indice):
+        """El índice coincide con recorrer el mercado"""
+        for bien in ("pan", "cafe"):
+            empresas = self.mercado.getEmpresas()
+            self.assertEqual(indice.oferentes(bien), [e for e in empresas if bien in e.bienes])
+            self.assertEqual(indice.con_existencias(bien),
+                             [e for e in empresas if len(e.bienes.get(bien, [])) > 0])
+            self.assertEqual(indice.stock_total(bien), sum(len(e.bienes.get(bien, [])) for e in empresas))
+
+    def test_produccion_ventas_y_agotamiento(self):
+        indice = self.mercado.activar_indice_oferentes()
+        self.assertEqual(indice.num_oferentes("pan"), 3)
+        self.assertEqual(indice.num_con_existencias("pan"), 1)
+
+        self.empresas[1].bienes["pan"].append("u")
+        self.empresas[2].bienes["cafe"] = ["c", "c"]
+        del self.empresas[0].bienes["pan"][:4]  # se agota
+        self._comprobar(indice)
+        self.assertEqual(indice.con_existencias("pan"), [self.empresas[1]])
+
+        self.empresas[1].bienes["pan"].pop(0)
+        self.empresas[2].bienes.pop("cafe")
+        self._comprobar(indice)
+        self.assertEqual(indice.num_oferentes("cafe"), 0)
+
+    def test_entrada_y_salida_de_empresas(self):
+        indice = self.mercado.activar_indice_oferentes()
+        entrante = Empresa("Nueva", self.mercado)
+        entrante.bienes["cafe"] = ["c"]
+        self.mercado.agregar_persona(entrante)
+        self.assertEqual(indice.con_existencias("cafe"), [entrante])
+
+        # Absorción: el inventario pasa a otra empresa y la absorbida sale
+        self.empresas[1].bienes["cafe"] = entrante.bienes["cafe"]
+        self.mercado.retirar_persona(entrante)
+        self.assertFalse(indice.contiene(entrante))
+        entrante.bienes["cafe"].append("c")  # ya no cuenta
+        self._comprobar(indice)
+        self.assertEqual(indice.stock_total("cafe"), 1)
+        self.assertIs(type(entrante.bienes), dict)
+
+    def test_altas_fuera_de_orden_conservan_el_orden_del_mercado(self):
+        indice = self.mercado.activar_indice_oferentes()
+        self.empresas[2].bienes["cafe"] = ["c"]
+        self.empresas[0].bienes["cafe"] = ["c"]  # Empresa más antigua, alta posterior
+        del self.empresas[1].bienes["pan"]
+        self.empresas[1].bienes["pan"] = ["u"]   # Baja y nueva alta
+        self._comprobar(indice)
+        self.assertEqual(list(indice.ofertas["cafe"].oferentes.values()),
+                         [self.empresas[0], self.empresas[2]])
+        self.assertEqual(list(indice.ofertas["pan"].con_existencias.values()),
+                         [self.empresas[0], self.empresas[1]])
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -11,6 +11,7 @@ import sys
 import os
 import time
 import gc
+import subprocess
 from unittest.mock import Mock
 
 # Añadir el directorio raíz al path
@@ -530,5 +531,152 @@ class TestLimitesRendimiento(unittest.TestCase):
                        f"{num_bienes} búsquedas tomaron {tiempo_total:.2f}s")
 
 
+class TestTiempoArranque(unittest.TestCase):
+    """Benchmark de tiempo de importación de los puntos de entrada"""
+
+    RAIZ = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+    MODULOS_PESADOS = ('sklearn', 'joblib', 'matplotlib', 'pandas', 'optuna')
+    # Objetivo: < 1 s en frío; margen para runners de CI cargados
+    LIMITE_SEGUNDOS = 3.0
+
+    def _medir_importacion(self, modulo):
+        """Importa ``modulo`` en un intérprete limpio y devuelve (segundos, pesados cargados)"""
+        codigo = (
+            "import sys, time\n"
+            "t = time.perf_counter()\n"
+            f"import {modulo}\n"
+            "dt = time.perf_counter() - t\n"
+            f"pesados = [m for m in {self.MODULOS_PESADOS!r} if m in sys.modules]\n"
+            "print(f'{dt:.4f};' + ','.join(pesados))\n"
+        )
+        salida = subprocess.run(
+            [sys.executable, '-c', codigo], cwd=self.RAIZ,
+            capture_output=True, text=True, timeout=120
+        )
+        self.assertEqual(salida.returncode, 0, salida.stderr)
+        ultima_linea = salida.stdout.strip().splitlines()[-1]
+        segundos, pesados = ultima_linea.split(';')
+        return float(segundos), [m for m in pesados.split(',') if m]
+
+    def test_importar_main_sin_dependencias_pesadas(self):
+        """Importar main no debe cargar sklearn, matplotlib, pandas ni optuna"""
+        segundos, pesados = self._medir_importacion('main')
+        self.assertEqual(pesados, [], f"main importó módulos pesados: {pesados}")
+        self.assertLess(segundos, self.LIMITE_SEGUNDOS,
+                        f"Importar main tomó {segundos:.2f}s")
+
+    def test_importar_mercado_sin_dependencias_pesadas(self):
+        """El modelo de mercado debe poder importarse sin el stack de ML/gráficos"""
+        segundos, pesados = self._medir_importacion('src.models.Mercado')
+        self.assertEqual(pesados, [], f"Mercado importó módulos pesados: {pesados}")
+        self.assertLess(segundos, self.LIMITE_SEGUNDOS)
+
+    def test_analytics_se_crea_bajo_demanda(self):
+        """El analytics ML del mercado no se instancia si está deshabilitado"""
+        mercado = Mercado({'pan': Bien('pan', 'alimentos_basicos')})
+        mercado.analytics_habilitado = False
+        self.assertIsNone(mercado._sistema_analytics)
+        mercado.obtener_estadisticas_completas()
+        self.assertIsNone(mercado._sistema_analytics)
+
+
+
+class TestSuiteBenchmarks(unittest.TestCase):
+    """Suite de benchmarks: medición, baselines por commit y detección de regresiones"""
+
+    def setUp(self):
+        import tempfile
+        from src.utils.BenchmarkSuite import SuiteBenchmarks
+        self.tmp = tempfile.TemporaryDirectory()
+        self.suite = SuiteBenchmarks(self.tmp.name, repeticiones=2, calentamiento=0,
+                                     umbral_regresion=0.20)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_micro_benchmarks_y_baseline(self):
+        """Los micro-benchmarks se miden y quedan guardados bajo el commit"""
+        from src.utils.BenchmarkSuite import benchmarks_micro
+        micro = [b for b in benchmarks_micro() if b.nombre in ('orderbook_submit_match', 'cobro_cuotas_bancarias')]
+        self.suite.registrar(micro)
+        resultados = self.suite.ejecutar()
+
+        self.assertEqual(len(resultados), 2)
+        self.assertIn('orderbook_submit_match[ordenes=2000]', resultados)
+        for resultado in resultados.values():
+            self.assertEqual(len(resultado.tiempos), 2)
+            self.assertGreater(resultado.mediana, 0)
+
+        self.suite.guardar_baseline(resultados, 'abc1234')
+        commit, baseline = self.suite.seleccionar_baseline(excluir='otro')
+        self.assertEqual(commit, 'abc1234')
+        self.assertEqual(set(baseline), set(resultados))
+
+    def test_detecta_regresion_sobre_umbral(self):
+        """Una mediana 50% más lenta que la baseline es regresión; una 10% más lenta no"""
+        from src.utils.BenchmarkSuite import ResultadoBenchmark
+        baseline = {'a': {'mediana': 1.0}, 'b': {'mediana': 1.0}}
+        resultados = {
+            'a': ResultadoBenchmark('a', 'micro', {}, [1.5, 1.5]),
+            'b': ResultadoBenchmark('b', 'micro', {}, [1.1, 1.1]),
+            'nuevo': ResultadoBenchmark('nuevo', 'micro', {}, [1.0]),
+        }
+        comparacion = {c['clave']: c for c in self.suite.comparar(resultados, baseline)}
+        self.assertTrue(comparacion['a']['regresion'])
+        self.assertFalse(comparacion['b']['regresion'])
+        self.assertNotIn('nuevo', comparacion)
+
+
+class TestAnalisisEscalabilidad(unittest.TestCase):
+    """Grilla, ajuste de exponentes y reporte del análisis de escalabilidad"""
+
+    def test_grid_barre_una_dimension_a_la_vez(self):
+        from src.utils.AnalisisEscalabilidad import generar_grid
+        base = {'consumidores': 100, 'bienes': 10, 'empresas': 5}
+        barridos = {'consumidores': (50, 100, 200), 'bienes': (10, 20), 'empresas': (5,)}
+        grid = generar_grid(barridos, base)
+        self.assertEqual(len(grid), 4)  # el punto base no se repite
+        self.assertEqual(len(generar_grid(barridos, base, completo=True)), 6)
+
+    def test_exponentes_y_subsistema_que_se_rompe_primero(self):
+        """Un subsistema cuadrático debe destacar frente a uno lineal"""
+        from src.utils.AnalisisEscalabilidad import PuntoEscalado, analizar_escalabilidad, ajustar_exponente
+        self.assertAlmostEqual(ajustar_exponente([10, 100, 1000], [1, 10, 100]), 1.0, places=6)
+        self.assertIsNone(ajustar_exponente([10, 10], [1, 2]))
+
+        puntos = []
+        for n in (100, 200, 400, 800):
+            lineal = n * 1e-4
+            cuadratico = (n ** 2) * 1e-7
+            puntos.append(PuntoEscalado(n, 10, 5, ciclos=2, tiempo_ciclos=2 * (lineal + cuadratico),
+                                        ciclos_por_segundo=1 / (lineal + cuadratico), rss_pico_mb=50 + n / 10,
+                                        subsistemas={'consumidores': lineal, 'gini': cuadratico}))
+        analisis = analizar_escalabilidad(puntos)
+        datos = analisis['consumidores']
+        self.assertAlmostEqual(datos['exponentes_subsistemas']['gini'], 2.0, places=6)
+        self.assertAlmostEqual(datos['exponentes_subsistemas']['consumidores'], 1.0, places=6)
+        self.assertEqual(datos['subsistema_mayor_exponente'], 'gini')
+        self.assertEqual(datos['subsistema_dominante_10x'], 'gini')
+        self.assertNotIn('bienes', analisis)
+
+        import tempfile
+        from src.utils.AnalisisEscalabilidad import generar_reporte_escalabilidad
+        with tempfile.TemporaryDirectory() as directorio:
+            reporte_md, reporte_json = generar_reporte_escalabilidad(puntos, analisis, directorio, 'test')
+            with open(reporte_md, encoding='utf-8') as f:
+                self.assertIn('gini (2.00)', f.read())
+            self.assertTrue(os.path.exists(reporte_json))
+
+    def test_limitar_catalogo_mantiene_categorias(self):
+        from main import crear_bienes_expandidos, limitar_catalogo_bienes
+        bienes = crear_bienes_expandidos()
+        reducido = limitar_catalogo_bienes(bienes, 12)
+        self.assertEqual(len(reducido), 12)
+        # 12 bienes alcanzan para cubrir todas las categorías del catálogo
+        self.assertEqual({b.categoria for b in reducido.values()},
+                         {b.categoria for b in bienes.values()})
+        self.assertIs(limitar_catalogo_bienes(bienes, None), bienes)
+
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
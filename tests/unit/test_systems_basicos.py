@@ -19,6 +19,8 @@ sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
 from src.systems.ValidadorEconomico import ValidadorEconomico, TipoAlerta
 from src.systems.SistemaBancario import SistemaBancario, Banco
 from src.systems.AnalyticsML import SistemaAnalyticsML
+from src.systems.PreciosDinamicos import MotorPreciosVectorizado, actualizar_precios_mercado
+from src.systems.SectoresEconomicos import EconomiaMultisectorial, ModeloInsumoProducto
 from src.models.Mercado import Mercado
 from src.models.Bien import Bien
 
@@ -286,6 +288,657 @@ class TestAnalyticsML(unittest.TestCase):
         self.assertIn('recomendaciones', insights)
 
 
+class TestMotorPreciosVectorizado(unittest.TestCase):
+    """Tests del motor de precios empresa × bien"""
+
+    def setUp(self):
+        from src.utils.BenchmarkSuite import crear_mercado_sintetico
+        self.mercado = crear_mercado_sintetico(0, num_empresas=8, num_bienes=6)
+        self.mercado.transacciones = [
+            {'vendedor': 'Productora_0', 'bien': 'bien_0', 'cantidad': 25, 'ciclo': 1},
+            {'vendedor': 'Productora_1', 'bien': 'bien_1', 'cantidad': 12, 'ciclo': 1},
+        ]
+        # Precios dispersos para que actúe el factor de competencia
+        for i, empresa in enumerate(self.mercado.getEmpresas()):
+            for bien in list(empresa.precios):
+                empresa.precios[bien] *= 0.6 + 0.1 * i
+
+    def test_promedio_competencia_excluye_empresa_propia(self):
+        motor = MotorPreciosVectorizado(None)
+        empresas = self.mercado.getEmpresas()
+        precios = motor.construir_matriz(empresas)
+        promedio = motor.promedio_competencia()
+        bien = next(iter(empresas[0].precios))
+        j = motor.indice_bienes[bien]
+        esperado = [e.precios[bien] for e in empresas[1:] if bien in e.precios]
+        self.assertAlmostEqual(promedio[0, j], sum(esperado) / len(esperado))
+        self.assertEqual(precios.shape, (len(empresas), len(motor.indice_bienes)))
+
+    def test_mismas_reglas_que_calculo_escalar(self):
+        """Con los precios del inicio de la ronda, ambos caminos coinciden"""
+        import random
+        from src.systems.PreciosDinamicos import integrar_sistema_precios_dinamicos
+        sistema = integrar_sistema_precios_dinamicos(self.mercado)
+        empresas = self.mercado.getEmpresas()
+        originales = [dict(e.precios) for e in empresas]
+
+        random.seed(7)
+        sistema.ajustar_volatilidad_mercado()
+        esperados = []
+        for empresa in empresas:
+            for bien in empresa.precios:
+                inventario = len(empresa.bienes.get(bien, []))
+                demanda = sum(t['cantidad'] for t in self.mercado.transacciones
+                              if t['bien'] == bien and t['vendedor'] == empresa.nombre)
+                esperados.append(sistema.calcular_precio_dinamico(empresa, bien, inventario, demanda))
+
+        random.seed(7)
+        actualizados = actualizar_precios_mercado(self.mercado)
+        obtenidos = [precio for e in empresas for precio in e.precios.values()]
+        self.assertEqual(actualizados, len(esperados))
+        for obtenido, esperado in zip(obtenidos, esperados):
+            self.assertAlmostEqual(obtenido, esperado, places=9)
+        self.assertNotEqual(originales, [dict(e.precios) for e in empresas])
+
+
+class TestModeloInsumoProducto(unittest.TestCase):
+    """Tests del modelo de Leontief de la economía multisectorial"""
+
+    def setUp(self):
+        self.economia = EconomiaMultisectorial(Mercado({}))
+        for i, sector in enumerate(self.economia.sectores.values()):
+            sector.pib_sectorial = 1000.0 * (i + 1)
+
+    def test_efectos_intersectoriales_igual_que_recorrido_por_pares(self):
+        esperados = {}
+        for origen, compras in self.economia.matriz_insumo_producto.items():
+            for destino, coeficiente in compras.items():
+                esperados[destino] = esperados.get(destino, 0) + \
+                    self.economia.sectores[origen].pib_sectorial * coeficiente
+        efectos = self.economia.calcular_efectos_intersectoriales()
+        self.assertEqual(set(efectos), set(esperados))
+        for sector, valor in esperados.items():
+            self.assertAlmostEqual(efectos[sector], valor)
+
+    def test_inversa_cacheada_hasta_cambiar_coeficientes(self):
+        import numpy as np
+        modelo = self.economia.insumo_producto
+        inversa = modelo.inversa_leontief
+        self.assertIs(modelo.inversa_leontief, inversa)
+        np.testing.assert_allclose(inversa @ (np.eye(len(modelo.nombres)) - modelo.coeficientes),
+                                   np.eye(len(modelo.nombres)), atol=1e-12)
+
+        modelo.establecer_coeficiente('mineria', 'agricultura', 0.2)
+        self.assertIsNot(modelo.inversa_leontief, inversa)
+        self.assertEqual(self.economia.matriz_insumo_producto['agricultura']['mineria'], 0.2)
+
+    def test_relaciones_de_solo_lectura(self):
+        relaciones = self.economia.matriz_insumo_producto
+        with self.assertRaises(TypeError):
+            relaciones['agricultura']['mineria'] = 0.3
+        with self.assertRaises(TypeError):
+            relaciones['agricultura'] = {}
+
+        # Reasignar la propiedad entera sí reconstruye el modelo
+        nuevas = {comprador: dict(compras) for comprador, compras in relaciones.items()}
+        nuevas['agricultura']['mineria'] = 0.3
+        self.economia.matriz_insumo_producto = nuevas
+        self.assertEqual(self.economia.matriz_insumo_producto['agricultura']['mineria'], 0.3)
+
+    def test_multiplicadores_y_encadenamientos(self):
+        import numpy as np
+        modelo = ModeloInsumoProducto(['a', 'b'], [[0.0, 0.5], [0.0, 0.0]])
+        # b compra 0.5 de a por unidad: una unidad de demanda final de b genera 1.5 de producto
+        np.testing.assert_allclose(modelo.multiplicadores_producto(), [1.0, 1.5])
+        np.testing.assert_allclose(modelo.produccion_requerida([0, 1]), [0.5, 1.0])
+        self.assertGreater(modelo.encadenamientos_hacia_atras()[1], 1)
+        self.assertGreater(modelo.encadenamientos_hacia_adelante()[0], 1)
+
+        multiplicadores = self.economia.obtener_multiplicadores_sectoriales()
+        self.assertEqual(set(multiplicadores), set(self.economia.sectores))
+        self.assertTrue(all(m['multiplicador'] >= 1 for m in multiplicadores.values()))
+
+    def test_shock_se_propaga_a_compradores(self):
+        from src.models.EmpresaProductora import EmpresaProductora
+        mercado = self.economia.mercado
+        empresas = {}
+        for nombre, sector in self.economia.sectores.items():
+            empresa = EmpresaProductora(f'Empresa_{nombre}', mercado)
+            empresa.eficiencia_produccion = 1.0
+            sector.agregar_empresa(empresa)
+            empresas[nombre] = empresa
+
+        self.economia.simular_shock_sectorial('mineria', 'productividad', 0.5)
+        self.assertEqual(empresas['mineria'].eficiencia_produccion, 0.5)
+        # Construcción compra insumos de minería: el shock le llega atenuado
+        self.assertLess(empresas['construccion'].eficiencia_produccion, 1.0)
+        self.assertGreaterEqual(empresas['construccion'].eficiencia_produccion, 0.85)
+
+
+class TestRecaudacionFiscalVectorizada(unittest.TestCase):
+    """Recaudación por arrays: tramos de renta, desglose y escritura de saldos"""
+
+    def _crear_economia(self):
+        from src.utils.BenchmarkSuite import crear_mercado_sintetico
+        from src.systems.SistemaFiscal import SistemaFiscal
+        mercado = crear_mercado_sintetico(60, num_empresas=5)
+        empresas = mercado.getEmpresas()
+        for i, consumidor in enumerate(mercado.getConsumidores()):
+            consumidor.empleado = i % 3 != 0
+            consumidor.ingreso_mensual = 1500 * i if consumidor.empleado else 0
+            consumidor.dinero = 600000 if i % 10 == 0 else 5000 + i
+            if consumidor.empleado:
+                empresas[i % len(empresas)].empleados.append(consumidor)
+        empresas[0].dinero = -100  # Sin impuesto corporativo ni contribuciones
+        return mercado, SistemaFiscal(mercado)
+
+    def test_tramos_de_renta(self):
+        import numpy as np
+        _, fiscal = self._crear_economia()
+        ingresos = [0, 10000, 24000, 30000, 60000, 130000]
+        # 30000: 24000 al 19% + 6000 al 24%; 130000 suma los cuatro tramos
+        esperados = [0, 1900, 4560, 6000, 13200, 38700]
+        np.testing.assert_allclose(fiscal._calcular_impuesto_renta_vectorizado(ingresos), esperados)
+        self.assertEqual([fiscal._calcular_impuesto_renta(i) for i in ingresos], esperados)
+
+    def test_mismo_desglose_y_saldos_que_escalar(self):
+        from src.systems.SistemaFiscal import TipoImpuesto
+        mercado_a, fiscal_a = self._crear_economia()
+        mercado_b, fiscal_b = self._crear_economia()
+        mercado_c, fiscal_c = self._crear_economia()
+        mercado_c.activar_almacen_consumidores()
+
+        desglose_a = fiscal_a._recaudar_impuestos_vectorizado(12)
+        desglose_b = fiscal_b._recaudar_impuestos_escalar(12)
+        desglose_c = fiscal_c._recaudar_impuestos_vectorizado(12)
+
+        self.assertGreater(desglose_a[TipoImpuesto.PATRIMONIO], 0)
+        for tipo in TipoImpuesto:
+            self.assertAlmostEqual(desglose_a[tipo], desglose_b[tipo], places=6)
+        for a, b, c in zip(mercado_a.personas, mercado_b.personas, mercado_c.personas):
+            self.assertAlmostEqual(a.dinero, b.dinero, places=6)
+            self.assertAlmostEqual(c.dinero, b.dinero, places=6)
+        self.assertEqual(desglose_c, desglose_a)
+
+    def test_fallo_en_empresas_no_cobra_dos_veces(self):
+        """Si falla el bloque de empresas nada se ha escrito y el método tradicional cobra una vez"""
+        from unittest import mock
+        import numpy as np
+        mercado_a, fiscal_a = self._crear_economia()
+        mercado_b, fiscal_b = self._crear_economia()
+
+        with mock.patch.object(np, 'maximum', side_effect=RuntimeError('empresas')):
+            fiscal_a._recaudar_impuestos(12)
+        fiscal_b._recaudar_impuestos_escalar(12)
+
+        for a, b in zip(mercado_a.personas, mercado_b.personas):
+            self.assertAlmostEqual(a.dinero, b.dinero, places=6)
+
+
+class TestControlPreciosVectorizado(unittest.TestCase):
+    """Pasada de control de precios sobre la matriz empresa × bien"""
+
+    def _crear_control(self, precios_por_empresa, inflacion=()):
+        from src.models.Empresa import Empresa
+        from src.systems.ControlPreciosRealista import ControladorPreciosRealista
+        bienes = {'Arroz': Bien('Arroz', 'alimentos_basicos'), 'Pan': Bien('Pan', 'alimentos_basicos')}
+        mercado = Mercado(bienes)
+        for i, precios in enumerate(precios_por_empresa):
+            empresa = Empresa(f'E{i}', mercado, bienes={b: [] for b in precios})
+            empresa.precios = dict(precios)
+            mercado.agregar_persona(empresa)
+        mercado.inflacion_historica = list(inflacion)
+        return mercado, ControladorPreciosRealista(mercado)
+
+    def _precios(self, mercado):
+        return [dict(e.precios) for e in mercado.getEmpresas()]
+
+    def test_limites_absolutos(self):
+        """El factor monetario no saca los precios de [mínimo, máximo]"""
+        mercado, control = self._crear_control([{'Arroz': 99.9}, {'Pan': 0.05}])
+        control.precio_maximo_permitido = 100.0
+        control.factor_monetario = 1.2  # Se limita a +5%
+
+        self.assertEqual(control._aplicar_control_masivo_vectorizado(), 2)
+        self.assertEqual(self._precios(mercado), [{'Arroz': 100.0}, {'Pan': 0.1}])
+        self.assertEqual(control.precios_anteriores, {'Arroz': 100.0, 'Pan': 0.1})
+
+    def test_emergencia_congela_precios(self):
+        """Con hiperinflación no se escribe ningún precio y la caché guarda el primero de cada bien"""
+        mercado, control = self._crear_control([{'Arroz': 12.0, 'Pan': 3.0}, {'Arroz': 15.0}],
+                                               inflacion=(0.05, 0.06))
+
+        self.assertEqual(control._aplicar_control_masivo_vectorizado(), 0)
+        self.assertTrue(control.activar_controles_emergencia)
+        self.assertEqual(self._precios(mercado), [{'Arroz': 12.0, 'Pan': 3.0}, {'Arroz': 15.0}])
+        self.assertEqual(control.precios_anteriores, {'Arroz': 12.0, 'Pan': 3.0})
+
+    def test_misma_pasada_que_escalar(self):
+        """Con la misma semilla coincide con ``aplicar_control_precios`` par a par"""
+        import random
+        precios = [{'Arroz': 12.0, 'Pan': 3.0}, {'Arroz': 15.0}, {'Pan': 2.5}]
+        mercado_v, control_v = self._crear_control(precios, inflacion=(0.01, 0.025))
+        mercado_e, control_e = self._crear_control(precios, inflacion=(0.01, 0.025))
+        for mercado in (mercado_v, mercado_e):
+            mercado.fase_ciclo_economico = 'expansion'
+            mercado.getEmpresas()[0].empleados.append(object())
+
+        random.seed(11)
+        cambios_v = control_v._aplicar_control_masivo_vectorizado()
+        random.seed(11)
+        cambios_e = control_e._aplicar_control_masivo_escalar()
+
+        self.assertGreater(cambios_v, 0)
+        self.assertEqual(cambios_v, cambios_e)
+        for fila_v, fila_e in zip(self._precios(mercado_v), self._precios(mercado_e)):
+            self.assertEqual(fila_v.keys(), fila_e.keys())
+            for bien in fila_v:
+                self.assertAlmostEqual(fila_v[bien], fila_e[bien], places=12)
+
+    def test_deflacion_emergencia(self):
+        """La deflación escala cada precio del mercado"""
+        mercado, control = self._crear_control([{'Arroz': 10.0, 'Pan': 4.0}, {'Pan': 5.0}])
+
+        control.activar_deflacion_emergencia(0.5)
+
+        self.assertEqual(self._precios(mercado), [{'Arroz': 9.9, 'Pan': 3.96}, {'Pan': 4.95}])
+        self.assertTrue(control.activar_controles_emergencia)
+
+
+class TestBusquedaSocioFusion(unittest.TestCase):
+    """Búsqueda de socios de fusión sobre la matriz de carteras"""
+
+    def _crear_gestor(self, carteras):
+        """``carteras``: ``{nombre: (bienes, dinero)}`` en orden de mercado"""
+        from src.models.Empresa import Empresa
+        from src.systems.GestorRescateEmpresarial import GestorRescateEmpresarial
+        mercado = Mercado({})
+        for nombre, (bienes, dinero) in carteras.items():
+            empresa = Empresa(nombre, mercado, bienes={b: [] for b in bienes})
+            empresa.dinero = dinero
+            mercado.agregar_persona(empresa)
+        gestor = GestorRescateEmpresarial(mercado)
+        gestor.criterio_importancia_sistemica = 0.0
+        return mercado, gestor, {e.nombre: e for e in mercado.getEmpresas()}
+
+    def test_socio_mas_capitalizado_dentro_del_rango(self):
+        mercado, gestor, empresas = self._crear_gestor({
+            'Crisis': ('abcd', -15000.0),
+            'Complementaria': ('abxy', 50000.0),  # Solapamiento 2/6
+            'Gemela': ('abcd', 90000.0),          # Solapamiento total: excluida
+            'Ajena': ('ef', 80000.0),             # Sin bienes comunes
+            'Minima': ('ax', 60000.0),            # Solapamiento 1/5, en el límite
+            'Pobre': ('abc', 15000.0),            # Capital insuficiente
+            'Vacia': ('', 95000.0),
+        })
+        crisis = empresas['Crisis']
+
+        self.assertIs(gestor._buscar_socio_fusion(crisis), empresas['Minima'])
+        self.assertIs(gestor._buscar_socio_fusion_escalar(crisis), empresas['Minima'])
+        self.assertIsNone(gestor._buscar_socio_fusion(empresas['Vacia']))
+        # Búsqueda suelta: no queda ninguna matriz cacheada
+        self.assertIsNone(gestor._carteras)
+
+    def test_empate_elige_el_primero_del_mercado(self):
+        from src.systems.GestorRescateEmpresarial import CarterasFusion
+        mercado, _, empresas = self._crear_gestor({
+            'Crisis': ('abcd', -15000.0),
+            'Primera': ('abxy', 50000.0),
+            'Segunda': ('abzw', 50000.0),
+        })
+        carteras = CarterasFusion(mercado.getEmpresas(), [empresas['Crisis']])
+        self.assertIs(carteras.socio(empresas['Crisis']), empresas['Primera'])
+
+    def test_refrescar_tras_fusion(self):
+        from src.systems.GestorRescateEmpresarial import CarterasFusion
+        mercado, _, empresas = self._crear_gestor({
+            'Crisis': ('abcd', -15000.0),
+            'Complementaria': ('abxy', 50000.0),
+            'Minima': ('ax', 60000.0),
+        })
+        carteras = CarterasFusion(mercado.getEmpresas(), [empresas['Crisis']])
+
+        carteras.refrescar(empresas['Minima'], activa=False)
+        self.assertIs(carteras.socio(empresas['Crisis']), empresas['Complementaria'])
+
+        empresas['Complementaria'].dinero = 10000.0
+        carteras.refrescar(empresas['Complementaria'])
+        self.assertIsNone(carteras.socio(empresas['Crisis']))
+
+    def test_pasada_de_rescate_usa_carteras_actualizadas(self):
+        """Tras absorber a la primera, el socio deja de ser compatible con la segunda"""
+        mercado, gestor, empresas = self._crear_gestor({
+            'Crisis1': ('abcde', -15000.0),
+            'Crisis2': ('abcde', -15000.0),
+            'Absorbente': ('abcx', 60000.0),      # 3/6 antes de la fusión, 5/6 después
+            'Complementaria': ('abyz', 50000.0),  # 2/7
+        })
+
+        gestor.evaluar_y_rescatar_empresas(1)
+
+        self.assertEqual([(f['empresa_absorbida'], f['empresa_absorbente']) for f in gestor.fusiones_realizadas],
+                         [('Crisis1', 'Absorbente'), ('Crisis2', 'Complementaria')])
+        self.assertEqual([e.nombre for e in mercado.getEmpresas()], ['Absorbente', 'Complementaria'])
+        self.assertIsNone(gestor._carteras)
+
+
+class TestMotorConcentracion(unittest.TestCase):
+    """Indicadores de concentración por bien y por sector desde la matriz de ventas"""
+
+    def setUp(self):
+        from src.utils.BenchmarkSuite import crear_mercado_sintetico
+        self.mercado = crear_mercado_sintetico(0, num_empresas=6, num_bienes=3)
+
+    def _vender(self, ventas):
+        self.mercado.ventas_ciclo_actual = {}
+        empresas = self.mercado.getEmpresas()
+        for (i, bien), importe in ventas.items():
+            self.mercado.registrar_venta(empresas[i], bien, importe)
+
+    def test_indicadores_por_bien_y_sector(self):
+        from src.systems.ControladorConcentracionEmpresarial import MotorConcentracion
+        self._vender({(0, 'bien_0'): 60.0, (1, 'bien_0'): 30.0, (2, 'bien_0'): 10.0,
+                      (0, 'bien_1'): 10.0, (3, 'bien_1'): 10.0, (4, 'bien_1'): 10.0,
+                      (5, 'bien_1'): 10.0, (1, 'bien_1'): 10.0})
+        self.mercado.registrar_venta(self.mercado.getEmpresas()[2], 'bien_0', 0.0)
+        por_bien, por_sector = MotorConcentracion().calcular(self.mercado)
+
+        bien_0 = por_bien.mercado('bien_0')
+        self.assertAlmostEqual(bien_0['hhi'], 0.36 + 0.09 + 0.01)
+        self.assertAlmostEqual(bien_0['cr4'], 1.0)
+        self.assertAlmostEqual(bien_0['cuota_dominante'], 0.6)
+        self.assertEqual(bien_0['empresa_dominante'], 'Productora_0')
+        self.assertEqual(bien_0['vendedores'], 3)
+        self.assertAlmostEqual(por_bien.mercado('bien_1')['hhi'], 0.2)
+        self.assertAlmostEqual(por_bien.mercado('bien_1')['cr4'], 0.8)
+        self.assertEqual(por_bien.mercado('bien_2')['empresa_dominante'], None)
+        self.assertEqual(por_bien.mercado('bien_2')['hhi'], 0.0)
+        # bien_0 -> alimentos_basicos, bien_1 -> alimentos_lujo
+        self.assertEqual(por_sector.como_dict()['alimentos_basicos'], bien_0)
+
+    def test_compra_registra_venta(self):
+        empresa = self.mercado.getEmpresas()[0]
+        from src.models.Consumidor import Consumidor
+        consumidor = Consumidor('Comprador', self.mercado)
+        consumidor.dinero = 10000
+        empresa.bienes['bien_0'] = [1, 1, 1]
+        self.assertTrue(consumidor.comprar_bien_mejorado(empresa, 'bien_0', 2, self.mercado, 1))
+        self.assertAlmostEqual(self.mercado.ventas_ciclo_actual[(empresa.nombre, 'bien_0')],
+                               empresa.precios['bien_0'] * 2)
+
+    def test_historial_acotado_y_mercados_concentrados(self):
+        from src.systems.ControladorConcentracionEmpresarial import MotorConcentracion
+        motor = MotorConcentracion(capacidad_historial=4)
+        for ciclo in range(6):
+            ventas = {(0, 'bien_0'): 90.0, (1, 'bien_0'): 10.0, (0, 'bien_1'): 50.0}
+            ventas[(1, 'bien_1')] = 50.0 if ciclo < 4 else 0.0  # Monopolio los dos últimos
+            self._vender(ventas)
+            motor.calcular(self.mercado)
+
+        self.assertEqual(len(motor.serie('bien_0')), 4)
+        self.assertAlmostEqual(motor.serie('bien_0')[-1], 0.82)
+        self.assertEqual(motor.mercados_concentrados(0.6, ciclos=3), ['bien_0'])
+        self.assertEqual(motor.mercados_concentrados(0.6, ciclos=2), ['bien_0', 'bien_1'])
+        self.assertEqual(motor.mercados_concentrados(0.6, ciclos=5), [])
+        self.assertIn('sector:alimentos_basicos', motor.mercados_concentrados(0.6, incluir_sectores=True))
+
+    def test_controlador_dirige_la_intervencion(self):
+        from src.systems.ControladorConcentracionEmpresarial import (
+            ControladorConcentracionEmpresarial, ConfigCreacionEmpresas)
+        controlador = ControladorConcentracionEmpresarial(ConfigCreacionEmpresas(empresas_optimas=3))
+        for empresa in self.mercado.getEmpresas():
+            empresa.dinero = 5000
+        for ciclo in range(1, 4):
+            self._vender({(0, 'bien_2'): 100.0, (1, 'bien_0'): 50.0, (2, 'bien_0'): 50.0})
+            analisis = controlador._analizar_concentracion(self.mercado)
+            necesidad = controlador._evaluar_necesidad_intervencion(analisis, 10 + ciclo)
+
+        self.assertEqual(analisis['empresas_activas'], 6)
+        self.assertEqual(analisis['mercados_concentrados'], ['bien_2'])
+        self.assertTrue(necesidad['necesaria'])
+        self.assertEqual(necesidad['mercados_objetivo'], ['bien_2'])
+
+        creadas = controlador._crear_empresas_estrategicas(self.mercado, necesidad, 13)
+        self.assertEqual(len(creadas), 1)
+        nueva = next(e for e in self.mercado.getEmpresas() if e.nombre == creadas[0]['id'])
+        self.assertEqual(creadas[0]['bienes'], ['bien_2'])
+        self.assertEqual(list(nueva.capacidad_produccion), ['bien_2'])
+        self.assertEqual(list(nueva.bienes), ['bien_2'])
+        self.assertGreater(nueva.acciones_emitidas, 0)
+        self.assertEqual(controlador.ultimo_ciclo_creacion['global'], 13)
+
+
+class TestAsignacionLaboral(unittest.TestCase):
+    """Asignación voraz sobre la matriz dispersa de candidaturas"""
+
+    def test_top_k_por_fila_y_celdas_no_factibles(self):
+        import numpy as np
+        from src.systems.AsignacionLaboral import MatrizPuntuaciones
+        puntuacion = np.array([[0.1, 0.9, 0.5, -np.inf],
+                               [-np.inf, -np.inf, -np.inf, 0.2],
+                               [0.3, 0.3, 0.8, 0.7]])
+
+        def evaluar_bloque(inicio, fin):
+            return puntuacion[inicio:fin], puntuacion[inicio:fin]
+
+        matriz = MatrizPuntuaciones.por_bloques(3, 4, evaluar_bloque, max_candidatos=2)
+        candidaturas = {(f, c) for f, c in zip(matriz.filas.tolist(), matriz.columnas.tolist())}
+        self.assertEqual(candidaturas, {(0, 1), (0, 2), (1, 3), (2, 2), (2, 3)})
+        self.assertEqual(matriz.forma, (3, 4))
+
+    def test_asignacion_respeta_capacidades_y_orden(self):
+        import numpy as np
+        from src.systems.AsignacionLaboral import MatrizPuntuaciones, asignar_voraz
+        matriz = MatrizPuntuaciones(filas=np.array([0, 0, 1, 1, 2]),
+                                    columnas=np.array([0, 1, 0, 1, 0]),
+                                    ajuste=np.ones(5),
+                                    puntuacion=np.array([0.9, 0.5, 0.8, 0.4, 0.8]),
+                                    forma=(3, 2))
+        # Capacidad 1 por columna: la fila 1 recurre a su segunda opción
+        self.assertEqual(asignar_voraz(matriz), [(0, 0), (1, 1)])
+        # Con dos plazas en la columna 0 la fila 1 gana el empate a la fila 2
+        self.assertEqual(asignar_voraz(matriz, capacidades=np.array([2, 1])), [(0, 0), (1, 0)])
+        self.assertEqual(asignar_voraz(matriz, capacidades=np.array([3, 1]), max_asignaciones=2),
+                         [(0, 0), (1, 0)])
+
+
+class TestComprasLote(unittest.TestCase):
+    """Ronda de compras de toda la población en bloque"""
+
+    def _crear_mercado(self):
+        import random
+        from src.utils.BenchmarkSuite import crear_mercado_sintetico
+        random.seed(4)
+        mercado = crear_mercado_sintetico(200, num_empresas=4, num_bienes=3)
+        mercado.ciclo_actual = 1
+        for j, empresa in enumerate(mercado.getEmpresas()):
+            for bien in list(empresa.bienes):
+                empresa.bienes[bien] = [1] * (5 + 10 * j)  # Stock escaso: hay racionamiento
+        return mercado
+
+    def test_respeta_presupuesto_e_inventarios(self):
+        from src.systems.ComprasLote import RondaComprasLote
+        mercado = self._crear_mercado()
+        consumidores = mercado.getConsumidores()
+        dinero_inicial = {c.nombre: c.dinero for c in consumidores}
+        presupuesto = {c.nombre: c.dinero * c.propension_consumo for c in consumidores}
+        stock_inicial = sum(len(u) for e in mercado.getEmpresas() for u in e.bienes.values())
+        caja_empresas = sum(e.dinero for e in mercado.getEmpresas())
+
+        resultado = RondaComprasLote(mercado).ejecutar(consumidores, 1)
+
+        self.assertGreater(resultado['compras'], 0)
+        self.assertEqual(len(mercado.transacciones), resultado['compras'])
+        stock_final = sum(len(u) for e in mercado.getEmpresas() for u in e.bienes.values())
+        self.assertEqual(stock_inicial - stock_final, resultado['compras'])
+        self.assertAlmostEqual(sum(e.dinero for e in mercado.getEmpresas()) - caja_empresas,
+                               resultado['gasto'], places=6)
+        for consumidor in consumidores:
+            gastado = dinero_inicial[consumidor.nombre] - consumidor.dinero
+            self.assertGreaterEqual(consumidor.dinero, 0)
+            self.assertLessEqual(gastado, presupuesto[consumidor.nombre] + 1e-9)
+            self.assertLessEqual(sum(consumidor.bienes.values()), 3)  # Una unidad por bien
+
+    def test_modo_lote_en_ciclo_de_mercado(self):
+        mercado = self._crear_mercado()
+        mercado.activar_almacen_consumidores()
+        consumidor = mercado.getConsumidores()[0]
+
+        # Durante la ronda de agentes el consumidor no compra por su cuenta
+        mercado.compras_en_lote = True
+        consumidor.ciclo_persona(1, mercado)
+        self.assertEqual(mercado.transacciones, [])
+
+        mercado.compras_en_lote = False
+        mercado._ronda_compras_lote(1)
+        compras = [t for t in mercado.transacciones if t['consumidor'].startswith('Consumidor')]
+        self.assertGreater(len(compras), 0)
+        self.assertEqual(len(mercado.transacciones_ciclo_actual), len(compras))
+        self.assertTrue(all(c.dinero >= 0 for c in mercado.getConsumidores()))
+
+    def test_solo_repite_por_agente_si_falla_antes_de_aplicar(self):
+        from unittest import mock
+        from src.models.Consumidor import Consumidor
+        from src.systems.ComprasLote import RondaComprasLote
+        aplicar_original = RondaComprasLote.aplicar
+
+        def aplicar_y_fallar(ronda, plan):
+            aplicar_original(ronda, plan)
+            raise RuntimeError('fallo tras escribir las compras')
+
+        mercado = self._crear_mercado()
+        with mock.patch.object(RondaComprasLote, 'aplicar', aplicar_y_fallar), \
+                mock.patch.object(Consumidor, 'ciclo_compras') as por_agente:
+            mercado._ronda_compras_lote(1)
+        por_agente.assert_not_called()
+        self.assertGreater(len(mercado.transacciones), 0)
+
+        mercado = self._crear_mercado()
+        with mock.patch.object(RondaComprasLote, 'planificar', side_effect=RuntimeError('demanda')), \
+                mock.patch.object(Consumidor, 'ciclo_compras') as por_agente:
+            mercado._ronda_compras_lote(1)
+        self.assertEqual(por_agente.call_count, len(mercado.getConsumidores()))
+
+
+class TestAcumuladorMacro(unittest.TestCase):
+    """Agregados macro por eventos frente a los recorridos completos"""
+
+    def setUp(self):
+        from src.utils.BenchmarkSuite import crear_mercado_sintetico
+        self.mercado = crear_mercado_sintetico(40, num_empresas=4, num_bienes=3)
+
+    def _desempleo_recorrido(self):
+        consumidores = self.mercado.getConsumidores()
+        return sum(1 for c in consumidores if not c.empleado) / len(consumidores)
+
+    def _comprobar_empleo(self, acumulador):
+        self.assertEqual(acumulador.poblacion, len(self.mercado.getConsumidores()))
+        self.assertAlmostEqual(acumulador.tasa_desempleo(), self._desempleo_recorrido())
+
+    def _contratar_y_despedir(self, acumulador):
+        from src.models.Consumidor import Consumidor
+        empresa = self.mercado.getEmpresas()[0]
+        empresa.dinero = 1e6
+        empresa.capacidad_empleo = 100
+        consumidores = self.mercado.getConsumidores()
+        for consumidor in consumidores[:10]:
+            if consumidor.empleado:
+                consumidor.empleado = False
+            empresa.contratar(consumidor)
+        self._comprobar_empleo(acumulador)
+        for consumidor in consumidores[:4]:
+            consumidor.perder_empleo()
+        consumidores[5].empleado = True  # ya empleado: no cuenta dos veces
+        self._comprobar_empleo(acumulador)
+
+        nuevo = Consumidor('Nuevo', self.mercado)
+        nuevo.empleado = False
+        self.mercado.agregar_persona(nuevo)
+        self.mercado.retirar_persona(consumidores[6])
+        self._comprobar_empleo(acumulador)
+        # Los consumidores retirados ya no mueven los contadores
+        consumidores[6].empleado = not consumidores[6].empleado
+        self._comprobar_empleo(acumulador)
+
+    def test_empleo_y_poblacion_por_eventos(self):
+        acumulador = self.mercado.activar_acumulador_macro()
+        self._comprobar_empleo(acumulador)
+        self._contratar_y_despedir(acumulador)
+
+    def test_empleo_con_almacen_columnar(self):
+        self.mercado.activar_almacen_consumidores()
+        acumulador = self.mercado.activar_acumulador_macro()
+        self._contratar_y_despedir(acumulador)
+        self.assertEqual(acumulador.empleados,
+                         int(self.mercado.almacen_consumidores.empleado[
+                             self.mercado.almacen_consumidores.indices(self.mercado.getConsumidores())].sum()))
+
+    def test_indicadores_gobierno_iguales_al_recorrido(self):
+        consumidores = self.mercado.getConsumidores()
+        for ciclo, consumidor in enumerate(consumidores[:8]):
+            self.mercado.registrar_transaccion(consumidor, 'bien_0', 1, 10.0 * (ciclo + 1), ciclo % 3)
+        # Etiqueta que coincide con len(transacciones), el criterio del gobierno
+        self.mercado.registrar_transacciones_lote([
+            {'consumidor': 'x', 'bien': 'bien_1', 'cantidad': 1, 'costo_total': 7.5, 'ciclo': 10}])
+        self.mercado.activar_acumulador_macro()
+        self.mercado.registrar_transacciones_lote([
+            {'consumidor': 'y', 'bien': 'bien_1', 'cantidad': 1, 'costo_total': 2.5, 'ciclo': 10}])
+
+        gobierno = self.mercado.gobierno
+        gobierno.calcular_indicadores_macroeconomicos()
+        con_acumulador = (gobierno.pib_nominal, gobierno.poblacion, gobierno.tasa_desempleo)
+        self.mercado.acumulador_macro = None
+        gobierno.calcular_indicadores_macroeconomicos()
+        self.assertEqual(con_acumulador, (gobierno.pib_nominal, gobierno.poblacion, gobierno.tasa_desempleo))
+        self.assertEqual(con_acumulador[0], 10.0)
+
+    def test_estadisticas_pib_del_banco_central(self):
+        import random
+        from src.models.AcumuladorMacro import AcumuladorMacro
+        from src.systems.BancoCentralAvanzado import BancoCentralAvanzado
+        random.seed(5)
+        banco = BancoCentralAvanzado(self.mercado)
+        self.mercado.pib_historico = [random.uniform(5e4, 1.5e5) for _ in range(12)]
+
+        acumulador = AcumuladorMacro(self.mercado)
+
+        def comparar_con_recorrido():
+            resultados = []
+            for activo in (acumulador, None):
+                self.mercado.acumulador_macro = activo
+                banco._estimar_pib_potencial()
+                resultados.append((banco.pib_potencial_estimado, banco._calcular_volatilidad_pib()))
+            for obtenido, esperado in zip(*resultados):
+                self.assertAlmostEqual(obtenido / esperado, 1.0, places=9)
+
+        # Cada consulta incorpora solo los ciclos nuevos
+        for _ in range(3):
+            comparar_con_recorrido()
+            self.mercado.pib_historico.extend(random.uniform(5e4, 1.5e5) for _ in range(5))
+        # Serie reemplazada por una más corta: se vuelve a acumular
+        self.mercado.pib_historico = self.mercado.pib_historico[:6]
+        comparar_con_recorrido()
+
+    def test_empleo_del_banco_central_no_depende_del_acumulador(self):
+        from src.models.AcumuladorMacro import AcumuladorMacro
+        from src.systems.BancoCentralAvanzado import BancoCentralAvanzado
+        banco = BancoCentralAvanzado(self.mercado)
+        for i, consumidor in enumerate(self.mercado.getConsumidores()):
+            consumidor.empleado = i % 4 == 0
+        acumulador = AcumuladorMacro(self.mercado)
+
+        estimaciones = []
+        for activo in (acumulador, None):
+            self.mercado.acumulador_macro = activo
+            estimaciones.append(banco._estimar_empleo_total())
+        self.assertEqual(estimaciones[0], estimaciones[1])
+
+        # Sin consumidores se mantiene el 95% por defecto aunque haya acumulador
+        from types import SimpleNamespace
+        banco.mercado = SimpleNamespace(acumulador_macro=acumulador)
+        self.assertEqual(banco._estimar_empleo_total(), 0.95)
+
+
 class TestBanco(unittest.TestCase):
     """Tests para la clase Banco"""
     
@@ -370,4 +370,4 @@ class TestCreacionInstanciasBasicas(unittest.TestCase):
 
 
 if __name__ == '__main__':
-    unittest.main()
\ No newline at end of file
+    unittest.main()
@@ -7,11 +7,15 @@ import sys
 import os
 import logging
 import glob
+import json
+import tempfile
 
 # Añadir el directorio raíz al path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
 
-from src.utils.SimuladorLogger import SimuladorLogger, get_simulador_logger, init_logging, close_logging
+from src.utils.SimuladorLogger import (SimuladorLogger, FiltroRepeticiones, diagnostico,
+                                       diagnostico_activo, get_simulador_logger, init_logging,
+                                       close_logging)
 
 
 class TestSimuladorLoggerCobertura(unittest.TestCase):
@@ -55,5 +59,74 @@ class TestSimuladorLoggerCobertura(unittest.TestCase):
         close_logging()
 
 
+
+class TestSimuladorLoggerAsincrono(unittest.TestCase):
+    """Pipeline asíncrono: cola, niveles por componente, límite de repeticiones y JSONL"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        close_logging()
+        self.tmp.cleanup()
+
+    def _leer(self, patron):
+        rutas = glob.glob(os.path.join(self.tmp.name, patron))
+        self.assertEqual(len(rutas), 1)
+        with open(rutas[0], encoding='utf-8') as f:
+            return f.read()
+
+    def test_escritura_en_segundo_plano_y_jsonl(self):
+        lg = SimuladorLogger(log_dir=self.tmp.name, jsonl=True)
+        lg.log_sistema("mensaje asincrono")
+        lg.close()
+        self.assertIn("SISTEMA: mensaje asincrono", self._leer('*.log'))
+        registros = [json.loads(l) for l in self._leer('*.jsonl').splitlines()]
+        self.assertTrue(any(r['mensaje'] == "SISTEMA: mensaje asincrono" for r in registros))
+        self.assertEqual(registros[-1]['nivel'], 'INFO')
+
+    def test_nivel_por_componente(self):
+        lg = SimuladorLogger(log_dir=self.tmp.name, niveles_componentes={'Empresa': logging.WARNING})
+        self.assertFalse(lg.habilitado('Empresa', logging.INFO))
+        self.assertTrue(lg.habilitado('Mercado', logging.INFO))
+        diagnostico("diagnostico %s", 'silenciado', componente='Empresa')
+        diagnostico("diagnostico %s", 'visible', componente='Mercado')
+        lg.close()
+        contenido = self._leer('*.log')
+        self.assertNotIn("diagnostico silenciado", contenido)
+        self.assertIn("diagnostico visible", contenido)
+
+    def test_diagnostico_no_formatea_si_esta_silenciado(self):
+        formateados = []
+
+        class Valor:
+            def __init__(self, texto):
+                self.texto = texto
+
+            def __str__(self):
+                formateados.append(self.texto)
+                return self.texto
+
+        lg = SimuladorLogger(log_dir=self.tmp.name, niveles_componentes={'Empresa': logging.WARNING})
+        self.assertFalse(diagnostico_activo('Empresa'))
+        diagnostico("valor %s", Valor('silenciado'), componente='Empresa')
+        diagnostico("valor %s", Valor('visible'), componente='Mercado')
+        lg.close()
+        self.assertNotIn('silenciado', formateados)
+        self.assertIn("valor visible", self._leer('*.log'))
+
+    def test_advertencias_repetitivas_limitadas(self):
+        filtro = FiltroRepeticiones(ventana_s=60.0, max_por_ventana=3)
+        registros = [logging.LogRecord('SimuladorEconomico.Empresa', logging.WARNING, __file__, 0,
+                                       f"Empresa_{i}: costo operativo inválido", None, None)
+                     for i in range(10)]
+        emitidos = [r for r in registros if filtro.filter(r)]
+        self.assertEqual(len(emitidos), 3)
+        # Los errores de otra plantilla no se ven afectados
+        otro = logging.LogRecord('SimuladorEconomico.Empresa', logging.WARNING, __file__, 0,
+                                 "otro mensaje", None, None)
+        self.assertTrue(filtro.filter(otro))
+
+
 if __name__ == '__main__':
     unittest.main()